@@ -0,0 +1,36 @@
+"""
+Create the candidate_changes log that worker processes catch their in-memory
+search indexes up from. Safe to rerun: also prunes entries past retention.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from app.db.database import engine, SessionLocal
+from app.db import models
+from app.services.candidate_changes import prune_candidate_changes
+
+
+def add_candidate_changes():
+    """Create (or prune) the candidate change log"""
+    print("🔨 Creating candidate change log...")
+    
+    db = SessionLocal()
+    try:
+        models.CandidateChange.__table__.create(bind=engine, checkfirst=True)
+        print("✅ Table candidate_changes ready")
+        
+        pruned = prune_candidate_changes(db)
+        print(f"✅ Pruned {pruned} old change(s)")
+        
+    except Exception as e:
+        print(f"❌ Error creating candidate change log: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_candidate_changes()
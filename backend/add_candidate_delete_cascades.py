@@ -0,0 +1,83 @@
+"""
+Make candidate and job deletes set-based: turn every foreign key the models
+declare with ondelete="CASCADE" (towards candidates and jobs) into ON DELETE
+CASCADE in the database, and index the candidate_id columns the cascades
+look up
+"""
+import re
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from app.db.database import SessionLocal
+from app.db import models
+
+PARENT_TABLES = ("candidates", "jobs")
+
+INDEXES = {
+    f"ix_{table}_candidate_id": f"{table} (candidate_id)"
+    for table in ("skills", "work_experience", "education", "projects", "certifications", "languages",
+                  "ai_analysis", "candidate_tags", "resumes", "embeddings")
+}
+
+
+def _cascading_columns():
+    """(table, column) pairs whose model foreign key cascades from a parent table"""
+    pairs = set()
+    for table in models.Base.metadata.tables.values():
+        for fk in table.foreign_keys:
+            if fk.ondelete == "CASCADE" and fk.column.table.name in PARENT_TABLES:
+                pairs.add((table.name, fk.parent.name))
+    return pairs
+
+
+def add_candidate_delete_cascades():
+    """Recreate non-cascading foreign keys with ON DELETE CASCADE and add the lookup indexes"""
+    print("🔨 Adding ON DELETE CASCADE to candidate/job foreign keys...")
+
+    db = SessionLocal()
+    try:
+        wanted = _cascading_columns()
+        constraints = db.execute(text("""
+            SELECT con.conname, rel.relname AS table_name, att.attname AS column_name,
+                   pg_get_constraintdef(con.oid) AS definition
+            FROM pg_constraint con
+            JOIN pg_class rel ON rel.oid = con.conrelid
+            JOIN pg_class ref ON ref.oid = con.confrelid
+            JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = con.conkey[1]
+            WHERE con.contype = 'f' AND con.confdeltype <> 'c'
+              AND ref.relname = ANY(:parents) AND array_length(con.conkey, 1) = 1
+        """), {"parents": list(PARENT_TABLES)}).fetchall()
+
+        for row in constraints:
+            if (row.table_name, row.column_name) not in wanted:
+                continue
+            definition = re.sub(r"\s+ON DELETE (NO ACTION|RESTRICT|SET NULL|SET DEFAULT)", "", row.definition)
+            # NOT VALID + VALIDATE: existing rows are checked without blocking writes
+            db.execute(text(
+                f'ALTER TABLE {row.table_name} DROP CONSTRAINT "{row.conname}", '
+                f'ADD CONSTRAINT "{row.conname}" {definition} ON DELETE CASCADE NOT VALID'
+            ))
+            db.commit()
+            db.execute(text(f'ALTER TABLE {row.table_name} VALIDATE CONSTRAINT "{row.conname}"'))
+            db.commit()
+            print(f"✅ {row.table_name}.{row.column_name} now cascades")
+
+        for name, definition in INDEXES.items():
+            db.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"))
+            print(f"✅ {name}")
+        db.commit()
+        print("✅ Candidate deletes cascade in the database")
+
+    except Exception as e:
+        print(f"❌ Error adding delete cascades: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_candidate_delete_cascades()
@@ -0,0 +1,49 @@
+"""
+Add candidates.total_experience_months, backfill it from work_experience and
+index it for experience filters and sorting. Safe to rerun: only candidates
+whose total changed are written, so a nightly run keeps open-ended positions
+(no end date) counted up to the current day.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from app.db.database import SessionLocal
+from app.services.experience_totals import refresh_candidate_experience_totals
+
+
+def add_candidate_experience_totals():
+    """Add, backfill and index the candidate experience total column"""
+    print("🔨 Adding candidate experience totals...")
+
+    db = SessionLocal()
+    try:
+        db.execute(text(
+            "ALTER TABLE candidates ADD COLUMN IF NOT EXISTS total_experience_months INTEGER NOT NULL DEFAULT 0"
+        ))
+        db.commit()
+        print("✅ Column candidates.total_experience_months ready")
+
+        updated = refresh_candidate_experience_totals(db)
+        print(f"✅ Backfilled experience totals for {updated} candidate(s)")
+
+        db.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_candidates_total_experience_months_id "
+            "ON candidates (total_experience_months, id)"
+        ))
+        db.execute(text("ANALYZE candidates"))
+        db.commit()
+        print("✅ Index ix_candidates_total_experience_months_id ready")
+
+    except Exception as e:
+        print(f"❌ Error adding candidate experience totals: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_candidate_experience_totals()
@@ -0,0 +1,55 @@
+"""
+Add indexes used by the structured candidate filters of the AI chat
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from app.db.database import SessionLocal
+
+INDEXES = [
+    ("ix_skills_lower_skill_name_candidate",
+     "CREATE INDEX IF NOT EXISTS ix_skills_lower_skill_name_candidate ON skills (lower(trim(skill_name)), candidate_id)"),
+    ("ix_languages_lower_language_name_candidate",
+     "CREATE INDEX IF NOT EXISTS ix_languages_lower_language_name_candidate ON languages (lower(language_name), candidate_id)"),
+    ("ix_candidates_years_of_experience",
+     "CREATE INDEX IF NOT EXISTS ix_candidates_years_of_experience ON candidates (years_of_experience)"),
+    ("ix_candidates_lower_career_level",
+     "CREATE INDEX IF NOT EXISTS ix_candidates_lower_career_level ON candidates (lower(career_level))"),
+]
+
+
+def add_candidate_filter_indexes():
+    """Create the filter indexes if they don't exist yet"""
+    print("🔨 Adding candidate filter indexes...")
+    
+    db = SessionLocal()
+    try:
+        for index_name, create_sql in INDEXES:
+            try:
+                db.execute(text(create_sql))
+                db.commit()
+                print(f"✅ Index ready: {index_name}")
+            except Exception as e:
+                print(f"❌ Error creating index {index_name}: {e}")
+                db.rollback()
+        
+        # Refresh planner statistics so the new indexes are used right away
+        db.execute(text("ANALYZE candidates"))
+        db.execute(text("ANALYZE skills"))
+        db.execute(text("ANALYZE languages"))
+        db.commit()
+        print("✅ Candidate filter indexes setup completed!")
+        
+    except Exception as e:
+        print(f"❌ Error setting up candidate filter indexes: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_candidate_filter_indexes()
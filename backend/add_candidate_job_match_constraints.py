@@ -0,0 +1,71 @@
+"""
+Prepare candidate_job_matches for incremental maintenance: one row per
+candidate/job pair, score-ordered indexes, the rescore queue and an initial
+backfill
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from app.db.database import engine, SessionLocal
+from app.db import models
+from app.services.match_maintenance import rebuild_all_matches
+
+
+def add_candidate_job_match_constraints():
+    """Deduplicate pairs, add the unique constraint and indexes, then score every open job"""
+    print("🔨 Setting up candidate_job_matches...")
+    
+    db = SessionLocal()
+    try:
+        # Keep the most recent row of any duplicated pair
+        removed = db.execute(text("""
+            DELETE FROM candidate_job_matches m
+            USING candidate_job_matches newer
+            WHERE m.candidate_id = newer.candidate_id
+              AND m.job_id = newer.job_id
+              AND (coalesce(m.calculated_at, 'epoch'), m.id::text)
+                  < (coalesce(newer.calculated_at, 'epoch'), newer.id::text)
+        """)).rowcount
+        print(f"✅ Removed {removed} duplicate match row(s)")
+        
+        db.execute(text("""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_candidate_job_matches_pair') THEN
+                    ALTER TABLE candidate_job_matches
+                        ADD CONSTRAINT uq_candidate_job_matches_pair UNIQUE (candidate_id, job_id);
+                END IF;
+            END $$;
+        """))
+        db.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_candidate_job_matches_job_score "
+            "ON candidate_job_matches (job_id, match_score DESC)"
+        ))
+        db.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_candidate_job_matches_candidate_score "
+            "ON candidate_job_matches (candidate_id, match_score DESC)"
+        ))
+        db.commit()
+        print("✅ Unique pair constraint and score indexes ready")
+        
+        models.MatchRescoreQueue.__table__.create(bind=engine, checkfirst=True)
+        print("✅ Table match_rescore_queue ready")
+        
+        stored = rebuild_all_matches(db)
+        db.execute(text("ANALYZE candidate_job_matches"))
+        db.commit()
+        print(f"✅ Stored {stored} candidate/job match(es)")
+        
+    except Exception as e:
+        print(f"❌ Error setting up candidate_job_matches: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_candidate_job_match_constraints()
@@ -0,0 +1,41 @@
+"""
+Create the candidate_read_documents table (or add its stale flag) and build a
+detail document for every existing candidate
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from app.db.database import engine, SessionLocal
+from app.db import models
+from app.services.candidate_read_model import refresh_candidate_read_documents
+
+
+def add_candidate_read_documents():
+    """Create and backfill the candidate detail read model"""
+    print("🔨 Creating candidate read documents...")
+    
+    db = SessionLocal()
+    try:
+        models.CandidateReadDocument.__table__.create(bind=engine, checkfirst=True)
+        db.execute(text(
+            "ALTER TABLE candidate_read_documents ADD COLUMN IF NOT EXISTS stale BOOLEAN NOT NULL DEFAULT false"
+        ))
+        db.commit()
+        print("✅ Table candidate_read_documents ready")
+        
+        built = refresh_candidate_read_documents(db)
+        print(f"✅ Built read documents for {built} candidate(s)")
+        
+    except Exception as e:
+        print(f"❌ Error creating candidate read documents: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_candidate_read_documents()
@@ -0,0 +1,45 @@
+"""
+Create the candidate full-text search table (generated tsvector columns + GIN
+indexes) and backfill it from existing candidates
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from app.db.database import engine, SessionLocal
+from app.db import models
+from app.services.search_documents import refresh_search_documents
+
+
+def add_candidate_search_documents():
+    """Create the table if needed and (re)build every candidate's search document"""
+    print("🔨 Setting up candidate full-text search...")
+    
+    db = SessionLocal()
+    try:
+        # The Arabic snowball configuration ships with PostgreSQL 12+
+        has_arabic = db.execute(text("SELECT 1 FROM pg_ts_config WHERE cfgname = 'arabic'")).first()
+        if not has_arabic:
+            print("❌ PostgreSQL has no 'arabic' text search configuration (requires PostgreSQL 12+)")
+            return
+        
+        models.CandidateSearchDocument.__table__.create(bind=engine, checkfirst=True)
+        print("✅ Table candidate_search_documents ready (GIN indexes on search_vector_en / search_vector_ar)")
+        
+        count = refresh_search_documents(db)
+        db.execute(text("ANALYZE candidate_search_documents"))
+        db.commit()
+        print(f"✅ Indexed {count} candidate(s)")
+        
+    except Exception as e:
+        print(f"❌ Error setting up candidate full-text search: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_candidate_search_documents()
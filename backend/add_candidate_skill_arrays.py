@@ -0,0 +1,44 @@
+"""
+Add the denormalised candidates.skill_ids / skill_names arrays, backfill them
+from the skills table and create their GIN indexes
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from app.db.database import SessionLocal
+from app.services.skill_arrays import refresh_candidate_skill_arrays
+
+
+def add_candidate_skill_arrays():
+    """Add, backfill and index the candidate skill array columns"""
+    print("🔨 Adding candidate skill arrays...")
+
+    db = SessionLocal()
+    try:
+        db.execute(text("ALTER TABLE candidates ADD COLUMN IF NOT EXISTS skill_ids INTEGER[]"))
+        db.execute(text("ALTER TABLE candidates ADD COLUMN IF NOT EXISTS skill_names TEXT[]"))
+        db.commit()
+        print("✅ Columns candidates.skill_ids, candidates.skill_names ready")
+
+        updated = refresh_candidate_skill_arrays(db)
+        print(f"✅ Backfilled skill arrays for {updated} candidate(s)")
+
+        db.execute(text("CREATE INDEX IF NOT EXISTS ix_candidates_skill_ids_gin ON candidates USING gin (skill_ids)"))
+        db.execute(text("CREATE INDEX IF NOT EXISTS ix_candidates_skill_names_gin ON candidates USING gin (skill_names)"))
+        db.execute(text("ANALYZE candidates"))
+        db.commit()
+        print("✅ GIN indexes ix_candidates_skill_ids_gin, ix_candidates_skill_names_gin ready")
+
+    except Exception as e:
+        print(f"❌ Error adding candidate skill arrays: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_candidate_skill_arrays()
@@ -0,0 +1,77 @@
+"""
+Add the composite indexes used by keyset (cursor) pagination, backfill NULL
+sort keys (tuple comparisons would otherwise skip them) and make the sort
+keys NOT NULL with a default so no new NULLs appear
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from app.db.database import SessionLocal
+
+# table -> sort key column that must not be NULL
+SORT_KEYS = {
+    "candidates": "created_at",
+    "jobs": "created_at",
+    "applications": "applied_date",
+    "users": "created_at",
+    "audit_logs": "timestamp",
+    "ai_chat_queries": "timestamp",
+}
+
+INDEXES = {
+    "ix_candidates_created_at_id": "candidates (created_at, id)",
+    "ix_candidates_status_created_at_id": "candidates (status, created_at, id)",
+    "ix_jobs_created_at_id": "jobs (created_at, id)",
+    "ix_jobs_status_created_at_id": "jobs (status, created_at, id)",
+    "ix_applications_applied_date_id": "applications (applied_date, id)",
+    "ix_applications_job_applied_date_id": "applications (job_id, applied_date, id)",
+    "ix_applications_candidate_applied_date_id": "applications (candidate_id, applied_date, id)",
+    "ix_users_created_at_id": "users (created_at, id)",
+    "ix_audit_logs_user_timestamp_id": "audit_logs (user_id, timestamp, id)",
+    "ix_ai_chat_queries_timestamp_id": "ai_chat_queries (timestamp, id)",
+    "ix_ai_chat_queries_user_timestamp_id": "ai_chat_queries (user_id, timestamp, id)",
+}
+
+
+def add_pagination_indexes():
+    """Backfill NULL sort keys, make them NOT NULL and create the keyset pagination indexes"""
+    print("🔨 Adding keyset pagination indexes...")
+    
+    db = SessionLocal()
+    try:
+        for table, column in SORT_KEYS.items():
+            result = db.execute(text(
+                f'UPDATE {table} SET "{column}" = TIMESTAMP \'1970-01-01\' WHERE "{column}" IS NULL'
+            ))
+            if result.rowcount:
+                print(f"✅ Backfilled {result.rowcount} NULL {table}.{column} value(s)")
+            db.execute(text(
+                f'ALTER TABLE {table} ALTER COLUMN "{column}" SET DEFAULT timezone(\'utc\', now()), '
+                f'ALTER COLUMN "{column}" SET NOT NULL'
+            ))
+            print(f"✅ {table}.{column} is NOT NULL")
+        db.commit()
+        
+        for name, definition in INDEXES.items():
+            db.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"))
+            print(f"✅ {name}")
+        db.commit()
+        
+        for table in SORT_KEYS:
+            db.execute(text(f"ANALYZE {table}"))
+        db.commit()
+        print("✅ Pagination indexes ready")
+        
+    except Exception as e:
+        print(f"❌ Error adding pagination indexes: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_pagination_indexes()
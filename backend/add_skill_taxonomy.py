@@ -0,0 +1,79 @@
+"""
+Create the canonical skill dictionary, seed it, add skill id columns to
+skills and jobs, and backfill ids for existing rows
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from app.db.database import engine, SessionLocal
+from app.db import models
+from app.services.skill_taxonomy import SEED_TAXONOMY, skill_key, resolve_skill_ids, assign_job_skill_ids
+
+
+def add_skill_taxonomy():
+    """Create/seed skill_dictionary and resolve skill ids for all skills and jobs"""
+    print("🔨 Setting up the skill taxonomy...")
+    
+    db = SessionLocal()
+    try:
+        models.SkillDictionary.__table__.create(bind=engine, checkfirst=True)
+        
+        # Seed (or refresh the aliases of) canonical skills
+        for canonical_name, aliases in SEED_TAXONOMY.items():
+            db.execute(text("""
+                INSERT INTO skill_dictionary (canonical_name, normalized_key, aliases, created_at)
+                VALUES (:name, :key, CAST(:aliases AS text[]), now())
+                ON CONFLICT (normalized_key) DO UPDATE SET
+                    canonical_name = EXCLUDED.canonical_name,
+                    aliases = EXCLUDED.aliases
+            """), {"name": canonical_name, "key": skill_key(canonical_name), "aliases": aliases})
+        db.commit()
+        print(f"✅ skill_dictionary ready ({len(SEED_TAXONOMY)} seeded skills)")
+        
+        db.execute(text("ALTER TABLE skills ADD COLUMN IF NOT EXISTS skill_id INTEGER REFERENCES skill_dictionary(id)"))
+        db.execute(text("CREATE INDEX IF NOT EXISTS ix_skills_skill_id ON skills (skill_id)"))
+        db.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS required_skill_ids INTEGER[]"))
+        db.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS preferred_skill_ids INTEGER[]"))
+        db.commit()
+        print("✅ Columns skills.skill_id, jobs.required_skill_ids, jobs.preferred_skill_ids ready")
+        
+        # Backfill candidate skills: resolve each distinct name once
+        names = [row[0] for row in db.execute(text(
+            "SELECT DISTINCT trim(skill_name) FROM skills WHERE skill_id IS NULL AND skill_name IS NOT NULL"
+        ))]
+        lookup = resolve_skill_ids(db, names)
+        if lookup:
+            db.execute(text("""
+                UPDATE skills s SET skill_id = m.skill_id
+                FROM unnest(CAST(:names AS text[]), CAST(:ids AS integer[])) AS m(name, skill_id)
+                WHERE s.skill_id IS NULL AND trim(s.skill_name) = m.name
+            """), {"names": list(lookup), "ids": list(lookup.values())})
+        db.commit()
+        print(f"✅ Resolved {len(lookup)} distinct candidate skill name(s)")
+        
+        jobs = db.query(models.Job).all()
+        lookup = resolve_skill_ids(
+            db, [name for job in jobs for name in (job.required_skills or []) + (job.preferred_skills or [])]
+        )
+        for job in jobs:
+            assign_job_skill_ids(job, lookup)
+        db.commit()
+        print(f"✅ Resolved skill ids for {len(jobs)} job(s)")
+        
+        db.execute(text("ANALYZE skill_dictionary"))
+        db.execute(text("ANALYZE skills"))
+        db.commit()
+        
+    except Exception as e:
+        print(f"❌ Error setting up the skill taxonomy: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_skill_taxonomy()
@@ -0,0 +1,49 @@
+"""
+Enable pg_trgm and create the name normalisation functions and trigram GIN
+indexes used by GET /candidates/typeahead
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from app.db.database import SessionLocal
+from app.services.fuzzy_lookup import NAME_FUNCTIONS_SQL, TRIGRAM_INDEXES_SQL
+
+
+def add_trigram_name_search():
+    """Create the pg_trgm extension, ats_name_key/ats_name_skeleton and the trigram indexes"""
+    print("🔨 Setting up trigram name search...")
+    
+    db = SessionLocal()
+    try:
+        db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        print("✅ Extension pg_trgm ready")
+        
+        db.execute(text(NAME_FUNCTIONS_SQL))
+        print("✅ Functions ats_name_key / ats_name_skeleton ready")
+        
+        for statement in TRIGRAM_INDEXES_SQL:
+            db.execute(text(statement))
+            print(f"✅ {statement.split(' ON ')[0].replace('CREATE INDEX IF NOT EXISTS ', '')}")
+        
+        db.execute(text("ANALYZE candidates"))
+        db.execute(text("ANALYZE work_experience"))
+        db.commit()
+        
+        sample = db.execute(text(
+            "SELECT ats_name_skeleton('Mohamed Kareem') AS latin, ats_name_skeleton('محمد كريم') AS arabic"
+        )).first()
+        print(f"🔍 Skeleton check: Mohamed Kareem -> {sample.latin}, محمد كريم -> {sample.arabic}")
+        
+    except Exception as e:
+        print(f"❌ Error setting up trigram name search: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_trigram_name_search()
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, undefer
+from typing import List, Optional
+import asyncio
 
-from app.db.database import get_db
+from app.db.database import get_db, SessionLocal
 from app.schemas.schemas import (
     SearchRequest,
     MatchResult,
@@ -11,8 +13,12 @@ from app.schemas.schemas import (
     AIChatResponse
 )
 from app.services.ai_service import chat_with_database
+from app.services.hybrid_search import hybrid_search, explain_hits
+from app.services.conversation_memory import conversation_store, record_exchange
 from app.db import models
 from app.core.auth import get_current_user
+from app.core.pagination import keyset_page, set_page_headers
+from app.core.responses import dumps, negotiated_response
 from app.db.models_users import User
 from datetime import datetime
 import time
@@ -20,9 +26,96 @@ import time
 router = APIRouter()
 
 
+CHAT_MODES = {"auto", "single", "map_reduce"}
+
+
+async def _finalize_chat(
+    request: AIQueryRequest,
+    response_data: dict,
+    db: Session,
+    current_user: User,
+    session,
+    start_time: float,
+    background_tasks: BackgroundTasks
+) -> AIChatResponse:
+    """Resolve candidate names, store the query and remember the exchange"""
+    execution_time = int((time.time() - start_time) * 1000)  # Convert to milliseconds
+    
+    # Extract candidate IDs - handle both list of strings and list of dicts
+    candidates_data = response_data.get("candidates", [])
+    if candidates_data and isinstance(candidates_data[0], dict):
+        candidate_ids = [c["id"] for c in candidates_data]
+    else:
+        # Already a list of UUIDs (strings)
+        candidate_ids = candidates_data
+    
+    # Fetch candidate details from database to create CandidateInfo objects
+    candidate_info_list = []
+    if candidate_ids:
+        from uuid import UUID
+        # Convert string UUIDs to UUID objects
+        uuid_list = [UUID(str(cid)) for cid in candidate_ids]
+        
+        # Query database for candidate details
+        candidates = db.query(models.Candidate).filter(
+            models.Candidate.id.in_(uuid_list)
+        ).all()
+        
+        # Create CandidateInfo objects
+        for candidate in candidates:
+            candidate_info_list.append({
+                "id": candidate.id,
+                "name": f"{candidate.first_name} {candidate.last_name}"
+            })
+    
+    # Save query to database
+    ai_query = models.AIChatQuery(
+        user_id=request.user_id or "anonymous",
+        query_text=request.query_text,
+        query_intent=response_data.get("intent"),
+        response=response_data.get("response", ""),
+        related_candidates=candidate_ids,  # Store UUIDs only
+        related_jobs=response_data.get("jobs", []),
+        execution_time_ms=execution_time,
+        timestamp=datetime.utcnow()
+    )
+    
+    db.add(ai_query)
+    db.commit()
+    
+    # Remember this exchange (older turns are folded into the rolling summary
+    # by a background task once the response is sent)
+    user_api_key = current_user.personal_groq_api_key if current_user.use_personal_ai_key else None
+    record_exchange(
+        session,
+        request.query_text,
+        response_data.get("response", ""),
+        [str(cid) for cid in candidate_ids],
+        background_tasks,
+        user_api_key
+    )
+    
+    # Return response with candidate info (names included)
+    return AIChatResponse(
+        response=response_data.get("response", ""),
+        candidates=candidate_info_list,
+        jobs=response_data.get("jobs", []),
+        conversation_id=session.conversation_id
+    )
+
+
+def _chat_mode(request: AIQueryRequest) -> str:
+    mode = request.mode or "auto"
+    if mode not in CHAT_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode '{mode}'. Use one of: {', '.join(sorted(CHAT_MODES))}")
+    return mode
+
+
 @router.post("/chat", response_model=AIChatResponse)
 async def chat_endpoint(
     request: AIQueryRequest,
+    http_request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -31,6 +124,7 @@ async def chat_endpoint(
     Example: "Find me Python developers with 5+ years experience"
     """
     start_time = time.time()
+    mode = _chat_mode(request)
     
     try:
         print(f"📥 Chat request from user: {current_user.email}")
@@ -38,65 +132,25 @@ async def chat_endpoint(
         if request.conversation_history:
             print(f"💬 Conversation history: {len(request.conversation_history)} messages")
         
+        # Server-side conversation memory keyed by user; client history only seeds new sessions
+        session = conversation_store.get(str(current_user.id), request.conversation_id)
+        session.seed_from_history(request.conversation_history)
+        
         # Process the query with AI using user's personal API key if configured
         response_data = await chat_with_database(
             request.query_text, 
             db, 
             current_user,
-            conversation_history=request.conversation_history
+            conversation_history=request.conversation_history,
+            session=session,
+            mode=mode
         )
         
         print(f"✅ Chat response generated")
         
-        execution_time = int((time.time() - start_time) * 1000)  # Convert to milliseconds
-        
-        # Extract candidate IDs - handle both list of strings and list of dicts
-        candidates_data = response_data.get("candidates", [])
-        if candidates_data and isinstance(candidates_data[0], dict):
-            candidate_ids = [c["id"] for c in candidates_data]
-        else:
-            # Already a list of UUIDs (strings)
-            candidate_ids = candidates_data
-        
-        # Fetch candidate details from database to create CandidateInfo objects
-        candidate_info_list = []
-        if candidate_ids:
-            from uuid import UUID
-            # Convert string UUIDs to UUID objects
-            uuid_list = [UUID(str(cid)) for cid in candidate_ids]
-            
-            # Query database for candidate details
-            candidates = db.query(models.Candidate).filter(
-                models.Candidate.id.in_(uuid_list)
-            ).all()
-            
-            # Create CandidateInfo objects
-            for candidate in candidates:
-                candidate_info_list.append({
-                    "id": candidate.id,
-                    "name": f"{candidate.first_name} {candidate.last_name}"
-                })
-        
-        # Save query to database
-        ai_query = models.AIChatQuery(
-            user_id=request.user_id or "anonymous",
-            query_text=request.query_text,
-            response=response_data.get("response", ""),
-            related_candidates=candidate_ids,  # Store UUIDs only
-            related_jobs=response_data.get("jobs", []),
-            execution_time_ms=execution_time,
-            timestamp=datetime.utcnow()
-        )
-        
-        db.add(ai_query)
-        db.commit()
-        
-        # Return response with candidate info (names included)
-        return AIChatResponse(
-            response=response_data.get("response", ""),
-            candidates=candidate_info_list,
-            jobs=response_data.get("jobs", [])
-        )
+        result = await _finalize_chat(request, response_data, db, current_user, session, start_time, background_tasks)
+        # Already validated as AIChatResponse; send it without a second validation pass
+        return negotiated_response(http_request, result.model_dump())
         
     except HTTPException:
         # Re-raise HTTPException as-is (403, 429, etc.)
@@ -108,6 +162,71 @@ async def chat_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/chat/stream")
+async def chat_stream_endpoint(
+    request: AIQueryRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Chat with progress streaming (newline-delimited JSON).
+    Emits {"event": "started"}, map-reduce progress events
+    ({"event": "map_started" | "batch_done" | "map_done" | "reduce_started", ...};
+    batch_done and map_done report failed batches) and finally
+    {"event": "result", ...AIChatResponse} or {"event": "error", "detail": ...}.
+    """
+    start_time = time.time()
+    mode = _chat_mode(request)
+    # Runs after the last NDJSON line is sent (e.g. the rolling conversation summary)
+    background_tasks = BackgroundTasks()
+    
+    def ndjson(payload: dict) -> bytes:
+        return dumps(payload) + b"\n"
+    
+    async def event_stream():
+        # The request-scoped session is closed before streaming starts, so the
+        # stream owns its own session
+        db = SessionLocal()
+        events: asyncio.Queue = asyncio.Queue()
+        
+        async def on_progress(event: dict):
+            await events.put(event)
+        
+        try:
+            session = conversation_store.get(str(current_user.id), request.conversation_id)
+            session.seed_from_history(request.conversation_history)
+            yield ndjson({"event": "started", "conversation_id": session.conversation_id, "mode": mode})
+            
+            async def run_chat():
+                try:
+                    return await chat_with_database(
+                        request.query_text,
+                        db,
+                        current_user,
+                        conversation_history=request.conversation_history,
+                        session=session,
+                        mode=mode,
+                        progress=on_progress
+                    )
+                finally:
+                    await events.put(None)
+            
+            chat_task = asyncio.create_task(run_chat())
+            while (event := await events.get()) is not None:
+                yield ndjson(event)
+            response_data = await chat_task
+            
+            result = await _finalize_chat(request, response_data, db, current_user, session, start_time, background_tasks)
+            yield ndjson({"event": "result", **result.model_dump()})
+        except Exception as e:
+            print(f"❌ Chat stream error: {str(e)}")
+            db.rollback()
+            yield ndjson({"event": "error", "detail": str(e)})
+        finally:
+            db.close()
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson", background=background_tasks)
+
+
 @router.post("/search", response_model=List[MatchResult])
 async def semantic_search_endpoint(
     request: SearchRequest,
@@ -117,30 +236,40 @@ async def semantic_search_endpoint(
     """
     Perform semantic search for candidates matching job requirements.
     Example: "Senior Full Stack Developer with React and Python"
-    Note: This now uses the chat interface for intelligent matching
+    Ranked locally (keyword + skill overlap + embeddings, fused with RRF);
+    set explain=true for AI-written reasons.
     """
     try:
-        # Use chat interface for semantic search with user's personal API key if configured
-        chat_result = await chat_with_database(request.query, db, current_user)
+        hits = hybrid_search(db, request.query, request.limit)
         
-        # Extract candidate IDs from chat response
-        candidate_ids = chat_result.get("candidates", [])
+        reasons = {}
+        if request.explain and hits:
+            user_api_key = None
+            if getattr(current_user, 'use_personal_ai_key', False):
+                user_api_key = getattr(current_user, 'personal_groq_api_key', None)
+            reasons = await explain_hits(request.query, hits, db, user_api_key)
         
-        # Build match results
         results = []
-        for candidate_id in candidate_ids[:request.limit]:
-            candidate = db.query(models.Candidate).filter(
-                models.Candidate.id == candidate_id
-            ).first()
-            
-            if candidate:
-                results.append(MatchResult(
-                    candidate_id=candidate.id,
-                    candidate_name=f"{candidate.first_name} {candidate.last_name}",
-                    match_score=90.0,  # AI-determined score
-                    matched_skills=[],
-                    reasoning=chat_result.get("response", "")[:200]
-                ))
+        for hit in hits:
+            candidate = hit.candidate
+            results.append(MatchResult(
+                candidate={
+                    **{k: v for k, v in candidate.__dict__.items() if not k.startswith('_')},
+                    'skills': [
+                        {'skill_name': s.skill_name, 'proficiency_level': s.proficiency_level}
+                        for s in candidate.skills
+                    ],
+                    'work_experiences': [],
+                    'educations': [],
+                    'projects': [],
+                    'certifications': [],
+                    'languages': []
+                },
+                match_score=hit.score,
+                matching_skills=hit.matched_skills,
+                reason=reasons.get(str(candidate.id)) or hit.reason(),
+                ranks=hit.ranks
+            ))
         
         return results
         
@@ -148,22 +277,39 @@ async def semantic_search_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.delete("/conversation")
+def reset_conversation(
+    conversation_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Clear server-side conversation memory (one conversation, or all of the user's)"""
+    removed = conversation_store.reset(str(current_user.id), conversation_id)
+    return {
+        "message": f"Cleared {removed} conversation(s)",
+        "cleared_count": removed
+    }
+
+
 @router.get("/queries", response_model=List[AIQueryResponse])
 def get_query_history(
+    response: Response,
     skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     user_id: str = None,
     db: Session = Depends(get_db)
 ):
     """Get AI query history"""
-    query = db.query(models.AIChatQuery)
+    # The response text is part of the history rows
+    query = db.query(models.AIChatQuery).options(undefer(models.AIChatQuery.response))
     
     if user_id:
         query = query.filter(models.AIChatQuery.user_id == user_id)
     
-    queries = query.order_by(
-        models.AIChatQuery.timestamp.desc()
-    ).offset(skip).limit(limit).all()
+    queries, next_cursor = keyset_page(
+        query, (models.AIChatQuery.timestamp, models.AIChatQuery.id), cursor, limit, skip=skip
+    )
+    set_page_headers(response, db, query, next_cursor)
     
     return queries
 
@@ -1,19 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 from uuid import UUID
 
 from app.db.database import get_db
 from app.db import models
+from app.core.pagination import keyset_page, set_page_headers
+from app.core.projection import parse_fields, projected_query, response_columns, rows_to_dicts
+from app.core.responses import negotiated_response
 from app.schemas.schemas import (
     ApplicationCreate,
     ApplicationUpdate,
     ApplicationResponse
 )
 from app.services.matching_service import calculate_match_score
+from app.services.candidate_sync import candidate_details_changed
 
 router = APIRouter()
 
+# Columns of a list row when no `fields=` is given
+APPLICATION_LIST_FIELDS = response_columns(models.Application, ApplicationResponse)
+
 
 @router.post("/", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
 async def create_application(
@@ -66,21 +73,31 @@ async def create_application(
     db_application.match_score = match_score
     
     db.add(db_application)
+    db.flush()
+    candidate_details_changed(db, [db_application.candidate_id])
     db.commit()
     db.refresh(db_application)
     return db_application
 
 
-@router.get("/", response_model=List[ApplicationResponse])
+@router.get("/", response_model=None)
 def list_applications(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Add an estimated X-Total-Count header"),
+    exact_total: bool = Query(False, description="Make X-Total-Count an exact count"),
     candidate_id: UUID = None,
     job_id: UUID = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (default: all response columns)"),
     db: Session = Depends(get_db)
 ):
-    """List applications with optional filtering"""
-    query = db.query(models.Application)
+    """List applications with optional filtering, selecting only the returned columns"""
+    keys = (models.Application.applied_date, models.Application.id)
+    names = parse_fields(models.Application, fields, APPLICATION_LIST_FIELDS)
+    query = projected_query(db, models.Application, names, keys)
     
     if candidate_id:
         query = query.filter(models.Application.candidate_id == candidate_id)
@@ -88,8 +105,9 @@ def list_applications(
     if job_id:
         query = query.filter(models.Application.job_id == job_id)
     
-    applications = query.offset(skip).limit(limit).all()
-    return applications
+    rows, next_cursor = keyset_page(query, keys, cursor, limit, skip=skip)
+    set_page_headers(response, db, query, next_cursor, include_total, exact_total)
+    return negotiated_response(request, rows_to_dicts(rows, names), headers=response.headers)
 
 
 @router.get("/{application_id}", response_model=ApplicationResponse)
@@ -132,6 +150,9 @@ def update_application(
     for field, value in update_data.items():
         setattr(application, field, value)
     
+    # The candidate detail document lists application status and dates
+    if update_data:
+        candidate_details_changed(db, [application.candidate_id])
     db.commit()
     db.refresh(application)
     return application
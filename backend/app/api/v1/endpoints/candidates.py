@@ -1,59 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Optional
 from uuid import UUID
+import io
 import os
-from datetime import datetime, date
-from collections import Counter
+from datetime import datetime, date, timedelta
+import orjson
 
-from app.db.database import get_db
+from app.db.database import SessionLocal, get_db
 from app.db import models
 from app.schemas.schemas import (
     CandidateCreate, 
     CandidateUpdate, 
     CandidateResponse
 )
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, has_permission
+from app.core.pagination import keyset_page, set_page_headers
+from app.core.projection import parse_fields, projected_query, response_columns, rows_to_dicts
+from app.core.responses import negotiated_response, wants_msgpack
+from app.core.http_cache import cache_headers, make_etag, not_modified, etag_matches
 from app.db.models_users import User
+from app.services.embedding_service import remove_embeddings
+from app.services.candidate_sync import candidate_details_changed, candidates_changed
+from app.services.candidate_purge import delete_candidates, purge_candidates, purge_query
+from app.services.candidate_read_model import get_candidate_detail_json, get_candidate_version
+from app.services.search_documents import search_candidates_fulltext
+from app.services.fuzzy_lookup import typeahead_candidates
+from app.services.match_maintenance import get_candidate_top_jobs
+from app.services.skill_arrays import apply_skill_filter
+from app.services.experience_totals import apply_experience_filter, candidate_experience_months, experience_years
+from app.services.candidate_import import import_candidates as import_candidate_records, refresh_imported_candidates
+from app.services.candidate_export import (
+    EXPORT_MEDIA_TYPES, export_available, export_filename, stream_candidate_export
+)
 
 router = APIRouter()
 
-
-def calculate_total_years_of_experience(db: Session, candidate_id: UUID) -> int:
-    """Calculate total years of experience from all work experience records"""
-    try:
-        work_experiences = db.query(models.WorkExperience).filter(
-            models.WorkExperience.candidate_id == candidate_id
-        ).all()
-        
-        if not work_experiences:
-            return 0
-            
-        total_months = 0
-        for exp in work_experiences:
-            if exp.duration_months:
-                total_months += exp.duration_months
-            elif exp.start_date:
-                # Calculate duration if not stored
-                end_date = exp.end_date or datetime.utcnow().date()
-                if exp.start_date <= end_date:
-                    delta = end_date - exp.start_date
-                    months = round(delta.days / 30.44)  # Average days per month
-                    total_months += months
-        
-        # Convert months to years, rounded to nearest integer
-        total_years = round(total_months / 12)
-        return max(0, min(total_years, 50))  # Cap at 50 years for sanity
-        
-    except Exception as e:
-        print(f"⚠️ Error calculating total years of experience: {e}")
-        return 0
+# Columns of a list row when no `fields=` is given; relations are never loaded for lists
+CANDIDATE_LIST_FIELDS = response_columns(models.Candidate, CandidateResponse)
+CANDIDATE_LIST_RELATIONS = ("skills", "work_experiences", "educations", "projects", "certifications", "languages")
 
 
 @router.post("/", response_model=CandidateResponse, status_code=status.HTTP_201_CREATED)
 def create_candidate(
     candidate: CandidateCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Create a new candidate"""
@@ -70,59 +62,191 @@ def create_candidate(
     
     db_candidate = models.Candidate(**candidate.model_dump())
     db.add(db_candidate)
+    db.flush()
+    candidate_details_changed(db, [db_candidate.id])
     db.commit()
     db.refresh(db_candidate)
+    candidates_changed(db, [db_candidate.id], background_tasks)
     return db_candidate
 
 
-@router.get("/", response_model=List[CandidateResponse])
+@router.get("/", response_model=None)
 def list_candidates(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Add an estimated X-Total-Count header"),
+    exact_total: bool = Query(False, description="Make X-Total-Count an exact count"),
     status: str = None,
+    skills_all: Optional[List[str]] = Query(None, description="Candidate must have every skill (repeat or comma-separate)"),
+    skills_any: Optional[List[str]] = Query(None, description="Candidate must have at least one skill"),
+    min_experience_years: Optional[float] = Query(None, ge=0, description="At least this many years of total work experience"),
+    max_experience_years: Optional[float] = Query(None, ge=0, description="Less than this many years of total work experience"),
+    sort: str = Query("created_at", pattern="^(created_at|experience)$", description="Newest first, or most experienced first"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (default: all response columns)"),
     db: Session = Depends(get_db)
 ):
-    """List all candidates with optional filtering (basic info only for performance)"""
-    query = db.query(models.Candidate)
+    """List candidates with optional filtering, selecting only the returned columns"""
+    first_key = models.Candidate.total_experience_months if sort == "experience" else models.Candidate.created_at
+    keys = (first_key, models.Candidate.id)
+    names = parse_fields(models.Candidate, fields, CANDIDATE_LIST_FIELDS)
+    query = projected_query(db, models.Candidate, names, keys)
     
     if status:
         query = query.filter(models.Candidate.status == status)
+    query = apply_skill_filter(db, query, all_of=skills_all, any_of=skills_any)
+    query = apply_experience_filter(query, min_experience_years, max_experience_years)
     
-    candidates = query.offset(skip).limit(limit).all()
+    rows, next_cursor = keyset_page(query, keys, cursor, limit, skip=skip)
+    set_page_headers(response, db, query, next_cursor, include_total, exact_total)
     
-    # Return basic candidate info without loading all relationships (for performance)
-    results = []
-    for candidate in candidates:
-        result = {
-            **{k: v for k, v in candidate.__dict__.items() if not k.startswith('_')},
-            'id': candidate.id,
-            'skills': [],
-            'work_experiences': [],
-            'educations': [],
-            'projects': [],
-            'certifications': [],
-            'languages': []
-        }
-        results.append(result)
-    
-    return results
+    # The full row shape keeps empty relation lists for existing clients
+    extra = None if fields else {relation: list for relation in CANDIDATE_LIST_RELATIONS}
+    return negotiated_response(request, rows_to_dicts(rows, names, extra), headers=response.headers)
 
 
-@router.get("/{candidate_id}")
-def get_candidate(
-    candidate_id: UUID,
+@router.get("/search")
+def search_candidates(
+    q: str = Query(..., min_length=1, description="Web-style query: words, \"quoted phrases\", OR, -exclude"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    lang: Optional[str] = Query(None, pattern="^(english|arabic)$", description="Defaults to the query's language"),
+    min_experience_years: Optional[float] = Query(None, ge=0, description="At least this many years of total work experience"),
+    max_experience_years: Optional[float] = Query(None, ge=0, description="Less than this many years of total work experience"),
+    sort: str = Query("relevance", pattern="^(relevance|experience)$", description="Best match first, or most experienced first"),
     db: Session = Depends(get_db)
 ):
-    """Get a specific candidate by ID with all related data"""
+    """Full-text candidate search ranked by ts_rank with highlighted snippets"""
+    return search_candidates_fulltext(
+        db, q, limit=limit, offset=offset, language=lang,
+        min_experience_years=min_experience_years, max_experience_years=max_experience_years, sort=sort
+    )
+
+
+@router.get("/typeahead")
+def typeahead(
+    q: str = Query(..., min_length=2, description="Partial name, email or company; Arabic or Latin spelling"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Fuzzy candidate lookup ranked by trigram similarity"""
+    return typeahead_candidates(db, q, limit=limit)
+
+
+@router.post("/import")
+def import_candidates(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="CSV or NDJSON; nested lists as JSON (CSV cells) or arrays (NDJSON)"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Defaults to the file extension"),
+    on_conflict: str = Query("update", pattern="^(update|skip)$", description="What to do with existing emails"),
+    dry_run: bool = Query(False, description="Validate and merge, then roll back"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Bulk-import candidates with their skills, experience, education, ... (COPY + set-based merge)"""
+    if not has_permission(current_user, "candidates", "create"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to import candidates")
+    import_format = format or ("ndjson" if os.path.splitext(file.filename or "")[1].lower() in (".ndjson", ".jsonl") else "csv")
+    
+    print(f"📥 Candidate import ({import_format}, on_conflict={on_conflict}) by {current_user.email}: {file.filename}")
+    try:
+        stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        report = import_candidate_records(db, stream, import_format, on_conflict, commit=not dry_run)
+    except UnicodeDecodeError as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"File is not UTF-8: {e}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Candidate import failed: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Import failed: {str(e)}")
+    
+    candidate_ids = report.pop("candidate_ids")
+    if not dry_run:
+        refresh_imported_candidates(db, candidate_ids, background_tasks)
+    print(f"✅ Candidate import: {report['inserted']} inserted, {report['updated']} updated, {report['rejected']} rejected")
+    return {**report, "dry_run": dry_run}
+
+
+@router.post("/purge")
+def purge(
+    background_tasks: BackgroundTasks,
+    status: Optional[str] = Query(None, description="Only candidates with this status (e.g. archived)"),
+    older_than_days: Optional[int] = Query(None, ge=1, description="Only candidates not updated for this many days"),
+    batch_size: int = Query(500, ge=1, le=5000, description="Candidates deleted per transaction"),
+    dry_run: bool = Query(False, description="Only count the candidates that would be deleted"),
+    background: bool = Query(False, description="Run the purge after responding"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete candidates by status and/or age in bounded batches (children cascade in the database)"""
+    if not has_permission(current_user, "candidates", "delete"):
+        raise HTTPException(status_code=403, detail="Not allowed to delete candidates")
+    if status is None and older_than_days is None:
+        raise HTTPException(status_code=400, detail="Give a status, older_than_days, or both")
+    updated_before = datetime.utcnow() - timedelta(days=older_than_days) if older_than_days else None
+    
+    matching = purge_query(db, status, updated_before).count()
+    if dry_run or not matching:
+        return {"matching": matching, "deleted": 0, "batches": 0, "dry_run": dry_run}
+    
+    print(f"🗑️ Candidate purge (status={status}, older_than_days={older_than_days}) by {current_user.email}: {matching} match")
+    if background:
+        background_tasks.add_task(_purge_in_background, status, updated_before, batch_size)
+        return {"matching": matching, "queued": True}
+    return {"matching": matching, **purge_candidates(db, status, updated_before, batch_size=batch_size)}
+
+
+def _purge_in_background(status: Optional[str], updated_before: Optional[datetime], batch_size: int):
+    """Purge with its own session (the request's is closed once the response is sent)"""
+    db = SessionLocal()
+    try:
+        result = purge_candidates(db, status, updated_before, batch_size=batch_size)
+        print(f"✅ Background candidate purge removed {result['deleted']} candidate(s)")
+    except Exception as e:
+        print(f"❌ Background candidate purge failed: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@router.get("/export")
+def export_candidates(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    status: Optional[str] = None,
+    skills_all: Optional[List[str]] = Query(None, description="Candidate must have every skill (repeat or comma-separate)"),
+    skills_any: Optional[List[str]] = Query(None, description="Candidate must have at least one skill"),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream every matching candidate with flattened skills, experience totals and best match score"""
+    if not has_permission(current_user, "candidates", "export"):
+        raise HTTPException(
+            status_code=403,
+            detail="Not allowed to export candidates"
+        )
+    if not export_available(format):
+        raise HTTPException(
+            status_code=501,
+            detail=f"{format} export needs the optional pyarrow package"
+        )
+    return StreamingResponse(
+        stream_candidate_export(format, status=status, skills_all=skills_all, skills_any=skills_any),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(format)}"'}
+    )
+
+
+def _candidate_detail(db: Session, candidate_id: UUID) -> dict:
+    """A candidate with all related data as a plain dict (404 for unknown candidates)"""
     from sqlalchemy.orm import selectinload
     from decimal import Decimal
     import traceback
-    import sys
     
     try:
         candidate = db.query(models.Candidate).options(
             selectinload(models.Candidate.skills),
-            selectinload(models.Candidate.work_experiences),
+            selectinload(models.Candidate.work_experiences).undefer(models.WorkExperience.responsibilities),
             selectinload(models.Candidate.educations),
             selectinload(models.Candidate.projects),
             selectinload(models.Candidate.certifications),
@@ -271,10 +395,27 @@ def get_candidate(
         )
 
 
+@router.get("/{candidate_id}")
+def get_candidate(
+    candidate_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Get a specific candidate by ID with all related data (304 when the client's ETag is current)"""
+    version = get_candidate_version(db, candidate_id)
+    etag = make_etag("candidate", candidate_id, wants_msgpack(request), *version) if version else None
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+    
+    result = _candidate_detail(db, candidate_id)
+    return negotiated_response(request, result, headers=cache_headers(etag) if etag else None)
+
+
 @router.put("/{candidate_id}", response_model=CandidateResponse)
 def update_candidate(
     candidate_id: UUID,
     candidate_update: CandidateUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -480,15 +621,18 @@ def update_candidate(
         # Update the updated_at timestamp
         candidate.updated_at = datetime.utcnow()
         
-        # Recalculate total years of experience from work experience records
-        total_years = calculate_total_years_of_experience(db, candidate_id)
-        candidate.years_of_experience = total_years
+        # Recalculate total experience from the work experience records in SQL
+        db.flush()
+        candidate.total_experience_months = candidate_experience_months(db, candidate_id)
+        candidate.years_of_experience = experience_years(candidate.total_experience_months)
+        candidate_details_changed(db, [candidate_id])
         
         db.commit()
         db.refresh(candidate)
+        candidates_changed(db, [candidate_id], background_tasks)
         
         # Return the updated candidate with all related data
-        return get_candidate(candidate_id, db)
+        return _candidate_detail(db, candidate_id)
         
     except Exception as e:
         db.rollback()
@@ -506,302 +650,61 @@ def delete_candidate(
     candidate_id: UUID,
     db: Session = Depends(get_db)
 ):
-    """Delete a candidate"""
-    candidate = db.query(models.Candidate).filter(
-        models.Candidate.id == candidate_id
-    ).first()
-    
-    if not candidate:
+    """Delete a candidate (child rows cascade in the database)"""
+    if not delete_candidates(db, [candidate_id]):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Candidate not found"
         )
-    
-    db.delete(candidate)
-    db.commit()
     return None
 
 
+@router.get("/{candidate_id}/top-jobs")
+def get_candidate_top_jobs_endpoint(
+    candidate_id: UUID,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Open jobs that best match a candidate, read from the stored match scores"""
+    if not db.query(models.Candidate.id).filter(models.Candidate.id == candidate_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Candidate not found"
+        )
+    
+    return get_candidate_top_jobs(db, candidate_id, limit=limit)
+
+
 @router.get("/{candidate_id}/complete")
 def get_candidate_complete(
     candidate_id: UUID,
+    request: Request,
     db: Session = Depends(get_db)
-) -> Dict[str, Any]:
-    """Get complete candidate details with all related data and statistics"""
-    
-    # Get candidate
-    candidate = db.query(models.Candidate).filter(
-        models.Candidate.id == candidate_id
-    ).first()
-    
-    if not candidate:
+) -> Response:
+    """Get complete candidate details with all related data and statistics (one read-model lookup)"""
+    version = get_candidate_version(db, candidate_id)
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Candidate not found"
         )
     
-    # Get all related data
-    skills = db.query(models.Skill).filter(
-        models.Skill.candidate_id == candidate_id
-    ).all()
-    
-    work_experiences = db.query(models.WorkExperience).filter(
-        models.WorkExperience.candidate_id == candidate_id
-    ).order_by(models.WorkExperience.start_date.desc()).all()
-    
-    educations = db.query(models.Education).filter(
-        models.Education.candidate_id == candidate_id
-    ).order_by(models.Education.end_date.desc()).all()
-    
-    projects = db.query(models.Project).filter(
-        models.Project.candidate_id == candidate_id
-    ).order_by(models.Project.start_date.desc()).all()
-    
-    certifications = db.query(models.Certification).filter(
-        models.Certification.candidate_id == candidate_id
-    ).order_by(models.Certification.issue_date.desc()).all()
+    msgpack = wants_msgpack(request)
+    etag = make_etag("complete", candidate_id, msgpack, *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    languages = db.query(models.Language).filter(
-        models.Language.candidate_id == candidate_id
-    ).all()
-    
-    applications = db.query(models.Application).filter(
-        models.Application.candidate_id == candidate_id
-    ).order_by(models.Application.applied_date.desc()).all()
-    
-    # Calculate statistics
-    stats = {}
-    
-    # Total years of experience
-    total_months = sum([
-        exp.duration_months or 0 
-        for exp in work_experiences
-    ])
-    stats['total_years_experience'] = round(total_months / 12, 1) if total_months else 0
-    
-    # Skills breakdown by category
-    skills_by_category = {}
-    for skill in skills:
-        category = skill.skill_category or 'Other'
-        if category not in skills_by_category:
-            skills_by_category[category] = []
-        skills_by_category[category].append({
-            'name': skill.skill_name,
-            'proficiency': skill.proficiency_level,
-            'years': float(skill.years_of_experience) if skill.years_of_experience else 0
-        })
-    stats['skills_by_category'] = skills_by_category
-    
-    # Skills by proficiency level
-    proficiency_counts = Counter([
-        skill.proficiency_level for skill in skills if skill.proficiency_level
-    ])
-    stats['skills_by_proficiency'] = dict(proficiency_counts)
-    
-    # Top skills by experience
-    top_skills = sorted(
-        [s for s in skills if s.years_of_experience],
-        key=lambda x: float(x.years_of_experience),
-        reverse=True
-    )[:10]
-    stats['top_skills'] = [
-        {
-            'name': s.skill_name,
-            'years': float(s.years_of_experience),
-            'proficiency': s.proficiency_level
-        }
-        for s in top_skills
-    ]
-    
-    # Work experience summary
-    companies = [exp.company_name for exp in work_experiences]
-    stats['total_companies'] = len(companies)
-    stats['current_company'] = work_experiences[0].company_name if work_experiences and work_experiences[0].is_current else None
-    
-    # Industry experience
-    industries = Counter([
-        exp.company_industry for exp in work_experiences if exp.company_industry
-    ])
-    stats['industries'] = dict(industries)
-    
-    # Education level
-    degrees = [edu.degree for edu in educations if edu.degree]  # Filter out null degrees
-    stats['highest_degree'] = degrees[0] if degrees else None
-    stats['total_degrees'] = len(degrees)
-    
-    # Certifications count
-    active_certs = [cert for cert in certifications if cert.is_active]
-    stats['total_certifications'] = len(certifications)
-    stats['active_certifications'] = len(active_certs)
-    
-    # Projects count
-    stats['total_projects'] = len(projects)
-    project_types = Counter([
-        proj.project_type for proj in projects if proj.project_type
-    ])
-    stats['projects_by_type'] = dict(project_types)
-    
-    # Languages spoken
-    stats['languages_spoken'] = len(languages)
-    
-    # Application stats
-    stats['total_applications'] = len(applications)
-    application_statuses = Counter([
-        app.status for app in applications
-    ])
-    stats['applications_by_status'] = dict(application_statuses)
-    
-    # Technologies used across all experiences and projects
-    all_technologies = []
-    for exp in work_experiences:
-        if exp.technologies_used:
-            all_technologies.extend(exp.technologies_used)
-    for proj in projects:
-        if proj.technologies_used:
-            all_technologies.extend(proj.technologies_used)
-    
-    tech_counter = Counter(all_technologies)
-    stats['top_technologies'] = [
-        {'name': tech, 'count': count}
-        for tech, count in tech_counter.most_common(15)
-    ]
-    
-    # Career progression (job levels over time)
-    career_progression = []
-    for exp in reversed(work_experiences):
-        if exp.job_level and exp.start_date:
-            career_progression.append({
-                'level': exp.job_level,
-                'title': exp.job_title,
-                'company': exp.company_name,
-                'date': exp.start_date.isoformat()
-            })
-    stats['career_progression'] = career_progression
+    document = get_candidate_detail_json(db, candidate_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Candidate not found"
+        )
     
-    # Prepare response
-    return {
-        'candidate': {
-            'id': str(candidate.id),
-            'first_name': candidate.first_name,
-            'last_name': candidate.last_name,
-            'email': candidate.email,
-            'phone': candidate.phone,
-            'current_location': candidate.current_location,
-            'preferred_locations': candidate.preferred_locations,
-            'open_to_relocation': candidate.open_to_relocation,
-            'willing_to_travel': candidate.willing_to_travel,
-            'professional_summary': candidate.professional_summary,
-            'career_level': candidate.career_level,
-            'availability_status': candidate.availability_status,
-            'notice_period_days': candidate.notice_period_days,
-            'current_salary_currency': candidate.current_salary_currency,
-            'current_salary_amount': float(candidate.current_salary_amount) if candidate.current_salary_amount else None,
-            'expected_salary_currency': candidate.expected_salary_currency,
-            'expected_salary_amount': float(candidate.expected_salary_amount) if candidate.expected_salary_amount else None,
-            'linkedin_url': candidate.linkedin_url,
-            'github_url': candidate.github_url,
-            'portfolio_url': candidate.portfolio_url,
-            'personal_website': candidate.personal_website,
-            'created_at': candidate.created_at.isoformat() if candidate.created_at else None,
-            'updated_at': candidate.updated_at.isoformat() if candidate.updated_at else None,
-            'status': candidate.status
-        },
-        'skills': [
-            {
-                'id': str(s.id),
-                'skill_name': s.skill_name,
-                'skill_category': s.skill_category,
-                'skill_type': s.skill_type,
-                'proficiency_level': s.proficiency_level,
-                'years_of_experience': float(s.years_of_experience) if s.years_of_experience else None,
-                'last_used_date': s.last_used_date.isoformat() if s.last_used_date else None,
-            }
-            for s in skills
-        ],
-        'work_experiences': [
-            {
-                'id': str(exp.id),
-                'company_name': exp.company_name,
-                'company_industry': exp.company_industry,
-                'company_size': exp.company_size,
-                'job_title': exp.job_title,
-                'job_level': exp.job_level,
-                'employment_type': exp.employment_type,
-                'start_date': exp.start_date.isoformat() if exp.start_date else None,
-                'end_date': exp.end_date.isoformat() if exp.end_date else None,
-                'is_current': exp.is_current,
-                'duration_months': exp.duration_months,
-                'responsibilities': exp.responsibilities,
-                'achievements': exp.achievements,
-                'technologies_used': exp.technologies_used,
-                'team_size': exp.team_size,
-                'managed_team_size': exp.managed_team_size,
-            }
-            for exp in work_experiences
-        ],
-        'educations': [
-            {
-                'id': str(edu.id),
-                'institution': edu.institution,
-                'degree': edu.degree,
-                'field_of_study': edu.field_of_study,
-                'specialization': edu.specialization,
-                'start_date': edu.start_date.isoformat() if edu.start_date else None,
-                'end_date': edu.end_date.isoformat() if edu.end_date else None,
-                'graduation_year': edu.graduation_year,
-                'grade_type': edu.grade_type,
-                'grade_value': edu.grade_value,
-                'achievements': edu.achievements,
-            }
-            for edu in educations
-        ],
-        'projects': [
-            {
-                'id': str(proj.id),
-                'project_name': proj.project_name,
-                'project_type': proj.project_type,
-                'description': proj.description,
-                'role': proj.role,
-                'technologies_used': proj.technologies_used,
-                'start_date': proj.start_date.isoformat() if proj.start_date else None,
-                'end_date': proj.end_date.isoformat() if proj.end_date else None,
-                'project_url': proj.project_url,
-                'github_url': proj.github_url,
-                'highlights': proj.highlights,
-            }
-            for proj in projects
-        ],
-        'certifications': [
-            {
-                'id': str(cert.id),
-                'certification_name': cert.certification_name,
-                'issuing_organization': cert.issuing_organization,
-                'issue_date': cert.issue_date.isoformat() if cert.issue_date else None,
-                'expiry_date': cert.expiry_date.isoformat() if cert.expiry_date else None,
-                'is_active': cert.is_active,
-                'credential_url': cert.credential_url,
-            }
-            for cert in certifications
-        ],
-        'languages': [
-            {
-                'id': str(lang.id),
-                'language_name': lang.language_name,
-                'proficiency_level': lang.proficiency_level,
-            }
-            for lang in languages
-        ],
-        'applications': [
-            {
-                'id': str(app.id),
-                'job_id': str(app.job_id),
-                'status': app.status,
-                'applied_at': app.applied_date.isoformat() if app.applied_date else None,
-            }
-            for app in applications
-        ],
-        'statistics': stats
-    }
+    if msgpack:
+        return negotiated_response(request, orjson.loads(document), headers=cache_headers(etag))
+    # The stored JSON is sent as-is
+    return Response(content=document, media_type="application/json", headers=cache_headers(etag))
 
 
 @router.get("/{candidate_id}/resume/download")
@@ -911,11 +814,12 @@ EXTRACTED CONTENT:
 @router.delete("/{candidate_id}/resume", status_code=status.HTTP_204_NO_CONTENT)
 def delete_candidate_resume(
     candidate_id: UUID,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Delete all resumes for a candidate"""
-    # Get all resumes for this candidate
-    resumes = db.query(models.Resume).filter(
+    # Ids and paths only: extracted_text can be large
+    resumes = db.query(models.Resume.id, models.Resume.file_path).filter(
         models.Resume.candidate_id == candidate_id
     ).all()
     
@@ -934,10 +838,12 @@ def delete_candidate_resume(
                 print(f"Warning: Could not delete file {resume.file_path}: {e}")
     
     # Delete database records
+    remove_embeddings(db, "resume", [resume.id for resume in resumes], commit=False)
     db.query(models.Resume).filter(
         models.Resume.candidate_id == candidate_id
     ).delete()
     db.commit()
+    candidates_changed(db, [candidate_id], background_tasks)
     
     return None
 
@@ -1,18 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from app.db.database import get_db
 from app.db import models
+from app.core.pagination import keyset_page, set_page_headers
+from app.core.projection import parse_fields, projected_query, response_columns, rows_to_dicts
+from app.core.responses import negotiated_response, wants_msgpack
+from app.core.http_cache import conditional_response, make_etag
 from app.schemas.schemas import JobCreate, JobUpdate, JobResponse
+from app.services.embedding_service import index_job, remove_embeddings
+from app.services.match_maintenance import mark_jobs_dirty, get_job_shortlist
+from app.services.candidate_sync import candidate_details_changed
 
 router = APIRouter()
 
+# Columns of a list row when no `fields=` is given
+JOB_LIST_FIELDS = response_columns(models.Job, JobResponse)
+
 
 @router.post("/", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 def create_job(
     job: JobCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Create a new job posting"""
@@ -20,32 +31,44 @@ def create_job(
     db.add(db_job)
     db.commit()
     db.refresh(db_job)
+    index_job(db, db_job)
+    mark_jobs_dirty(db, [db_job.id], background_tasks)
     return db_job
 
 
-@router.get("/", response_model=List[JobResponse])
+@router.get("/", response_model=None)
 def list_jobs(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Add an estimated X-Total-Count header"),
+    exact_total: bool = Query(False, description="Make X-Total-Count an exact count"),
     status: str = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (default: all response columns)"),
     db: Session = Depends(get_db)
 ):
-    """List all jobs with optional filtering"""
-    query = db.query(models.Job)
+    """List jobs with optional filtering, selecting only the returned columns"""
+    keys = (models.Job.created_at, models.Job.id)
+    names = parse_fields(models.Job, fields, JOB_LIST_FIELDS)
+    query = projected_query(db, models.Job, names, keys)
     
     if status:
         query = query.filter(models.Job.status == status)
     
-    jobs = query.offset(skip).limit(limit).all()
-    return jobs
+    rows, next_cursor = keyset_page(query, keys, cursor, limit, skip=skip)
+    set_page_headers(response, db, query, next_cursor, include_total, exact_total)
+    return negotiated_response(request, rows_to_dicts(rows, names), headers=response.headers)
 
 
 @router.get("/{job_id}", response_model=JobResponse)
 def get_job(
     job_id: UUID,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    """Get a specific job by ID"""
+    """Get a specific job by ID (304 when the client's ETag is current)"""
     job = db.query(models.Job).filter(models.Job.id == job_id).first()
     
     if not job:
@@ -54,13 +77,39 @@ def get_job(
             detail="Job not found"
         )
     
-    return job
+    etag = make_etag("job", job_id, wants_msgpack(request), job.updated_at or job.created_at)
+    return conditional_response(
+        request, etag, lambda: negotiated_response(request, JobResponse.model_validate(job).model_dump())
+    )
+
+
+@router.get("/{job_id}/shortlist")
+def get_job_shortlist_endpoint(
+    job_id: UUID,
+    limit: int = Query(20, ge=1, le=200),
+    min_score: float = Query(0.0, ge=0, le=100),
+    skills_all: Optional[List[str]] = Query(None, description="Candidate must have every skill (repeat or comma-separate)"),
+    skills_any: Optional[List[str]] = Query(None, description="Candidate must have at least one skill"),
+    db: Session = Depends(get_db)
+):
+    """Best-matching candidates for a job, read from the stored match scores"""
+    if not db.query(models.Job.id).filter(models.Job.id == job_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return get_job_shortlist(
+        db, job_id, limit=limit, min_score=min_score,
+        skills_all=skills_all, skills_any=skills_any
+    )
 
 
 @router.put("/{job_id}", response_model=JobResponse)
 def update_job(
     job_id: UUID,
     job_update: JobUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Update a job posting"""
@@ -78,6 +127,10 @@ def update_job(
     
     db.commit()
     db.refresh(job)
+    index_job(db, job)
+    # Only requirement or status changes affect stored matches
+    if {"required_skills", "preferred_skills", "status"} & update_data.keys():
+        mark_jobs_dirty(db, [job_id], background_tasks)
     return job
 
 
@@ -95,6 +148,14 @@ def delete_job(
             detail="Job not found"
         )
     
+    # Applications cascade with the job; their candidates' detail documents list them
+    applicant_ids = [cid for (cid,) in db.query(models.Application.candidate_id).filter(
+        models.Application.job_id == job_id
+    )]
     db.delete(job)
+    # Sessions don't autoflush: the rebuilt documents must not see the deleted applications
+    db.flush()
+    remove_embeddings(db, "job", [job_id], commit=False)
+    candidate_details_changed(db, applicant_ids)
     db.commit()
     return None
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File
+from sqlalchemy.orm import Session, undefer
 from typing import List, Optional
 from uuid import UUID
 import os
@@ -8,9 +8,11 @@ from datetime import datetime
 
 from app.db.database import get_db
 from app.db import models
-from app.schemas.schemas import ResumeResponse
+from app.schemas.schemas import ResumeResponse, ResumeSummary
 from app.services.pdf_parser import parse_pdf
 from app.services.ai_service import analyze_resume
+from app.services.embedding_service import index_resume, remove_embeddings
+from app.services.candidate_sync import candidates_changed
 from app.core.config import settings
 from app.core.auth import get_current_user
 from app.db.models_users import User
@@ -20,6 +22,7 @@ router = APIRouter()
 
 @router.post("/upload", response_model=ResumeResponse)
 async def upload_resume_auto(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -157,6 +160,10 @@ async def upload_resume_auto(
         db.commit()
         db.refresh(resume)
         
+        # Make the new resume searchable right away
+        index_resume(db, resume)
+        candidates_changed(db, [resume.candidate_id], background_tasks)
+        
         return resume
         
     except Exception as e:
@@ -193,6 +200,7 @@ async def upload_resume_auto(
 @router.post("/upload/{candidate_id}", response_model=ResumeResponse)
 async def upload_resume(
     candidate_id: UUID,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -260,6 +268,8 @@ async def upload_resume(
         
         db.commit()
         db.refresh(resume)
+        index_resume(db, resume)
+        candidates_changed(db, [candidate_id], background_tasks)
     except Exception as e:
         resume.parse_status = "failed"
         resume.parse_error = str(e)
@@ -268,12 +278,12 @@ async def upload_resume(
     return resume
 
 
-@router.get("/candidate/{candidate_id}", response_model=List[ResumeResponse])
+@router.get("/candidate/{candidate_id}", response_model=List[ResumeSummary])
 def get_candidate_resumes(
     candidate_id: UUID,
     db: Session = Depends(get_db)
 ):
-    """Get all resumes for a candidate"""
+    """Get all resumes for a candidate (metadata only; GET /resumes/{id} has the extracted text)"""
     resumes = db.query(models.Resume).filter(
         models.Resume.candidate_id == candidate_id
     ).order_by(models.Resume.version.desc()).all()
@@ -287,7 +297,7 @@ def get_resume(
     db: Session = Depends(get_db)
 ):
     """Get a specific resume"""
-    resume = db.query(models.Resume).filter(
+    resume = db.query(models.Resume).options(undefer(models.Resume.extracted_text)).filter(
         models.Resume.id == resume_id
     ).first()
     
@@ -303,10 +313,12 @@ def get_resume(
 @router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_resume(
     resume_id: UUID,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Delete a resume"""
-    resume = db.query(models.Resume).filter(
+    # Owner and path only: extracted_text can be large
+    resume = db.query(models.Resume.candidate_id, models.Resume.file_path).filter(
         models.Resume.id == resume_id
     ).first()
     
@@ -320,6 +332,8 @@ def delete_resume(
     if os.path.exists(resume.file_path):
         os.remove(resume.file_path)
     
-    db.delete(resume)
+    db.query(models.Resume).filter(models.Resume.id == resume_id).delete(synchronize_session=False)
+    remove_embeddings(db, "resume", [resume_id], commit=False)
     db.commit()
+    candidates_changed(db, [resume.candidate_id], background_tasks)
     return None
@@ -3,7 +3,8 @@ System Settings Management Endpoints
 Allows admins to view and update system configuration stored in .env
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
@@ -11,10 +12,13 @@ from app.core.auth import get_current_user, require_admin, require_settings_edit
 from app.db.database import get_db
 from app.db.models_users import User, AuditLog, SystemSettings
 from app.core.config import settings
+from app.core.http_cache import cache_headers, etag_matches, make_etag, not_modified
+from app.core.responses import negotiated_response, wants_msgpack
 import os
 from pathlib import Path
 from datetime import datetime
 import httpx
+from functools import lru_cache
 
 router = APIRouter()
 
@@ -429,8 +433,34 @@ def get_all_settings_definitions() -> List[Dict[str, Any]]:
     ]
 
 
+@lru_cache(maxsize=1)
+def _definitions_version() -> str:
+    """Setting definitions only change with the code"""
+    return make_etag(repr(get_all_settings_definitions()))
+
+
+def _settings_etag(db: Session, request: Request, scope: str, is_admin: bool) -> str:
+    """ETag over the stored settings, the .env file and how values are masked for the caller"""
+    count, digest = db.execute(text(
+        "SELECT count(*), md5(coalesce(string_agg(key || '=' || coalesce(value, ''), E'\\n' ORDER BY key), '')) "
+        "FROM system_settings"
+    )).first()
+    env_file = get_env_file_path()
+    env_version = None
+    if env_file.exists():
+        stat = env_file.stat()
+        env_version = (stat.st_mtime_ns, stat.st_size)
+    return make_etag("settings", scope, is_admin, wants_msgpack(request),
+                     _definitions_version(), count, digest, env_version)
+
+
+def _settings_response(request: Request, result: List[SettingResponse], etag: str):
+    return negotiated_response(request, [item.model_dump() for item in result], headers=cache_headers(etag))
+
+
 @router.get("/", response_model=List[SettingResponse])
 async def get_all_settings(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_any_user)
 ):
@@ -438,6 +468,10 @@ async def get_all_settings(
     Get all system settings
     All users can view, but sensitive values are masked for non-admins
     """
+    etag = _settings_etag(db, request, "all", current_user.role in ["super_admin", "admin"])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     # Get saved settings from database
     db_settings = db.query(SystemSettings).all()
     db_settings_dict = {setting.key: setting.value for setting in db_settings}
@@ -473,11 +507,12 @@ async def get_all_settings(
             provider=setting_def.get("provider")
         ))
     
-    return result
+    return _settings_response(request, result, etag)
 
 
 @router.get("/public", response_model=List[SettingResponse])
 async def get_public_settings(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -485,6 +520,10 @@ async def get_public_settings(
     Get public settings that all users can read
     Returns only settings marked as is_public=True
     """
+    etag = _settings_etag(db, request, "public", False)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     # Get saved settings from database
     db_settings = db.query(SystemSettings).all()
     db_settings_dict = {setting.key: setting.value for setting in db_settings}
@@ -520,12 +559,13 @@ async def get_public_settings(
             provider=setting_def.get("provider")
         ))
     
-    return result
+    return _settings_response(request, result, etag)
 
 
 @router.get("/{category}", response_model=List[SettingResponse])
 async def get_settings_by_category(
     category: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_any_user)
 ):
@@ -534,6 +574,10 @@ async def get_settings_by_category(
     Categories: database, ai_provider, application, security, server
     All users can view, but sensitive values are masked for non-admins
     """
+    etag = _settings_etag(db, request, f"category:{category}", current_user.role in ["super_admin", "admin"])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     # Get saved settings from database
     db_settings = db.query(SystemSettings).all()
     db_settings_dict = {setting.key: setting.value for setting in db_settings}
@@ -570,7 +614,7 @@ async def get_settings_by_category(
                 provider=setting_def.get("provider")
             ))
     
-    return result
+    return _settings_response(request, result, etag)
 
 
 @router.put("/{key}")
@@ -1,8 +1,8 @@
 """
 User management endpoints: CRUD operations for users (Admin only)
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, Request
+from sqlalchemy.orm import Session, undefer_group
 from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, EmailStr
@@ -14,6 +14,7 @@ from app.core.auth import (
     hash_password,
     get_current_user
 )
+from app.core.pagination import keyset_page, set_page_headers
 
 router = APIRouter()
 
@@ -112,8 +113,12 @@ async def log_audit_action(db: Session, user: User, action: str, resource_id: st
 
 @router.get("/", response_model=List[UserResponse])
 async def list_users(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Add an estimated X-Total-Count header"),
+    exact_total: bool = Query(False, description="Make X-Total-Count an exact count"),
     role: Optional[str] = None,
     status: Optional[str] = None,
     current_user: User = Depends(get_current_user),
@@ -136,7 +141,8 @@ async def list_users(
         query = query.filter(User.status == status)
     
     # Get users
-    users = query.offset(skip).limit(limit).all()
+    users, next_cursor = keyset_page(query, (User.created_at, User.id), cursor, limit, skip=skip)
+    set_page_headers(response, db, query, next_cursor, include_total, exact_total)
     
     return [
         UserResponse(
@@ -501,8 +507,10 @@ async def change_user_role(
 @router.get("/{user_id}/audit-log")
 async def get_user_audit_log(
     user_id: str,
+    response: Response,
     skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -522,9 +530,9 @@ async def get_user_audit_log(
         )
     
     # Get audit logs
-    logs = db.query(AuditLog).filter(
-        AuditLog.user_id == user_uuid
-    ).order_by(AuditLog.timestamp.desc()).offset(skip).limit(limit).all()
+    query = db.query(AuditLog).options(undefer_group("values")).filter(AuditLog.user_id == user_uuid)
+    logs, next_cursor = keyset_page(query, (AuditLog.timestamp, AuditLog.id), cursor, limit, skip=skip)
+    set_page_headers(response, db, query, next_cursor)
     
     return [
         {
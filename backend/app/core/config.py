@@ -49,6 +49,10 @@ class Settings(BaseSettings):
     OPENROUTER_MODEL: str = os.getenv("OPENROUTER_MODEL", "anthropic/claude-2")
     OPENROUTER_API_URL: str = "https://openrouter.ai/api/v1/chat/completions"
     
+    # Outbound AI request limits (shared by all concurrent chat/analysis calls)
+    AI_MAX_CONCURRENT_REQUESTS: int = int(os.getenv("AI_MAX_CONCURRENT_REQUESTS", "4"))
+    AI_REQUESTS_PER_MINUTE: int = int(os.getenv("AI_REQUESTS_PER_MINUTE", "30"))
+    
     # Legacy AI_MODEL for backward compatibility
     AI_MODEL: str = os.getenv("AI_MODEL", os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"))
     
@@ -58,7 +62,15 @@ class Settings(BaseSettings):
     ALLOWED_EXTENSIONS: List[str] = [".pdf", ".doc", ".docx"]
     
     # Vector Embeddings
-    EMBEDDING_DIMENSION: int = 1536
+    # EMBEDDING_MODEL names a sentence-transformers model (optional dependency);
+    # when empty or unavailable the CPU hashed TF embedder is used
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "")
+    EMBEDDING_DIMENSION: int = int(os.getenv("EMBEDDING_DIMENSION", "768"))
+    # IVF (k-means partitioned) search kicks in above this many vectors
+    EMBEDDING_IVF_MIN_VECTORS: int = int(os.getenv("EMBEDDING_IVF_MIN_VECTORS", "20000"))
+    
+    # Local keyword search index snapshots
+    SEARCH_INDEX_DIR: str = os.getenv("SEARCH_INDEX_DIR", "/tmp/search_index" if os.getenv("VERCEL") else "search_index")
     
     # Server (optional, not used by FastAPI but allowed in .env)
     HOST: str = "0.0.0.0"
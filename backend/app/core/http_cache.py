@@ -0,0 +1,54 @@
+"""
+ETags and conditional GET
+Read endpoints derive a strong ETag from a cheap version (updated_at columns,
+a settings fingerprint) before building their payload. When the client's
+If-None-Match already names that version the endpoint answers 304 Not
+Modified without loading, serialising or sending the body.
+"""
+import hashlib
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response
+
+# Responses are per-user (auth) and must be revalidated on every use
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the given version parts (order matters)"""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 specifies for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def cache_headers(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> dict:
+    return {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept, Authorization"}
+
+
+def not_modified(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
+
+
+def conditional_response(
+    request: Request,
+    etag: Optional[str],
+    build: Callable[[], Response],
+    cache_control: str = PRIVATE_REVALIDATE
+) -> Response:
+    """304 when the client has `etag`, else build() with ETag/Cache-Control set (no ETag when None)"""
+    if etag is not None and etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    response = build()
+    if etag is not None:
+        response.headers.update(cache_headers(etag, cache_control))
+    return response
@@ -0,0 +1,156 @@
+"""
+Keyset (cursor) pagination for list endpoints
+Pages are ordered by a stable key such as (created_at, id) and the next page
+starts after the last row seen, so every page is an index range scan whatever
+its depth. The cursor is an opaque base64 token of the last row's key values;
+it is returned in the X-Next-Cursor header so list responses keep their shape.
+Totals are optional: a planner estimate by default, an exact count on request.
+Key columns must be NOT NULL; keyset_page refuses nullable ones.
+"""
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import text, tuple_
+from sqlalchemy.orm import Query, Session
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_IS_ESTIMATE_HEADER = "X-Total-Count-Estimated"
+# Headers the browser may read on cross-origin responses (see main.py CORS)
+PAGINATION_HEADERS = [NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_IS_ESTIMATE_HEADER]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _decode_value(value: Any, python_type: type) -> Any:
+    if value is None:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a row's key values"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> List[Any]:
+    """Key values of a cursor, typed like the key columns; 400 on a malformed cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("wrong number of key values")
+        return [_decode_value(value, key.type.python_type) for value, key in zip(values, keys)]
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {e}"
+        )
+
+
+def _require_not_null(keys: Sequence):
+    """
+    Row comparisons and DESC order disagree on NULLs (they sort first and
+    compare unknown), so rows would repeat or vanish between pages: every key
+    column must be NOT NULL (see add_pagination_indexes.py)
+    """
+    for key in keys:
+        if getattr(key.expression, "nullable", False):
+            raise ValueError(f"Keyset key {key} is nullable")
+
+
+def keyset_page(
+    query: Query,
+    keys: Sequence,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    descending: bool = True,
+    skip: int = 0
+) -> Tuple[list, Optional[str]]:
+    """
+    One page of `query` ordered by `keys` (the last key must be unique, e.g. id).
+    Returns the rows and the cursor of the next page (None on the last page).
+    `skip` keeps offset paging working for old clients when no cursor is given.
+    """
+    _require_not_null(keys)
+    if cursor:
+        after = tuple_(*keys) < tuple_(*decode_cursor(cursor, keys)) if descending \
+            else tuple_(*keys) > tuple_(*decode_cursor(cursor, keys))
+        query = query.filter(after)
+    elif skip:
+        query = query.offset(skip)
+
+    order = [key.desc() for key in keys] if descending else list(keys)
+    # One extra row tells whether there is a next page without a count
+    rows = query.order_by(*order).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, key.key) for key in keys])
+
+
+def estimated_count(db: Session, query: Query) -> Optional[int]:
+    """
+    Cheap row count: pg_class.reltuples for an unfiltered table, the planner's
+    row estimate otherwise. None when no estimate is available (never analyzed).
+    """
+    statement = query.order_by(None).statement
+    tables = statement.get_final_froms()
+    try:
+        if statement.whereclause is None and len(tables) == 1 and hasattr(tables[0], "name"):
+            estimate = db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": tables[0].name}
+            ).scalar()
+        else:
+            compiled = statement.compile(dialect=db.get_bind().dialect)
+            plan = db.connection().exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + compiled.string, compiled.params
+            ).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"]
+    except Exception as e:
+        print(f"⚠️ Row estimate unavailable: {e}")
+        db.rollback()
+        return None
+    # reltuples is -1 for tables that were never vacuumed/analyzed
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+def set_page_headers(
+    response: Response,
+    db: Session,
+    query: Query,
+    next_cursor: Optional[str],
+    include_total: bool = False,
+    exact_total: bool = False
+):
+    """Expose the next cursor and, on request, the (estimated or exact) total as headers"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if not (include_total or exact_total):
+        return
+    total = None if exact_total else estimated_count(db, query)
+    if total is None:
+        total = query.order_by(None).count()
+        response.headers[TOTAL_IS_ESTIMATE_HEADER] = "false"
+    else:
+        response.headers[TOTAL_IS_ESTIMATE_HEADER] = "true"
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
@@ -0,0 +1,63 @@
+"""
+Column-projected list responses
+List endpoints select only the columns they return and build plain dicts from
+the row tuples, skipping ORM identity-map work and response-model validation.
+Clients can narrow the columns further with a `fields=` sparse fieldset.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import Query, Session
+
+
+def column_names(model) -> List[str]:
+    """Mapped column attribute names of an ORM model"""
+    return [attr.key for attr in inspect(model).column_attrs]
+
+
+def response_columns(model, schema: type[BaseModel]) -> List[str]:
+    """The response schema's fields that are plain columns of the model (the default fieldset)"""
+    columns = set(column_names(model))
+    return [name for name in schema.model_fields if name in columns]
+
+
+def parse_fields(model, fields: Optional[str], default: Sequence[str], always: Sequence[str] = ("id",)) -> List[str]:
+    """Requested column names (`fields=a,b,c`), `default` when absent; 400 on unknown names"""
+    if not fields:
+        return list(default)
+    allowed = set(column_names(model))
+    names = list(always)
+    unknown = []
+    for name in (part.strip() for part in fields.split(",")):
+        if not name or name in names:
+            continue
+        if name not in allowed:
+            unknown.append(name)
+        names.append(name)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(sorted(allowed))}"
+        )
+    return names
+
+
+def projected_query(db: Session, model, names: Sequence[str], keys: Sequence = ()) -> Query:
+    """Query over only the named columns, plus any pagination keys not already named"""
+    columns = [getattr(model, name) for name in names]
+    columns += [key for key in keys if key.key not in names]
+    return db.query(*columns)
+
+
+def rows_to_dicts(rows, names: Sequence[str], extra: Optional[Dict[str, Any]] = None) -> List[dict]:
+    """Response dicts with exactly `names` (plus constant `extra` keys) from row tuples"""
+    results = []
+    for row in rows:
+        mapping = row._mapping
+        result = {name: mapping[name] for name in names}
+        if extra:
+            result.update({key: value() if callable(value) else value for key, value in extra.items()})
+        results.append(result)
+    return results
@@ -0,0 +1,92 @@
+"""
+Fast response serialisation
+orjson renders every JSON response (UUIDs, datetimes and dates natively;
+Decimals, sets and Pydantic models through `_default`). Hot endpoints whose
+payloads are built from trusted rows return `negotiated_response(...)`
+directly, which skips FastAPI's jsonable_encoder pass and response-model
+re-validation. Clients sending `Accept: application/msgpack` get MessagePack
+when the optional msgpack package is installed.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Mapping, Optional
+from uuid import UUID
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not serialise itself"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """orjson-encoded UTF-8 bytes (non-ASCII characters are not escaped)"""
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; the application's default response class"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):  # numpy arrays and scalars
+        return obj.tolist()
+    return _default(obj)
+
+
+class MsgPackResponse(Response):
+    """MessagePack body with the same value conventions as the JSON responses"""
+    media_type = MSGPACK_MEDIA_TYPES[0]
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, default=_msgpack_default, use_bin_type=True)
+
+
+def wants_msgpack(request: Optional[Request]) -> bool:
+    """Whether the client asked for MessagePack and it can be produced"""
+    if msgpack is None or request is None:
+        return False
+    accept = request.headers.get("accept", "").lower()
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def negotiated_response(
+    request: Optional[Request],
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    A ready-made response (JSON or MessagePack per the Accept header). FastAPI
+    sends returned Response objects as they are, so `content` is neither run
+    through jsonable_encoder nor validated against the route's response model.
+    """
+    response_class = MsgPackResponse if wants_msgpack(request) else FastJSONResponse
+    response = response_class(content, status_code=status_code, headers=dict(headers or {}))
+    response.headers["Vary"] = "Accept"
+    return response
@@ -1,9 +1,9 @@
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Date, Float, Numeric,
-    ForeignKey, Boolean, Enum, JSON, ARRAY
+    ForeignKey, Boolean, Enum, JSON, ARRAY, Index, func, LargeBinary, UniqueConstraint, Computed, BigInteger, text
 )
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR, JSONB, ARRAY as PG_ARRAY
 from datetime import datetime
 import uuid
 import enum
@@ -98,6 +98,8 @@ class Candidate(Base):
     professional_summary = Column(Text)
     career_level = Column(String(50))
     years_of_experience = Column(Integer, default=0)
+    # Sum of work_experience months (maintained by app/services/experience_totals.py)
+    total_experience_months = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Availability
     availability_status = Column(String(50))  # "Immediately", "2 weeks", "1 month"
@@ -116,30 +118,47 @@ class Candidate(Base):
     personal_website = Column(String(500))
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("timezone('utc', now())"))
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_active_at = Column(DateTime)
     status = Column(String(20), default="active")
     
-    # Relationships
-    skills = relationship("Skill", back_populates="candidate", cascade="all, delete-orphan")
-    work_experiences = relationship("WorkExperience", back_populates="candidate", cascade="all, delete-orphan")
-    educations = relationship("Education", back_populates="candidate", cascade="all, delete-orphan")
-    projects = relationship("Project", back_populates="candidate", cascade="all, delete-orphan")
-    certifications = relationship("Certification", back_populates="candidate", cascade="all, delete-orphan")
-    languages = relationship("Language", back_populates="candidate", cascade="all, delete-orphan")
-    ai_analyses = relationship("AIAnalysis", back_populates="candidate", cascade="all, delete-orphan")
-    tags = relationship("CandidateTag", back_populates="candidate", cascade="all, delete-orphan")
-    resumes = relationship("Resume", back_populates="candidate", cascade="all, delete-orphan")
-    applications = relationship("Application", back_populates="candidate", cascade="all, delete-orphan")
-    job_matches = relationship("CandidateJobMatch", back_populates="candidate", cascade="all, delete-orphan")
+    # Denormalised copies of the skills table for indexed containment filters
+    # (maintained by app/services/skill_arrays.py)
+    skill_ids = Column(PG_ARRAY(Integer))
+    skill_names = Column(PG_ARRAY(Text))
+    
+    # Relationships (child rows are removed by ON DELETE CASCADE, never loaded for a delete)
+    skills = relationship("Skill", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    work_experiences = relationship("WorkExperience", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    educations = relationship("Education", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    projects = relationship("Project", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    certifications = relationship("Certification", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    languages = relationship("Language", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    ai_analyses = relationship("AIAnalysis", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    tags = relationship("CandidateTag", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    resumes = relationship("Resume", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    applications = relationship("Application", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    job_matches = relationship("CandidateJobMatch", back_populates="candidate", cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Indexes used by structured chat filters (see app/services/query_filter.py) and skill filters
+    __table_args__ = (
+        Index("ix_candidates_years_of_experience", years_of_experience),
+        Index("ix_candidates_lower_career_level", func.lower(career_level)),
+        Index("ix_candidates_skill_ids_gin", skill_ids, postgresql_using="gin"),
+        Index("ix_candidates_skill_names_gin", skill_names, postgresql_using="gin"),
+        # Keyset pagination (see app/core/pagination.py)
+        Index("ix_candidates_created_at_id", created_at, id),
+        Index("ix_candidates_status_created_at_id", status, created_at, id),
+        Index("ix_candidates_total_experience_months_id", total_experience_months, id),
+    )
 
 
 class Skill(Base):
     __tablename__ = "skills"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"))
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), index=True)
     
     # Skill Details
     skill_name = Column(String(200), nullable=False)
@@ -163,15 +182,35 @@ class Skill(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Canonical skill (see app/services/skill_taxonomy.py), resolved at write time
+    skill_id = Column(Integer, ForeignKey("skill_dictionary.id"), index=True)
+    
     # Relationships
     candidate = relationship("Candidate", back_populates="skills")
+    
+    __table_args__ = (
+        Index("ix_skills_lower_skill_name_candidate", func.lower(func.trim(skill_name)), candidate_id),
+    )
+
+
+class SkillDictionary(Base):
+    """Canonical skills with their aliases ("JS", "ES6" -> JavaScript)"""
+    __tablename__ = "skill_dictionary"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    canonical_name = Column(String(200), nullable=False)
+    normalized_key = Column(String(200), unique=True, nullable=False)  # skill_key(canonical_name)
+    aliases = Column(ARRAY(Text))
+    category = Column(String(100))
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
 
 
 class WorkExperience(Base):
     __tablename__ = "work_experience"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"))
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), index=True)
     
     # Company Info
     company_name = Column(String(255), nullable=False)
@@ -191,7 +230,7 @@ class WorkExperience(Base):
     duration_months = Column(Integer)
     
     # Responsibilities & Achievements
-    responsibilities = Column(Text)
+    responsibilities = deferred(Column(Text))  # Deferred: loaded on access or with undefer()
     achievements = Column(ARRAY(Text))  # Array of achievements
     technologies_used = Column(ARRAY(Text))  # Tech stack
     methodologies = Column(ARRAY(Text))  # Agile, Scrum, Waterfall
@@ -217,7 +256,7 @@ class Education(Base):
     __tablename__ = "education"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"))
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), index=True)
     
     institution = Column(String(255), nullable=False)
     degree = Column(String(100), nullable=True)  # Nullable - AI may not extract for short courses/workshops
@@ -245,7 +284,7 @@ class Project(Base):
     __tablename__ = "projects"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"))
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), index=True)
     
     project_name = Column(String(255), nullable=False)
     project_type = Column(String(100))  # Personal, Professional, Open Source
@@ -274,7 +313,7 @@ class Certification(Base):
     __tablename__ = "certifications"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"))
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), index=True)
     
     certification_name = Column(String(255), nullable=False)
     issuing_organization = Column(String(255), nullable=True)  # Made nullable - AI may not extract this
@@ -298,7 +337,7 @@ class Language(Base):
     __tablename__ = "languages"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"))
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), index=True)
     
     language_name = Column(String(100), nullable=False)
     proficiency_level = Column(String(50))  # Native, Fluent, Professional, Limited
@@ -313,6 +352,10 @@ class Language(Base):
     
     # Relationships
     candidate = relationship("Candidate", back_populates="languages")
+    
+    __table_args__ = (
+        Index("ix_languages_lower_language_name_candidate", func.lower(language_name), candidate_id),
+    )
 
 
 class AIAnalysis(Base):
@@ -320,7 +363,7 @@ class AIAnalysis(Base):
     __tablename__ = "ai_analysis"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"))
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), index=True)
     
     analysis_date = Column(DateTime, default=datetime.utcnow)
     ai_model_used = Column(String(100))  # "Groq Llama 3.3 70B"
@@ -348,7 +391,7 @@ class AIAnalysis(Base):
     extraction_confidence = Column(Numeric(3, 2))  # 0.95 = 95%
     
     # Raw data for debugging
-    raw_analysis = Column(JSON)
+    raw_analysis = deferred(Column(JSON))
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -361,7 +404,7 @@ class CandidateTag(Base):
     __tablename__ = "candidate_tags"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"))
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), index=True)
     
     tag_name = Column(String(100), nullable=False)  # "Cloud Expert", "Team Lead"
     tag_category = Column(String(50))  # expertise, experience_type, soft_skill
@@ -380,14 +423,14 @@ class Resume(Base):
     __tablename__ = "resumes"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"))
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), index=True)
     
     original_filename = Column(String(500), nullable=False)
     file_path = Column(String(1000), nullable=False)
     file_size_bytes = Column(Integer)
     mime_type = Column(String(100))
     
-    extracted_text = Column(Text)  # Full text extraction
+    extracted_text = deferred(Column(Text))  # Full text extraction (deferred: lists only need metadata)
     
     upload_date = Column(DateTime, default=datetime.utcnow)
     last_parsed_date = Column(DateTime)
@@ -418,6 +461,9 @@ class Job(Base):
     
     required_skills = Column(ARRAY(Text))
     preferred_skills = Column(ARRAY(Text))
+    # skill_dictionary ids of the lists above, resolved at write time
+    required_skill_ids = Column(ARRAY(Integer))
+    preferred_skill_ids = Column(ARRAY(Integer))
     
     min_experience_years = Column(Integer)
     max_experience_years = Column(Integer)
@@ -439,12 +485,18 @@ class Job(Base):
     deadline = Column(Date)
     number_of_positions = Column(Integer, default=1)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("timezone('utc', now())"))
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    applications = relationship("Application", back_populates="job", cascade="all, delete-orphan")
-    matches = relationship("CandidateJobMatch", back_populates="job", cascade="all, delete-orphan")
+    applications = relationship("Application", back_populates="job", cascade="all, delete-orphan", passive_deletes=True)
+    matches = relationship("CandidateJobMatch", back_populates="job", cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Keyset pagination (see app/core/pagination.py)
+    __table_args__ = (
+        Index("ix_jobs_created_at_id", created_at, id),
+        Index("ix_jobs_status_created_at_id", status, created_at, id),
+    )
 
 
 class Application(Base):
@@ -455,7 +507,7 @@ class Application(Base):
     candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"))
     job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id", ondelete="CASCADE"))
     
-    applied_date = Column(DateTime, default=datetime.utcnow)
+    applied_date = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("timezone('utc', now())"))
     status = Column(String(50), default="submitted")
     
     cover_letter = Column(Text)
@@ -470,6 +522,13 @@ class Application(Base):
     # Relationships
     candidate = relationship("Candidate", back_populates="applications")
     job = relationship("Job", back_populates="applications")
+    
+    # Keyset pagination (see app/core/pagination.py)
+    __table_args__ = (
+        Index("ix_applications_applied_date_id", applied_date, id),
+        Index("ix_applications_job_applied_date_id", job_id, applied_date, id),
+        Index("ix_applications_candidate_applied_date_id", candidate_id, applied_date, id),
+    )
 
 
 class CandidateJobMatch(Base):
@@ -504,6 +563,13 @@ class CandidateJobMatch(Base):
     # Relationships
     candidate = relationship("Candidate", back_populates="job_matches")
     job = relationship("Job", back_populates="matches")
+    
+    # One row per pair; shortlists and "top jobs" read these indexes in score order
+    __table_args__ = (
+        UniqueConstraint("candidate_id", "job_id", name="uq_candidate_job_matches_pair"),
+        Index("ix_candidate_job_matches_job_score", "job_id", match_score.desc()),
+        Index("ix_candidate_job_matches_candidate_score", "candidate_id", match_score.desc()),
+    )
 
 
 class AIChatQuery(Base):
@@ -516,7 +582,7 @@ class AIChatQuery(Base):
     query_text = Column(Text, nullable=False)
     query_intent = Column(String(100))  # search_candidates, compare, get_insights
     
-    response = Column(Text, nullable=False)
+    response = deferred(Column(Text, nullable=False))
     
     related_candidates = Column(ARRAY(UUID(as_uuid=True)))
     related_jobs = Column(ARRAY(UUID(as_uuid=True)))
@@ -528,4 +594,103 @@ class AIChatQuery(Base):
     user_feedback = Column(Text)
     was_helpful = Column(Boolean)
     
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("timezone('utc', now())"))
+    
+    # Keyset pagination of the history (see app/core/pagination.py)
+    __table_args__ = (
+        Index("ix_ai_chat_queries_timestamp_id", timestamp, id),
+        Index("ix_ai_chat_queries_user_timestamp_id", user_id, timestamp, id),
+    )
+
+
+class Embedding(Base):
+    """Persisted vector embeddings for resumes and jobs (see app/services/embedding_service.py)"""
+    __tablename__ = "embeddings"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    entity_type = Column(String(50), nullable=False)  # resume, job
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    # Owning candidate for resume embeddings (removed together with the candidate)
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), index=True)
+    
+    model_name = Column(String(200), nullable=False)
+    dimension = Column(Integer, nullable=False)
+    vector_data = Column(LargeBinary, nullable=False)  # float32 bytes, L2-normalised
+    content_hash = Column(String(64))  # skip re-embedding unchanged text
+    
+    embedding_date = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint("entity_type", "entity_id", name="uq_embeddings_entity"),
+    )
+
+
+def _weighted_tsvector(config: str) -> str:
+    """Generated-column expression: names/skills rank above titles, summary and resume text"""
+    return (
+        f"setweight(to_tsvector('{config}', coalesce(names, '') || ' ' || coalesce(skills, '')), 'A') || "
+        f"setweight(to_tsvector('{config}', coalesce(titles, '') || ' ' || coalesce(companies, '')), 'B') || "
+        f"setweight(to_tsvector('{config}', coalesce(summary, '')), 'C') || "
+        f"setweight(to_tsvector('{config}', coalesce(resume_text, '')), 'D')"
+    )
+
+
+class CandidateSearchDocument(Base):
+    """Denormalised full-text search document per candidate (see app/services/search_documents.py)"""
+    __tablename__ = "candidate_search_documents"
+    
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+    
+    names = Column(Text)
+    skills = Column(Text)
+    titles = Column(Text)  # job titles + technologies used
+    companies = Column(Text)
+    summary = Column(Text)
+    resume_text = Column(Text)
+    
+    # English stemming, and Arabic stemming for Arabic CVs/queries
+    search_vector_en = Column(TSVECTOR, Computed(_weighted_tsvector("english"), persisted=True))
+    search_vector_ar = Column(TSVECTOR, Computed(_weighted_tsvector("arabic"), persisted=True))
+    
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_candidate_search_documents_en", search_vector_en, postgresql_using="gin"),
+        Index("ix_candidate_search_documents_ar", search_vector_ar, postgresql_using="gin"),
+    )
+
+
+class CandidateReadDocument(Base):
+    """Fully assembled candidate detail view (see app/services/candidate_read_model.py)"""
+    __tablename__ = "candidate_read_documents"
+    
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+    document = Column(JSONB, nullable=False)
+    # Set in the transaction of a write whose document could not be rebuilt in it; rebuilt on read
+    stale = Column(Boolean, nullable=False, default=False, server_default="false")
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class CandidateChange(Base):
+    """Append-only log of candidate writes (see app/services/candidate_changes.py)"""
+    __tablename__ = "candidate_changes"
+    
+    seq = Column(BigInteger, primary_key=True, autoincrement=True)
+    # No foreign key: deletions are logged too
+    candidate_id = Column(UUID(as_uuid=True), nullable=False)
+    changed_at = Column(DateTime, nullable=False, server_default=text("timezone('utc', clock_timestamp())"))
+    
+    __table_args__ = (
+        Index("ix_candidate_changes_changed_at", changed_at),
+    )
+
+
+class MatchRescoreQueue(Base):
+    """Candidates and jobs whose stored matches need rescoring (see app/services/match_maintenance.py)"""
+    __tablename__ = "match_rescore_queue"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    entity_type = Column(String(20), nullable=False)  # candidate, job
+    # No foreign key: a deleted job still needs its stored matches dropped
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    queued_at = Column(DateTime, nullable=False, server_default=text("timezone('utc', clock_timestamp())"))
@@ -3,9 +3,9 @@ User Management Models
 Includes User, Role, Permission, and SystemSettings models
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Table, Integer, JSON, Text, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Table, Integer, JSON, Text, Index, Enum as SQLEnum, text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import uuid
 import enum
@@ -86,7 +86,7 @@ class User(Base):
     use_custom_instructions = Column(Boolean, default=False)  # Whether to use custom instructions
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("timezone('utc', now())"))
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     
@@ -99,6 +99,11 @@ class User(Base):
     sessions = relationship("UserSession", back_populates="user", cascade="all, delete-orphan")
     usage_limits = relationship("UserUsageLimit", back_populates="user", uselist=False, cascade="all, delete-orphan")
     usage_history = relationship("UserUsageHistory", back_populates="user", cascade="all, delete-orphan")
+    
+    # Keyset pagination (see app/core/pagination.py)
+    __table_args__ = (
+        Index("ix_users_created_at_id", created_at, id),
+    )
 
 
 class UserSession(Base):
@@ -150,8 +155,8 @@ class AuditLog(Base):
     
     # Details
     description = Column(Text)
-    old_values = Column(JSON)  # Previous state
-    new_values = Column(JSON)  # New state
+    old_values = deferred(Column(JSON), group="values")  # Previous state
+    new_values = deferred(Column(JSON), group="values")  # New state
     
     # Context
     ip_address = Column(String(50))
@@ -164,10 +169,15 @@ class AuditLog(Base):
     error_message = Column(Text)
     
     # Timestamp
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("timezone('utc', now())"), index=True)
     
     # Relationships
     user = relationship("User", back_populates="audit_logs")
+    
+    # Keyset pagination of a user's log (see app/core/pagination.py)
+    __table_args__ = (
+        Index("ix_audit_logs_user_timestamp_id", user_id, timestamp, id),
+    )
 
 
 class SystemSettings(Base):
@@ -2,8 +2,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1 import router as api_router
 from app.core.config import settings
+from app.core.pagination import PAGINATION_HEADERS
+from app.core.responses import FastJSONResponse
 from app.db.database import engine
 from app.db import models
+from app.services import skill_taxonomy  # noqa: F401  registers write-time skill id resolution
+from app.services import candidate_changes  # noqa: F401  registers the candidate change log
+from app.services.bm25_index import start_bm25_sync
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,7 +28,8 @@ except Exception as e:
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="ATS/AI Application - Applicant Tracking System with AI capabilities"
+    description="ATS/AI Application - Applicant Tracking System with AI capabilities",
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -33,11 +39,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=PAGINATION_HEADERS,
 )
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+def warm_search_indexes():
+    """Load the keyword index in the background so the first search doesn't build it"""
+    start_bm25_sync()
+
 @app.get("/")
 async def root():
     return {
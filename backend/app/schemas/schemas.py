@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, HttpUrl
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, HttpUrl, Field
+from typing import Optional, List, Dict
 from datetime import datetime, date
 from uuid import UUID
 
@@ -83,6 +83,7 @@ class CandidateResponse(CandidateBase):
     professional_summary: Optional[str] = None
     career_level: Optional[str] = None
     years_of_experience: Optional[int] = None
+    total_experience_months: Optional[int] = None
     availability_status: Optional[str] = None
     notice_period_days: Optional[int] = None
     current_salary_currency: Optional[str] = None
@@ -114,10 +115,10 @@ class ResumeCreate(ResumeBase):
     candidate_id: UUID
 
 
-class ResumeResponse(ResumeBase):
+class ResumeSummary(ResumeBase):
+    """Resume metadata for lists (the extracted text is only in ResumeResponse)"""
     id: UUID
     candidate_id: UUID
-    extracted_text: Optional[str] = None
     parse_status: str  # Fixed: was parsed_status, should match database column
     upload_date: datetime
     version: int
@@ -127,6 +128,10 @@ class ResumeResponse(ResumeBase):
         from_attributes = True
 
 
+class ResumeResponse(ResumeSummary):
+    extracted_text: Optional[str] = None
+
+
 # Skill Schemas
 class SkillBase(BaseModel):
     name: str
@@ -296,7 +301,9 @@ class ChatMessage(BaseModel):
 class AIQueryRequest(BaseModel):
     query_text: str
     user_id: Optional[str] = None
-    conversation_history: Optional[List[ChatMessage]] = []  # Previous messages for context
+    conversation_history: Optional[List[ChatMessage]] = []  # Previous messages for context (only needed to seed a new server session)
+    conversation_id: Optional[str] = None  # Server-side conversation session to continue
+    mode: Optional[str] = "auto"  # auto, single or map_reduce (whole-pool sweeps)
 
 
 class AIQueryResponse(BaseModel):
@@ -315,7 +322,8 @@ class AIQueryResponse(BaseModel):
 # Chat/Search Schemas
 class SearchRequest(BaseModel):
     query: str
-    limit: int = 10
+    limit: int = Field(10, ge=1, le=100)
+    explain: bool = False  # Ask the AI for a one-line reason per result (one extra LLM call)
 
 
 class CandidateInfo(BaseModel):
@@ -329,6 +337,7 @@ class AIChatResponse(BaseModel):
     response: str
     candidates: List[CandidateInfo] = []
     jobs: List[UUID] = []
+    conversation_id: Optional[str] = None
 
 
 class MatchResult(BaseModel):
@@ -336,6 +345,7 @@ class MatchResult(BaseModel):
     match_score: float
     matching_skills: List[str]
     reason: str
+    ranks: Dict[str, int] = {}  # 1-based rank per ranking source (keyword, skills, semantic)
 
 
 # Custom Instructions Schemas
@@ -0,0 +1,47 @@
+"""
+Async rate limiter for outbound AI API calls
+Caps the number of in-flight requests and spaces request starts so bursts of
+concurrent prompts (e.g. map-reduce chat batches) stay under provider limits.
+"""
+import asyncio
+import time
+from typing import Optional
+
+from app.core.config import settings
+
+
+class AsyncRateLimiter:
+    """Concurrency cap plus a minimum interval between request starts"""
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int):
+        self._max_concurrency = max(1, max_concurrency)
+        self._min_interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._interval_lock: Optional[asyncio.Lock] = None
+        self._next_start = 0.0
+
+    def _primitives(self):
+        # Created lazily so they bind to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._interval_lock = asyncio.Lock()
+        return self._semaphore, self._interval_lock
+
+    async def __aenter__(self):
+        semaphore, interval_lock = self._primitives()
+        await semaphore.acquire()
+        if self._min_interval:
+            async with interval_lock:
+                now = time.monotonic()
+                wait = self._next_start - now
+                self._next_start = max(now, self._next_start) + self._min_interval
+            if wait > 0:
+                await asyncio.sleep(wait)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+
+ai_rate_limiter = AsyncRateLimiter(settings.AI_MAX_CONCURRENT_REQUESTS, settings.AI_REQUESTS_PER_MINUTE)
@@ -1,19 +1,34 @@
 import httpx
 from typing import Dict, Any, List
 from app.core.config import settings
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, joinedload, undefer
 from app.db import models
 import json
 import re
 from datetime import datetime
+from uuid import UUID
+from app.services.intent_router import (
+    classify_intent, answer_intent, detect_language, contains_any,
+    HR_KEYWORDS, JOB_TERMS, APPLICATION_TERMS
+)
+from app.services.query_filter import compile_candidate_filter, apply_candidate_filter
+from app.services.ai_rate_limiter import ai_rate_limiter
+from app.services.map_reduce_chat import map_reduce_chat, estimate_tokens, DEFAULT_CONTEXT_TOKEN_BUDGET
+from app.services.hybrid_search import hybrid_search
+from app.services.candidate_sync import candidate_details_changed
 
+# Upper bound on candidates sent to the model after a structured filter
+MAX_FILTERED_CANDIDATES = 50
 
-async def call_ai_api(prompt: str, system_message: str = None, user_api_key: str = None, db: Session = None) -> str:
+
+async def call_ai_api(prompt: str, system_message: str = None, user_api_key: str = None, db: Session = None,
+                      mock_on_rate_limit: bool = True) -> str:
     """
     Call AI API (OpenRouter or DeepSeek) for completions
     Args:
         user_api_key: Optional user's personal API key
         db: Database session to get system API key from database
+        mock_on_rate_limit: Return a canned response on 429 instead of raising
     """
     # If USE_MOCK_AI is enabled, skip API and use mock responses
     if settings.USE_MOCK_AI:
@@ -122,17 +137,6 @@ async def call_ai_api(prompt: str, system_message: str = None, user_api_key: str
                         original_query = line.replace("Current Question:", "").strip()
                         break
             
-            # Detect language to provide appropriate response
-            def detect_language(text: str) -> str:
-                arabic_chars = sum(1 for char in text if '\u0600' <= char <= '\u06FF')
-                english_chars = sum(1 for char in text if char.isascii() and char.isalpha())
-                total_chars = arabic_chars + english_chars
-                
-                if total_chars == 0:
-                    return "english"
-                
-                arabic_ratio = arabic_chars / total_chars
-                return "arabic" if arabic_ratio > 0.3 else "english"
             
             user_language = detect_language(original_query)
             
@@ -230,17 +234,6 @@ async def call_ai_api(prompt: str, system_message: str = None, user_api_key: str
     
     # If personal API key is required but not provided, return appropriate message
     if require_personal_key and not user_api_key:
-        # Detect language for appropriate error message
-        def detect_language(text: str) -> str:
-            arabic_chars = sum(1 for char in text if '\u0600' <= char <= '\u06FF')
-            english_chars = sum(1 for char in text if char.isascii() and char.isalpha())
-            total_chars = arabic_chars + english_chars
-            
-            if total_chars == 0:
-                return "english"
-            
-            arabic_ratio = arabic_chars / total_chars
-            return "arabic" if arabic_ratio > 0.3 else "english"
         
         user_language = detect_language(prompt)
         
@@ -303,7 +296,7 @@ async def call_ai_api(prompt: str, system_message: str = None, user_api_key: str
     }
     
     try:
-        async with httpx.AsyncClient() as client:
+        async with ai_rate_limiter, httpx.AsyncClient() as client:
             response = await client.post(
                 api_url,
                 headers=headers,
@@ -315,7 +308,7 @@ async def call_ai_api(prompt: str, system_message: str = None, user_api_key: str
             return result["choices"][0]["message"]["content"]
     except httpx.HTTPStatusError as e:
         print(f"❌ HTTP Error {e.response.status_code}: {e.response.text}")
-        if e.response.status_code == 429:
+        if e.response.status_code == 429 and mock_on_rate_limit:
             # Rate limit hit - return a helpful mock response
             print("⚠️ Rate limit hit (429). Using mock response for testing.")
             if "resume" in prompt.lower() or "analyze" in prompt.lower():
@@ -808,17 +801,12 @@ Return the analysis as JSON."""
                     is_current = bool(exp.get("is_current", False))
                     achievements = safe_extract_list(exp, "achievements")
                     
-                    # Calculate duration in months for this role
+                    # Duration of finished roles only; open-ended roles are counted up to today by
+                    # the candidates.total_experience_months aggregate (see experience_totals)
                     duration_months = 0
-                    if start_date:
-                        if end_date:
-                            # Calculate difference between start and end date
-                            delta = end_date - start_date
-                            duration_months = round(delta.days / 30.44, 1)  # Average days per month
-                        elif is_current:
-                            # Calculate from start date to now
-                            delta = datetime.utcnow().date() - start_date
-                            duration_months = round(delta.days / 30.44, 1)
+                    if start_date and end_date:
+                        delta = end_date - start_date
+                        duration_months = round(delta.days / 30.44, 1)  # Average days per month
                     
                     # Ensure minimum value and reasonable maximum
                     if duration_months < 0:
@@ -975,6 +963,7 @@ Return the analysis as JSON."""
                     print(f"⚠️ Error processing language: {lang} - {e}")
                     continue
         
+        candidate_details_changed(db, [candidate_id])
         db.commit()
         
         # Return analysis with candidate_id
@@ -986,11 +975,24 @@ Return the analysis as JSON."""
         return {"error": str(e)}
 
 
-async def chat_with_database(query: str, db: Session, current_user = None, conversation_history: list = None) -> Dict[str, Any]:
+async def chat_with_database(
+    query: str,
+    db: Session,
+    current_user = None,
+    conversation_history: list = None,
+    session = None,
+    mode: str = "auto",
+    progress = None
+) -> Dict[str, Any]:
     """
     Natural language chat interface to query the database using AI
-    Supports conversation history for context-aware responses
+    Supports conversation history for context-aware responses, either from a
+    server-side ConversationSession (preferred) or from client-sent history
     Includes candidates, jobs, and applications context
+    
+    mode: "single" sends one prompt, "map_reduce" sweeps the pool in batches,
+    "auto" switches to map-reduce when the context exceeds the token budget.
+    progress: optional async callback receiving map-reduce progress events
     """
     # Log user activity for audit trail
     user_identifier = "anonymous"
@@ -1006,47 +1008,66 @@ async def chat_with_database(query: str, db: Session, current_user = None, conve
     # Detect if query is candidate/HR related or general chat
     query_lower = query.lower()
     
-    # HR/Candidate related keywords
-    hr_keywords = [
-        'candidate', 'candidates', 'resume', 'cv', 'job', 'position', 'skill', 'experience', 
-        'developer', 'engineer', 'manager', 'hire', 'recruit', 'interview', 'apply', 'application',
-        'مرشح', 'مرشحين', 'سيرة', 'وظيفة', 'مهارة', 'خبرة', 'مطور', 'مهندس', 'توظيف', 'مقابلة'
-    ]
+    # Aggregate questions ("how many candidates know Python", "list open jobs in
+    # Cairo", "who applied to X") are answered exactly from SQL without the LLM
+    intent = classify_intent(query)
+    intent_answer = answer_intent(intent, db)
+    if intent_answer and intent.direct:
+        print(f"⚡ Answered locally via intent '{intent.name}'")
+        return {
+            "response": intent_answer.response,
+            "candidates": intent_answer.candidates,
+            "jobs": intent_answer.jobs,
+            "intent": intent.name
+        }
     
     # Check if any HR keywords are in the query or if specific names are mentioned
-    is_hr_related = any(keyword in query_lower for keyword in hr_keywords)
+    is_hr_related = contains_any(query_lower, HR_KEYWORDS) or intent_answer is not None
     
     # Also check if specific candidate names are mentioned
-    all_candidates = db.query(models.Candidate).all()
-    mentioned_candidates = []
+    # Names are matched on a lightweight column query; full profiles are only
+    # loaded below for the candidates that end up in the prompt
+    name_rows = db.query(
+        models.Candidate.id, models.Candidate.first_name, models.Candidate.last_name
+    ).all()
+    mentioned_candidate_ids = []
     
-    for candidate in all_candidates:
-        full_name = f"{candidate.first_name} {candidate.last_name}".lower()
-        first_name = candidate.first_name.lower()
-        last_name = candidate.last_name.lower()
+    for row in name_rows:
+        first_name = (row.first_name or "").lower()
+        last_name = (row.last_name or "").lower()
+        full_name = f"{first_name} {last_name}"
         
-        if (first_name in query_lower or 
-            last_name in query_lower or 
+        if ((first_name and first_name in query_lower) or 
+            (last_name and last_name in query_lower) or 
             full_name in query_lower):
-            mentioned_candidates.append(candidate)
+            mentioned_candidate_ids.append(row.id)
+            is_hr_related = True
+    
+    # Follow-up questions ("what about her education?") reuse the candidates
+    # cached in the server-side conversation instead of re-retrieving everyone
+    if not mentioned_candidate_ids and session is not None and session.is_follow_up(query):
+        known_ids = {row.id for row in name_rows}
+        mentioned_candidate_ids = [UUID(cid) for cid in session.candidate_ids if UUID(cid) in known_ids]
+        if mentioned_candidate_ids:
+            print(f"🧠 Reusing {len(mentioned_candidate_ids)} candidate(s) from conversation memory")
             is_hr_related = True
     
+    # Constraint queries ("senior Python developers in Cairo with 5+ years") are
+    # compiled into a typed filter and evaluated by the database; the model then
+    # only ranks and summarises the candidates that satisfy it
+    candidate_filter = None
+    if is_hr_related and not mentioned_candidate_ids:
+        candidate_filter = await compile_candidate_filter(query, db, user_api_key)
+        if candidate_filter.is_empty():
+            candidate_filter = None
+        else:
+            print(f"🧮 Compiled candidate filter: {candidate_filter.describe()}")
+    
     print(f"🔍 Chat query: {query}")
     print(f"🎯 HR-related query: {is_hr_related}")
     
     # If it's not HR-related, provide a simple conversational response
     if not is_hr_related:
-        # Detect language preference from query
-        def detect_language(text: str) -> str:
-            arabic_chars = sum(1 for char in text if '\u0600' <= char <= '\u06FF')
-            english_chars = sum(1 for char in text if char.isascii() and char.isalpha())
-            total_chars = arabic_chars + english_chars
-            
-            if total_chars == 0:
-                return "english"
-            
-            arabic_ratio = arabic_chars / total_chars
-            return "arabic" if arabic_ratio > 0.3 else "english"
         
         user_language = detect_language(query)
         print(f"🌐 Detected language: {user_language}")
@@ -1085,7 +1106,8 @@ async def chat_with_database(query: str, db: Session, current_user = None, conve
             language_instruction = get_ai_setting(db, "ai_language_enforcement_english", 
                 default_value="Use English only")
         
-        simple_prompt = f"""Current Question: {query}
+        memory_context = session.build_context() if session is not None else ""
+        simple_prompt = f"""{memory_context}Current Question: {query}
 
 {chat_instructions}
 
@@ -1115,27 +1137,52 @@ Answer the question directly and professionally."""
             }
     
     # Continue with HR-related logic for candidate queries
-    candidates = mentioned_candidates if mentioned_candidates else all_candidates
+    # Eager-load the relations used to build the prompt context so the loop
+    # below doesn't issue one query per candidate per relation
+    candidate_query = db.query(models.Candidate).options(
+        selectinload(models.Candidate.skills),
+        selectinload(models.Candidate.work_experiences).undefer(models.WorkExperience.responsibilities),
+        selectinload(models.Candidate.educations)
+    )
+    unfiltered_query = candidate_query
+    if mentioned_candidate_ids:
+        candidate_query = candidate_query.filter(models.Candidate.id.in_(mentioned_candidate_ids))
+    elif candidate_filter:
+        candidate_query = apply_candidate_filter(db, candidate_query, candidate_filter).order_by(
+            models.Candidate.years_of_experience.desc().nullslast(), models.Candidate.created_at.desc()
+        ).limit(MAX_FILTERED_CANDIDATES + 1)
+    candidates = candidate_query.all()
+    
+    user_language = detect_language(query)
+    print(f"🌐 Detected language: {user_language}")
+    
+    filter_context = ""
+    if candidate_filter and not candidates:
+        # A compiled filter may have misread an ordinary word as a criterion: an empty
+        # result is never answered as "no match" without the model seeing the candidates
+        print("⚠️ Candidate filter matched nothing, asking the model over all candidates")
+        filter_context = (
+            f"\n\nNOTE: a database filter read from the question ({candidate_filter.describe()}) "
+            f"matched no candidates and may have misread it. Judge the candidates below against "
+            f"the question yourself.\n"
+        )
+        candidate_filter = None
+        candidates = unfiltered_query.all()
+    
+    if candidate_filter:
+        truncated = len(candidates) > MAX_FILTERED_CANDIDATES
+        candidates = candidates[:MAX_FILTERED_CANDIDATES]
+        filter_context = (
+            f"\n\nFILTER APPLIED BY THE DATABASE: {candidate_filter.describe()}\n"
+            f"Every candidate listed satisfies these criteria"
+            f"{f' (showing the first {MAX_FILTERED_CANDIDATES} matches)' if truncated else ''}. "
+            f"Do not re-check the criteria; rank the candidates and summarise why they fit.\n"
+        )
     
     print(f"📊 Found {len(candidates)} relevant candidates:")
     for c in candidates:
         print(f"   - {c.first_name} {c.last_name}")
 
-    # Detect language preference from query
-    def detect_language(text: str) -> str:
-        arabic_chars = sum(1 for char in text if '\u0600' <= char <= '\u06FF')
-        english_chars = sum(1 for char in text if char.isascii() and char.isalpha())
-        total_chars = arabic_chars + english_chars
-        
-        if total_chars == 0:
-            return "english"  # Default to English if no clear language detected
-        
-        arabic_ratio = arabic_chars / total_chars
-        return "arabic" if arabic_ratio > 0.3 else "english"
-    
-    user_language = detect_language(query)
-    print(f"🌐 Detected language: {user_language}")
-
     # Build comprehensive context about candidates
     context_parts = []
     candidate_ids = []
@@ -1198,10 +1245,7 @@ Work Experience:
     
     # Enhanced jobs context - Always include if query mentions positions or is about matching
     jobs_context = ""
-    job_related_terms = ['job', 'position', 'opening', 'vacancy', 'suitable', 'best', 'match', 'fit', 'recommend', 
-                        'وظيفة', 'وظائف', 'منصب', 'مناسب', 'أفضل', 'يناسب', 'ملائم', 'أنسب', 'الأنسب']
-    
-    if any(word in query_lower for word in job_related_terms):
+    if contains_any(query_lower, JOB_TERMS):
         jobs = db.query(models.Job).filter(models.Job.status == 'open').limit(10).all()
         if jobs:
             if user_language == "arabic":
@@ -1240,32 +1284,26 @@ Description: {job.description[:200] if job.description else 'Not specified'}...
     
     # Add Applications context if query mentions applications/candidates applying
     applications_context = ""
-    if any(word in query_lower for word in ['application', 'applied', 'applying', 'candidate', 'تقديم', 'متقدم']):
-        applications = db.query(models.Application).limit(50).all()
+    if contains_any(query_lower, APPLICATION_TERMS):
+        # Load candidate and job alongside each application in a single joined query
+        applications = db.query(models.Application).options(
+            joinedload(models.Application.candidate),
+            joinedload(models.Application.job)
+        ).order_by(models.Application.applied_date.desc()).limit(50).all()
         if applications:
             applications_context = "\n\nAPPLICATIONS STATUS:\n"
             for app in applications:
-                candidate = db.query(models.Candidate).filter(models.Candidate.id == app.candidate_id).first()
-                job = db.query(models.Job).filter(models.Job.id == app.job_id).first()
+                candidate = app.candidate
+                job = app.job
                 if candidate and job:
+                    interview = f", Interview: {app.interview_date:%Y-%m-%d}" if app.interview_date else ""
                     applications_context += f"""
 - {candidate.first_name} {candidate.last_name} applied for {job.title}
-  Status: {app.status}, Stage: {app.current_stage or 'Initial'}
+  Status: {app.status or 'submitted'}{interview}
 ---"""
     
-    # Detect language preference from query
-    def detect_language(text: str) -> str:
-        arabic_chars = sum(1 for char in text if '\u0600' <= char <= '\u06FF')
-        english_chars = sum(1 for char in text if char.isascii() and char.isalpha())
-        total_chars = arabic_chars + english_chars
-        
-        if total_chars == 0:
-            return "english"  # Default to English if no clear language detected
-        
-        arabic_ratio = arabic_chars / total_chars
-        return "arabic" if arabic_ratio > 0.3 else "english"
-    
-    user_language = detect_language(query)
+    # Structured results from the local intent router are passed to the model as exact facts
+    structured_context = intent_answer.as_context() if intent_answer else ""
     
     # Get language-specific AI instructions from database (customizable by admin)
     if user_language == "arabic":
@@ -1290,11 +1328,13 @@ Description: {job.description[:200] if job.description else 'Not specified'}...
     system_message = custom_instructions + """
     
 CURRENT DATABASE CONTEXT:
-""" + database_context + jobs_context + applications_context
+""" + database_context + jobs_context + applications_context + structured_context + filter_context
     
-    # Build conversation context if history exists
+    # Build conversation context: server-side memory first, client history as fallback
     conversation_context = ""
-    if conversation_history:
+    if session is not None and session.has_history():
+        conversation_context = session.build_context()
+    elif conversation_history:
         conversation_context = "\n\nPREVIOUS CONVERSATION:\n"
         for msg in conversation_history[-6:]:  # Include last 6 messages (3 exchanges) for context
             # Handle both Pydantic objects and dictionaries
@@ -1330,6 +1370,8 @@ CANDIDATE PROFILES:
 {database_context}
 
 {jobs_context}
+{structured_context}
+{filter_context}
 
 IMPORTANT: 
 - The candidates listed above are the ONLY ones you should discuss. 
@@ -1341,9 +1383,30 @@ IMPORTANT:
 - {get_ai_setting(db, f"ai_language_enforcement_{user_language}", default_value="Use appropriate language")}
 - Provide a structured, professional analysis based on the candidate data and conversation history above."""
 
+    # Contexts too large for one prompt are answered with map-reduce over the profile cards
+    context_budget = int(get_ai_setting(db, "ai_chat_context_token_budget",
+                                        default_value=str(DEFAULT_CONTEXT_TOKEN_BUDGET)))
+    use_map_reduce = bool(context_parts) and (
+        mode == "map_reduce" or
+        (mode == "auto" and estimate_tokens(system_message) + estimate_tokens(user_prompt) > context_budget)
+    )
+    
     # Call AI to generate response
     try:
-        ai_response = await call_ai_api(user_prompt, system_message, user_api_key, db)
+        if use_map_reduce:
+            ai_response = await map_reduce_chat(
+                query,
+                context_parts,
+                db,
+                custom_instructions,
+                language_instruction=get_ai_setting(db, f"ai_language_enforcement_{user_language}",
+                                                    default_value="Use appropriate language"),
+                extra_context=conversation_context + jobs_context + applications_context + structured_context + filter_context,
+                user_api_key=user_api_key,
+                progress=progress
+            )
+        else:
+            ai_response = await call_ai_api(user_prompt, system_message, user_api_key, db)
         
         # Clean up response if it contains JSON markers or code blocks
         if "```" in ai_response:
@@ -1369,7 +1432,8 @@ IMPORTANT:
         return {
             "response": ai_response,
             "candidates": mentioned_candidate_ids,
-            "jobs": []
+            "jobs": [],
+            "mode": "map_reduce" if use_map_reduce else "single"
         }
     except Exception as e:
         # Fallback if AI fails
@@ -1383,41 +1447,19 @@ IMPORTANT:
 async def semantic_search(query: str, limit: int, db: Session) -> List[Dict[str, Any]]:
     """
     Perform semantic search for candidates based on job requirements
-    This is a simple implementation - can be enhanced with vector embeddings
+    Ranks the whole pool locally (no LLM call) with the hybrid ranker
     """
     try:
-        # For now, use keyword-based search as a placeholder
-        # In production, this would use vector embeddings
-        
-        # Extract keywords from query
-        keywords = query.lower().split()
-        
-        # Search for candidates with matching skills
-        candidates = db.query(models.Candidate).limit(limit).all()
-        
-        results = []
-        for candidate in candidates:
-            # Get candidate skills directly (no CandidateSkill table)
-            skill_names = []
-            for skill in candidate.skills:
-                if skill.skill_name:
-                    skill_names.append(skill.skill_name.lower())
-            
-            # Calculate simple match score
-            match_score = sum(1 for keyword in keywords if any(keyword in skill for skill in skill_names))
-            
-            if match_score > 0:
-                results.append({
-                    "candidate_id": str(candidate.id),
-                    "name": f"{candidate.first_name} {candidate.last_name}",
-                    "email": candidate.email,
-                    "match_score": match_score * 20,  # Convert to percentage-like score
-                    "matched_skills": [s for s in skill_names if any(k in s for k in keywords)]
-                })
-        
-        # Sort by match score
-        results.sort(key=lambda x: x["match_score"], reverse=True)
-        return results[:limit]
+        return [
+            {
+                "candidate_id": str(hit.candidate.id),
+                "name": f"{hit.candidate.first_name} {hit.candidate.last_name}",
+                "email": hit.candidate.email,
+                "match_score": hit.score,
+                "matched_skills": hit.matched_skills
+            }
+            for hit in hybrid_search(db, query, limit)
+        ]
         
     except Exception as e:
         print(f"Error in semantic_search: {str(e)}")
@@ -7,7 +7,7 @@ import httpx
 import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime, date
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.core.config import settings
 from app.db import models
 import re
@@ -445,8 +445,15 @@ Return ONLY valid JSON, no additional text."""
         Enhanced AI chat that understands the rich database structure
         """
         
-        # Get all candidates with full context
-        candidates = db.query(models.Candidate).all()
+        # Get all candidates with full context (relations eager-loaded in bulk)
+        candidates = db.query(models.Candidate).options(
+            selectinload(models.Candidate.skills),
+            selectinload(models.Candidate.work_experiences),
+            selectinload(models.Candidate.educations),
+            selectinload(models.Candidate.certifications),
+            selectinload(models.Candidate.languages),
+            selectinload(models.Candidate.tags)
+        ).all()
         
         if not candidates:
             return {
@@ -455,6 +462,15 @@ Return ONLY valid JSON, no additional text."""
                 "jobs": []
             }
         
+        # Latest AI analysis per candidate in one query (DISTINCT ON candidate_id)
+        latest_analyses = db.query(models.AIAnalysis).distinct(
+            models.AIAnalysis.candidate_id
+        ).order_by(
+            models.AIAnalysis.candidate_id,
+            models.AIAnalysis.analysis_date.desc()
+        ).all()
+        analysis_by_candidate = {a.candidate_id: a for a in latest_analyses}
+        
         # Build comprehensive context
         context_parts = []
         candidate_ids = []
@@ -463,9 +479,7 @@ Return ONLY valid JSON, no additional text."""
             candidate_ids.append(str(candidate.id))
             
             # Get latest AI analysis
-            ai_analysis = db.query(models.AIAnalysis).filter(
-                models.AIAnalysis.candidate_id == candidate.id
-            ).order_by(models.AIAnalysis.analysis_date.desc()).first()
+            ai_analysis = analysis_by_candidate.get(candidate.id)
             
             # Build rich candidate profile
             skills = [f"{s.skill_name} ({s.proficiency_level})" for s in candidate.skills]
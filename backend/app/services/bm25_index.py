@@ -0,0 +1,397 @@
+"""
+In-process BM25 inverted index over candidate text
+One document per candidate: skills, work-experience titles and technologies,
+professional summary and extracted resume text (field-weighted by repetition).
+Postings are compact typed arrays scored with NumPy, updates are incremental
+and the index is snapshotted to disk so restarts don't rebuild from scratch.
+Loading and catching up with other workers (from the candidate change log)
+run on a background thread started at startup; searches never wait for them.
+"""
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models
+from app.db.database import SessionLocal
+from app.services.candidate_changes import (
+    CHANGE_LOG_RETENTION, changed_candidates_since, database_now, prune_candidate_changes
+)
+from app.services.text_tokenizer import tokenize
+
+# Field weights (token repetition): skills matter more than free text
+FIELD_WEIGHTS = {"skills": 3, "titles": 2, "technologies": 2, "summary": 1, "names": 1, "resume": 1}
+# Compact once this share of documents are tombstones
+COMPACT_TOMBSTONE_RATIO = 0.25
+# Persist a snapshot after this many incremental updates
+SNAPSHOT_EVERY_UPDATES = 100
+# How often a process picks up changes written by other workers (seconds)
+INDEX_REFRESH_INTERVAL = 30
+MAX_TF = 65535
+
+
+class BM25Index:
+    """Okapi BM25 with per-term postings stored as int32 doc ids + uint16 term frequencies"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._vocab: Dict[str, int] = {}
+        self._postings_docs: List[array] = []
+        self._postings_tfs: List[array] = []
+        self._doc_keys: List[Optional[str]] = []  # None marks a tombstone
+        self._doc_lengths = array("f")
+        self._alive = bytearray()
+        self._key_to_doc: Dict[str, int] = {}
+        self._total_length = 0.0
+        self._tombstones = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._key_to_doc)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_to_doc
+
+    def keys(self) -> List[str]:
+        return list(self._key_to_doc)
+
+    def add(self, key: str, tokens: List[str]):
+        """Index (or re-index) a document"""
+        with self._lock:
+            if key in self._key_to_doc:
+                self._remove_locked(key)
+            doc = len(self._doc_keys)
+            self._doc_keys.append(key)
+            self._doc_lengths.append(float(len(tokens)))
+            self._alive.append(1)
+            self._key_to_doc[key] = doc
+            self._total_length += len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_id = self._vocab.get(term)
+                if term_id is None:
+                    term_id = len(self._postings_docs)
+                    self._vocab[term] = term_id
+                    self._postings_docs.append(array("i"))
+                    self._postings_tfs.append(array("H"))
+                self._postings_docs[term_id].append(doc)
+                self._postings_tfs[term_id].append(min(tf, MAX_TF))
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._key_to_doc:
+                return False
+            self._remove_locked(key)
+            if self._tombstones > max(1000, COMPACT_TOMBSTONE_RATIO * len(self._doc_keys)):
+                self.compact()
+            return True
+
+    def _remove_locked(self, key: str):
+        doc = self._key_to_doc.pop(key)
+        self._doc_keys[doc] = None
+        self._alive[doc] = 0
+        self._total_length -= self._doc_lengths[doc]
+        self._tombstones += 1
+
+    def compact(self):
+        """Drop tombstoned documents and renumber the rest"""
+        with self._lock:
+            alive = np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool)
+            remap = np.cumsum(alive, dtype=np.int64) - 1
+            vocab, postings_docs, postings_tfs = {}, [], []
+            for term, term_id in self._vocab.items():
+                docs = np.frombuffer(self._postings_docs[term_id], dtype=np.int32)
+                keep = alive[docs]
+                if not keep.any():
+                    continue
+                vocab[term] = len(postings_docs)
+                postings_docs.append(array("i", remap[docs[keep]].astype(np.int32).tobytes()))
+                postings_tfs.append(array("H", np.frombuffer(self._postings_tfs[term_id], dtype=np.uint16)[keep].tobytes()))
+            self._vocab, self._postings_docs, self._postings_tfs = vocab, postings_docs, postings_tfs
+            self._doc_keys = [k for k in self._doc_keys if k is not None]
+            lengths = np.frombuffer(self._doc_lengths, dtype=np.float32)[alive]
+            self._doc_lengths = array("f", lengths.tobytes())
+            self._alive = bytearray(b"\x01" * len(self._doc_keys))
+            self._key_to_doc = {k: i for i, k in enumerate(self._doc_keys)}
+            self._tombstones = 0
+
+    def search(self, query_tokens: List[str], k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (key, score) pairs"""
+        with self._lock:
+            n_docs = len(self._key_to_doc)
+            if not n_docs or not query_tokens or k <= 0:
+                return []
+            avg_length = self._total_length / n_docs or 1.0
+            lengths = np.frombuffer(self._doc_lengths, dtype=np.float32)
+            alive = np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool)
+            scores = np.zeros(len(self._doc_keys), dtype=np.float32)
+
+            for term, query_tf in Counter(query_tokens).items():
+                term_id = self._vocab.get(term)
+                if term_id is None:
+                    continue
+                docs = np.frombuffer(self._postings_docs[term_id], dtype=np.int32)
+                keep = alive[docs]
+                docs = docs[keep]
+                if not len(docs):
+                    continue
+                tfs = np.frombuffer(self._postings_tfs[term_id], dtype=np.uint16)[keep].astype(np.float32)
+                df = len(docs)
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                norm = self.k1 * (1.0 - self.b + self.b * lengths[docs] / avg_length)
+                # Doc ids are unique within a posting list, so fancy-index accumulation is safe
+                scores[docs] += query_tf * idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+
+            candidates = np.nonzero(scores > 0)[0]
+            if not len(candidates):
+                return []
+            k = min(k, len(candidates))
+            top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            top = top[np.argsort(-scores[top])]
+            return [(self._doc_keys[i], float(scores[i])) for i in top]
+
+    def snapshot(self, path: Path, metadata: dict = None):
+        """Write the index to a single .npz file (postings concatenated with offsets)"""
+        with self._lock:
+            if self._tombstones:
+                self.compact()
+            terms = list(self._vocab)
+            offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+            docs_parts, tfs_parts = [], []
+            for i, term in enumerate(terms):
+                term_id = self._vocab[term]
+                docs_parts.append(np.frombuffer(self._postings_docs[term_id], dtype=np.int32))
+                tfs_parts.append(np.frombuffer(self._postings_tfs[term_id], dtype=np.uint16))
+                offsets[i + 1] = offsets[i] + len(docs_parts[-1])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # A unique temp file per writer: workers snapshotting at once never share one
+            with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp", delete=False) as tmp:
+                tmp_path = Path(tmp.name)
+                try:
+                    np.savez(
+                        tmp,
+                        terms=np.array(json.dumps(terms, ensure_ascii=False)),
+                        keys=np.array(json.dumps(self._doc_keys)),
+                        offsets=offsets,
+                        docs=np.concatenate(docs_parts) if docs_parts else np.zeros(0, dtype=np.int32),
+                        tfs=np.concatenate(tfs_parts) if tfs_parts else np.zeros(0, dtype=np.uint16),
+                        lengths=np.frombuffer(self._doc_lengths, dtype=np.float32),
+                        params=np.array([self.k1, self.b]),
+                        metadata=np.array(json.dumps(metadata or {})),
+                    )
+                except BaseException:
+                    tmp.close()
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def restore(cls, path: Path) -> Tuple["BM25Index", dict]:
+        """Load an index written by snapshot(); returns (index, metadata)"""
+        with np.load(path) as data:
+            k1, b = data["params"].tolist()
+            index = cls(k1=k1, b=b)
+            terms = json.loads(str(data["terms"]))
+            offsets, docs, tfs = data["offsets"], data["docs"], data["tfs"]
+            for i, term in enumerate(terms):
+                index._vocab[term] = i
+                index._postings_docs.append(array("i", docs[offsets[i]:offsets[i + 1]].tobytes()))
+                index._postings_tfs.append(array("H", tfs[offsets[i]:offsets[i + 1]].tobytes()))
+            index._doc_keys = json.loads(str(data["keys"]))
+            index._doc_lengths = array("f", data["lengths"].astype(np.float32).tobytes())
+            metadata = json.loads(str(data["metadata"]))
+        index._alive = bytearray(b"\x01" * len(index._doc_keys))
+        index._key_to_doc = {k: i for i, k in enumerate(index._doc_keys)}
+        index._total_length = float(sum(index._doc_lengths))
+        return index, metadata
+
+
+# ==================== CANDIDATE DOCUMENTS ====================
+
+def build_candidate_tokens(db: Session, candidate_ids: Optional[Iterable] = None) -> Dict[str, List[str]]:
+    """Field-weighted token lists per candidate, built from four batched column queries"""
+    fields: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+    id_list = list(candidate_ids) if candidate_ids is not None else None
+
+    def scoped(query, column):
+        return query.filter(column.in_(id_list)) if id_list is not None else query
+
+    for row in scoped(db.query(
+        models.Candidate.id, models.Candidate.first_name, models.Candidate.last_name,
+        models.Candidate.professional_summary
+    ), models.Candidate.id).yield_per(1000):
+        doc = fields[str(row.id)]
+        doc["names"].append(f"{row.first_name or ''} {row.last_name or ''}")
+        doc["summary"].append(row.professional_summary or "")
+
+    for row in scoped(db.query(models.Skill.candidate_id, models.Skill.skill_name),
+                      models.Skill.candidate_id).yield_per(5000):
+        if str(row.candidate_id) in fields:
+            fields[str(row.candidate_id)]["skills"].append(row.skill_name or "")
+
+    for row in scoped(db.query(
+        models.WorkExperience.candidate_id, models.WorkExperience.job_title, models.WorkExperience.technologies_used
+    ), models.WorkExperience.candidate_id).yield_per(5000):
+        if str(row.candidate_id) in fields:
+            doc = fields[str(row.candidate_id)]
+            doc["titles"].append(row.job_title or "")
+            doc["technologies"].extend(row.technologies_used or [])
+
+    for row in scoped(db.query(models.Resume.candidate_id, models.Resume.extracted_text),
+                      models.Resume.candidate_id).yield_per(500):
+        text = row.extracted_text or ""
+        if str(row.candidate_id) in fields and not text.startswith("[PDF"):
+            fields[str(row.candidate_id)]["resume"].append(text)
+
+    documents = {}
+    for candidate_id, doc in fields.items():
+        tokens: List[str] = []
+        for field, weight in FIELD_WEIGHTS.items():
+            field_tokens = tokenize(" \n ".join(doc.get(field, [])))
+            tokens.extend(field_tokens * weight)
+        documents[candidate_id] = tokens
+    return documents
+
+
+_index: Optional[BM25Index] = None
+_synced_at: Optional[datetime] = None  # database time of the last sync
+_last_refresh = 0.0
+_pending_updates = 0
+_state_lock = threading.Lock()
+_sync_thread: Optional[threading.Thread] = None
+
+
+def snapshot_path() -> Path:
+    return Path(settings.SEARCH_INDEX_DIR) / "bm25_candidates.npz"
+
+
+def _save_snapshot():
+    global _pending_updates
+    try:
+        _index.snapshot(snapshot_path(), {"synced_at": _synced_at.isoformat() if _synced_at else None})
+        _pending_updates = 0
+    except Exception as e:
+        print(f"⚠️ Could not write BM25 snapshot: {e}")
+
+
+def _catch_up(index: BM25Index, db: Session, since: datetime) -> Tuple[int, int]:
+    """Re-index candidates in the change log since `since`; deleted ones are dropped"""
+    changed = changed_candidates_since(db, since)
+    documents = build_candidate_tokens(db, list(changed)) if changed else {}
+    removed = 0
+    for candidate_id in changed:
+        if candidate_id in documents:
+            index.add(candidate_id, documents[candidate_id])
+        elif index.remove(candidate_id):
+            removed += 1
+    return len(documents), removed
+
+
+def _load_index(db: Session) -> Tuple[BM25Index, datetime]:
+    """Restore the snapshot and catch it up from the change log, or build from scratch"""
+    synced_at = database_now(db)
+    path = snapshot_path()
+    if path.exists():
+        try:
+            index, metadata = BM25Index.restore(path)
+            since = datetime.fromisoformat(metadata["synced_at"]) if metadata.get("synced_at") else None
+            if since is not None and synced_at - since < CHANGE_LOG_RETENTION:
+                updated, removed = _catch_up(index, db, since)
+                print(f"📥 Restored BM25 index ({len(index)} docs; {updated} updated, {removed} removed)")
+                return index, synced_at
+            print("⚠️ BM25 snapshot predates the change log, rebuilding")
+        except Exception as e:
+            print(f"⚠️ BM25 snapshot unusable, rebuilding: {e}")
+    index = BM25Index()
+    for candidate_id, tokens in build_candidate_tokens(db).items():
+        index.add(candidate_id, tokens)
+    print(f"🔨 Built BM25 index over {len(index)} candidates")
+    return index, synced_at
+
+
+def sync_bm25_index(db: Session):
+    """Load the index on first use, afterwards catch it up with other workers' writes"""
+    global _index, _synced_at
+    if _index is None:
+        index, synced_at = _load_index(db)
+        with _state_lock:
+            _index, _synced_at = index, synced_at
+            _save_snapshot()
+        prune_candidate_changes(db)
+    else:
+        synced_at = database_now(db)
+        _catch_up(_index, db, _synced_at)
+        _synced_at = synced_at
+
+
+def _run_sync():
+    # Runs on its own thread, so it owns its session
+    db = SessionLocal()
+    try:
+        sync_bm25_index(db)
+    except Exception as e:
+        print(f"⚠️ BM25 index sync failed: {e}")
+    finally:
+        db.close()
+
+
+def start_bm25_sync() -> bool:
+    """Start a background load/catch-up unless one is already running"""
+    global _sync_thread, _last_refresh
+    with _state_lock:
+        if _sync_thread is not None and _sync_thread.is_alive():
+            return False
+        _last_refresh = time.time()
+        _sync_thread = threading.Thread(target=_run_sync, name="bm25-sync", daemon=True)
+        _sync_thread.start()
+        return True
+
+
+def get_bm25_index(db: Session = None) -> Optional[BM25Index]:
+    """The process-wide index, or None while it is still loading in the background"""
+    if _index is None or time.time() - _last_refresh > INDEX_REFRESH_INTERVAL:
+        start_bm25_sync()
+    return _index
+
+
+def refresh_candidates(db: Session, candidate_ids: Iterable):
+    """Incrementally re-index candidates after a write (upload, profile edit, delete)"""
+    global _pending_updates
+    if _index is None:
+        return  # loaded (and caught up from the change log) in the background
+    candidate_ids = [str(cid) for cid in candidate_ids]
+    try:
+        documents = build_candidate_tokens(db, candidate_ids)
+        for candidate_id in candidate_ids:
+            if candidate_id in documents:
+                _index.add(candidate_id, documents[candidate_id])
+            else:
+                _index.remove(candidate_id)
+        with _state_lock:
+            _pending_updates += len(candidate_ids)
+            if _pending_updates >= SNAPSHOT_EVERY_UPDATES:
+                _save_snapshot()
+    except Exception as e:
+        print(f"⚠️ BM25 refresh failed for {candidate_ids}: {e}")
+
+
+def remove_candidate(candidate_id):
+    if _index is not None:
+        _index.remove(str(candidate_id))
+
+
+def search_candidates_bm25(db: Session, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+    """Top candidates by BM25 over the whole pool: [(candidate_id, score)]; empty while warming up"""
+    index = get_bm25_index(db)
+    return index.search(tokenize(query), limit) if index is not None else []
@@ -0,0 +1,94 @@
+"""
+Durable log of candidate changes for the in-process search indexes
+Every write that touches a candidate or one of its child rows appends the
+candidate id to candidate_changes inside its own transaction: ORM flushes
+through an after_flush hook, set-based writers (bulk import, bulk delete)
+explicitly. candidates_changed logs again right after the commit, which
+covers bulk child deletes made through query(...).delete(). Worker processes catch their in-memory indexes up by reading the
+log since their last sync, so catch-up costs O(changes), not O(candidates).
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, List, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+# Rows a writer logged but committed up to this much later are still picked up
+CHANGE_VISIBILITY_GRACE = timedelta(minutes=2)
+# Older entries are pruned; an index synced before this must be rebuilt
+CHANGE_LOG_RETENTION = timedelta(days=7)
+
+# Child rows whose writes change a candidate's searchable text
+CANDIDATE_CHILDREN = (
+    models.Skill, models.WorkExperience, models.Education, models.Project,
+    models.Certification, models.Language, models.Resume
+)
+
+
+def record_candidate_changes(bind, candidate_ids: Iterable):
+    """Append candidate ids to the change log in the caller's transaction (session or connection)"""
+    ids = sorted({str(cid) for cid in candidate_ids if cid})
+    if not ids:
+        return
+    bind.execute(
+        text("INSERT INTO candidate_changes (candidate_id) SELECT unnest(CAST(:ids AS uuid[]))"),
+        {"ids": ids}
+    )
+
+
+def database_now(db: Session) -> datetime:
+    """Current UTC time on the database server (the clock change timestamps use)"""
+    return db.execute(text("SELECT timezone('utc', clock_timestamp())")).scalar()
+
+
+def changed_candidates_since(db: Session, since: datetime) -> Set[str]:
+    """Ids of candidates changed (or deleted) since `since`, allowing for late commits"""
+    rows = db.execute(
+        text("SELECT DISTINCT candidate_id FROM candidate_changes WHERE changed_at > :since"),
+        {"since": since - CHANGE_VISIBILITY_GRACE}
+    )
+    return {str(row[0]) for row in rows}
+
+
+def prune_candidate_changes(db: Session, retention: timedelta = CHANGE_LOG_RETENTION) -> int:
+    """Delete log entries older than the retention window; returns rows deleted"""
+    deleted = db.execute(
+        text("DELETE FROM candidate_changes WHERE changed_at < timezone('utc', clock_timestamp()) - :retention"),
+        {"retention": retention}
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def _changed_candidate_ids(session: Session) -> List:
+    """Candidate ids of the candidates and child rows written by a flush"""
+    ids = []
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        if isinstance(obj, models.Candidate):
+            ids.append(obj.id)
+        elif isinstance(obj, CANDIDATE_CHILDREN):
+            ids.append(obj.candidate_id)
+        elif isinstance(obj, models.Embedding) and obj.candidate_id:
+            # Resume vectors: other workers' embedding indexes catch up from the log too
+            ids.append(obj.candidate_id)
+    return ids
+
+
+@event.listens_for(Session, "after_flush")
+def _log_candidate_changes(session: Session, flush_context):
+    """Log candidates written by this flush (ids are assigned by now)"""
+    candidate_ids = _changed_candidate_ids(session)
+    if not candidate_ids:
+        return
+    connection = session.connection()
+    try:
+        # Savepoint: a failure here must not abort the transaction of the write itself
+        with connection.begin_nested():
+            record_candidate_changes(connection, candidate_ids)
+    except Exception as e:
+        # Never block the write; the index still updates in this process
+        print(f"⚠️ Candidate change log skipped: {e}")
@@ -0,0 +1,225 @@
+"""
+Streaming candidate export (CSV, NDJSON, Parquet)
+One query joins candidates with per-candidate skill and experience aggregates
+and each candidate's best stored job match, and is read through a server-side
+cursor in fixed-size batches. Every batch is encoded and handed to the
+response before the next is fetched, so memory stays constant whatever the
+table size.
+"""
+import csv
+import io
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Query, Session
+
+from app.core.responses import dumps
+from app.db import models
+from app.db.database import SessionLocal
+from app.services.skill_arrays import apply_skill_filter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pq = None
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Column order of every export format (the labels selected by _export_query)
+EXPORT_COLUMNS = [
+    "id", "first_name", "last_name", "email", "phone", "current_location", "career_level",
+    "years_of_experience", "availability_status", "expected_salary_amount", "expected_salary_currency",
+    "status", "created_at", "updated_at", "skills", "skill_count", "total_experience_months",
+    "positions", "best_match_score", "best_match_job", "best_match_calculated_at",
+]
+
+
+def _export_query(db: Session) -> Query:
+    """Candidates with flattened skills, position counts and their best stored match"""
+    Candidate = models.Candidate
+    skills = db.query(
+        models.Skill.candidate_id.label("candidate_id"),
+        func.string_agg(models.Skill.skill_name, aggregate_order_by("; ", models.Skill.skill_name)).label("skills"),
+        func.count(models.Skill.id).label("skill_count"),
+    ).group_by(models.Skill.candidate_id).subquery("skill_totals")
+    experience = db.query(
+        models.WorkExperience.candidate_id.label("candidate_id"),
+        func.count(models.WorkExperience.id).label("positions"),
+    ).group_by(models.WorkExperience.candidate_id).subquery("positions")
+    # Index scan on (candidate_id, match_score DESC) per candidate
+    best_match = db.query(
+        models.CandidateJobMatch.match_score.label("best_match_score"),
+        models.Job.title.label("best_match_job"),
+        models.CandidateJobMatch.calculated_at.label("best_match_calculated_at"),
+    ).join(
+        models.Job, models.Job.id == models.CandidateJobMatch.job_id
+    ).filter(
+        models.CandidateJobMatch.candidate_id == Candidate.id,
+        models.CandidateJobMatch.match_score.isnot(None)
+    ).order_by(models.CandidateJobMatch.match_score.desc()).limit(1).subquery().lateral("best_match")
+
+    return db.query(
+        Candidate.id,
+        Candidate.first_name,
+        Candidate.last_name,
+        Candidate.email,
+        Candidate.phone,
+        Candidate.current_location,
+        Candidate.career_level,
+        Candidate.years_of_experience,
+        Candidate.availability_status,
+        Candidate.expected_salary_amount,
+        Candidate.expected_salary_currency,
+        Candidate.status,
+        Candidate.created_at,
+        Candidate.updated_at,
+        skills.c.skills,
+        func.coalesce(skills.c.skill_count, 0).label("skill_count"),
+        Candidate.total_experience_months,
+        func.coalesce(experience.c.positions, 0).label("positions"),
+        best_match.c.best_match_score,
+        best_match.c.best_match_job,
+        best_match.c.best_match_calculated_at,
+    ).outerjoin(
+        skills, skills.c.candidate_id == Candidate.id
+    ).outerjoin(
+        experience, experience.c.candidate_id == Candidate.id
+    ).outerjoin(best_match, true())
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def iter_export_batches(
+    db: Session,
+    status: Optional[str] = None,
+    skills_all: Optional[List[str]] = None,
+    skills_any: Optional[List[str]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """Export rows as lists of plain dicts, streamed from a server-side cursor"""
+    query = _export_query(db)
+    if status:
+        query = query.filter(models.Candidate.status == status)
+    query = apply_skill_filter(db, query, all_of=skills_all, any_of=skills_any)
+    query = query.order_by(models.Candidate.created_at, models.Candidate.id)
+
+    batch = []
+    for row in query.yield_per(batch_size):
+        batch.append({name: _plain(value) for name, value in zip(EXPORT_COLUMNS, row)})
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def encode_csv(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    # BOM so spreadsheet apps detect UTF-8 (Arabic names)
+    buffer.write("﻿")
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b"".join(dumps(row) + b"\n" for row in batch)
+
+
+class _DrainingSink:
+    """Write-only file for ParquetWriter that hands written bytes out between row groups"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def _parquet_schema():
+    types = {
+        "years_of_experience": pa.int32(),
+        "expected_salary_amount": pa.float64(),
+        "created_at": pa.timestamp("us"),
+        "updated_at": pa.timestamp("us"),
+        "skill_count": pa.int32(),
+        "total_experience_months": pa.int64(),
+        "positions": pa.int32(),
+        "best_match_score": pa.float64(),
+        "best_match_calculated_at": pa.timestamp("us"),
+    }
+    return pa.schema([(name, types.get(name, pa.string())) for name in EXPORT_COLUMNS])
+
+
+def encode_parquet(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """One Parquet row group per batch; the footer is written after the last one"""
+    schema = _parquet_schema()
+    sink = _DrainingSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+    try:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson, "parquet": encode_parquet}
+
+
+def export_available(export_format: str) -> bool:
+    return export_format in ENCODERS and (export_format != "parquet" or pq is not None)
+
+
+def export_filename(export_format: str) -> str:
+    return f"candidates-{datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}"
+
+
+def stream_candidate_export(export_format: str, **filters) -> Iterator[bytes]:
+    """Encoded export chunks; owns its session because streaming outlives the request's"""
+    db = SessionLocal()
+    try:
+        yield from ENCODERS[export_format](iter_export_batches(db, **filters))
+    finally:
+        db.close()
@@ -0,0 +1,401 @@
+"""
+Bulk candidate import through COPY
+Records (CSV or NDJSON, with nested skills, work experience, education, ...)
+are validated in Python, streamed into ON COMMIT DROP staging tables with
+COPY in chunks, and merged into candidates and the child tables with a few
+set-based statements in one transaction. Existing candidates are matched on
+email and either updated (provided values win, provided child lists replace
+the stored ones) or skipped.
+"""
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import ARRAY, JSON, Boolean, Date, DateTime, Integer, Numeric, String, inspect, text
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.services.candidate_changes import record_candidate_changes
+from app.services.candidate_read_model import mark_candidate_read_documents_stale, rebuild_stale_read_documents
+from app.services.candidate_sync import candidates_changed
+from app.services.skill_taxonomy import resolve_skill_ids
+
+IMPORT_FORMATS = ("csv", "ndjson")
+CONFLICT_MODES = ("update", "skip")
+IMPORT_CHUNK_SIZE = 5000
+REFRESH_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 50
+
+# Record key -> child model; each entry of the list becomes one child row
+CHILD_MODELS = {
+    "skills": models.Skill,
+    "work_experiences": models.WorkExperience,
+    "educations": models.Education,
+    "projects": models.Project,
+    "certifications": models.Certification,
+    "languages": models.Language,
+}
+# Legacy spellings of the child keys
+CHILD_ALIASES = {
+    "work_experience": "work_experiences",
+    "experience": "work_experiences",
+    "experiences": "work_experiences",
+    "education": "educations",
+}
+# Columns the database maintains (or derives) rather than the import file
+_MANAGED_COLUMNS = {
+    "id", "candidate_id", "created_at", "updated_at", "skill_ids", "skill_names", "skill_id", "total_experience_months"
+}
+_TRUE = {"1", "true", "t", "yes", "y"}
+_FALSE = {"0", "false", "f", "no", "n"}
+
+
+class RecordError(ValueError):
+    """A record that cannot be imported (reported with its line number)"""
+
+
+def _columns(model) -> Dict[str, Any]:
+    return {attr.key: attr.columns[0] for attr in inspect(model).column_attrs}
+
+
+def _importable(model) -> List[str]:
+    return [name for name in _columns(model) if name not in _MANAGED_COLUMNS]
+
+
+def _coerce(column, value: Any) -> Any:
+    """File value -> value of the column's type; blanks are NULL"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    column_type = column.type
+    if isinstance(column_type, ARRAY):
+        if isinstance(value, str):
+            value = json.loads(value) if value.lstrip().startswith("[") else value.split(";")
+        items = [str(item).strip() for item in value if item is not None and str(item).strip()]
+        return items or None
+    if isinstance(column_type, JSON):
+        return json.dumps(json.loads(value) if isinstance(value, str) else value)
+    if isinstance(column_type, Boolean):
+        if isinstance(value, bool):
+            return value
+        key = str(value).strip().lower()
+        if key in _TRUE or key in _FALSE:
+            return key in _TRUE
+        raise ValueError(f"not a boolean: {value!r}")
+    if isinstance(column_type, (Integer, Numeric)):
+        try:
+            number = Decimal(str(value).strip())
+        except InvalidOperation:
+            raise ValueError(f"not a number: {value!r}")
+        return int(number) if isinstance(column_type, Integer) else number
+    if isinstance(column_type, DateTime):
+        return value if isinstance(value, datetime) else datetime.fromisoformat(str(value).strip())
+    if isinstance(column_type, Date):
+        if isinstance(value, date):
+            return value
+        value = str(value).strip()
+        # "2021" / "2021-03" from legacy systems -> first day
+        value = {4: f"{value}-01-01", 7: f"{value}-01"}.get(len(value), value)
+        return date.fromisoformat(value[:10])
+    value = str(value).strip()
+    if isinstance(column_type, String) and column_type.length and len(value) > column_type.length:
+        raise ValueError(f"longer than {column_type.length} characters")
+    return value
+
+
+def _months_between(start: date, end: Optional[date]) -> int:
+    end = end or date.today()
+    return max(0, (end.year - start.year) * 12 + end.month - start.month)
+
+
+def _child_rows(key: str, entries: Any) -> List[Dict[str, Any]]:
+    model = CHILD_MODELS[key]
+    columns = _columns(model)
+    if isinstance(entries, str):
+        # CSV cells hold a JSON list, or "; "-separated skill names (as exported)
+        entries = json.loads(entries) if entries.lstrip().startswith("[") else entries.split(";")
+    if not isinstance(entries, list):
+        raise RecordError(f"{key} must be a list")
+    rows = []
+    for entry in entries:
+        if isinstance(entry, str):
+            if key != "skills":
+                raise RecordError(f"{key} entries must be objects")
+            entry = {"skill_name": entry}
+        if not isinstance(entry, dict):
+            raise RecordError(f"{key} entries must be objects")
+        if not entry or (key == "skills" and not str(entry.get("skill_name") or "").strip()):
+            continue
+        row = {}
+        for name in _importable(model):
+            try:
+                row[name] = _coerce(columns[name], entry.get(name))
+            except (ValueError, TypeError) as e:
+                raise RecordError(f"{key}.{name}: {e}")
+            default = columns[name].default
+            if row[name] is None and default is not None and default.is_scalar:
+                row[name] = default.arg
+            if row[name] is None and not columns[name].nullable:
+                raise RecordError(f"{key}.{name} is required")
+        if key == "work_experiences" and row["duration_months"] is None and row["start_date"]:
+            row["duration_months"] = _months_between(row["start_date"], row["end_date"])
+        rows.append(row)
+    return rows
+
+
+def normalize_record(record: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]]]:
+    """Validated candidate values and child rows of one file record; RecordError when unusable"""
+    columns = _columns(models.Candidate)
+    candidate = {}
+    for name in _importable(models.Candidate):
+        try:
+            candidate[name] = _coerce(columns[name], record.get(name))
+        except (ValueError, TypeError) as e:
+            raise RecordError(f"{name}: {e}")
+    for name in ("email", "first_name", "last_name"):
+        if not candidate[name]:
+            raise RecordError(f"{name} is required")
+
+    children = {}
+    for key, value in record.items():
+        key = CHILD_ALIASES.get(key, key)
+        if key in CHILD_MODELS and value not in (None, ""):
+            children[key] = _child_rows(key, value)
+    return candidate, children
+
+
+def read_records(stream: TextIO, import_format: str) -> Iterator[Tuple[int, Any]]:
+    """(line number, record dict) pairs; records that are not objects are passed through for rejection"""
+    if import_format == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if line.strip():
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, e
+
+
+def _copy_value(value: Any) -> Any:
+    """Value as text for COPY ... (FORMAT csv); None stays an unquoted empty field (NULL)"""
+    if isinstance(value, list):
+        escaped = (item.replace("\\", "\\\\").replace('"', '\\"') for item in value)
+        return "{" + ",".join(f'"{item}"' for item in escaped) + "}"
+    return value
+
+
+class _Stage:
+    """A temp staging table filled with COPY from an in-memory CSV buffer"""
+
+    def __init__(self, table: str, names: List[str], extras: Iterable[str] = ("seq",)):
+        self.table = table
+        self.names = names  # target table columns
+        self.columns = names + list(extras)
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.rows = 0
+
+    def add(self, row: Dict[str, Any], **extras):
+        row = {**row, **extras}
+        self.writer.writerow([_copy_value(row.get(name)) for name in self.columns])
+        self.rows += 1
+
+    def flush(self, cursor):
+        if self.buffer.tell():
+            self.buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {self.table} ({', '.join(self.columns)}) FROM STDIN WITH (FORMAT csv)", self.buffer
+            )
+            self.buffer.seek(0)
+            self.buffer.truncate()
+
+
+def _create_stage(db: Session, model, names: List[str], extras: str = "seq bigint") -> _Stage:
+    """ON COMMIT DROP copy of the model's table shape (no constraints) for the named columns"""
+    table = f"import_{model.__tablename__}"
+    db.execute(text(
+        f"CREATE TEMP TABLE {table} ON COMMIT DROP AS "
+        f"SELECT {', '.join(names)} FROM {model.__tablename__} WITH NO DATA"
+    ))
+    for extra in extras.split(","):
+        db.execute(text(f"ALTER TABLE {table} ADD COLUMN {extra.strip()}"))
+    return _Stage(table, names, [extra.split()[0] for extra in extras.split(",")])
+
+
+def _resolve_skill_ids(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    try:
+        # Savepoint: a missing dictionary must not abort the import transaction
+        with db.begin_nested():
+            return resolve_skill_ids(db, names)
+    except Exception as e:
+        # add_skill_taxonomy.py backfills missing ids
+        print(f"⚠️ Skill id resolution skipped: {e}")
+        return {}
+
+
+def _candidate_defaults(now: datetime) -> Dict[str, Any]:
+    """Python-side column defaults of Candidate, applied to inserted rows only"""
+    defaults = {"created_at": now, "updated_at": now}
+    for name, column in _columns(models.Candidate).items():
+        if name not in _MANAGED_COLUMNS and column.default is not None and column.default.is_scalar:
+            defaults[name] = column.default.arg
+    return defaults
+
+
+def _merge_candidates(db: Session, names: List[str], on_conflict: str, now: datetime) -> Dict[str, int]:
+    """Update matched candidates (update mode), insert new ones; record both in import_merged"""
+    db.execute(text(
+        "CREATE TEMP TABLE import_merged (seq bigint PRIMARY KEY, candidate_id uuid NOT NULL, inserted boolean NOT NULL) "
+        "ON COMMIT DROP"
+    ))
+    updated = 0
+    if on_conflict == "update":
+        assignments = ", ".join(f"{name} = coalesce(i.{name}, c.{name})" for name in names)
+        updated = db.execute(text(
+            "WITH changed AS ("
+            f" UPDATE candidates c SET {assignments}, updated_at = :now"
+            " FROM import_candidates i WHERE c.email = i.email"
+            " RETURNING i.seq, c.id"
+            ") INSERT INTO import_merged SELECT seq, id, false FROM changed"
+        ), {"now": now}).rowcount
+
+    defaults = _candidate_defaults(now)
+    values = [f"coalesce(i.{name}, :d_{name})" if name in defaults else f"i.{name}" for name in names]
+    inserted = db.execute(text(
+        "WITH added AS ("
+        f" INSERT INTO candidates (id, {', '.join(names)}, created_at, updated_at)"
+        f" SELECT i.id, {', '.join(values)}, :d_created_at, :d_updated_at"
+        " FROM import_candidates i"
+        " WHERE NOT EXISTS (SELECT 1 FROM candidates c WHERE c.email = i.email)"
+        # Written concurrently since the UPDATE: leave those rows alone
+        " ON CONFLICT (email) DO NOTHING"
+        " RETURNING id"
+        ") INSERT INTO import_merged SELECT i.seq, i.id, true FROM added JOIN import_candidates i ON i.id = added.id"
+    ), {f"d_{name}": value for name, value in defaults.items()}).rowcount
+    return {"inserted": inserted, "updated": updated}
+
+
+def _merge_children(db: Session, key: str, stage: _Stage, now: datetime) -> int:
+    """Replace the child rows of updated candidates that came with this list; add them to new ones"""
+    table = CHILD_MODELS[key].__tablename__
+    db.execute(text(
+        f"DELETE FROM {table} t USING import_merged m"
+        f" WHERE t.candidate_id = m.candidate_id AND NOT m.inserted"
+        f" AND EXISTS (SELECT 1 FROM import_candidate_lists l WHERE l.seq = m.seq AND l.list_key = :key)"
+    ), {"key": key})
+    names = stage.names
+    return db.execute(text(
+        f"INSERT INTO {table} (id, candidate_id, {', '.join(names)}, created_at)"
+        f" SELECT gen_id, m.candidate_id, {', '.join('s.' + name for name in names)}, :now"
+        f" FROM {stage.table} s JOIN import_merged m ON m.seq = s.seq"
+    ), {"now": now}).rowcount
+
+
+def import_candidates(
+    db: Session,
+    stream: TextIO,
+    import_format: str = "csv",
+    on_conflict: str = "update",
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    commit: bool = True
+) -> Dict[str, Any]:
+    """
+    Import candidate records from a text stream in one transaction.
+
+    Returns counts (received, rejected, duplicates, inserted, updated, skipped,
+    child rows per list), the first rejected records with their line numbers,
+    and `candidate_ids` of every inserted or updated candidate for the
+    derived-structure refresh (see candidate_sync.candidates_changed).
+    """
+    if import_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {import_format}")
+    if on_conflict not in CONFLICT_MODES:
+        raise ValueError(f"Unsupported conflict mode: {on_conflict}")
+
+    now = datetime.utcnow()
+    candidate_names = _importable(models.Candidate)
+    candidates = _create_stage(db, models.Candidate, ["id"] + candidate_names)
+    # Which child lists each record carried (those replace the stored lists on update)
+    db.execute(text("CREATE TEMP TABLE import_candidate_lists (list_key text, seq bigint) ON COMMIT DROP"))
+    lists = _Stage("import_candidate_lists", ["list_key"])
+    children = {
+        key: _create_stage(db, model, _importable(model) + ["skill_id"] * (key == "skills"), "seq bigint, gen_id uuid")
+        for key, model in CHILD_MODELS.items()
+    }
+
+    cursor = db.connection().connection.cursor()
+    report = {"received": 0, "rejected": 0, "errors": []}
+    pending = []
+
+    def flush():
+        # Canonical skill ids for this chunk (the resolver adds unknown names to the dictionary)
+        skill_ids = _resolve_skill_ids(db, {row["skill_name"] for _, kids in pending for row in kids.get("skills", [])})
+        for seq, kids in pending:
+            for key, rows in kids.items():
+                lists.add({"list_key": key}, seq=seq)
+                for row in rows:
+                    if key == "skills":
+                        row["skill_id"] = skill_ids.get(row["skill_name"])
+                    children[key].add(row, seq=seq, gen_id=uuid.uuid4())
+        for stage in [candidates, lists, *children.values()]:
+            stage.flush(cursor)
+        pending.clear()
+
+    for line_number, record in read_records(stream, import_format):
+        report["received"] += 1
+        try:
+            if not isinstance(record, dict):
+                raise RecordError(f"not a JSON object ({record})")
+            candidate, kids = normalize_record(record)
+        except (RecordError, ValueError) as e:
+            report["rejected"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append({"line": line_number, "error": str(e)})
+            continue
+        candidates.add(candidate, id=uuid.uuid4(), seq=line_number)
+        pending.append((line_number, kids))
+        if len(pending) >= chunk_size:
+            flush()
+    flush()
+
+    db.execute(text("CREATE INDEX ON import_candidates (email)"))
+    db.execute(text("ANALYZE import_candidates"))
+    # The last record wins when a file repeats an email
+    report["duplicates"] = db.execute(text(
+        "DELETE FROM import_candidates a USING import_candidates b WHERE a.email = b.email AND a.seq < b.seq"
+    )).rowcount
+
+    report.update(_merge_candidates(db, candidate_names, on_conflict, now))
+    report["skipped"] = candidates.rows - report["duplicates"] - report["inserted"] - report["updated"]
+    report["children"] = {key: _merge_children(db, key, stage, now) for key, stage in children.items()}
+    report["candidate_ids"] = [row[0] for row in db.execute(text("SELECT candidate_id FROM import_merged"))]
+    # Detail documents are rebuilt after the commit; until then reads rebuild them.
+    # Set-based writes bypass the ORM flush hook, so the change log is written here
+    for start in range(0, len(report["candidate_ids"]), REFRESH_CHUNK_SIZE):
+        chunk = report["candidate_ids"][start:start + REFRESH_CHUNK_SIZE]
+        mark_candidate_read_documents_stale(db, chunk)
+        record_candidate_changes(db, chunk)
+
+    if commit:
+        db.commit()
+    else:
+        db.rollback()
+    return report
+
+
+def refresh_imported_candidates(db: Session, candidate_ids: List, background_tasks=None):
+    """Run the derived-structure hooks for imported candidates, a chunk at a time"""
+    for start in range(0, len(candidate_ids), REFRESH_CHUNK_SIZE):
+        chunk = candidate_ids[start:start + REFRESH_CHUNK_SIZE]
+        candidates_changed(db, chunk, background_tasks)
+        try:
+            rebuild_stale_read_documents(db, chunk)
+        except Exception as e:
+            print(f"⚠️ Candidate read document rebuild failed (rebuilt on read): {e}")
+            db.rollback()
@@ -0,0 +1,91 @@
+"""
+Set-based candidate deletion
+Candidates are deleted with plain DELETE statements; skills, experience,
+resumes, applications, matches, embeddings and the derived documents go with
+them through ON DELETE CASCADE (the ORM relationships use passive_deletes, so
+nothing is loaded first). Bulk purges run in bounded batches, each its own
+short transaction, so archival cleanups never hold locks for long.
+"""
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Query, Session
+
+from app.db import models
+from app.services.candidate_changes import record_candidate_changes
+from app.services.candidate_sync import candidates_deleted
+
+PURGE_BATCH_SIZE = 500
+
+
+def _remove_files(paths: Sequence[str]):
+    for path in paths:
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except Exception as e:
+                print(f"⚠️ Could not delete file {path}: {e}")
+
+
+def delete_candidates(db: Session, candidate_ids: Sequence) -> int:
+    """Delete candidates (children cascade in the database) and their resume files; returns rows deleted"""
+    candidate_ids = list(candidate_ids)
+    if not candidate_ids:
+        return 0
+    paths = [path for (path,) in db.query(models.Resume.file_path).filter(
+        models.Resume.candidate_id.in_(candidate_ids)
+    )]
+    deleted = db.query(models.Candidate).filter(
+        models.Candidate.id.in_(candidate_ids)
+    ).delete(synchronize_session=False)
+    if deleted:
+        # Other workers drop them from their in-memory indexes on catch-up
+        record_candidate_changes(db, candidate_ids)
+    db.commit()
+    if deleted:
+        _remove_files(paths)
+        candidates_deleted(candidate_ids)
+    return deleted
+
+
+def purge_query(db: Session, status: Optional[str] = None, updated_before: Optional[datetime] = None) -> Query:
+    """Ids of the candidates a purge with these criteria removes; at least one criterion is required"""
+    if status is None and updated_before is None:
+        raise ValueError("A purge needs a status or an age criterion")
+    query = db.query(models.Candidate.id)
+    if status:
+        query = query.filter(models.Candidate.status == status)
+    if updated_before:
+        # Never-updated rows count by their creation date
+        query = query.filter(
+            (models.Candidate.updated_at < updated_before)
+            | (models.Candidate.updated_at.is_(None) & (models.Candidate.created_at < updated_before))
+        )
+    return query
+
+
+def purge_candidates(
+    db: Session,
+    status: Optional[str] = None,
+    updated_before: Optional[datetime] = None,
+    batch_size: int = PURGE_BATCH_SIZE,
+    max_batches: Optional[int] = None
+) -> Dict[str, Any]:
+    """Delete every matching candidate, `batch_size` per transaction; returns deleted and batch counts"""
+    query = purge_query(db, status, updated_before)
+    deleted = batches = 0
+    while max_batches is None or batches < max_batches:
+        # SKIP LOCKED: rows being edited right now are left for the next run
+        ids: List = [cid for (cid,) in query.order_by(models.Candidate.id).limit(batch_size).with_for_update(
+            skip_locked=True, of=models.Candidate
+        )]
+        if not ids:
+            db.rollback()
+            break
+        deleted += delete_candidates(db, ids)
+        batches += 1
+        print(f"🗑️ Purged batch {batches}: {len(ids)} candidate(s)")
+        if len(ids) < batch_size:
+            break
+    return {"deleted": deleted, "batches": batches}
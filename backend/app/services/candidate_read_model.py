@@ -0,0 +1,403 @@
+"""
+Candidate read model
+One JSONB document per candidate in `candidate_read_documents` holds the fully
+assembled detail view (profile, skills, experience, education, projects,
+certifications, languages, applications) and its precomputed statistics.
+Writers rebuild it inside their own transaction (candidate_sync.
+candidate_details_changed, before commit), so the document and its updated_at
+(the ETag version) commit together with the data. When a rebuild cannot run in
+the transaction (bulk imports, a failing build) the document is marked stale in
+it instead and rebuilt on the next read. GET /candidates/{id}/complete is a
+single primary-key read that returns the stored JSON unchanged.
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import orjson
+from sqlalchemy import Text, cast, func, literal, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, undefer
+
+from app.db import models
+
+# Candidates rebuilt per flush when refreshing everything (backfill)
+REFRESH_BATCH_SIZE = 200
+
+
+def build_candidate_detail(db: Session, candidate: models.Candidate) -> Dict[str, Any]:
+    """Assemble the detail document of one candidate (seven queries, stats computed in Python)"""
+    candidate_id = candidate.id
+    
+    # Get all related data
+    skills = db.query(models.Skill).filter(
+        models.Skill.candidate_id == candidate_id
+    ).all()
+    
+    work_experiences = db.query(models.WorkExperience).options(
+        undefer(models.WorkExperience.responsibilities)
+    ).filter(
+        models.WorkExperience.candidate_id == candidate_id
+    ).order_by(models.WorkExperience.start_date.desc()).all()
+    
+    educations = db.query(models.Education).filter(
+        models.Education.candidate_id == candidate_id
+    ).order_by(models.Education.end_date.desc()).all()
+    
+    projects = db.query(models.Project).filter(
+        models.Project.candidate_id == candidate_id
+    ).order_by(models.Project.start_date.desc()).all()
+    
+    certifications = db.query(models.Certification).filter(
+        models.Certification.candidate_id == candidate_id
+    ).order_by(models.Certification.issue_date.desc()).all()
+    
+    languages = db.query(models.Language).filter(
+        models.Language.candidate_id == candidate_id
+    ).all()
+    
+    applications = db.query(models.Application).filter(
+        models.Application.candidate_id == candidate_id
+    ).order_by(models.Application.applied_date.desc()).all()
+    
+    # Calculate statistics
+    stats = {}
+    
+    # Total years of experience (stored SQL aggregate, see experience_totals)
+    total_months = candidate.total_experience_months
+    stats['total_years_experience'] = round(total_months / 12, 1) if total_months else 0
+    
+    # Skills breakdown by category
+    skills_by_category = {}
+    for skill in skills:
+        category = skill.skill_category or 'Other'
+        if category not in skills_by_category:
+            skills_by_category[category] = []
+        skills_by_category[category].append({
+            'name': skill.skill_name,
+            'proficiency': skill.proficiency_level,
+            'years': float(skill.years_of_experience) if skill.years_of_experience else 0
+        })
+    stats['skills_by_category'] = skills_by_category
+    
+    # Skills by proficiency level
+    proficiency_counts = Counter([
+        skill.proficiency_level for skill in skills if skill.proficiency_level
+    ])
+    stats['skills_by_proficiency'] = dict(proficiency_counts)
+    
+    # Top skills by experience
+    top_skills = sorted(
+        [s for s in skills if s.years_of_experience],
+        key=lambda x: float(x.years_of_experience),
+        reverse=True
+    )[:10]
+    stats['top_skills'] = [
+        {
+            'name': s.skill_name,
+            'years': float(s.years_of_experience),
+            'proficiency': s.proficiency_level
+        }
+        for s in top_skills
+    ]
+    
+    # Work experience summary
+    companies = [exp.company_name for exp in work_experiences]
+    stats['total_companies'] = len(companies)
+    stats['current_company'] = work_experiences[0].company_name if work_experiences and work_experiences[0].is_current else None
+    
+    # Industry experience
+    industries = Counter([
+        exp.company_industry for exp in work_experiences if exp.company_industry
+    ])
+    stats['industries'] = dict(industries)
+    
+    # Education level
+    degrees = [edu.degree for edu in educations if edu.degree]  # Filter out null degrees
+    stats['highest_degree'] = degrees[0] if degrees else None
+    stats['total_degrees'] = len(degrees)
+    
+    # Certifications count
+    active_certs = [cert for cert in certifications if cert.is_active]
+    stats['total_certifications'] = len(certifications)
+    stats['active_certifications'] = len(active_certs)
+    
+    # Projects count
+    stats['total_projects'] = len(projects)
+    project_types = Counter([
+        proj.project_type for proj in projects if proj.project_type
+    ])
+    stats['projects_by_type'] = dict(project_types)
+    
+    # Languages spoken
+    stats['languages_spoken'] = len(languages)
+    
+    # Application stats
+    stats['total_applications'] = len(applications)
+    application_statuses = Counter([
+        app.status for app in applications
+    ])
+    stats['applications_by_status'] = dict(application_statuses)
+    
+    # Technologies used across all experiences and projects
+    all_technologies = []
+    for exp in work_experiences:
+        if exp.technologies_used:
+            all_technologies.extend(exp.technologies_used)
+    for proj in projects:
+        if proj.technologies_used:
+            all_technologies.extend(proj.technologies_used)
+    
+    tech_counter = Counter(all_technologies)
+    stats['top_technologies'] = [
+        {'name': tech, 'count': count}
+        for tech, count in tech_counter.most_common(15)
+    ]
+    
+    # Career progression (job levels over time)
+    career_progression = []
+    for exp in reversed(work_experiences):
+        if exp.job_level and exp.start_date:
+            career_progression.append({
+                'level': exp.job_level,
+                'title': exp.job_title,
+                'company': exp.company_name,
+                'date': exp.start_date.isoformat()
+            })
+    stats['career_progression'] = career_progression
+    
+    # Plain JSON values only: the document is stored as JSONB
+    return {
+        'candidate': {
+            'id': str(candidate.id),
+            'first_name': candidate.first_name,
+            'last_name': candidate.last_name,
+            'email': candidate.email,
+            'phone': candidate.phone,
+            'current_location': candidate.current_location,
+            'preferred_locations': candidate.preferred_locations,
+            'open_to_relocation': candidate.open_to_relocation,
+            'willing_to_travel': candidate.willing_to_travel,
+            'professional_summary': candidate.professional_summary,
+            'career_level': candidate.career_level,
+            'availability_status': candidate.availability_status,
+            'notice_period_days': candidate.notice_period_days,
+            'current_salary_currency': candidate.current_salary_currency,
+            'current_salary_amount': float(candidate.current_salary_amount) if candidate.current_salary_amount else None,
+            'expected_salary_currency': candidate.expected_salary_currency,
+            'expected_salary_amount': float(candidate.expected_salary_amount) if candidate.expected_salary_amount else None,
+            'linkedin_url': candidate.linkedin_url,
+            'github_url': candidate.github_url,
+            'portfolio_url': candidate.portfolio_url,
+            'personal_website': candidate.personal_website,
+            'created_at': candidate.created_at.isoformat() if candidate.created_at else None,
+            'updated_at': candidate.updated_at.isoformat() if candidate.updated_at else None,
+            'status': candidate.status
+        },
+        'skills': [
+            {
+                'id': str(s.id),
+                'skill_name': s.skill_name,
+                'skill_category': s.skill_category,
+                'skill_type': s.skill_type,
+                'proficiency_level': s.proficiency_level,
+                'years_of_experience': float(s.years_of_experience) if s.years_of_experience else None,
+                'last_used_date': s.last_used_date.isoformat() if s.last_used_date else None,
+            }
+            for s in skills
+        ],
+        'work_experiences': [
+            {
+                'id': str(exp.id),
+                'company_name': exp.company_name,
+                'company_industry': exp.company_industry,
+                'company_size': exp.company_size,
+                'job_title': exp.job_title,
+                'job_level': exp.job_level,
+                'employment_type': exp.employment_type,
+                'start_date': exp.start_date.isoformat() if exp.start_date else None,
+                'end_date': exp.end_date.isoformat() if exp.end_date else None,
+                'is_current': exp.is_current,
+                'duration_months': exp.duration_months,
+                'responsibilities': exp.responsibilities,
+                'achievements': exp.achievements,
+                'technologies_used': exp.technologies_used,
+                'team_size': exp.team_size,
+                'managed_team_size': exp.managed_team_size,
+            }
+            for exp in work_experiences
+        ],
+        'educations': [
+            {
+                'id': str(edu.id),
+                'institution': edu.institution,
+                'degree': edu.degree,
+                'field_of_study': edu.field_of_study,
+                'specialization': edu.specialization,
+                'start_date': edu.start_date.isoformat() if edu.start_date else None,
+                'end_date': edu.end_date.isoformat() if edu.end_date else None,
+                'graduation_year': edu.graduation_year,
+                'grade_type': edu.grade_type,
+                'grade_value': edu.grade_value,
+                'achievements': edu.achievements,
+            }
+            for edu in educations
+        ],
+        'projects': [
+            {
+                'id': str(proj.id),
+                'project_name': proj.project_name,
+                'project_type': proj.project_type,
+                'description': proj.description,
+                'role': proj.role,
+                'technologies_used': proj.technologies_used,
+                'start_date': proj.start_date.isoformat() if proj.start_date else None,
+                'end_date': proj.end_date.isoformat() if proj.end_date else None,
+                'project_url': proj.project_url,
+                'github_url': proj.github_url,
+                'highlights': proj.highlights,
+            }
+            for proj in projects
+        ],
+        'certifications': [
+            {
+                'id': str(cert.id),
+                'certification_name': cert.certification_name,
+                'issuing_organization': cert.issuing_organization,
+                'issue_date': cert.issue_date.isoformat() if cert.issue_date else None,
+                'expiry_date': cert.expiry_date.isoformat() if cert.expiry_date else None,
+                'is_active': cert.is_active,
+                'credential_url': cert.credential_url,
+            }
+            for cert in certifications
+        ],
+        'languages': [
+            {
+                'id': str(lang.id),
+                'language_name': lang.language_name,
+                'proficiency_level': lang.proficiency_level,
+            }
+            for lang in languages
+        ],
+        'applications': [
+            {
+                'id': str(app.id),
+                'job_id': str(app.job_id),
+                'status': app.status,
+                'applied_at': app.applied_date.isoformat() if app.applied_date else None,
+            }
+            for app in applications
+        ],
+        'statistics': stats
+    }
+
+
+_UNSEEN = object()
+
+
+def _store(db: Session, candidate_id, document: Dict[str, Any], seen=_UNSEEN) -> bool:
+    """
+    Upsert a document. With `seen` (the updated_at read before building, None when
+    there was no row) it is only written if no writer touched the row meanwhile.
+    """
+    Document = models.CandidateReadDocument
+    statement = insert(Document).values(
+        candidate_id=candidate_id, document=document, stale=False, updated_at=datetime.utcnow()
+    )
+    if seen is None:
+        statement = statement.on_conflict_do_nothing(index_elements=[Document.candidate_id])
+    else:
+        statement = statement.on_conflict_do_update(
+            index_elements=[Document.candidate_id],
+            set_={"document": statement.excluded.document, "stale": False,
+                  "updated_at": statement.excluded.updated_at},
+            where=None if seen is _UNSEEN else Document.updated_at == seen
+        )
+    return db.execute(statement).rowcount > 0
+
+
+def mark_candidate_read_documents_stale(db: Session, candidate_ids: Iterable) -> int:
+    """Mark documents stale (and move their version) in the caller's transaction; no commit"""
+    candidate_ids = [cid for cid in candidate_ids if cid]
+    if not candidate_ids:
+        return 0
+    Document = models.CandidateReadDocument
+    statement = insert(Document).from_select(
+        ["candidate_id", "document", "stale", "updated_at"],
+        select(models.Candidate.id, cast(literal("{}"), Document.document.type), true(), func.timezone("utc", func.clock_timestamp()))
+        .where(models.Candidate.id.in_(candidate_ids))
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[Document.candidate_id],
+        set_={"stale": True, "updated_at": statement.excluded.updated_at}
+    )
+    return db.execute(statement).rowcount
+
+
+def refresh_candidate_read_documents(db: Session, candidate_ids: Optional[Iterable] = None, commit: bool = True) -> int:
+    """Rebuild the read documents of the given candidates (all candidates when None)"""
+    query = db.query(models.Candidate)
+    if candidate_ids is not None:
+        candidate_ids = [cid for cid in candidate_ids if cid]
+        if not candidate_ids:
+            return 0
+        query = query.filter(models.Candidate.id.in_(candidate_ids))
+    
+    refreshed = 0
+    # populate_existing: columns updated by set-based SQL in this transaction are reread
+    for candidate in query.populate_existing().yield_per(REFRESH_BATCH_SIZE):
+        _store(db, candidate.id, build_candidate_detail(db, candidate))
+        refreshed += 1
+    if commit:
+        db.commit()
+    return refreshed
+
+
+def rebuild_stale_read_documents(db: Session, candidate_ids: Iterable, commit: bool = True) -> int:
+    """Rebuild the stale documents among the given candidates, skipping any a writer touched meanwhile"""
+    candidate_ids = [cid for cid in candidate_ids if cid]
+    if not candidate_ids:
+        return 0
+    Document = models.CandidateReadDocument
+    stale = dict(db.query(Document.candidate_id, Document.updated_at).filter(
+        Document.candidate_id.in_(candidate_ids), Document.stale.is_(True)
+    ).all())
+    rebuilt = 0
+    for candidate in db.query(models.Candidate).filter(models.Candidate.id.in_(list(stale))).yield_per(REFRESH_BATCH_SIZE):
+        rebuilt += _store(db, candidate.id, build_candidate_detail(db, candidate), seen=stale[candidate.id])
+    if commit:
+        db.commit()
+    return rebuilt
+
+
+def get_candidate_version(db: Session, candidate_id) -> Optional[Tuple]:
+    """
+    (candidate updated_at, read document updated_at) for ETags; None for unknown candidates.
+    The document timestamp moves on every related write (skills, experience, applications...).
+    """
+    return db.query(models.Candidate.updated_at, models.CandidateReadDocument.updated_at).outerjoin(
+        models.CandidateReadDocument, models.CandidateReadDocument.candidate_id == models.Candidate.id
+    ).filter(models.Candidate.id == candidate_id).first()
+
+
+def get_candidate_detail_json(db: Session, candidate_id) -> Optional[str]:
+    """The stored detail document as JSON text; built on read when missing or stale; None for unknown candidates"""
+    Document = models.CandidateReadDocument
+    stored = db.query(cast(Document.document, Text), Document.stale, Document.updated_at).filter(
+        Document.candidate_id == candidate_id
+    ).first()
+    if stored is not None and not stored.stale:
+        return stored[0]
+    
+    # Not built yet (before the backfill) or marked stale by a write
+    candidate = db.query(models.Candidate).filter(models.Candidate.id == candidate_id).first()
+    if candidate is None:
+        return None
+    detail = build_candidate_detail(db, candidate)
+    try:
+        _store(db, candidate_id, detail, seen=stored.updated_at if stored is not None else None)
+        db.commit()
+    except Exception as e:
+        print(f"⚠️ Could not store candidate read document: {e}")
+        db.rollback()
+    return orjson.dumps(detail).decode()
@@ -0,0 +1,90 @@
+"""
+Keeps derived candidate search structures in sync after writes
+Endpoints call candidates_changed after committing candidate, skill, experience
+or resume changes; each derived structure is refreshed independently so one
+failing index never breaks the write itself. Stored job matches are queued
+for rescoring, which runs in a background task when the endpoint passes its
+BackgroundTasks (always pass them; otherwise the queue waits for the next
+flush or the flush_match_rescore_queue.py job).
+The detail read document is different: candidate_details_changed rebuilds it
+inside the write's own transaction, before the endpoint commits.
+"""
+from typing import Iterable, Optional
+
+from fastapi import BackgroundTasks
+from sqlalchemy.orm import Session
+
+from app.services import bm25_index
+from app.services.candidate_changes import record_candidate_changes
+from app.services.embedding_service import forget_candidate
+from app.services.match_engine import invalidate_candidate_pool
+from app.services.match_maintenance import mark_candidates_dirty
+from app.services.candidate_read_model import mark_candidate_read_documents_stale, refresh_candidate_read_documents
+from app.services.experience_totals import refresh_candidate_experience_totals
+from app.services.search_documents import refresh_search_documents
+from app.services.skill_arrays import refresh_candidate_skill_arrays
+
+
+def candidates_changed(db: Session, candidate_ids: Iterable, background_tasks: Optional[BackgroundTasks] = None):
+    """Refresh every derived search structure for the given candidates (job matches in the background)"""
+    candidate_ids = [cid for cid in candidate_ids if cid]
+    if not candidate_ids:
+        return
+    invalidate_candidate_pool()
+    try:
+        # Bulk child deletes bypass the flush hook; log them for the other workers' indexes
+        record_candidate_changes(db, candidate_ids)
+        db.commit()
+    except Exception as e:
+        print(f"⚠️ Candidate change log write failed: {e}")
+        db.rollback()
+    mark_candidates_dirty(db, candidate_ids, background_tasks)
+    bm25_index.refresh_candidates(db, candidate_ids)
+    try:
+        refresh_candidate_skill_arrays(db, candidate_ids)
+    except Exception as e:
+        print(f"⚠️ Candidate skill array refresh failed: {e}")
+        db.rollback()
+    try:
+        refresh_candidate_experience_totals(db, candidate_ids)
+    except Exception as e:
+        print(f"⚠️ Candidate experience total refresh failed: {e}")
+        db.rollback()
+    try:
+        refresh_search_documents(db, candidate_ids)
+    except Exception as e:
+        print(f"⚠️ Full-text search document refresh failed: {e}")
+        db.rollback()
+
+
+def candidate_details_changed(db: Session, candidate_ids: Iterable):
+    """
+    Rebuild the detail read documents in the caller's transaction; call before its commit.
+    A failing rebuild marks the documents stale instead (rebuilt on read), never the write.
+    """
+    candidate_ids = [cid for cid in candidate_ids if cid]
+    if not candidate_ids:
+        return
+    # Sessions don't autoflush; the rebuild reads the caller's pending writes
+    db.flush()
+    try:
+        with db.begin_nested():
+            # The document's statistics read the stored experience total
+            refresh_candidate_experience_totals(db, candidate_ids, commit=False)
+            refresh_candidate_read_documents(db, candidate_ids, commit=False)
+        return
+    except Exception as e:
+        print(f"⚠️ Candidate read document rebuild failed, marking stale: {e}")
+    try:
+        with db.begin_nested():
+            mark_candidate_read_documents_stale(db, candidate_ids)
+    except Exception as e:
+        print(f"⚠️ Candidate read documents could not be marked stale: {e}")
+
+
+def candidates_deleted(candidate_ids: Iterable):
+    """Drop in-memory entries of deleted candidates (database rows cascade)"""
+    for candidate_id in candidate_ids:
+        bm25_index.remove_candidate(candidate_id)
+        forget_candidate(candidate_id)
+    invalidate_candidate_pool()
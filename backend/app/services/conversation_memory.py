@@ -0,0 +1,237 @@
+"""
+Server-side conversation memory for the AI chat
+Keeps a short window of recent turns per user conversation, compresses older
+turns into a rolling summary and caches the candidates discussed so far so
+follow-up questions can reuse them instead of re-retrieving.
+
+The store is process-local: it only holds within a single worker process.
+With several workers (or after a restart) a request can land on a process
+that has never seen the conversation; it then starts a fresh session seeded
+from the client-provided history, so answers degrade to stateless chat
+rather than fail. Run the API with one worker if conversation memory matters.
+"""
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import BackgroundTasks
+from sqlalchemy.orm import Session
+
+# Raw turns kept verbatim (3 exchanges); older turns go into the summary
+MAX_RECENT_TURNS = 6
+# Hard cap on the rolling summary so prompt size stays bounded
+MAX_SUMMARY_CHARS = 1500
+# Candidates remembered for follow-up questions
+MAX_CACHED_CANDIDATES = 10
+# Idle sessions are dropped after this long
+SESSION_TTL = timedelta(hours=2)
+MAX_SESSIONS = 1000
+
+# Pronouns / phrases that refer back to candidates from earlier turns
+FOLLOW_UP_MARKERS = [
+    ' he ', ' she ', ' his ', ' her ', ' him ', ' they ', ' them ', ' their ',
+    'this candidate', 'that candidate', 'these candidates', 'those candidates',
+    'what about', 'and the', 'same candidate',
+    ' هو ', ' هي ', ' هم ', 'هذا المرشح', 'هذه المرشحة', 'هؤلاء', 'ماذا عن'
+]
+
+
+@dataclass
+class ConversationSession:
+    """Conversation state for a single user conversation"""
+    conversation_id: str
+    summary: str = ""
+    turns: List[Dict[str, str]] = field(default_factory=list)
+    candidate_ids: List[str] = field(default_factory=list)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+
+    def has_history(self) -> bool:
+        return bool(self.summary or self.turns)
+
+    def seed_from_history(self, conversation_history: list):
+        """Initialise an empty session from client-provided history (e.g. restored chats)"""
+        if self.has_history() or not conversation_history:
+            return
+        for msg in conversation_history:
+            # Handle both Pydantic objects and dictionaries
+            if hasattr(msg, 'role'):
+                role, content = msg.role, msg.content
+            else:
+                role, content = msg.get("role"), msg.get("content")
+            if content:
+                self.turns.append({"role": "user" if role == "user" else "assistant", "content": content})
+        # Older seeded turns are folded into the summary locally
+        overflow = self.turns[:-MAX_RECENT_TURNS]
+        if overflow:
+            self.turns = self.turns[-MAX_RECENT_TURNS:]
+            self.summary = _local_summary(self.summary, overflow)
+
+    def is_follow_up(self, query: str) -> bool:
+        """True if the query likely refers to candidates discussed earlier"""
+        if not self.candidate_ids:
+            return False
+        padded = f" {query.lower()} "
+        return any(marker in padded for marker in FOLLOW_UP_MARKERS)
+
+    def build_context(self) -> str:
+        """Prompt block with the rolling summary and the recent raw turns"""
+        if not self.has_history():
+            return ""
+        context = ""
+        if self.summary:
+            context += f"\n\nCONVERSATION SUMMARY:\n{self.summary}\n"
+        if self.turns:
+            context += "\nPREVIOUS CONVERSATION:\n"
+            for msg in self.turns:
+                role = "User" if msg["role"] == "user" else "Assistant"
+                context += f"{role}: {msg['content']}\n"
+        return context + "\n"
+
+
+class ConversationStore:
+    """In-process store of conversation sessions keyed by user and conversation id.
+
+    Single-process only: sessions are not shared between workers (see module docstring).
+    """
+
+    def __init__(self, ttl: timedelta = SESSION_TTL, max_sessions: int = MAX_SESSIONS):
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ttl = ttl
+        self._max_sessions = max_sessions
+
+    @staticmethod
+    def _key(user_key: str, conversation_id: str) -> str:
+        return f"{user_key}:{conversation_id}"
+
+    def get(self, user_key: str, conversation_id: Optional[str] = None) -> ConversationSession:
+        """Return the session for this user, creating a new one if needed"""
+        conversation_id = conversation_id or uuid.uuid4().hex
+        key = self._key(user_key, conversation_id)
+        now = datetime.utcnow()
+        with self._lock:
+            self._evict_expired(now)
+            session = self._sessions.get(key)
+            if session is None:
+                session = ConversationSession(conversation_id=conversation_id)
+                self._sessions[key] = session
+                while len(self._sessions) > self._max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(key)
+            session.updated_at = now
+            return session
+
+    def reset(self, user_key: str, conversation_id: Optional[str] = None) -> int:
+        """Drop one conversation, or all conversations of a user; returns the number removed"""
+        with self._lock:
+            if conversation_id:
+                return 1 if self._sessions.pop(self._key(user_key, conversation_id), None) else 0
+            keys = [k for k in self._sessions if k.startswith(f"{user_key}:")]
+            for k in keys:
+                del self._sessions[k]
+            return len(keys)
+
+    def _evict_expired(self, now: datetime):
+        expired = [k for k, s in self._sessions.items() if now - s.updated_at > self._ttl]
+        for k in expired:
+            del self._sessions[k]
+
+
+conversation_store = ConversationStore()
+
+
+def _local_summary(summary: str, turns: List[Dict[str, str]]) -> str:
+    """Cheap extractive fallback: keep the first sentence of each compressed turn"""
+    lines = [summary] if summary else []
+    for msg in turns:
+        first_sentence = msg["content"].strip().split("\n")[0].split(". ")[0][:200]
+        role = "User" if msg["role"] == "user" else "Assistant"
+        lines.append(f"- {role}: {first_sentence}")
+    return "\n".join(lines)[-MAX_SUMMARY_CHARS:]
+
+
+async def _summarize_turns(summary: str, turns: List[Dict[str, str]], db: Session, user_api_key: str = None) -> str:
+    """Fold older turns into the rolling summary with one short AI call"""
+    # Import here to avoid circular imports
+    from app.core.config import settings
+    from app.services.ai_service import call_ai_api
+
+    if settings.USE_MOCK_AI:
+        return _local_summary(summary, turns)
+
+    transcript = "\n".join(
+        f"{'User' if m['role'] == 'user' else 'Assistant'}: {m['content'][:1000]}" for m in turns
+    )
+    prompt = f"""Update the running summary of a recruiter's conversation with an HR assistant.
+
+Current summary:
+{summary or '(empty)'}
+
+New messages:
+{transcript}
+
+Write the updated summary in at most 8 short bullet points. Keep candidate names, job titles,
+requirements and decisions. Use the same language as the conversation."""
+    try:
+        updated = await call_ai_api(prompt, "You summarise conversations concisely.", user_api_key, db)
+        if updated and updated.strip():
+            return updated.strip()[:MAX_SUMMARY_CHARS]
+    except Exception as e:
+        print(f"⚠️ Conversation summary failed, using local summary: {e}")
+    return _local_summary(summary, turns)
+
+
+async def summarize_in_background(
+    session: ConversationSession,
+    base_summary: str,
+    overflow: List[Dict[str, str]],
+    provisional: str,
+    user_api_key: str = None
+):
+    """Replace the provisional local summary with an AI-written one (runs after the response)"""
+    # Import here to avoid circular imports
+    from app.db.database import SessionLocal
+
+    # The request session is closed by now, so the task owns its own session
+    db = SessionLocal()
+    try:
+        updated = await _summarize_turns(base_summary, overflow, db, user_api_key)
+    finally:
+        db.close()
+    # A later exchange may already have folded more turns in; keep that one
+    if session.summary == provisional:
+        session.summary = updated
+
+
+def record_exchange(
+    session: ConversationSession,
+    query: str,
+    response: str,
+    candidate_ids: List[str],
+    background_tasks: Optional[BackgroundTasks] = None,
+    user_api_key: str = None
+):
+    """Append a user/assistant exchange and compress anything beyond the recent window.
+
+    Overflowing turns are folded into the summary locally right away; the AI
+    summary replaces it from a background task so the response never waits on it.
+    """
+    session.turns.append({"role": "user", "content": query})
+    session.turns.append({"role": "assistant", "content": response})
+    if candidate_ids:
+        session.candidate_ids = [str(cid) for cid in candidate_ids][:MAX_CACHED_CANDIDATES]
+
+    overflow = session.turns[:-MAX_RECENT_TURNS]
+    if overflow:
+        session.turns = session.turns[-MAX_RECENT_TURNS:]
+        base_summary = session.summary
+        session.summary = _local_summary(base_summary, overflow)
+        if background_tasks is not None:
+            background_tasks.add_task(
+                summarize_in_background, session, base_summary, overflow, session.summary, user_api_key
+            )
+    session.updated_at = datetime.utcnow()
@@ -0,0 +1,498 @@
+"""
+Local vector embeddings for semantic candidate search
+CPU-only pipeline: a sentence-transformers model when installed and configured
+(settings.EMBEDDING_MODEL), otherwise a hashed TF embedder that needs no
+model download. Vectors are persisted per resume and job in the `embeddings`
+table and served from an in-process NumPy index (flat, or IVF once large),
+so semantic search never calls an LLM. IVF training runs on a background
+thread; searches use the flat scan (or the previous partitioning) meanwhile.
+Resume vectors written or deleted by other workers are picked up from the
+candidate change log (see candidate_changes.py), like the BM25 index.
+"""
+import hashlib
+import math
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session, undefer
+
+from app.core.config import settings
+from app.db import models
+from app.services.candidate_changes import changed_candidates_since, database_now
+from app.services.text_tokenizer import tokenize
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # optional dependency
+    SentenceTransformer = None
+
+# Only the head of very long documents is embedded
+MAX_EMBED_CHARS = 20000
+# Bigrams add phrase information ("machine learning") at a lower weight
+BIGRAM_WEIGHT = 0.5
+# How often a process checks the table for vectors written by other workers (seconds)
+INDEX_REFRESH_INTERVAL = 30
+# k-means settings for the IVF index
+IVF_TRAIN_ITERATIONS = 8
+IVF_MAX_TRAINING_VECTORS = 20000
+
+
+# ==================== EMBEDDERS ====================
+
+class HashedTfEmbedder:
+    """Signed feature hashing of sublinear term frequencies (unigrams + bigrams)"""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.name = f"hashed-tf-{dimension}"
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        tokens = tokenize((text or "")[:MAX_EMBED_CHARS])
+        features = Counter(tokens)
+        bigrams = Counter(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        for counts, weight in ((features, 1.0), (bigrams, BIGRAM_WEIGHT)):
+            for feature, count in counts.items():
+                h = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if h & 0x80000000 else -1.0
+                vector[h % self.dimension] += sign * weight * (1.0 + math.log(count))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.vstack([self._embed_one(t) for t in texts])
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model (CPU)"""
+
+    def __init__(self, model_name: str):
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dimension = self._model.get_sentence_embedding_dimension()
+        self.name = f"st:{model_name}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        vectors = self._model.encode(
+            [(t or "")[:MAX_EMBED_CHARS] for t in texts], normalize_embeddings=True, convert_to_numpy=True
+        )
+        return vectors.astype(np.float32)
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    """The configured embedder, falling back to hashed TF if the model is unavailable"""
+    global _embedder
+    with _embedder_lock:
+        if _embedder is None:
+            if settings.EMBEDDING_MODEL and SentenceTransformer is not None:
+                try:
+                    _embedder = SentenceTransformerEmbedder(settings.EMBEDDING_MODEL)
+                    print(f"🧠 Using embedding model {settings.EMBEDDING_MODEL}")
+                except Exception as e:
+                    print(f"⚠️ Could not load embedding model {settings.EMBEDDING_MODEL}: {e}")
+            elif settings.EMBEDDING_MODEL:
+                print("⚠️ sentence-transformers not installed, using hashed TF embeddings")
+            if _embedder is None:
+                _embedder = HashedTfEmbedder(settings.EMBEDDING_DIMENSION)
+        return _embedder
+
+
+# ==================== VECTOR INDEX ====================
+
+class VectorIndex:
+    """
+    In-process cosine index over L2-normalised float32 vectors
+    Flat (exact) search by default; above settings.EMBEDDING_IVF_MIN_VECTORS an
+    IVF partitioning (spherical k-means) restricts search to the nearest lists.
+    Training is started by search() on a background thread, never run inline.
+    """
+
+    def __init__(self, dimension: int, ivf_min_vectors: int = None):
+        self.dimension = dimension
+        self.ivf_min_vectors = ivf_min_vectors if ivf_min_vectors is not None else settings.EMBEDDING_IVF_MIN_VECTORS
+        self._matrix = np.zeros((0, dimension), dtype=np.float32)
+        self._ids: List[str] = []
+        self._owners: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.RLock()
+        # IVF state
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0
+        self._training_thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _ensure_capacity(self, needed: int):
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 64)
+        matrix = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        assignments = np.zeros(new_capacity, dtype=np.int32)
+        assignments[:self._size] = self._assignments[:self._size]
+        self._matrix, self._assignments = matrix, assignments
+
+    def upsert(self, entity_id: str, vector: np.ndarray, owner: Optional[str] = None):
+        with self._lock:
+            row = self._rows.get(entity_id)
+            if row is None:
+                self._ensure_capacity(self._size + 1)
+                row = self._size
+                self._size += 1
+                self._rows[entity_id] = row
+                self._ids.append(entity_id)
+                self._owners.append(owner)
+            else:
+                self._owners[row] = owner
+            self._matrix[row] = vector
+            if self._centroids is not None:
+                self._assignments[row] = int(np.argmax(self._centroids @ vector))
+
+    def remove(self, entity_id: str) -> bool:
+        with self._lock:
+            row = self._rows.pop(entity_id, None)
+            if row is None:
+                return False
+            last = self._size - 1
+            if row != last:
+                # Move the last row into the hole to keep the matrix dense
+                moved_id = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._assignments[row] = self._assignments[last]
+                self._ids[row] = moved_id
+                self._owners[row] = self._owners[last]
+                self._rows[moved_id] = row
+            self._ids.pop()
+            self._owners.pop()
+            self._size = last
+            return True
+
+    def remove_owner(self, owner: str) -> int:
+        return self.remove_owners([owner])
+
+    def remove_owners(self, owners: Iterable[str]) -> int:
+        """Drop every vector of the given owners (one scan)"""
+        owners = set(owners)
+        with self._lock:
+            entity_ids = [eid for eid, o in zip(self._ids, self._owners) if o in owners]
+            for entity_id in entity_ids:
+                self.remove(entity_id)
+            return len(entity_ids)
+
+    def needs_training(self) -> bool:
+        """True once the index is large enough for IVF and untrained, or has doubled since training"""
+        with self._lock:
+            return self._size >= self.ivf_min_vectors and (
+                self._centroids is None or self._size > 2 * self._trained_size
+            )
+
+    def train_ivf(self, n_lists: int = None):
+        """Partition the vectors with spherical k-means (the lock is only held to snapshot and install)"""
+        with self._lock:
+            size = self._size
+            if size == 0:
+                return
+            n_lists = n_lists or max(1, int(math.sqrt(size)))
+            rng = np.random.default_rng(0)
+            sample_rows = rng.choice(size, min(size, IVF_MAX_TRAINING_VECTORS), replace=False)
+            # Fancy indexing copies, so k-means below can run without the lock
+            sample = self._matrix[sample_rows]
+        centroids = sample[rng.choice(len(sample), min(n_lists, len(sample)), replace=False)].copy()
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(len(centroids)):
+                members = sample[labels == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm:
+                        centroids[c] = centroid / norm
+        with self._lock:
+            # Rows added or moved while training are assigned here
+            size = self._size
+            self._centroids = centroids
+            self._assignments[:size] = np.argmax(self._matrix[:size] @ centroids.T, axis=1)
+            self._trained_size = size
+        print(f"🧭 Trained IVF index: {len(centroids)} lists over {size} vectors")
+
+    def train_in_background(self) -> bool:
+        """Start IVF training on a daemon thread if needed and not already running"""
+        with self._lock:
+            if not self.needs_training() or (self._training_thread and self._training_thread.is_alive()):
+                return False
+
+            def run():
+                try:
+                    self.train_ivf()
+                except Exception as e:
+                    print(f"⚠️ IVF training failed: {e}")
+
+            self._training_thread = threading.Thread(target=run, name="ivf-training", daemon=True)
+            self._training_thread.start()
+            return True
+
+    def search(self, query: np.ndarray, k: int, n_probe: int = None) -> List[Tuple[str, Optional[str], float]]:
+        """Top-k (entity_id, owner, cosine) pairs"""
+        with self._lock:
+            size = self._size
+            if size == 0 or k <= 0:
+                return []
+            # Flat scan (or the previous partitioning) serves searches until training finishes
+            self.train_in_background()
+
+            if self._centroids is not None and size >= self.ivf_min_vectors:
+                n_probe = n_probe or max(4, len(self._centroids) // 10)
+                probe = np.argsort(self._centroids @ query)[::-1][:n_probe]
+                rows = np.nonzero(np.isin(self._assignments[:size], probe))[0]
+                scores = self._matrix[rows] @ query
+            else:
+                rows = None
+                scores = self._matrix[:size] @ query
+
+            k = min(k, len(scores))
+            if k == 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            results = []
+            for i in top:
+                row = int(rows[i]) if rows is not None else int(i)
+                results.append((self._ids[row], self._owners[row], float(scores[i])))
+            return results
+
+
+# ==================== PERSISTENCE + INDEX MANAGEMENT ====================
+
+_indexes: Dict[str, VectorIndex] = {}
+_synced_at: Dict[str, datetime] = {}  # database time of each index's last sync
+_last_refresh: Dict[str, float] = {}
+_index_lock = threading.Lock()
+
+
+def _content_hash(text: str, model_name: str) -> str:
+    return hashlib.sha256(f"{model_name}\n{text}".encode("utf-8")).hexdigest()
+
+
+def _vector_rows(db: Session, entity_type: str, model_name: str, candidate_ids: Optional[List[str]] = None) -> list:
+    """Persisted (entity_id, candidate_id, vector) rows, optionally only those of some candidates"""
+    query = db.query(
+        models.Embedding.entity_id, models.Embedding.candidate_id, models.Embedding.vector_data
+    ).filter(
+        models.Embedding.entity_type == entity_type,
+        models.Embedding.model_name == model_name
+    )
+    if candidate_ids is not None:
+        query = query.filter(models.Embedding.candidate_id.in_(candidate_ids))
+    return [
+        (str(row.entity_id), str(row.candidate_id) if row.candidate_id else None,
+         np.frombuffer(row.vector_data, dtype=np.float32))
+        for row in query.yield_per(1000)
+    ]
+
+
+def _load_index(db: Session, entity_type: str, model_name: str, dimension: int) -> VectorIndex:
+    index = VectorIndex(dimension)
+    for entity_id, owner, vector in _vector_rows(db, entity_type, model_name):
+        index.upsert(entity_id, vector, owner)
+    return index
+
+
+def _catch_up_resumes(index: VectorIndex, db: Session, model_name: str, since: datetime) -> int:
+    """Replace the vectors of candidates in the change log since `since` (deleted ones drop out)"""
+    changed = list(changed_candidates_since(db, since))
+    if not changed:
+        return 0
+    rows = _vector_rows(db, "resume", model_name, changed)
+    with index._lock:
+        index.remove_owners(changed)
+        for entity_id, owner, vector in rows:
+            index.upsert(entity_id, vector, owner)
+    return len(changed)
+
+
+def get_index(db: Session, entity_type: str) -> VectorIndex:
+    """
+    The in-process index for an entity type, loaded lazily and refreshed with
+    other workers' writes: resumes from the candidate change log, jobs (few,
+    and not searched) by reloading
+    """
+    embedder = get_embedder()
+    with _index_lock:
+        index = _indexes.get(entity_type)
+        now = time.time()
+        if index is not None and now - _last_refresh.get(entity_type, 0) <= INDEX_REFRESH_INTERVAL:
+            return index
+        # Taken before reading, so writes committed meanwhile are caught up next time
+        synced_at = database_now(db)
+        if index is not None and entity_type == "resume":
+            _catch_up_resumes(index, db, embedder.name, _synced_at[entity_type])
+        else:
+            index = _load_index(db, entity_type, embedder.name, embedder.dimension)
+            _indexes[entity_type] = index
+            print(f"📥 Loaded {len(index)} {entity_type} embeddings into memory")
+        _synced_at[entity_type] = synced_at
+        _last_refresh[entity_type] = now
+        return index
+
+
+def upsert_embedding(
+    db: Session,
+    entity_type: str,
+    entity_id,
+    text: str,
+    candidate_id=None,
+    commit: bool = True
+) -> bool:
+    """Embed and persist one document, updating the in-memory index; False if unchanged/empty"""
+    if not text or not text.strip():
+        return False
+    embedder = get_embedder()
+    content_hash = _content_hash(text, embedder.name)
+    existing = db.query(models.Embedding).filter(
+        models.Embedding.entity_type == entity_type,
+        models.Embedding.entity_id == entity_id
+    ).first()
+    if existing and existing.content_hash == content_hash:
+        return False
+
+    vector = embedder.embed([text])[0]
+    if existing is None:
+        existing = models.Embedding(entity_type=entity_type, entity_id=entity_id)
+        db.add(existing)
+    existing.candidate_id = candidate_id
+    existing.model_name = embedder.name
+    existing.dimension = embedder.dimension
+    existing.vector_data = vector.astype(np.float32).tobytes()
+    existing.content_hash = content_hash
+    existing.embedding_date = datetime.utcnow()
+    if commit:
+        db.commit()
+
+    get_index(db, entity_type).upsert(str(entity_id), vector, str(candidate_id) if candidate_id else None)
+    return True
+
+
+def resume_text(resume: models.Resume) -> str:
+    text = resume.extracted_text or ""
+    # Placeholders written when parsing fails carry no content
+    return "" if text.startswith("[PDF") else text
+
+
+def job_text(job: models.Job) -> str:
+    parts = [
+        job.title, job.description, job.requirements, job.responsibilities,
+        ", ".join(job.required_skills or []), ", ".join(job.preferred_skills or [])
+    ]
+    return "\n".join(p for p in parts if p)
+
+
+def _index_in_savepoint(db: Session, entity_type: str, entity_id, text: str, candidate_id, commit: bool) -> bool:
+    """
+    Upsert one embedding inside a savepoint: a failure rolls back only this row,
+    never the caller's uncommitted work (e.g. the rest of a backfill batch)
+    """
+    try:
+        with db.begin_nested():
+            indexed = upsert_embedding(db, entity_type, entity_id, text, candidate_id, commit=False)
+    except Exception as e:
+        print(f"⚠️ Failed to embed {entity_type} {entity_id}: {e}")
+        return False
+    if commit:
+        try:
+            db.commit()
+        except Exception as e:
+            print(f"⚠️ Failed to save {entity_type} {entity_id} embedding: {e}")
+            db.rollback()
+            return False
+    return indexed
+
+
+def index_resume(db: Session, resume: models.Resume, commit: bool = True) -> bool:
+    """Embed a resume after upload/parse; failures never break the upload"""
+    return _index_in_savepoint(db, "resume", resume.id, resume_text(resume), resume.candidate_id, commit)
+
+
+def index_job(db: Session, job: models.Job, commit: bool = True) -> bool:
+    """Embed a job after create/update"""
+    return _index_in_savepoint(db, "job", job.id, job_text(job), None, commit)
+
+
+def remove_embeddings(db: Session, entity_type: str, entity_ids: Iterable, commit: bool = True):
+    """Delete persisted vectors and drop them from the in-memory index"""
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return
+    db.query(models.Embedding).filter(
+        models.Embedding.entity_type == entity_type,
+        models.Embedding.entity_id.in_(entity_ids)
+    ).delete(synchronize_session=False)
+    if commit:
+        db.commit()
+    index = _indexes.get(entity_type)
+    if index is not None:
+        for entity_id in entity_ids:
+            index.remove(str(entity_id))
+
+
+def forget_candidate(candidate_id):
+    """Drop a deleted candidate's resume vectors from memory (rows cascade in the DB)"""
+    index = _indexes.get("resume")
+    if index is not None:
+        index.remove_owner(str(candidate_id))
+
+
+# ==================== SEARCH ====================
+
+def embed_query(text: str) -> np.ndarray:
+    return get_embedder().embed([text])[0]
+
+
+def search_candidates(db: Session, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+    """Top candidates by best resume cosine similarity: [(candidate_id, score)]"""
+    index = get_index(db, "resume")
+    if not len(index):
+        return []
+    # Over-fetch because a candidate can own several resume versions
+    hits = index.search(embed_query(query), limit * 3)
+    best: Dict[str, float] = {}
+    for _, owner, score in hits:
+        if owner and score > best.get(owner, -1.0):
+            best[owner] = score
+    return sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def backfill_embeddings(db: Session, batch_size: int = 200) -> Dict[str, int]:
+    """Embed every resume and job that has no up-to-date vector"""
+    counts = {"resume": 0, "job": 0}
+    last_id = None
+    while True:
+        query = db.query(models.Resume).options(undefer(models.Resume.extracted_text)).order_by(models.Resume.id)
+        if last_id is not None:
+            query = query.filter(models.Resume.id > last_id)
+        batch = query.limit(batch_size).all()
+        if not batch:
+            break
+        for resume in batch:
+            counts["resume"] += index_resume(db, resume, commit=False)
+        db.commit()
+        last_id = batch[-1].id
+    for job in db.query(models.Job).all():
+        counts["job"] += index_job(db, job, commit=False)
+    db.commit()
+    return counts
@@ -0,0 +1,85 @@
+"""
+Candidate experience totals
+candidates.total_experience_months is the sum of the candidate's work
+experience durations (duration_months, else the months from start date to end
+date or today), computed by one SQL aggregate and stored on the candidate.
+List and search queries filter and sort on the indexed column instead of
+loading work history. Writes refresh it through candidate_sync; rerunning
+add_candidate_experience_totals.py (e.g. nightly) ages open-ended positions.
+"""
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Query, Session
+
+from app.db import models
+
+# Sanity cap (50 years), as for years_of_experience
+MAX_EXPERIENCE_MONTHS = 600
+
+# Months of one work_experience row: the stored duration, else start to end date (or today)
+_POSITION_MONTHS = """
+coalesce(
+    we.duration_months,
+    CASE WHEN we.start_date <= coalesce(we.end_date, CURRENT_DATE)
+         THEN round((coalesce(we.end_date, CURRENT_DATE) - we.start_date) / 30.44)::int END,
+    0
+)
+"""
+
+_TOTAL_SQL = f"""
+SELECT least(coalesce(sum({_POSITION_MONTHS}), 0), {MAX_EXPERIENCE_MONTHS})
+FROM work_experience we
+WHERE we.candidate_id = :candidate_id
+"""
+
+_REFRESH_SQL = f"""
+UPDATE candidates c SET
+    total_experience_months = coalesce(least(agg.months, {MAX_EXPERIENCE_MONTHS}), 0)
+FROM candidates target
+LEFT JOIN (
+    SELECT we.candidate_id, sum({_POSITION_MONTHS}) AS months
+    FROM work_experience we
+    {{experience_where}}
+    GROUP BY we.candidate_id
+) agg ON agg.candidate_id = target.id
+WHERE c.id = target.id {{candidates_where}}
+  AND c.total_experience_months IS DISTINCT FROM coalesce(least(agg.months, {MAX_EXPERIENCE_MONTHS}), 0)
+"""
+
+
+def candidate_experience_months(db: Session, candidate_id: UUID) -> int:
+    """Total months of one candidate computed from its work_experience rows (flush pending rows first)"""
+    return int(db.execute(text(_TOTAL_SQL), {"candidate_id": str(candidate_id)}).scalar() or 0)
+
+
+def experience_years(total_months: Optional[int]) -> int:
+    """Whole years for years_of_experience"""
+    return round((total_months or 0) / 12)
+
+
+def refresh_candidate_experience_totals(db: Session, candidate_ids: Optional[Iterable] = None, commit: bool = True) -> int:
+    """Recompute total_experience_months of the given candidates (all candidates when None); returns rows changed"""
+    params: Dict[str, Any] = {}
+    if candidate_ids is None:
+        experience_where = candidates_where = ""
+    else:
+        params["ids"] = [str(cid) for cid in candidate_ids]
+        if not params["ids"]:
+            return 0
+        experience_where = "WHERE we.candidate_id = ANY(CAST(:ids AS uuid[]))"
+        candidates_where = "AND target.id = ANY(CAST(:ids AS uuid[]))"
+    result = db.execute(text(_REFRESH_SQL.format(experience_where=experience_where, candidates_where=candidates_where)), params)
+    if commit:
+        db.commit()
+    return result.rowcount
+
+
+def apply_experience_filter(query: Query, min_years: Optional[float] = None, max_years: Optional[float] = None) -> Query:
+    """Restrict to candidates with at least min_years and less than max_years of total experience"""
+    if min_years is not None:
+        query = query.filter(models.Candidate.total_experience_months >= round(min_years * 12))
+    if max_years is not None:
+        query = query.filter(models.Candidate.total_experience_months < round(max_years * 12))
+    return query
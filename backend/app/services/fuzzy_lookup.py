@@ -0,0 +1,161 @@
+"""
+Trigram fuzzy lookup for candidate names, emails and companies
+Names are normalised in SQL by two IMMUTABLE functions so they can back
+pg_trgm GIN expression indexes:
+  ats_name_key(text)      - Arabic -> Latin transliteration, accent stripping and
+                            spelling folding (Mohammed/Muhammad -> muhamad, Kareem -> karim)
+  ats_name_skeleton(text) - consonant skeleton of the key, so Latin and Arabic
+                            spellings meet (Mohamed / محمد -> mhmd)
+"""
+import re
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Lower bound for word similarity in typeahead matches
+WORD_SIMILARITY_THRESHOLD = 0.4
+# Shorter normalised queries match nearly every name
+MIN_QUERY_CHARS = 2
+
+# Multi-letter transliterations first, then single letters
+_ARABIC_DIGRAPHS = {"خ": "kh", "ش": "sh", "ث": "th", "ذ": "th", "غ": "gh"}
+_ARABIC_LETTERS = {
+    "ا": "a", "أ": "a", "إ": "a", "آ": "a", "ٱ": "a", "ى": "a", "ة": "a", "ع": "a",
+    "ب": "b", "ت": "t", "ج": "j", "ح": "h", "د": "d", "ر": "r", "ز": "z", "س": "s",
+    "ص": "s", "ض": "d", "ط": "t", "ظ": "z", "ف": "f", "ق": "k", "ك": "k", "ل": "l",
+    "م": "m", "ن": "n", "ه": "h", "و": "w", "ؤ": "w", "ي": "y", "ئ": "y",
+}
+_LATIN_ACCENTS = {
+    "à": "a", "á": "a", "â": "a", "ã": "a", "ä": "a", "å": "a", "ç": "c", "è": "e", "é": "e",
+    "ê": "e", "ë": "e", "ì": "i", "í": "i", "î": "i", "ï": "i", "ñ": "n", "ò": "o", "ó": "o",
+    "ô": "o", "õ": "o", "ö": "o", "ù": "u", "ú": "u", "û": "u", "ü": "u", "ý": "y",
+}
+# Spelling variants folded after transliteration (order matters)
+_LATIN_FOLDS = [("ph", "f"), ("ck", "k"), ("q", "k"), ("ou", "u"), ("oo", "u"), ("ee", "i"), ("o", "u"), ("e", "a")]
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _name_key_sql() -> str:
+    expr = "lower(coalesce(value, ''))"
+    # Arabic diacritics, tatweel and hamza carry no consonant information
+    expr = f"regexp_replace({expr}, '[\u064b-\u0652\u0670\u0640\u0621]', '', 'g')"
+    for arabic, latin in _ARABIC_DIGRAPHS.items():
+        expr = f"replace({expr}, {_sql_literal(arabic)}, {_sql_literal(latin)})"
+    singles = {**_ARABIC_LETTERS, **_LATIN_ACCENTS}
+    expr = f"translate({expr}, {_sql_literal(''.join(singles))}, {_sql_literal(''.join(singles.values()))})"
+    expr = f"regexp_replace({expr}, '[^a-z0-9@. ]+', ' ', 'g')"
+    for source, target in _LATIN_FOLDS:
+        expr = f"replace({expr}, {_sql_literal(source)}, {_sql_literal(target)})"
+    # Collapse doubled letters (mohammed -> muhamad) and whitespace
+    expr = f"regexp_replace({expr}, '([a-z])\\1+', '\\1', 'g')"
+    return f"btrim(regexp_replace({expr}, '\\s+', ' ', 'g'))"
+
+
+def name_key(value: str) -> str:
+    """Python mirror of ats_name_key(); same tables, same steps"""
+    key = re.sub("[\u064b-\u0652\u0670\u0640\u0621]", "", (value or "").lower())
+    for arabic, latin in _ARABIC_DIGRAPHS.items():
+        key = key.replace(arabic, latin)
+    key = key.translate(str.maketrans({**_ARABIC_LETTERS, **_LATIN_ACCENTS}))
+    key = re.sub(r"[^a-z0-9@. ]+", " ", key)
+    for source, target in _LATIN_FOLDS:
+        key = key.replace(source, target)
+    key = re.sub(r"([a-z])\1+", r"\1", key)
+    return re.sub(r"\s+", " ", key).strip()
+
+
+def name_skeleton(value: str) -> str:
+    """Python mirror of ats_name_skeleton()"""
+    return re.sub(r"(\S)[aeiouwy]+", r"\1", name_key(value))
+
+
+NAME_FUNCTIONS_SQL = f"""
+CREATE OR REPLACE FUNCTION ats_name_key(value text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+  SELECT {_name_key_sql()}
+$$;
+
+CREATE OR REPLACE FUNCTION ats_name_skeleton(value text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+  SELECT regexp_replace(ats_name_key(value), '(\\S)[aeiouwy]+', '\\1', 'g')
+$$;
+"""
+
+# Expressions shared by the indexes and the queries (must match exactly to use the index)
+CANDIDATE_NAME_EXPR = "ats_name_key(c.first_name || ' ' || c.last_name)"
+CANDIDATE_SKELETON_EXPR = "ats_name_skeleton(c.first_name || ' ' || c.last_name)"
+COMPANY_EXPR = "ats_name_key(w.company_name)"
+
+TRIGRAM_INDEXES_SQL = [
+    "CREATE INDEX IF NOT EXISTS ix_candidates_name_key_trgm ON candidates "
+    "USING gin (ats_name_key(first_name || ' ' || last_name) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_candidates_name_skeleton_trgm ON candidates "
+    "USING gin (ats_name_skeleton(first_name || ' ' || last_name) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_candidates_email_trgm ON candidates USING gin (lower(email) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_work_experience_company_key_trgm ON work_experience "
+    "USING gin (ats_name_key(company_name) gin_trgm_ops)",
+]
+
+_TYPEAHEAD_SQL = f"""
+WITH q AS (
+    SELECT ats_name_key(:q) AS name_key, ats_name_skeleton(:q) AS skeleton, lower(:q) AS email
+),
+by_name AS (
+    SELECT c.id,
+           greatest(word_similarity(q.name_key, {CANDIDATE_NAME_EXPR}),
+                    0.9 * word_similarity(q.skeleton, {CANDIDATE_SKELETON_EXPR})) AS score,
+           'name' AS matched_on, NULL::text AS company
+    FROM candidates c, q
+    WHERE q.name_key <% {CANDIDATE_NAME_EXPR} OR q.skeleton <% {CANDIDATE_SKELETON_EXPR}
+),
+by_email AS (
+    SELECT c.id, greatest(word_similarity(q.email, lower(c.email)), 0.5) AS score,
+           'email' AS matched_on, NULL::text AS company
+    FROM candidates c, q
+    WHERE lower(c.email) LIKE q.email || '%' OR q.email <% lower(c.email)
+),
+by_company AS (
+    SELECT w.candidate_id AS id, 0.8 * word_similarity(q.name_key, {COMPANY_EXPR}) AS score,
+           'company' AS matched_on, w.company_name AS company
+    FROM work_experience w, q
+    WHERE q.name_key <% {COMPANY_EXPR}
+),
+ranked AS (
+    SELECT DISTINCT ON (id) id, score, matched_on, company
+    FROM (SELECT * FROM by_name UNION ALL SELECT * FROM by_email UNION ALL SELECT * FROM by_company) m
+    ORDER BY id, score DESC
+)
+SELECT c.id, c.first_name, c.last_name, c.email, c.current_location,
+       r.score, r.matched_on, r.company
+FROM ranked r JOIN candidates c ON c.id = r.id
+ORDER BY r.score DESC, c.last_name, c.first_name
+LIMIT :limit
+"""
+
+
+def typeahead_candidates(db: Session, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Fuzzy candidate lookup by (partial, misspelled or transliterated) name, email or company"""
+    query = (query or "").strip()
+    # Measured after normalisation: diacritics, tatweel and punctuation don't count
+    if len(name_key(query).replace(" ", "")) < MIN_QUERY_CHARS:
+        return []
+    # Transaction-local threshold for the <% operator
+    db.execute(text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+               {"threshold": str(WORD_SIMILARITY_THRESHOLD)})
+    rows = db.execute(text(_TYPEAHEAD_SQL), {"q": query, "limit": limit}).fetchall()
+    return [
+        {
+            "id": row.id,
+            "name": f"{row.first_name} {row.last_name}",
+            "email": row.email,
+            "current_location": row.current_location,
+            "score": round(float(row.score), 4),
+            "matched_on": row.matched_on,
+            "company": row.company,
+        }
+        for row in rows
+    ]
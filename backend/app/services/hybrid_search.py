@@ -0,0 +1,185 @@
+"""
+Local hybrid candidate ranking
+Fuses three independent rankings with reciprocal rank fusion (RRF):
+  - keyword: BM25 over skills, titles, summaries and resume text
+  - skills:  overlap between skills named in the query and candidate skills
+  - semantic: embedding similarity
+The fused list is fetched in one batched query. The LLM is only used for the
+optional explanation step.
+"""
+import json
+import operator
+import re
+from dataclasses import dataclass, field
+from functools import reduce
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, or_
+from sqlalchemy.orm import Session, selectinload
+
+from app.db import models
+from app.services.bm25_index import search_candidates_bm25
+from app.services.embedding_service import search_candidates
+from app.services.query_filter import compile_filter_rules, get_skill_vocabulary
+from app.services.skill_taxonomy import get_skill_resolver
+
+# RRF damping constant (Cormack et al. use 60); larger values flatten rank differences
+RRF_K = 60
+SOURCE_WEIGHTS = {"keyword": 1.0, "skills": 1.0, "semantic": 1.0}
+# Each ranker contributes this many candidates per requested result (at least MIN_POOL_SIZE)
+POOL_FACTOR = 5
+MIN_POOL_SIZE = 50
+
+
+@dataclass
+class HybridHit:
+    candidate: models.Candidate
+    score: float  # 0-100, relative to the best possible fused score
+    matched_skills: List[str] = field(default_factory=list)
+    ranks: Dict[str, int] = field(default_factory=dict)  # 1-based rank per source
+
+    def reason(self) -> str:
+        parts = []
+        if self.matched_skills:
+            parts.append("skills: " + ", ".join(self.matched_skills))
+        labels = {"keyword": "keyword match", "skills": "skill overlap", "semantic": "semantic similarity"}
+        for source, rank in sorted(self.ranks.items(), key=lambda item: item[1]):
+            parts.append(f"{labels[source]} #{rank}")
+        return "; ".join(parts)
+
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, Sequence[str]],
+    k: int = RRF_K,
+    weights: Optional[Dict[str, float]] = None
+) -> Tuple[Dict[str, float], Dict[str, Dict[str, int]]]:
+    """Fuse ranked id lists: score(d) = sum(weight / (k + rank)); also returns each id's ranks"""
+    weights = weights or {}
+    scores: Dict[str, float] = {}
+    ranks: Dict[str, Dict[str, int]] = {}
+    for source, ids in rankings.items():
+        weight = weights.get(source, 1.0)
+        for rank, item_id in enumerate(ids, 1):
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (k + rank)
+            ranks.setdefault(item_id, {})[source] = rank
+    return scores, ranks
+
+
+def query_skills(db: Session, query: str) -> List[str]:
+    """Known skills named in the query (lowercase)"""
+    return compile_filter_rules(query, get_skill_vocabulary(db)).skills
+
+
+def resolve_skills(db: Session, skills: List[str]) -> Tuple[Set[int], Set[str]]:
+    """Taxonomy ids of the skills the dictionary knows, lowercase names of the rest"""
+    resolver = get_skill_resolver(db)
+    skill_ids, names = set(), set()
+    for name in skills:
+        skill_id = resolver.resolve(name)
+        if skill_id is not None:
+            skill_ids.add(skill_id)
+        else:
+            names.add(name.lower())
+    return skill_ids, names
+
+
+def rank_by_skill_overlap(db: Session, skills: List[str], limit: int) -> List[str]:
+    """Candidates ordered by how many of the given skills they have (canonical ids, like match_engine)"""
+    if not skills:
+        return []
+    Candidate = models.Candidate
+    skill_ids, names = resolve_skills(db, skills)
+    # One predicate per distinct skill, so "js" and "javascript" count once
+    predicates = [Candidate.skill_ids.contains([skill_id]) for skill_id in sorted(skill_ids)] + \
+        [Candidate.skill_names.contains([name]) for name in sorted(names)]
+    matches = reduce(operator.add, [case((predicate, 1), else_=0) for predicate in predicates]).label("matches")
+    rows = db.query(Candidate.id, matches).filter(
+        or_(*predicates)
+    ).order_by(matches.desc(), Candidate.id).limit(limit).all()
+    return [str(row.id) for row in rows]
+
+
+def hybrid_search(db: Session, query: str, limit: int = 10) -> List[HybridHit]:
+    """Rank candidates for a free-text query without calling the LLM"""
+    pool_size = max(limit * POOL_FACTOR, MIN_POOL_SIZE)
+    wanted_skills = query_skills(db, query)
+    rankings = {
+        "keyword": [cid for cid, _ in search_candidates_bm25(db, query, pool_size)],
+        "skills": rank_by_skill_overlap(db, wanted_skills, pool_size),
+        "semantic": [cid for cid, score in search_candidates(db, query, pool_size) if score > 0],
+    }
+    rankings = {source: ids for source, ids in rankings.items() if ids}
+    if not rankings:
+        return []
+
+    scores, ranks = reciprocal_rank_fusion(rankings, weights=SOURCE_WEIGHTS)
+    # Rank 1 in every contributing source is the best achievable score
+    best_possible = sum(SOURCE_WEIGHTS.get(source, 1.0) / (RRF_K + 1) for source in rankings)
+    top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    # One batched fetch for the returned candidates and their skills
+    candidates = {
+        candidate.id: candidate
+        for candidate in db.query(models.Candidate).options(
+            selectinload(models.Candidate.skills)
+        ).filter(models.Candidate.id.in_([UUID(cid) for cid, _ in top])).all()
+    }
+
+    wanted_ids, wanted_names = resolve_skills(db, wanted_skills)
+    hits = []
+    for candidate_id, score in top:
+        candidate = candidates.get(UUID(candidate_id))
+        if not candidate:
+            continue  # deleted since it was indexed
+        matched = sorted({
+            skill.skill_name for skill in candidate.skills
+            if skill.skill_name and (
+                skill.skill_id in wanted_ids or skill.skill_name.strip().lower() in wanted_names
+            )
+        })
+        hits.append(HybridHit(
+            candidate=candidate,
+            score=round(100 * score / best_possible, 1),
+            matched_skills=matched,
+            ranks=ranks[candidate_id]
+        ))
+    return hits
+
+
+async def explain_hits(
+    query: str,
+    hits: List[HybridHit],
+    db: Session,
+    user_api_key: str = None
+) -> Dict[str, str]:
+    """One LLM call that writes a short reason per ranked candidate; {} on failure"""
+    # Import here to avoid circular imports
+    from app.services.ai_service import call_ai_api
+
+    if not hits:
+        return {}
+    cards = []
+    for hit in hits:
+        candidate = hit.candidate
+        skills = ", ".join(s.skill_name for s in candidate.skills[:25] if s.skill_name)
+        cards.append(
+            f"- id: {candidate.id}\n  name: {candidate.first_name} {candidate.last_name}\n"
+            f"  level: {candidate.career_level or 'N/A'}, years: {candidate.years_of_experience or 'N/A'}\n"
+            f"  skills: {skills or 'N/A'}\n  summary: {(candidate.professional_summary or '')[:300]}"
+        )
+    prompt = (
+        f"Search query: {query}\n\nRanked candidates:\n" + "\n".join(cards) +
+        "\n\nFor each candidate write one sentence on why they fit (or do not fit) the query. "
+        "Answer only with a JSON object mapping candidate id to the sentence."
+    )
+    try:
+        response = await call_ai_api(
+            prompt, "You are an HR assistant explaining candidate search results.", user_api_key, db
+        )
+        match = re.search(r"\{.*\}", response, re.DOTALL)
+        reasons = json.loads(match.group(0)) if match else {}
+        return {str(k): str(v) for k, v in reasons.items()} if isinstance(reasons, dict) else {}
+    except Exception as e:
+        print(f"⚠️ Search explanation failed, using local reasons: {e}")
+        return {}
@@ -0,0 +1,328 @@
+"""
+Local intent router for the AI chat
+Classifies recruiter questions with fast local rules and answers simple
+aggregate questions ("how many candidates know Python", "list open jobs in
+Cairo", "who applied to job X") with parameterised SQL instead of an LLM call.
+Anything else falls through to the LLM with the structured results attached.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.services.skill_arrays import apply_skill_filter
+from app.services.skill_taxonomy import get_skill_resolver
+
+# ==================== KEYWORD LISTS ====================
+
+# HR/Candidate related keywords
+HR_KEYWORDS = [
+    'candidate', 'candidates', 'resume', 'cv', 'job', 'position', 'skill', 'experience',
+    'developer', 'engineer', 'manager', 'hire', 'recruit', 'interview', 'apply', 'application',
+    'مرشح', 'مرشحين', 'سيرة', 'وظيفة', 'مهارة', 'خبرة', 'مطور', 'مهندس', 'توظيف', 'مقابلة'
+]
+
+# Terms that mean the jobs context should be included
+JOB_TERMS = [
+    'job', 'position', 'opening', 'vacancy', 'suitable', 'best', 'match', 'fit', 'recommend',
+    'وظيفة', 'وظائف', 'منصب', 'مناسب', 'أفضل', 'يناسب', 'ملائم', 'أنسب', 'الأنسب'
+]
+
+# Terms that mean the applications context should be included
+APPLICATION_TERMS = ['application', 'applied', 'applying', 'candidate', 'تقديم', 'متقدم']
+
+# Terms that ask for judgement; such questions always go to the LLM
+EVALUATION_TERMS = [
+    'best', 'better', 'compare', 'recommend', 'suitable', 'fit', 'why', 'evaluate', 'strongest',
+    'أفضل', 'قارن', 'مقارنة', 'أنسب', 'الأنسب', 'مناسب', 'لماذا', 'قيّم', 'تقييم'
+]
+
+MAX_LISTED_RESULTS = 20
+
+# ==================== PATTERNS ====================
+# Matched against the whole question (see _fullmatch): a question with any
+# other clause ("... from Cairo", "... and what are their skills") is general.
+
+_COUNT_CANDIDATES_EN = re.compile(
+    r"how many (?:candidates|applicants|people|profiles)"
+    r"(?:\s+(?:do we have|are there|are in the database|in total))?"
+    r"(?:\s+(?:do we have\s+)?(?:that |who )?(?:know|knows|have|has|with|use|uses|using|"
+    r"skilled in|experienced in|experience in|experience with)\s+(?P<skills>.+))?"
+)
+_COUNT_CANDIDATES_AR = re.compile(
+    r"كم (?:عدد )?(?:المرشحين|مرشح|المتقدمين)(?:\s+(?:لدينا|يوجد|في قاعدة البيانات))?"
+    r"(?:\s+(?:الذين |اللذين )?(?:يعرفون|يجيدون|لديهم|لديه|يملكون|يستخدمون|بمهارة|مع)\s+(?P<skills>.+))?"
+)
+_LIST_JOBS_EN = re.compile(
+    r"(?:list|show|what are|which are|any|get)\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?"
+    r"(?:open|available|current|active)?\s*(?:jobs|positions|openings|vacancies)"
+    r"(?:\s+(?:in|at|located in|based in)\s+(?P<location>.+))?"
+)
+_LIST_JOBS_AR = re.compile(
+    r"(?:(?:ما هي|اعرض|أظهر)\s+)?الوظائف(?:\s+(?:المتاحة|المفتوحة|الشاغرة))?(?:\s+(?:في|ب)\s*(?P<location>.+))?"
+)
+_JOB_APPLICANTS_EN = re.compile(
+    r"who (?:has |have )?appl(?:ied|ies)\s+(?:to|for)\s+(?:the\s+)?(?:job\s+|position\s+|role\s+)?(?P<job>.+)"
+)
+_JOB_APPLICANTS_AR = re.compile(
+    r"من (?:تقدم|قدم|تقدموا|قدموا)\s+(?:على|إلى|الى|ل)\s*(?:وظيفة\s+)?(?P<job>.+)"
+)
+
+_SKILL_SPLIT = re.compile(r"\s*(?:,|&|/|\band\b|\bor\b|\s+و)\s*")
+_TRAILING_NOISE = re.compile(r"[\s?؟!.]+$")
+_TRAILING_WORDS_EN = re.compile(r"\s+(?:job|position|role|skills?|in the database|in our database)$")
+# A captured value holding another clause ("backend role and what are their skills",
+# "cairo that need react") is a compound question, never a plain parameter
+_CLAUSE_WORDS = re.compile(
+    r"\b(?:what|which|who|whom|whose|how|why|when|where|their|them|that|need|needs|requiring|"
+    r"require|requires|with|from|have|has|are|is)\b"
+    r"|(?:^|\s)(?:ما|ماذا|كيف|لماذا|الذين|التي|الذي|لديهم|تحتاج|يحتاج)(?:\s|$)"
+)
+
+
+def detect_language(text: str) -> str:
+    """Detect whether the user writes in Arabic or English"""
+    arabic_chars = sum(1 for char in text if '\u0600' <= char <= '\u06FF')
+    english_chars = sum(1 for char in text if char.isascii() and char.isalpha())
+    total_chars = arabic_chars + english_chars
+
+    if total_chars == 0:
+        return "english"  # Default to English if no clear language detected
+
+    arabic_ratio = arabic_chars / total_chars
+    return "arabic" if arabic_ratio > 0.3 else "english"
+
+
+def contains_any(text: str, terms: List[str]) -> bool:
+    """Case-insensitive keyword check used by the chat routing"""
+    text_lower = text.lower()
+    return any(term in text_lower for term in terms)
+
+
+# ==================== CLASSIFICATION ====================
+
+@dataclass
+class Intent:
+    """Result of local intent classification"""
+    name: str  # count_candidates, list_open_jobs, job_applicants, or general
+    language: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    # True when the structured result fully answers the question
+    direct: bool = False
+
+
+def _clean(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    value = _TRAILING_NOISE.sub("", value.strip())
+    return _TRAILING_WORDS_EN.sub("", value).strip(" \"'")
+
+
+def _split_skills(value: str) -> List[str]:
+    return [s.strip().lower() for s in _SKILL_SPLIT.split(value) if s and s.strip()]
+
+
+def _fullmatch(text: str, *patterns: re.Pattern) -> Optional[re.Match]:
+    """The first pattern matching the whole question (trailing punctuation ignored)"""
+    text = _TRAILING_NOISE.sub("", text)
+    for pattern in patterns:
+        match = pattern.fullmatch(text)
+        if match:
+            return match
+    return None
+
+
+def _plain(value: str) -> bool:
+    """A single parameter, not a follow-up clause"""
+    return bool(value) and not _CLAUSE_WORDS.search(value)
+
+
+def classify_intent(query: str) -> Intent:
+    """
+    Classify a chat query with local rules (no LLM call). Only questions matched
+    as a whole are candidates for a direct answer; answer_intent still declines
+    when a skill, job or location does not resolve against the database.
+    """
+    language = detect_language(query)
+    text = query.strip().lower()
+    needs_judgement = contains_any(text, EVALUATION_TERMS)
+
+    match = _fullmatch(text, _COUNT_CANDIDATES_EN, _COUNT_CANDIDATES_AR)
+    if match:
+        skills = _split_skills(_clean(match.group("skills")))
+        if all(_plain(skill) for skill in skills):
+            return Intent("count_candidates", language, {"skills": skills}, direct=not needs_judgement)
+
+    match = _fullmatch(text, _JOB_APPLICANTS_EN, _JOB_APPLICANTS_AR)
+    if match and _plain(_clean(match.group("job"))):
+        return Intent("job_applicants", language, {"job": _clean(match.group("job"))}, direct=not needs_judgement)
+
+    match = _fullmatch(text, _LIST_JOBS_EN, _LIST_JOBS_AR)
+    if match:
+        location = _clean(match.group("location"))
+        if not location or _plain(location):
+            return Intent("list_open_jobs", language, {"location": location}, direct=not needs_judgement)
+
+    return Intent("general", language)
+
+
+# ==================== SQL ANSWERERS ====================
+
+@dataclass
+class IntentAnswer:
+    """Structured answer produced from the database"""
+    intent: str
+    response: str
+    candidates: List[str] = field(default_factory=list)
+    jobs: List[str] = field(default_factory=list)
+
+    def as_context(self) -> str:
+        """Block attached to the LLM prompt when the question still needs the model"""
+        return f"\n\nSTRUCTURED QUERY RESULTS (exact, from the database):\n{self.response}\n"
+
+
+def _known_skill(db: Session, name: str) -> bool:
+    """A skill of the dictionary (canonical name or alias) or of some candidate"""
+    if get_skill_resolver(db).resolve(name) is not None:
+        return True
+    return db.query(models.Skill.id).filter(
+        func.lower(func.trim(models.Skill.skill_name)) == name
+    ).first() is not None
+
+
+def _contains(value: str) -> str:
+    """ILIKE pattern matching `value` anywhere, with % and _ taken literally (escape '\\')"""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _more_line(total: int, listed: int, arabic: bool) -> str:
+    more = total - listed
+    if more <= 0:
+        return ""
+    return f"\n... و {more} آخرين" if arabic else f"\n... and {more} more"
+
+
+def _answer_count_candidates(intent: Intent, db: Session) -> Optional[IntentAnswer]:
+    skills = intent.params.get("skills") or []
+    arabic = intent.language == "arabic"
+    # "5 years of experience", "a masters degree": not skills, the LLM answers
+    if not all(_known_skill(db, skill) for skill in skills):
+        return None
+
+    if not skills:
+        total = db.query(func.count(models.Candidate.id)).scalar() or 0
+        response = f"يوجد {total} مرشح في قاعدة البيانات." if arabic else \
+            f"There are {total} candidate(s) in the database."
+        return IntentAnswer(intent.name, response)
+
+    # Candidates having every requested skill, resolved through the taxonomy
+    # (aliases such as "js" count candidates stored as "JavaScript")
+    matching = apply_skill_filter(db, db.query(models.Candidate), all_of=skills)
+    total = matching.count()
+    rows = matching.with_entities(
+        models.Candidate.id, models.Candidate.first_name, models.Candidate.last_name
+    ).order_by(
+        models.Candidate.first_name, models.Candidate.last_name
+    ).limit(MAX_LISTED_RESULTS).all()
+
+    skills_label = ", ".join(skills)
+    if arabic:
+        response = f"عدد المرشحين الذين لديهم ({skills_label}): {total}"
+    else:
+        response = f"{total} candidate(s) have {skills_label}."
+    if rows:
+        response += "\n" + "\n".join(f"• {r.first_name} {r.last_name}" for r in rows)
+        response += _more_line(total, len(rows), arabic)
+    return IntentAnswer(intent.name, response, candidates=[str(r.id) for r in rows])
+
+
+def _answer_list_open_jobs(intent: Intent, db: Session) -> Optional[IntentAnswer]:
+    location = intent.params.get("location")
+    arabic = intent.language == "arabic"
+    location_match = models.Job.location.ilike(_contains(location), escape="\\") if location else None
+    # Only places some job is located in; anything else is not a location
+    if location and db.query(models.Job.id).filter(location_match).first() is None:
+        return None
+
+    query = db.query(
+        models.Job.id, models.Job.title, models.Job.location, models.Job.remote_option
+    ).filter(models.Job.status == "open")
+    if location:
+        query = query.filter(location_match)
+    total = query.count()
+    jobs = query.order_by(models.Job.created_at.desc()).limit(MAX_LISTED_RESULTS).all()
+
+    where = (f" في {location}" if arabic else f" in {location}") if location else ""
+    if not jobs:
+        response = f"لا توجد وظائف مفتوحة{where} حالياً." if arabic else \
+            f"There are no open jobs{where} at the moment."
+        return IntentAnswer(intent.name, response)
+
+    response = f"الوظائف المفتوحة{where} ({total}):" if arabic else f"Open jobs{where} ({total}):"
+    for job in jobs:
+        details = ", ".join(v for v in [job.location, job.remote_option] if v)
+        response += f"\n• {job.title}" + (f" ({details})" if details else "")
+    response += _more_line(total, len(jobs), arabic)
+    return IntentAnswer(intent.name, response, jobs=[str(j.id) for j in jobs])
+
+
+def _answer_job_applicants(intent: Intent, db: Session) -> Optional[IntentAnswer]:
+    job_title = intent.params["job"]
+    arabic = intent.language == "arabic"
+    title_match = models.Job.title.ilike(_contains(job_title), escape="\\")
+    if db.query(models.Job.id).filter(title_match).first() is None:
+        return None
+
+    query = db.query(
+        models.Candidate.id, models.Candidate.first_name, models.Candidate.last_name,
+        models.Application.status, models.Job.id.label("job_id"), models.Job.title
+    ).join(
+        models.Application, models.Application.candidate_id == models.Candidate.id
+    ).join(
+        models.Job, models.Job.id == models.Application.job_id
+    ).filter(title_match)
+    total = query.count()
+    rows = query.order_by(models.Application.applied_date.desc()).limit(MAX_LISTED_RESULTS).all()
+
+    if not rows:
+        response = f"لم يتقدم أحد لوظيفة \"{job_title}\"." if arabic else \
+            f"Nobody has applied to \"{job_title}\"."
+        return IntentAnswer(intent.name, response)
+
+    response = f"المتقدمون لوظيفة \"{job_title}\" ({total}):" if arabic else \
+        f"Applicants for \"{job_title}\" ({total}):"
+    for row in rows:
+        response += f"\n• {row.first_name} {row.last_name} — {row.title} ({row.status or 'submitted'})"
+    response += _more_line(total, len(rows), arabic)
+    return IntentAnswer(
+        intent.name,
+        response,
+        candidates=list(dict.fromkeys(str(r.id) for r in rows)),
+        jobs=list(dict.fromkeys(str(r.job_id) for r in rows))
+    )
+
+
+_ANSWERERS = {
+    "count_candidates": _answer_count_candidates,
+    "list_open_jobs": _answer_list_open_jobs,
+    "job_applicants": _answer_job_applicants,
+}
+
+
+def answer_intent(intent: Intent, db: Session) -> Optional[IntentAnswer]:
+    """
+    Run the SQL answerer for a supported intent; None for general questions and
+    when a requested skill, job or location is unknown (the LLM answers those)
+    """
+    answerer = _ANSWERERS.get(intent.name)
+    if not answerer:
+        return None
+    try:
+        return answerer(intent, db)
+    except Exception as e:
+        print(f"⚠️ Intent answerer '{intent.name}' failed: {e}")
+        return None
@@ -0,0 +1,167 @@
+"""
+Map-reduce execution mode for the AI chat
+Questions that sweep the whole candidate pool ("summarise the skills landscape
+of all candidates") don't fit in one prompt. Profile cards are partitioned into
+token-budgeted batches, each batch is answered concurrently (under the shared
+AI rate limiter) and the partial answers are reduced in a final call. Failed
+batches are retried once; any still missing are reported in the answer.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+# Rough token estimate used for budgeting (≈4 characters per token)
+CHARS_PER_TOKEN = 4
+# Prompt budget for a single chat call; larger contexts switch to map-reduce in auto mode
+DEFAULT_CONTEXT_TOKEN_BUDGET = 24000
+# Profile-card budget per map batch (leaves room for instructions and the answer)
+DEFAULT_BATCH_TOKEN_BUDGET = 6000
+# Partial answers are reduced in groups so the reduce prompt also stays bounded
+MAX_PARTIALS_PER_REDUCE = 12
+# Extra attempts for a failed map batch
+MAP_BATCH_RETRIES = 1
+
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def partition_cards(cards: List[str], batch_token_budget: int) -> List[List[str]]:
+    """Greedy packing of profile cards into batches within the token budget"""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for card in cards:
+        tokens = estimate_tokens(card)
+        if current and current_tokens + tokens > batch_token_budget:
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(card)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _failure_note(failed: int, total: int) -> str:
+    """Tell the reader the answer only covers part of the candidates"""
+    if not failed:
+        return ""
+    return (f"\n\n(Note: {failed} of {total} batches of candidate profiles could not be analysed, "
+            f"so this answer covers only part of the candidate pool.)")
+
+
+async def _notify(progress: Optional[ProgressCallback], event: Dict[str, Any]):
+    if progress is not None:
+        try:
+            await progress(event)
+        except Exception as e:
+            print(f"⚠️ Progress callback failed: {e}")
+
+
+def _map_prompt(query: str, batch: List[str], index: int, total: int, language_instruction: str) -> str:
+    cards = "\n---\n".join(batch)
+    return f"""You are analysing part {index} of {total} of our candidate database.
+
+Question: {query}
+
+CANDIDATE PROFILES (this part only):
+{cards}
+
+Answer the question for THIS PART ONLY as compact notes: counts, recurring skills,
+notable candidates (exact names) and anything the final answer will need to combine.
+Do not speculate about candidates that are not listed. {language_instruction}"""
+
+
+def _reduce_prompt(query: str, partials: List[str], extra_context: str, language_instruction: str) -> str:
+    notes = "\n\n".join(f"PART {i}:\n{p}" for i, p in enumerate(partials, 1))
+    return f"""The candidate database was analysed in {len(partials)} parts. Combine the partial
+findings below into one answer to the question. Add up counts across parts, merge
+recurring themes and keep exact candidate names.
+
+Question: {query}
+
+PARTIAL FINDINGS:
+{notes}
+{extra_context}
+{language_instruction}"""
+
+
+async def map_reduce_chat(
+    query: str,
+    cards: List[str],
+    db: Session,
+    system_message: str,
+    language_instruction: str = "",
+    extra_context: str = "",
+    user_api_key: str = None,
+    progress: Optional[ProgressCallback] = None,
+    batch_token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET
+) -> str:
+    """
+    Answer a question over an arbitrarily large set of profile cards
+    Emits progress events: map_started, batch_done, map_done, reduce_started
+    """
+    # Import here to avoid circular imports
+    from app.services.ai_service import call_ai_api
+
+    batches = partition_cards(cards, batch_token_budget)
+    total = len(batches)
+    print(f"🗺️ Map-reduce chat: {len(cards)} profiles in {total} batches")
+    await _notify(progress, {"event": "map_started", "batches": total, "candidates": len(cards)})
+
+    done = 0
+
+    async def run_batch(index: int, batch: List[str]) -> Optional[str]:
+        """Partial answer for one batch, or None if every attempt failed"""
+        nonlocal done
+        partial = None
+        for attempt in range(1 + MAP_BATCH_RETRIES):
+            try:
+                # A rate-limited call must fail here, not come back as canned text
+                answer = await call_ai_api(
+                    _map_prompt(query, batch, index, total, language_instruction),
+                    system_message, user_api_key, db, mock_on_rate_limit=False
+                )
+                if answer and answer.strip():
+                    partial = answer.strip()
+                    break
+                print(f"⚠️ Map batch {index}/{total} returned an empty answer (attempt {attempt + 1})")
+            except Exception as e:
+                print(f"❌ Map batch {index}/{total} failed (attempt {attempt + 1}): {e}")
+        done += 1
+        await _notify(progress, {
+            "event": "batch_done", "batch": index, "completed": done, "batches": total,
+            "failed": partial is None
+        })
+        return partial
+
+    # The shared rate limiter inside call_ai_api bounds concurrency
+    results = await asyncio.gather(*(run_batch(i, b) for i, b in enumerate(batches, 1)))
+    partials = [p for p in results if p is not None]
+    failed = total - len(partials)
+    await _notify(progress, {"event": "map_done", "batches": total, "failed": failed})
+    if not partials:
+        raise RuntimeError(f"All {total} map-reduce batches failed")
+    if failed:
+        print(f"⚠️ Map-reduce chat: {failed} of {total} batches failed")
+
+    # Reduce in rounds until a single answer remains
+    round_number = 0
+    while True:
+        round_number += 1
+        groups = [partials[i:i + MAX_PARTIALS_PER_REDUCE] for i in range(0, len(partials), MAX_PARTIALS_PER_REDUCE)]
+        await _notify(progress, {"event": "reduce_started", "round": round_number, "inputs": len(partials)})
+        final_round = len(groups) == 1
+        partials = await asyncio.gather(*(
+            call_ai_api(
+                _reduce_prompt(query, group, extra_context if final_round else "", language_instruction),
+                system_message, user_api_key, db, mock_on_rate_limit=False
+            )
+            for group in groups
+        ))
+        if final_round:
+            return partials[0] + _failure_note(failed, total)
@@ -0,0 +1,281 @@
+"""
+Multi-factor candidate/job match engine
+Scores skills, experience, location and salary column-wise over NumPy arrays
+of the whole candidate pool. Free-text columns (locations) are interned to
+integer ids so per-job work is proportional to the number of distinct values,
+not the number of candidates. Component scores are 0-100 and are combined
+with configurable weights.
+"""
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.services.matching_service import CandidateSkillMatrix, job_skill_weights, NO_SKILLS_SCORE
+from app.services.skill_taxonomy import SkillKey, SkillResolver, get_skill_resolver
+
+CANDIDATE_POOL_TTL = 30
+
+# Scores used when one side of a comparison is unknown
+UNKNOWN_SCORE = 50.0
+# Experience: points lost per missing year, per year above the maximum (floor for overqualified)
+MISSING_YEAR_PENALTY = 25.0
+EXTRA_YEAR_PENALTY = 5.0
+OVERQUALIFIED_FLOOR = 60.0
+# Location scores by how the candidate relates to the job location
+LOCATION_PREFERRED_SCORE = 90.0
+# Same place name but the job's region/country is unconfirmed ("Alexandria" vs "Alexandria, VA, USA")
+LOCATION_UNQUALIFIED_SCORE = 75.0
+LOCATION_RELOCATE_SCORE = 70.0
+LOCATION_HYBRID_MISMATCH_SCORE = 30.0
+LOCATION_MISMATCH_SCORE = 10.0
+# Salary: points lost per 1% the expectation is above the band's maximum
+SALARY_OVER_BAND_PENALTY = 2.0
+
+
+@dataclass
+class MatchWeights:
+    skills: float = 0.55
+    experience: float = 0.20
+    location: float = 0.15
+    salary: float = 0.10
+
+    def normalized(self) -> Dict[str, float]:
+        weights = {k: max(float(v), 0.0) for k, v in asdict(self).items()}
+        total = sum(weights.values()) or 1.0
+        return {k: v / total for k, v in weights.items()}
+
+
+def get_match_weights(db: Session) -> MatchWeights:
+    """Weights from system settings (match_weight_skills, ...), defaults otherwise"""
+    # Import here to avoid circular imports
+    from app.services.ai_service import get_ai_setting
+
+    weights = MatchWeights()
+    for name, default in asdict(weights).items():
+        try:
+            setattr(weights, name, float(get_ai_setting(db, f"match_weight_{name}", str(default))))
+        except ValueError:
+            print(f"⚠️ Invalid match_weight_{name} setting, using {default}")
+    return weights
+
+
+def _normalize_location(value: Optional[str]) -> str:
+    return " ".join((value or "").lower().replace(",", " ").split())
+
+
+def _location_match(candidate_location: str, job_location: str) -> float:
+    """
+    Compare whole words, never substrings ('oman' is not in 'romania'):
+    100 when every word of the job location is in the candidate's ('cairo' vs
+    'cairo egypt'), LOCATION_UNQUALIFIED_SCORE when only the candidate's words
+    are in the job's ('alexandria' vs 'alexandria va usa'), 0 otherwise.
+    """
+    candidate_words = set(re.findall(r"\w+", candidate_location))
+    job_words = set(re.findall(r"\w+", job_location))
+    if not candidate_words or not job_words:
+        return 0.0
+    if job_words <= candidate_words:
+        return 100.0
+    if candidate_words <= job_words:
+        return LOCATION_UNQUALIFIED_SCORE
+    return 0.0
+
+
+class _Interner:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def __call__(self, value: str) -> int:
+        return self.ids.setdefault(value, len(self.ids))
+
+    def values(self) -> List[str]:
+        return list(self.ids)
+
+
+@dataclass
+class MatchJob:
+    """The job fields the engine reads"""
+    required_skills: Optional[List[SkillKey]] = None
+    preferred_skills: Optional[List[SkillKey]] = None
+    min_experience_years: Optional[int] = None
+    max_experience_years: Optional[int] = None
+    location: Optional[str] = None
+    remote_option: Optional[str] = None
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    salary_currency: Optional[str] = None
+
+    @classmethod
+    def from_job(cls, job, resolver: Optional[SkillResolver] = None) -> "MatchJob":
+        """Copy a Job; with a resolver, skills become canonical ids (stored ids when present)"""
+        match_job = cls(**{name: getattr(job, name) for name in cls.__dataclass_fields__})
+        if resolver is not None:
+            for names_field, ids_field in (("required_skills", "required_skill_ids"),
+                                           ("preferred_skills", "preferred_skill_ids")):
+                stored_ids = getattr(job, ids_field, None)
+                names = getattr(match_job, names_field) or []
+                keys = stored_ids if stored_ids is not None and names else [resolver.key(n) for n in names if n]
+                setattr(match_job, names_field, list(keys))
+        return match_job
+
+
+class CandidatePool:
+    """Column arrays for a set of candidates, aligned with their skill matrix rows"""
+
+    def __init__(self, candidates: Iterable[Tuple], skill_rows: Iterable[Tuple]):
+        """
+        candidates: (id, years_of_experience, current_location, preferred_locations,
+                     open_to_relocation, expected_salary_amount, expected_salary_currency)
+        skill_rows: (candidate_id, skill id or name)
+        """
+        candidates = list(candidates)
+        self.candidate_ids = [row[0] for row in candidates]
+        positions = {cid: i for i, cid in enumerate(self.candidate_ids)}
+
+        self.years = np.array([np.nan if r[1] is None else float(r[1]) for r in candidates], dtype=np.float64)
+        self.relocate = np.array([bool(r[4]) for r in candidates], dtype=bool)
+        self.salary = np.array([np.nan if r[5] is None else float(r[5]) for r in candidates], dtype=np.float64)
+
+        self.locations = _Interner()
+        self.location_ids = np.array([self.locations(_normalize_location(r[2])) for r in candidates], dtype=np.int32)
+        preferred = sorted({
+            (row, self.locations(_normalize_location(location)))
+            for row, r in enumerate(candidates) for location in (r[3] or []) if location
+        })
+        preferred = np.array(preferred, dtype=np.int32).reshape(-1, 2)
+        self.preferred_rows, self.preferred_ids = preferred[:, 0].copy(), preferred[:, 1].copy()
+
+        self.currencies = _Interner()
+        self.currency_ids = np.array([self.currencies((r[6] or "").upper()) for r in candidates], dtype=np.int32)
+
+        # Skill matrix rows must line up with the candidate rows
+        self.skills = CandidateSkillMatrix(
+            [(cid, None) for cid in self.candidate_ids] +
+            [(cid, name) for cid, name in skill_rows if cid in positions]
+        )
+
+    def __len__(self) -> int:
+        return len(self.candidate_ids)
+
+    # ---- components (each returns a float array of 0-100 scores) ----
+
+    def skills_score(self, job: MatchJob) -> np.ndarray:
+        if not job.required_skills and not job.preferred_skills:
+            return np.full(len(self), NO_SKILLS_SCORE)
+        return self.skills.score(job_skill_weights(job.required_skills, job.preferred_skills))
+
+    def experience_score(self, job: MatchJob) -> np.ndarray:
+        years = self.years
+        score = np.full(len(self), 100.0)
+        if job.min_experience_years is not None:
+            missing = np.maximum(job.min_experience_years - years, 0)
+            score -= np.nan_to_num(missing * MISSING_YEAR_PENALTY)
+        if job.max_experience_years is not None:
+            extra = np.maximum(years - job.max_experience_years, 0)
+            score = np.where(extra > 0, np.maximum(score - extra * EXTRA_YEAR_PENALTY, OVERQUALIFIED_FLOOR), score)
+        score = np.clip(score, 0.0, 100.0)
+        if job.min_experience_years is not None or job.max_experience_years is not None:
+            score[np.isnan(years)] = UNKNOWN_SCORE
+        return score
+
+    def location_score(self, job: MatchJob) -> np.ndarray:
+        remote = (job.remote_option or "").lower()
+        job_location = _normalize_location(job.location)
+        if not job_location or ("remote" in remote and "hybrid" not in remote):
+            return np.full(len(self), 100.0)
+
+        # Decide once per distinct location string, then gather per candidate
+        matches = np.array([_location_match(loc, job_location) for loc in self.locations.values()], dtype=np.float64)
+        unknown = np.array([not loc for loc in self.locations.values()], dtype=bool)
+        in_preferred = np.bincount(
+            self.preferred_rows, weights=(matches[self.preferred_ids] > 0).astype(np.float64), minlength=len(self)
+        ) > 0
+
+        score = np.full(len(self), LOCATION_HYBRID_MISMATCH_SCORE if "hybrid" in remote else LOCATION_MISMATCH_SCORE)
+        score = np.where(self.relocate, LOCATION_RELOCATE_SCORE, score)
+        score = np.where(in_preferred, LOCATION_PREFERRED_SCORE, score)
+        score = np.where(unknown[self.location_ids], np.maximum(score, UNKNOWN_SCORE), score)
+        return np.maximum(score, matches[self.location_ids])
+
+    def salary_score(self, job: MatchJob) -> np.ndarray:
+        if job.salary_max is None and job.salary_min is None:
+            return np.full(len(self), 100.0)
+        ceiling = float(job.salary_max if job.salary_max is not None else job.salary_min)
+        over_percent = np.maximum(self.salary - ceiling, 0) / max(ceiling, 1.0) * 100
+        score = np.clip(100.0 - over_percent * SALARY_OVER_BAND_PENALTY, 0.0, 100.0)
+
+        # Unknown expectations and different currencies cannot be compared
+        currency = (job.salary_currency or "").upper()
+        currencies = self.currencies.values()
+        comparable = np.array([not c or not currency or c == currency for c in currencies], dtype=bool)
+        return np.where(np.isnan(self.salary) | ~comparable[self.currency_ids], UNKNOWN_SCORE, score)
+
+    def score(self, job: MatchJob, weights: MatchWeights) -> Dict[str, np.ndarray]:
+        """Component and total scores (rounded to 2 decimals) for every candidate"""
+        components = {
+            "skills": self.skills_score(job),
+            "experience": self.experience_score(job),
+            "location": self.location_score(job),
+            "salary": self.salary_score(job),
+        }
+        total = sum(weight * components[name] for name, weight in weights.normalized().items())
+        components["total"] = total
+        return {name: np.round(values, 2) for name, values in components.items()}
+
+
+_CANDIDATE_COLUMNS = (
+    models.Candidate.id,
+    models.Candidate.years_of_experience,
+    models.Candidate.current_location,
+    models.Candidate.preferred_locations,
+    models.Candidate.open_to_relocation,
+    models.Candidate.expected_salary_amount,
+    models.Candidate.expected_salary_currency,
+)
+
+
+def load_candidate_pool(db: Session, candidate_ids: Optional[List] = None, active_only: bool = True) -> CandidatePool:
+    """Active candidates (optionally restricted to ids) in two queries"""
+    candidates = db.query(*_CANDIDATE_COLUMNS)
+    skills = db.query(models.Skill.candidate_id, models.Skill.skill_id, models.Skill.skill_name).join(
+        models.Candidate, models.Candidate.id == models.Skill.candidate_id
+    )
+    if active_only:
+        candidates = candidates.filter(models.Candidate.status == "active")
+        skills = skills.filter(models.Candidate.status == "active")
+    if candidate_ids is not None:
+        candidates = candidates.filter(models.Candidate.id.in_(candidate_ids))
+        skills = skills.filter(models.Skill.candidate_id.in_(candidate_ids))
+    resolver = get_skill_resolver(db)
+    skill_rows = [
+        (candidate_id, skill_id if skill_id is not None else resolver.key(name))
+        for candidate_id, skill_id, name in skills.all() if skill_id is not None or name
+    ]
+    return CandidatePool(candidates.all(), skill_rows)
+
+
+_pool: Optional[CandidatePool] = None
+_pool_built_at = 0.0
+_pool_lock = threading.Lock()
+
+
+def get_candidate_pool(db: Session) -> CandidatePool:
+    """The whole active pool, cached like the skill matrix"""
+    global _pool, _pool_built_at
+    with _pool_lock:
+        if _pool is None or time.time() - _pool_built_at > CANDIDATE_POOL_TTL:
+            _pool = load_candidate_pool(db)
+            _pool_built_at = time.time()
+        return _pool
+
+
+def invalidate_candidate_pool():
+    """Force a reload on the next match (called after candidate or skill writes)"""
+    global _pool
+    _pool = None
@@ -0,0 +1,275 @@
+"""
+Incremental maintenance of the candidate_job_matches table
+Writes queue candidates or jobs in the match_rescore_queue table; one
+background task per burst of writes (or flush_match_rescore_queue.py run as a
+job) drains the queue and rescores only what changed:
+  - queued candidates against every open job
+  - queued jobs against every active candidate
+The queue is shared by all worker processes and survives restarts; a failed
+rescore leaves its entries queued. Reads never rescore, so shortlists and
+"top jobs" views are indexed reads of what was last stored (pairs scoring at
+least MATCH_STORE_MIN_SCORE).
+"""
+import threading
+from datetime import datetime
+from typing import Iterable, List, Optional
+from uuid import UUID
+
+from fastapi import BackgroundTasks
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.database import SessionLocal
+from app.services.skill_taxonomy import get_skill_resolver
+from app.services.match_engine import (
+    CandidatePool, MatchJob, MatchWeights, get_candidate_pool, get_match_weights,
+    invalidate_candidate_pool, load_candidate_pool
+)
+
+# Pairs below this score are not stored
+MATCH_STORE_MIN_SCORE = 30.0
+UPSERT_BATCH_SIZE = 1000
+# Queue entries claimed per rescoring transaction
+RESCORE_BATCH_SIZE = 500
+# pg advisory lock key: one rescoring flush at a time across all workers
+RESCORE_LOCK_KEY = 7_305_001
+
+_flush_scheduled = False
+_schedule_lock = threading.Lock()
+
+
+def _mark(db: Session, entity_type: str, ids: Iterable, background_tasks: Optional[BackgroundTasks]):
+    global _flush_scheduled
+    ids = sorted({str(i) for i in ids if i})
+    if not ids:
+        return
+    try:
+        db.execute(
+            text("INSERT INTO match_rescore_queue (entity_type, entity_id) "
+                 "SELECT :entity_type, unnest(CAST(:ids AS uuid[]))"),
+            {"entity_type": entity_type, "ids": ids}
+        )
+        db.commit()
+    except Exception as e:
+        # Never break the write; rebuild_all_matches recovers anything missed
+        print(f"⚠️ Could not queue match rescoring: {e}")
+        db.rollback()
+        return
+    with _schedule_lock:
+        # Coalesce: one pending flush in this process covers every entry queued before it runs
+        if background_tasks is not None and not _flush_scheduled:
+            background_tasks.add_task(flush_dirty_matches)
+            _flush_scheduled = True
+
+
+def mark_candidates_dirty(db: Session, candidate_ids: Iterable, background_tasks: Optional[BackgroundTasks] = None):
+    """Queue candidates for rescoring (their skills, experience or status changed)"""
+    _mark(db, "candidate", candidate_ids, background_tasks)
+
+
+def mark_jobs_dirty(db: Session, job_ids: Iterable, background_tasks: Optional[BackgroundTasks] = None):
+    """Queue jobs for rescoring (their requirements or status changed)"""
+    _mark(db, "job", job_ids, background_tasks)
+
+
+# Engine component -> CandidateJobMatch column
+_SCORE_COLUMNS = {
+    "total": "match_score",
+    "skills": "skills_match_score",
+    "experience": "experience_match_score",
+    "location": "location_match_score",
+    "salary": "salary_match_score",
+}
+
+
+def _store_scores(db: Session, pool: CandidatePool, jobs: List[models.Job], weights: MatchWeights) -> int:
+    """Score the pool against the given jobs and upsert the pairs worth keeping"""
+    now = datetime.utcnow()
+    resolver = get_skill_resolver(db)
+    rows = []
+    for job in jobs:
+        components = pool.score(MatchJob.from_job(job, resolver), weights)
+        for row in (components["total"] >= MATCH_STORE_MIN_SCORE).nonzero()[0]:
+            values = {column: float(components[name][row]) for name, column in _SCORE_COLUMNS.items()}
+            rows.append({"candidate_id": pool.candidate_ids[row], "job_id": job.id, "calculated_at": now, **values})
+
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        statement = insert(models.CandidateJobMatch).values(rows[start:start + UPSERT_BATCH_SIZE])
+        db.execute(statement.on_conflict_do_update(
+            constraint="uq_candidate_job_matches_pair",
+            set_={
+                column: statement.excluded[column]
+                for column in list(_SCORE_COLUMNS.values()) + ["calculated_at"]
+            }
+        ))
+    return len(rows)
+
+
+def _open_jobs(db: Session, job_ids: Optional[List[UUID]] = None) -> List[models.Job]:
+    query = db.query(models.Job).filter(models.Job.status == "open")
+    if job_ids is not None:
+        query = query.filter(models.Job.id.in_(job_ids))
+    return query.all()
+
+
+def rescore_jobs(db: Session, job_ids: List[UUID]) -> int:
+    """Replace the stored matches of the given jobs (closed or deleted jobs keep none)"""
+    db.query(models.CandidateJobMatch).filter(
+        models.CandidateJobMatch.job_id.in_(job_ids)
+    ).delete(synchronize_session=False)
+    jobs = _open_jobs(db, job_ids)
+    return _store_scores(db, get_candidate_pool(db), jobs, get_match_weights(db)) if jobs else 0
+
+
+def rescore_candidates(db: Session, candidate_ids: List[UUID], skip_job_ids: Iterable[UUID] = ()) -> int:
+    """Replace the stored matches of the given candidates against open jobs"""
+    skip = set(skip_job_ids)
+    jobs = [job for job in _open_jobs(db) if job.id not in skip]
+    query = db.query(models.CandidateJobMatch).filter(
+        models.CandidateJobMatch.candidate_id.in_(candidate_ids)
+    )
+    if skip:
+        query = query.filter(models.CandidateJobMatch.job_id.notin_(skip))
+    query.delete(synchronize_session=False)
+    if not jobs:
+        return 0
+    return _store_scores(db, load_candidate_pool(db, candidate_ids), jobs, get_match_weights(db))
+
+
+def _claim_queue(db: Session, limit: int) -> list:
+    """Lock the oldest queue entries in this transaction (waits for any other worker's flush)"""
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": RESCORE_LOCK_KEY})
+    return db.execute(
+        text("SELECT id, entity_type, entity_id FROM match_rescore_queue ORDER BY id LIMIT :limit FOR UPDATE"),
+        {"limit": limit}
+    ).fetchall()
+
+
+def flush_dirty_matches(db: Optional[Session] = None, batch_size: int = RESCORE_BATCH_SIZE) -> int:
+    """Drain the rescore queue (background tasks and jobs only); returns the number of pairs stored"""
+    global _flush_scheduled
+    with _schedule_lock:
+        # Entries queued from now on schedule a new flush
+        _flush_scheduled = False
+    own_session = db is None
+    db = db or SessionLocal()
+    stored = 0
+    try:
+        while True:
+            rows = _claim_queue(db, batch_size)
+            if not rows:
+                db.rollback()
+                break
+            job_ids = sorted({row.entity_id for row in rows if row.entity_type == "job"}, key=str)
+            candidate_ids = sorted({row.entity_id for row in rows if row.entity_type == "candidate"}, key=str)
+            if job_ids:
+                stored += rescore_jobs(db, job_ids)
+            if candidate_ids:
+                # Queued jobs were just scored against every candidate
+                stored += rescore_candidates(db, candidate_ids, skip_job_ids=job_ids)
+            db.execute(text("DELETE FROM match_rescore_queue WHERE id = ANY(:ids)"), {"ids": [row.id for row in rows]})
+            db.commit()
+            print(f"🎯 Rescored matches: {len(candidate_ids)} candidate(s), {len(job_ids)} job(s), {stored} pair(s) stored")
+            if len(rows) < batch_size:
+                break
+        return stored
+    except Exception as e:
+        # The claimed entries stay queued for the next flush
+        print(f"❌ Match rescoring failed: {e}")
+        db.rollback()
+        return stored
+    finally:
+        if own_session:
+            db.close()
+
+
+def rebuild_all_matches(db: Session) -> int:
+    """Recompute every stored match (backfill)"""
+    invalidate_candidate_pool()
+    db.query(models.CandidateJobMatch).delete(synchronize_session=False)
+    stored = _store_scores(db, get_candidate_pool(db), _open_jobs(db), get_match_weights(db))
+    db.commit()
+    return stored
+
+
+def get_job_shortlist(
+    db: Session,
+    job_id: UUID,
+    limit: int = 20,
+    min_score: float = 0.0,
+    skills_all: Optional[List[str]] = None,
+    skills_any: Optional[List[str]] = None
+) -> List[dict]:
+    """Best stored matches for a job (index scan on job_id, match_score DESC), optionally skill-filtered"""
+    # Import here to avoid circular imports
+    from app.services.skill_arrays import apply_skill_filter
+
+    query = db.query(
+        models.CandidateJobMatch,
+        models.Candidate.first_name,
+        models.Candidate.last_name,
+        models.Candidate.email,
+        models.Candidate.current_location,
+        models.Candidate.career_level,
+        models.Candidate.years_of_experience,
+    ).join(
+        models.Candidate, models.Candidate.id == models.CandidateJobMatch.candidate_id
+    ).filter(
+        models.CandidateJobMatch.job_id == job_id,
+        models.CandidateJobMatch.match_score >= min_score
+    )
+    query = apply_skill_filter(db, query, all_of=skills_all, any_of=skills_any)
+    rows = query.order_by(models.CandidateJobMatch.match_score.desc()).limit(limit).all()
+
+    applied = {
+        candidate_id for (candidate_id,) in db.query(models.Application.candidate_id).filter(
+            models.Application.job_id == job_id,
+            models.Application.candidate_id.in_([row[0].candidate_id for row in rows])
+        )
+    } if rows else set()
+
+    return [
+        {
+            "candidate_id": match.candidate_id,
+            "name": f"{first_name} {last_name}",
+            "email": email,
+            "current_location": current_location,
+            "career_level": career_level,
+            "years_of_experience": years_of_experience,
+            **_match_scores(match),
+            "has_applied": match.candidate_id in applied,
+        }
+        for match, first_name, last_name, email, current_location, career_level, years_of_experience in rows
+    ]
+
+
+def get_candidate_top_jobs(db: Session, candidate_id: UUID, limit: int = 10) -> List[dict]:
+    """Best stored matches for a candidate (index scan on candidate_id, match_score DESC)"""
+    rows = db.query(
+        models.CandidateJobMatch,
+        models.Job.title,
+        models.Job.company_name,
+        models.Job.location,
+    ).join(
+        models.Job, models.Job.id == models.CandidateJobMatch.job_id
+    ).filter(
+        models.CandidateJobMatch.candidate_id == candidate_id
+    ).order_by(models.CandidateJobMatch.match_score.desc()).limit(limit).all()
+
+    return [
+        {"job_id": match.job_id, "title": title, "company_name": company_name, "location": location,
+         **_match_scores(match)}
+        for match, title, company_name, location in rows
+    ]
+
+
+def _match_scores(match: models.CandidateJobMatch) -> dict:
+    return {
+        **{
+            column: float(getattr(match, column)) if getattr(match, column) is not None else None
+            for column in _SCORE_COLUMNS.values()
+        },
+        "calculated_at": match.calculated_at,
+    }
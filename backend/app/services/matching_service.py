@@ -1,7 +1,34 @@
 from sqlalchemy.orm import Session
 from app.db import models
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from uuid import UUID
+import heapq
+
+import numpy as np
+
+# Required skills are worth 70%, preferred skills 30%
+REQUIRED_WEIGHT = 70.0
+PREFERRED_WEIGHT = 30.0
+NO_SKILLS_SCORE = 50.0
+
+
+def _normalize_skill(skill):
+    """Skill names compare case-insensitively; skill ids (see skill_taxonomy) as-is"""
+    return skill.lower().strip() if isinstance(skill, str) else skill
+
+
+def job_skill_weights(required_skills: Optional[List], preferred_skills: Optional[List]) -> Dict:
+    """
+    Points each (normalised) skill is worth for a job; a perfect match sums to 100.
+    A skill listed twice, or as both required and preferred, counts each time.
+    """
+    weights: Dict[str, float] = {}
+    for skills, total_weight in ((required_skills or [], REQUIRED_WEIGHT), (preferred_skills or [], PREFERRED_WEIGHT)):
+        for skill in skills:
+            if skill not in (None, ""):
+                key = _normalize_skill(skill)
+                weights[key] = weights.get(key, 0.0) + total_weight / len(skills)
+    return weights
 
 
 async def calculate_match_score(
@@ -11,51 +38,59 @@ async def calculate_match_score(
 ) -> float:
     """
     Calculate match score between a candidate and a job.
-    Returns a score from 0 to 100.
+    Returns a score from 0 to 100 (skills, experience, location and salary).
     """
-    # Get candidate skills (skill names)
-    candidate_skills = db.query(models.Skill).filter(
-        models.Skill.candidate_id == candidate_id
-    ).all()
-    
-    # Create set of candidate skill names (case-insensitive)
-    candidate_skill_names = {skill.skill_name.lower().strip() for skill in candidate_skills if skill.skill_name}
-    
-    # Get job
+    # Import here to avoid circular imports
+    from app.services.match_engine import MatchJob, get_match_weights, load_candidate_pool
+    from app.services.skill_taxonomy import get_skill_resolver
+
     job = db.query(models.Job).filter(models.Job.id == job_id).first()
     if not job:
         return 0.0
-    
-    # Get job required and preferred skills
-    required_skills = job.required_skills if job.required_skills else []
-    preferred_skills = job.preferred_skills if job.preferred_skills else []
-    
-    if not required_skills and not preferred_skills:
-        # No skills defined for job, return neutral score
-        return 50.0
-    
-    # Count matching skills (case-insensitive comparison)
-    matched_required = sum(
-        1 for skill in required_skills 
-        if skill.lower().strip() in candidate_skill_names
-    )
-    
-    matched_preferred = sum(
-        1 for skill in preferred_skills 
-        if skill.lower().strip() in candidate_skill_names
-    )
-    
-    # Calculate score
-    # Required skills are worth 70%, preferred skills 30%
-    total_required = len(required_skills) if required_skills else 1
-    total_preferred = len(preferred_skills) if preferred_skills else 1
-    
-    required_score = (matched_required / total_required) * 70
-    preferred_score = (matched_preferred / total_preferred) * 30
-    
-    total_score = required_score + preferred_score
-    
-    return round(total_score, 2)
+
+    pool = load_candidate_pool(db, [candidate_id], active_only=False)
+    if not len(pool):
+        return 0.0
+    match_job = MatchJob.from_job(job, get_skill_resolver(db))
+    return float(pool.score(match_job, get_match_weights(db))["total"][0])
+
+
+class CandidateSkillMatrix:
+    """
+    Sparse (COO) candidate x skill incidence matrix over the active pool.
+    Skills (canonical skill ids, or names for unresolved skills) are interned to
+    column numbers, so scoring a job is one gather over the non-zeros plus a
+    segment sum (np.bincount) - no per-candidate Python.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[UUID, Optional[Union[int, str]]]]):
+        self.vocabulary: Dict[Union[int, str], int] = {}
+        self.candidate_ids: List[UUID] = []
+        positions: Dict[UUID, int] = {}
+        pairs = set()
+        for candidate_id, skill in rows:
+            row = positions.get(candidate_id)
+            if row is None:
+                row = positions[candidate_id] = len(self.candidate_ids)
+                self.candidate_ids.append(candidate_id)
+            if skill not in (None, ""):
+                column = self.vocabulary.setdefault(_normalize_skill(skill), len(self.vocabulary))
+                pairs.add((row, column))
+        entries = np.array(sorted(pairs), dtype=np.int32).reshape(-1, 2)
+        self.entry_rows = entries[:, 0].copy()
+        self.entry_skills = entries[:, 1].copy()
+
+    def __len__(self) -> int:
+        return len(self.candidate_ids)
+
+    def score(self, weights: Dict) -> np.ndarray:
+        """Summed weight of each candidate's skills; skills unknown to the pool score nothing"""
+        skill_weights = np.zeros(len(self.vocabulary) + 1, dtype=np.float64)
+        for skill, weight in weights.items():
+            column = self.vocabulary.get(skill)
+            if column is not None:
+                skill_weights[column] = weight
+        return np.bincount(self.entry_rows, weights=skill_weights[self.entry_skills], minlength=len(self))
 
 
 async def get_top_matches_for_job(
@@ -66,30 +101,45 @@ async def get_top_matches_for_job(
 ) -> list:
     """
     Get top matching candidates for a job
+    Scores the whole active pool at once; only the top `limit` candidates are
+    loaded as ORM objects.
     """
-    # Get all candidates
-    candidates = db.query(models.Candidate).filter(
-        models.Candidate.status == "active"
-    ).all()
-    
-    matches = []
-    for candidate in candidates:
-        # Check if already applied
-        existing_app = db.query(models.Application).filter(
-            models.Application.candidate_id == candidate.id,
-            models.Application.job_id == job_id
-        ).first()
-        
-        score = await calculate_match_score(candidate.id, job_id, db)
-        
-        if score >= min_score:
-            matches.append({
-                "candidate": candidate,
-                "score": score,
-                "has_applied": existing_app is not None
-            })
-    
-    # Sort by score
-    matches.sort(key=lambda x: x["score"], reverse=True)
-    
-    return matches[:limit]
+    # Import here to avoid circular imports
+    from app.services.match_engine import MatchJob, get_candidate_pool, get_match_weights
+    from app.services.skill_taxonomy import get_skill_resolver
+
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job:
+        return []
+
+    pool = get_candidate_pool(db)
+    components = pool.score(MatchJob.from_job(job, get_skill_resolver(db)), get_match_weights(db))
+    scores = components["total"]
+
+    eligible = np.flatnonzero(scores >= min_score)
+    top_rows = heapq.nlargest(limit, eligible.tolist(), key=scores.__getitem__)
+    if not top_rows:
+        return []
+
+    top_ids = [pool.candidate_ids[row] for row in top_rows]
+    candidates = {
+        candidate.id: candidate
+        for candidate in db.query(models.Candidate).filter(models.Candidate.id.in_(top_ids))
+    }
+    applied = {
+        candidate_id for (candidate_id,) in db.query(models.Application.candidate_id).filter(
+            models.Application.job_id == job_id,
+            models.Application.candidate_id.in_(top_ids)
+        )
+    }
+
+    return [
+        {
+            "candidate": candidates[candidate_id],
+            "score": float(scores[row]),
+            "components": {name: float(values[row]) for name, values in components.items() if name != "total"},
+            "has_applied": candidate_id in applied
+        }
+        for row, candidate_id in zip(top_rows, top_ids)
+        if candidate_id in candidates  # deleted since the pool was loaded
+    ]
@@ -0,0 +1,242 @@
+"""
+Natural-language to structured-filter compilation for candidate queries
+Turns a recruiter question ("senior Python and Django developers in Cairo with
+5+ years, fluent in English") into a typed CandidateFilter that runs as an
+indexed SQL query. The LLM then only ranks and summarises the filtered set.
+"""
+import json
+import re
+import time
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional, Set
+
+from sqlalchemy import exists, func
+from sqlalchemy.orm import Session, Query
+
+from app.db import models
+from app.services.skill_arrays import apply_skill_filter
+
+# Known skill vocabulary is refreshed at most this often (seconds)
+SKILL_VOCABULARY_TTL = 300
+
+# Seniority words only; role titles such as "manager" describe the job, not the level
+CAREER_LEVEL_TERMS = {
+    "entry-level": "Entry", "entry level": "Entry", "junior": "Entry", "graduate": "Entry", "مبتدئ": "Entry",
+    "mid-level": "Mid", "mid level": "Mid", "intermediate": "Mid", "متوسط": "Mid",
+    "senior": "Senior", "sr": "Senior", "خبير": "Senior",
+    "lead": "Lead", "principal": "Lead",
+}
+CAREER_LEVELS = ["Entry", "Mid", "Senior", "Lead", "Manager", "Director", "Executive"]
+
+LANGUAGE_TERMS = {
+    "english": "English", "arabic": "Arabic", "french": "French", "german": "German",
+    "spanish": "Spanish", "italian": "Italian", "turkish": "Turkish", "chinese": "Chinese",
+    "الإنجليزية": "English", "الانجليزية": "English", "إنجليزي": "English", "انجليزي": "English",
+    "العربية": "Arabic", "عربي": "Arabic", "الفرنسية": "French", "فرنسي": "French",
+    "الألمانية": "German", "ألماني": "German",
+}
+LANGUAGE_CONTEXT_TERMS = ["speak", "speaks", "speaking", "fluent", "language", "native", "يتحدث", "يجيد", "لغة", "اللغة"]
+
+_MIN_YEARS = re.compile(
+    r"(?:(?:at least|minimum(?: of)?|min\.?|more than|over|أكثر من|على الأقل)\s*)?"
+    r"(\d{1,2})\s*(\+)?\s*(?:years?|yrs?|سنوات|سنة|عام|أعوام)"
+)
+_MAX_YEARS = re.compile(r"(?:less than|under|up to|at most|أقل من)\s*(\d{1,2})\s*(?:years?|yrs?|سنوات|سنة|عام)")
+# A candidate location only from an explicit residence phrase and a capitalised
+# name: "in Cairo" may be a job's city, "from IBM" an employer, "worked in Dubai"
+# past experience. Arabic has no capitalisation, so Arabic locations are left to the LLM mode.
+_LOCATION_EN = re.compile(
+    r"\b(?:based in|located in|living in|lives in|residing in|resident in)\s+"
+    r"([A-Z][A-Za-z\-]+(?:\s+[A-Z][A-Za-z\-]+)?)"
+)
+_NON_LOCATION_WORDS = {
+    "the", "our", "database", "system", "total", "experience", "years", "year",
+    "field", "team", "house", "office", "english", "arabic",
+}
+# Skill names that are also everyday words ("should we go with", "best
+# communication skills", "the sales job"); the rules never read them as skills
+_COMMON_WORDS = {
+    "a", "an", "and", "any", "are", "as", "at", "be", "best", "by", "can", "do", "for", "go", "good",
+    "has", "have", "in", "is", "it", "new", "of", "on", "or", "our", "out", "the", "to", "up", "we",
+    "who", "with", "work", "communication", "leadership", "teamwork", "management", "sales",
+    "marketing", "design", "support", "research", "writing", "planning", "training", "testing",
+    "security", "networking", "operations", "presentation", "negotiation", "problem solving",
+    "time management", "customer service",
+}
+
+_vocabulary_cache = {"loaded_at": 0.0, "skills": set()}
+
+
+@dataclass
+class CandidateFilter:
+    """Typed candidate filter compiled from a natural-language query"""
+    skills: List[str] = field(default_factory=list)  # candidate must have all (lowercase)
+    min_years: Optional[int] = None
+    max_years: Optional[int] = None
+    location: Optional[str] = None
+    career_level: Optional[str] = None
+    languages: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.skills or self.min_years is not None or self.max_years is not None
+                    or self.location or self.career_level or self.languages)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def describe(self) -> str:
+        """Human-readable summary used in prompts and direct answers"""
+        parts = []
+        if self.skills:
+            parts.append(f"skills ⊇ {{{', '.join(self.skills)}}}")
+        if self.min_years is not None:
+            parts.append(f"years ≥ {self.min_years}")
+        if self.max_years is not None:
+            parts.append(f"years < {self.max_years}")
+        if self.location:
+            parts.append(f"location ~ {self.location}")
+        if self.career_level:
+            parts.append(f"career level = {self.career_level}")
+        if self.languages:
+            parts.append(f"languages ⊇ {{{', '.join(self.languages)}}}")
+        return ", ".join(parts)
+
+
+def get_skill_vocabulary(db: Session) -> Set[str]:
+    """Distinct lowercase skill names present in the database (cached)"""
+    now = time.time()
+    if now - _vocabulary_cache["loaded_at"] > SKILL_VOCABULARY_TTL:
+        rows = db.query(func.distinct(func.lower(func.trim(models.Skill.skill_name)))).all()
+        _vocabulary_cache["skills"] = {r[0] for r in rows if r[0]}
+        _vocabulary_cache["loaded_at"] = now
+    return _vocabulary_cache["skills"]
+
+
+def _contains_term(text: str, term: str) -> bool:
+    """Whole-word containment that also works for terms like 'c++' or 'node.js'"""
+    return re.search(r"(?<![\w+#.])" + re.escape(term) + r"(?![\w+#])", text) is not None
+
+
+def compile_filter_rules(query: str, known_skills: Optional[Set[str]] = None) -> CandidateFilter:
+    """Compile a query into a CandidateFilter with local rules (no LLM call)"""
+    text = query.lower()
+    candidate_filter = CandidateFilter()
+
+    # Skills: whole-word matches against the known vocabulary, longest first so
+    # "machine learning" wins over "learning"; everyday words and spoken languages
+    # (handled below) are skipped
+    if known_skills:
+        remaining = text
+        for skill in sorted(known_skills, key=len, reverse=True):
+            if len(skill) <= 1 or skill in _COMMON_WORDS or skill in LANGUAGE_TERMS:
+                continue
+            if _contains_term(remaining, skill):
+                candidate_filter.skills.append(skill)
+                remaining = remaining.replace(skill, " ")
+
+    match = _MAX_YEARS.search(text)
+    if match:
+        candidate_filter.max_years = int(match.group(1))
+        text_for_min = text[:match.start()] + text[match.end():]
+    else:
+        text_for_min = text
+    match = _MIN_YEARS.search(text_for_min)
+    if match:
+        candidate_filter.min_years = int(match.group(1))
+
+    for term, level in CAREER_LEVEL_TERMS.items():
+        if _contains_term(text, term):
+            candidate_filter.career_level = level
+            break
+
+    if any(term in text for term in LANGUAGE_CONTEXT_TERMS):
+        for term, language in LANGUAGE_TERMS.items():
+            if _contains_term(text, term) and language not in candidate_filter.languages:
+                candidate_filter.languages.append(language)
+
+    skills = set(candidate_filter.skills)
+    for match in _LOCATION_EN.finditer(query):
+        location = match.group(1).strip(" ?؟.,")
+        lowered = location.lower()
+        if (lowered in _NON_LOCATION_WORDS or lowered in skills or lowered.isdigit()
+                or lowered in LANGUAGE_TERMS or (known_skills and lowered in known_skills)):
+            continue
+        candidate_filter.location = location
+        break
+
+    return candidate_filter
+
+
+async def compile_filter_llm(query: str, db: Session, user_api_key: str = None) -> CandidateFilter:
+    """Compile a query with one short LLM call; falls back to local rules on any failure"""
+    # Import here to avoid circular imports
+    from app.core.config import settings
+    from app.services.ai_service import call_ai_api
+
+    known_skills = get_skill_vocabulary(db)
+    fallback = compile_filter_rules(query, known_skills)
+    if settings.USE_MOCK_AI:
+        return fallback
+
+    system_message = "You convert recruiter questions into JSON search filters. Return ONLY JSON."
+    prompt = f"""Convert this recruiter question into a candidate filter.
+
+Question: {query}
+
+Return JSON with exactly these keys (use null / [] when not mentioned):
+{{"skills": ["python"], "min_years": 5, "max_years": null, "location": "Cairo",
+ "career_level": "Entry|Mid|Senior|Lead|Manager|Director|Executive", "languages": ["English"]}}"""
+    try:
+        response = await call_ai_api(prompt, system_message, user_api_key, db)
+        json_text = response.strip().strip("`")
+        if json_text.startswith("json"):
+            json_text = json_text[4:]
+        data = json.loads(json_text)
+        career_level = data.get("career_level")
+        return CandidateFilter(
+            skills=[str(s).strip().lower() for s in data.get("skills") or [] if str(s).strip()],
+            min_years=int(data["min_years"]) if data.get("min_years") is not None else None,
+            max_years=int(data["max_years"]) if data.get("max_years") is not None else None,
+            location=(data.get("location") or None),
+            career_level=career_level if career_level in CAREER_LEVELS else None,
+            languages=[str(l).strip().title() for l in data.get("languages") or [] if str(l).strip()],
+        )
+    except Exception as e:
+        print(f"⚠️ LLM filter compilation failed, using rules: {e}")
+        return fallback
+
+
+async def compile_candidate_filter(query: str, db: Session, user_api_key: str = None) -> CandidateFilter:
+    """Compile with the mode configured in settings: 'rules' (default), 'llm' or 'off'"""
+    # Import here to avoid circular imports
+    from app.services.ai_service import get_ai_setting
+
+    mode = (get_ai_setting(db, "ai_query_filter_mode", "rules") or "rules").lower()
+    if mode == "off":
+        return CandidateFilter()
+    if mode == "llm":
+        return await compile_filter_llm(query, db, user_api_key)
+    return compile_filter_rules(query, get_skill_vocabulary(db))
+
+
+def apply_candidate_filter(db: Session, query: Query, candidate_filter: CandidateFilter) -> Query:
+    """Add the filter's constraints to a Candidate query as indexed SQL predicates"""
+    Candidate = models.Candidate
+
+    if candidate_filter.skills:
+        # Taxonomy ids where known, so aliases match (GIN-indexed, see skill_arrays.py)
+        query = apply_skill_filter(db, query, all_of=candidate_filter.skills)
+    if candidate_filter.min_years is not None:
+        query = query.filter(Candidate.years_of_experience >= candidate_filter.min_years)
+    if candidate_filter.max_years is not None:
+        query = query.filter(Candidate.years_of_experience < candidate_filter.max_years)
+    if candidate_filter.location:
+        query = query.filter(Candidate.current_location.ilike(f"%{candidate_filter.location}%"))
+    if candidate_filter.career_level:
+        query = query.filter(func.lower(Candidate.career_level) == candidate_filter.career_level.lower())
+    for language in candidate_filter.languages:
+        query = query.filter(exists().where(
+            models.Language.candidate_id == Candidate.id,
+            func.lower(models.Language.language_name) == language.lower()
+        ))
+    return query
@@ -0,0 +1,131 @@
+"""
+PostgreSQL full-text search over candidates
+Maintains one row per candidate in `candidate_search_documents` (names, skills,
+titles, companies, summary, resume text) whose generated tsvector columns are
+GIN-indexed, and ranks matches with ts_rank_cd plus ts_headline snippets.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import cast, func, literal, text
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.services.experience_totals import apply_experience_filter
+from app.services.intent_router import detect_language
+
+# Resume text is truncated before indexing (tsvector values are capped at 1MB)
+MAX_RESUME_CHARS = 200000
+HEADLINE_OPTIONS = "MaxFragments=2, MinWords=5, MaxWords=20, StartSel=<mark>, StopSel=</mark>"
+
+_REFRESH_SQL = """
+INSERT INTO candidate_search_documents
+    (candidate_id, names, skills, titles, companies, summary, resume_text, updated_at)
+SELECT
+    c.id,
+    concat_ws(' ', c.first_name, c.last_name),
+    (SELECT string_agg(s.skill_name, ', ') FROM skills s WHERE s.candidate_id = c.id),
+    (SELECT string_agg(concat_ws(' ', w.job_title, array_to_string(w.technologies_used, ' ')), ', ')
+       FROM work_experience w WHERE w.candidate_id = c.id),
+    (SELECT string_agg(w.company_name, ', ') FROM work_experience w WHERE w.candidate_id = c.id),
+    c.professional_summary,
+    (SELECT left(string_agg(r.extracted_text, E'\\n' ORDER BY r.version DESC), :max_resume_chars)
+       FROM resumes r WHERE r.candidate_id = c.id AND r.extracted_text NOT LIKE '[PDF%'),
+    now()
+FROM candidates c
+{where}
+ON CONFLICT (candidate_id) DO UPDATE SET
+    names = EXCLUDED.names,
+    skills = EXCLUDED.skills,
+    titles = EXCLUDED.titles,
+    companies = EXCLUDED.companies,
+    summary = EXCLUDED.summary,
+    resume_text = EXCLUDED.resume_text,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+def refresh_search_documents(db: Session, candidate_ids: Optional[Iterable] = None, commit: bool = True) -> int:
+    """Rebuild the search documents of the given candidates (all candidates when None)"""
+    params: Dict[str, Any] = {"max_resume_chars": MAX_RESUME_CHARS}
+    if candidate_ids is None:
+        where = ""
+    else:
+        params["ids"] = [str(cid) for cid in candidate_ids]
+        if not params["ids"]:
+            return 0
+        where = "WHERE c.id = ANY(CAST(:ids AS uuid[]))"
+    result = db.execute(text(_REFRESH_SQL.format(where=where)), params)
+    if commit:
+        db.commit()
+    return result.rowcount
+
+
+def search_candidates_fulltext(
+    db: Session,
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+    language: Optional[str] = None,
+    min_experience_years: Optional[float] = None,
+    max_experience_years: Optional[float] = None,
+    sort: str = "relevance"
+) -> List[Dict[str, Any]]:
+    """
+    Ranked candidates matching a web-style query (quotes, OR, -exclusion) with highlighted snippets.
+    Optionally restricted to a range of total experience, or sorted by it (sort="experience").
+    """
+    language = language or detect_language(query)
+    config = "arabic" if language == "arabic" else "english"
+    Document = models.CandidateSearchDocument
+    vector = Document.search_vector_ar if config == "arabic" else Document.search_vector_en
+    ts_query = func.websearch_to_tsquery(cast(literal(config), REGCONFIG), query)
+
+    # Rank on the index first; headlines are computed only for the returned page
+    rank = func.ts_rank_cd(vector, ts_query).label("rank")
+    page = db.query(
+        Document.candidate_id.label("candidate_id"),
+        rank,
+        func.concat_ws(
+            " · ", Document.skills, Document.titles, Document.summary, func.left(Document.resume_text, 20000)
+        ).label("source")
+    ).filter(vector.op("@@")(ts_query))
+    order = [rank.desc()]
+    if sort == "experience" or min_experience_years is not None or max_experience_years is not None:
+        # Stored totals: no work history is read to filter or order the page
+        page = page.join(models.Candidate, models.Candidate.id == Document.candidate_id)
+        page = apply_experience_filter(page, min_experience_years, max_experience_years)
+        if sort == "experience":
+            order.insert(0, models.Candidate.total_experience_months.desc())
+    page = page.order_by(*order).offset(offset).limit(limit).subquery()
+    page_order = [page.c.rank.desc()]
+    if sort == "experience":
+        page_order.insert(0, models.Candidate.total_experience_months.desc())
+
+    rows = db.query(
+        models.Candidate.id,
+        models.Candidate.first_name,
+        models.Candidate.last_name,
+        models.Candidate.email,
+        models.Candidate.current_location,
+        models.Candidate.career_level,
+        models.Candidate.years_of_experience,
+        models.Candidate.total_experience_months,
+        page.c.rank,
+        func.ts_headline(cast(literal(config), REGCONFIG), page.c.source, ts_query, HEADLINE_OPTIONS).label("snippet")
+    ).join(page, page.c.candidate_id == models.Candidate.id).order_by(*page_order).all()
+
+    return [
+        {
+            "id": row.id,
+            "name": f"{row.first_name} {row.last_name}",
+            "email": row.email,
+            "current_location": row.current_location,
+            "career_level": row.career_level,
+            "years_of_experience": row.years_of_experience,
+            "total_experience_months": row.total_experience_months,
+            "rank": round(float(row.rank), 6),
+            "snippet": row.snippet,
+        }
+        for row in rows
+    ]
@@ -0,0 +1,100 @@
+"""
+Denormalised candidate skill arrays
+candidates.skill_ids (canonical ids, see skill_taxonomy) and
+candidates.skill_names (lower(trim(skill_name))) mirror the skills table and
+are GIN-indexed, so "has all of" / "has any of" filters are single indexed
+array predicates (@> / &&) instead of joins against skills.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import or_, text
+from sqlalchemy.orm import Query, Session
+
+from app.db import models
+from app.services.skill_taxonomy import get_skill_resolver
+
+_REFRESH_SQL = """
+UPDATE candidates c SET
+    skill_ids = coalesce(agg.skill_ids, '{{}}'),
+    skill_names = coalesce(agg.skill_names, '{{}}')
+FROM candidates target
+LEFT JOIN (
+    SELECT s.candidate_id,
+           array_agg(DISTINCT s.skill_id) FILTER (WHERE s.skill_id IS NOT NULL) AS skill_ids,
+           array_agg(DISTINCT lower(trim(s.skill_name))) FILTER (WHERE s.skill_name IS NOT NULL) AS skill_names
+    FROM skills s
+    {skills_where}
+    GROUP BY s.candidate_id
+) agg ON agg.candidate_id = target.id
+WHERE c.id = target.id {candidates_where}
+"""
+
+
+def refresh_candidate_skill_arrays(db: Session, candidate_ids: Optional[Iterable] = None, commit: bool = True) -> int:
+    """Recompute the skill arrays of the given candidates (all candidates when None)"""
+    params: Dict[str, Any] = {}
+    if candidate_ids is None:
+        skills_where = candidates_where = ""
+    else:
+        params["ids"] = [str(cid) for cid in candidate_ids]
+        if not params["ids"]:
+            return 0
+        skills_where = "WHERE s.candidate_id = ANY(CAST(:ids AS uuid[]))"
+        candidates_where = "AND target.id = ANY(CAST(:ids AS uuid[]))"
+    result = db.execute(text(_REFRESH_SQL.format(skills_where=skills_where, candidates_where=candidates_where)), params)
+    if commit:
+        db.commit()
+    return result.rowcount
+
+
+def _split(skills: Optional[Iterable[str]]) -> List[str]:
+    """Accept repeated and comma-separated values; drop blanks"""
+    names = []
+    for value in skills or []:
+        names.extend(part.strip() for part in str(value).split(","))
+    return [name for name in names if name]
+
+
+def _skill_predicates(db: Session, names: List[str]) -> List:
+    """One predicate per requested skill: the canonical id when known, else the lowercase name"""
+    if not names:
+        return []
+    resolver = get_skill_resolver(db)
+    predicates = []
+    for name in names:
+        skill_id = resolver.resolve(name)
+        if skill_id is not None:
+            predicates.append(("ids", skill_id))
+        else:
+            predicates.append(("names", name.lower()))
+    return predicates
+
+
+def apply_skill_filter(
+    db: Session,
+    query: Query,
+    all_of: Optional[Iterable[str]] = None,
+    any_of: Optional[Iterable[str]] = None
+) -> Query:
+    """Restrict a query over Candidate to candidates with all of / any of the given skills"""
+    Candidate = models.Candidate
+
+    required = _skill_predicates(db, _split(all_of))
+    ids = [value for kind, value in required if kind == "ids"]
+    names = [value for kind, value in required if kind == "names"]
+    if ids:
+        query = query.filter(Candidate.skill_ids.contains(ids))
+    if names:
+        query = query.filter(Candidate.skill_names.contains(names))
+
+    optional = _skill_predicates(db, _split(any_of))
+    ids = [value for kind, value in optional if kind == "ids"]
+    names = [value for kind, value in optional if kind == "names"]
+    clauses = []
+    if ids:
+        clauses.append(Candidate.skill_ids.overlap(ids))
+    if names:
+        clauses.append(Candidate.skill_names.overlap(names))
+    if clauses:
+        query = query.filter(or_(*clauses))
+    return query
@@ -0,0 +1,261 @@
+"""
+Canonical skill taxonomy
+Every skill string ("JS", "Javascript", "JavaScript ES6") resolves to one
+integer id in `skill_dictionary`. Ids are assigned at write time by a
+before_flush hook: Skill.skill_id for candidate skills and
+Job.required_skill_ids / preferred_skill_ids for jobs. Skills not in the
+dictionary are added as new canonical entries, so every skill has an id.
+"""
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+RESOLVER_TTL = 300
+
+# Canonical name -> aliases (matched after key normalisation, see skill_key)
+SEED_TAXONOMY: Dict[str, List[str]] = {
+    "JavaScript": ["js", "javascript es6", "es6", "es2015", "ecmascript", "vanilla js"],
+    "TypeScript": ["ts"],
+    "Python": ["python3", "py"],
+    "Java": ["java se", "java ee", "j2ee", "jakarta ee"],
+    "C#": ["csharp", "c sharp"],
+    "C++": ["cpp", "cplusplus"],
+    "C": ["ansi c"],
+    "Go": ["golang"],
+    "Rust": [],
+    "PHP": [],
+    "Ruby": [],
+    "Ruby on Rails": ["rails", "ror"],
+    "Kotlin": [],
+    "Swift": [],
+    "Dart": [],
+    "R": [],
+    "SQL": ["structured query language"],
+    "PostgreSQL": ["postgres", "psql", "pgsql"],
+    "MySQL": [],
+    "Microsoft SQL Server": ["mssql", "sql server", "ms sql"],
+    "Oracle Database": ["oracle", "oracle db", "pl sql", "plsql"],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Elasticsearch": ["elastic search", "elk"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "Sass": ["scss"],
+    "Tailwind CSS": ["tailwind"],
+    "Bootstrap": [],
+    "React": ["reactjs", "react js", "react.js"],
+    "React Native": [],
+    "Next.js": ["nextjs", "next"],
+    "Angular": ["angularjs", "angular js", "angular 2"],
+    "Vue.js": ["vue", "vuejs", "vue js"],
+    "Node.js": ["node", "nodejs", "node js"],
+    "Express.js": ["express", "expressjs"],
+    "NestJS": ["nest", "nest js"],
+    "Django": [],
+    "Django REST Framework": ["drf", "django rest"],
+    "Flask": [],
+    "FastAPI": ["fast api"],
+    "Spring Boot": ["spring", "springboot"],
+    ".NET": ["dotnet", "dot net", "asp.net", "asp.net core", ".net core"],
+    "Laravel": [],
+    "GraphQL": [],
+    "REST APIs": ["rest", "restful", "rest api", "restful apis", "restful api"],
+    "Docker": ["containers", "containerization"],
+    "Kubernetes": ["k8s"],
+    "Amazon Web Services": ["aws", "amazon aws"],
+    "Microsoft Azure": ["azure"],
+    "Google Cloud Platform": ["gcp", "google cloud"],
+    "Terraform": [],
+    "CI/CD": ["cicd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Git": ["github", "gitlab", "version control"],
+    "Linux": [],
+    "Machine Learning": ["ml"],
+    "Deep Learning": ["dl"],
+    "Artificial Intelligence": ["ai"],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": ["cv"],
+    "TensorFlow": ["tensor flow"],
+    "PyTorch": ["torch"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "Pandas": [],
+    "NumPy": [],
+    "Data Analysis": ["data analytics"],
+    "Power BI": ["powerbi"],
+    "Tableau": [],
+    "Microsoft Excel": ["excel", "ms excel"],
+    "Microsoft Office": ["ms office", "office 365"],
+    "Agile": ["agile methodology"],
+    "Scrum": [],
+    "Jira": [],
+    "Project Management": ["pm"],
+    "Communication": ["communication skills"],
+    "Leadership": ["team leadership"],
+    "Problem Solving": ["problem-solving", "problem solving skills"],
+    "Teamwork": ["team work", "team player"],
+    "Figma": [],
+    "UI/UX Design": ["ui ux", "ux", "ui", "ui design", "ux design"],
+    "Selenium": [],
+    "Unit Testing": ["tdd"],
+    "Microservices": ["micro services"],
+}
+
+# Trailing version markers: "python 3.10" -> "python", "html5" -> "html", "angular 2" -> "angular"
+_VERSION_SUFFIX = re.compile(r"(?<=[a-z+#])\s*v?\d+(\.\d+)*x?$")
+_SEPARATORS = re.compile(r"[\s._\-/]+")
+
+SkillKey = Union[int, str]
+
+
+def skill_key(name: str) -> str:
+    """Lookup key: lowercase with separators removed ("Node.js" / "node js" -> "nodejs")"""
+    return _SEPARATORS.sub("", (name or "").strip().lower())
+
+
+def _candidate_keys(name: str) -> List[str]:
+    """Exact key first, then without a trailing version ("JavaScript ES6" -> "javascript")"""
+    lowered = (name or "").strip().lower()
+    keys = [skill_key(lowered)]
+    for variant in (_VERSION_SUFFIX.sub("", lowered), re.sub(r"\s+es\d+$", "", lowered)):
+        key = skill_key(variant)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+class SkillResolver:
+    """Compiled key -> skill id lookup over canonical names and aliases"""
+
+    def __init__(self, entries: Iterable):
+        self.ids: Dict[str, int] = {}
+        self.names: Dict[int, str] = {}
+        for skill_id, canonical_name, aliases in entries:
+            self.add(skill_id, canonical_name, aliases)
+
+    def add(self, skill_id: int, canonical_name: str, aliases: Optional[Iterable[str]] = None):
+        self.names[skill_id] = canonical_name
+        for alias in [canonical_name, *(aliases or [])]:
+            self.ids.setdefault(skill_key(alias), skill_id)
+
+    def resolve(self, name: str) -> Optional[int]:
+        for key in _candidate_keys(name):
+            if key in self.ids:
+                return self.ids[key]
+        return None
+
+    def key(self, name: str) -> SkillKey:
+        """The skill id when known, else the normalised string (for in-memory matching)"""
+        skill_id = self.resolve(name)
+        return skill_id if skill_id is not None else (skill_key(name) or name)
+
+    def canonical_name(self, skill_id: int) -> Optional[str]:
+        return self.names.get(skill_id)
+
+
+_resolver: Optional[SkillResolver] = None
+_resolver_loaded_at = 0.0
+_resolver_lock = threading.Lock()
+
+
+def get_skill_resolver(db) -> SkillResolver:
+    """The dictionary compiled into a lookup, reloaded every RESOLVER_TTL seconds"""
+    global _resolver, _resolver_loaded_at
+    with _resolver_lock:
+        if _resolver is None or time.time() - _resolver_loaded_at > RESOLVER_TTL:
+            connection = db.connection() if isinstance(db, Session) else db
+            try:
+                # Savepoint so a missing table (before add_skill_taxonomy.py) doesn't abort the transaction
+                with connection.begin_nested():
+                    rows = connection.execute(text("SELECT id, canonical_name, aliases FROM skill_dictionary")).fetchall()
+            except Exception as e:
+                print(f"⚠️ Skill dictionary unavailable, matching on names: {e}")
+                return SkillResolver([])
+            _resolver = SkillResolver(rows)
+            _resolver_loaded_at = time.time()
+        return _resolver
+
+
+def resolve_skill_ids(db, names: Iterable[str]) -> Dict[str, int]:
+    """Ids for the given names, adding unknown skills to the dictionary as new canonical entries"""
+    resolver = get_skill_resolver(db)
+    names = [n.strip() for n in names if n and n.strip()]
+    resolved = {name: resolver.resolve(name) for name in names}
+    missing = {}
+    for name, skill_id in resolved.items():
+        if skill_id is None and skill_key(name):
+            missing.setdefault(skill_key(name), name)
+
+    if missing:
+        # Concurrent writers may add the same skill; the unique key makes this idempotent
+        db.execute(text(
+            "INSERT INTO skill_dictionary (canonical_name, normalized_key, created_at) "
+            "SELECT name, key, now() FROM unnest(CAST(:names AS text[]), CAST(:keys AS text[])) AS t(name, key) "
+            "ON CONFLICT (normalized_key) DO NOTHING"
+        ), {"names": list(missing.values()), "keys": list(missing)})
+        rows = db.execute(text(
+            "SELECT id, canonical_name, aliases FROM skill_dictionary WHERE normalized_key = ANY(CAST(:keys AS text[]))"
+        ), {"keys": list(missing)}).fetchall()
+        with _resolver_lock:
+            for row in rows:
+                resolver.add(row.id, row.canonical_name, row.aliases)
+        resolved = {name: skill_id if skill_id is not None else resolver.resolve(name)
+                    for name, skill_id in resolved.items()}
+
+    return {name: skill_id for name, skill_id in resolved.items() if skill_id is not None}
+
+
+def _ids_for(names: Optional[List[str]], lookup: Dict[str, int]) -> List[int]:
+    ids = []
+    for name in names or []:
+        skill_id = lookup.get((name or "").strip())
+        if skill_id is not None and skill_id not in ids:
+            ids.append(skill_id)
+    return ids
+
+
+def assign_job_skill_ids(job: models.Job, lookup: Dict[str, int]):
+    """Set the job's skill id arrays from a resolve_skill_ids() lookup"""
+    job.required_skill_ids = _ids_for(job.required_skills, lookup)
+    job.preferred_skill_ids = _ids_for(job.preferred_skills, lookup)
+
+
+def _needs_resolution(obj, *fields: str) -> bool:
+    state = inspect(obj)
+    return state.pending or any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Session, "before_flush")
+def _assign_skill_ids(session: Session, flush_context, instances):
+    """Resolve skill ids of new or renamed skills and of jobs whose skill lists changed"""
+    changed = list(session.new) + list(session.dirty)
+    skills = [obj for obj in changed if isinstance(obj, models.Skill) and obj.skill_name
+              and (obj.skill_id is None or _needs_resolution(obj, "skill_name"))]
+    jobs = [obj for obj in changed if isinstance(obj, models.Job)
+            and _needs_resolution(obj, "required_skills", "preferred_skills")]
+    if not skills and not jobs:
+        return
+
+    names = [skill.skill_name for skill in skills]
+    for job in jobs:
+        names.extend(job.required_skills or [])
+        names.extend(job.preferred_skills or [])
+
+    connection = session.connection()
+    try:
+        # Savepoint: a failure here must not abort the transaction of the write itself
+        with connection.begin_nested():
+            lookup = resolve_skill_ids(connection, names)
+    except Exception as e:
+        # Never block the write; add_skill_taxonomy.py backfills missing ids
+        print(f"⚠️ Skill id resolution skipped: {e}")
+        return
+
+    for skill in skills:
+        skill.skill_id = lookup.get(skill.skill_name.strip())
+    for job in jobs:
+        assign_job_skill_ids(job, lookup)
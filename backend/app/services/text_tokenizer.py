@@ -0,0 +1,61 @@
+"""
+Arabic + English tokenizer shared by the local search indexes
+Normalises Arabic orthography (diacritics, tatweel, alef/yaa/taa marbuta
+variants, the definite article) and keeps technical English tokens such as
+"c++", "c#" and "node.js" intact.
+"""
+import re
+from typing import List
+
+_TOKEN_PATTERN = re.compile("[a-z0-9][a-z0-9+#.\\-]*|[\u0621-\u064a\u0660-\u0669]+")
+_ARABIC_DIACRITICS = re.compile("[\u064b-\u0652\u0670\u0640]")  # tashkeel + tatweel
+_ARABIC_PREFIXES = ("وال", "بال", "كال", "فال", "لل", "ال")
+
+ENGLISH_STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have he her his i in into is it its
+of on or our she so than that the their them they this to was we were what when
+where which who will with you your years year experience work worked working
+""".split())
+
+_ARABIC_STOPWORDS_RAW = """
+في من على الى إلى عن مع هذا هذه ذلك التي الذي الذين و او أو ثم كان كانت هو هي هم
+لدى لديه لديها عند كل بين حتى قد لا ما
+"""
+
+
+def normalize_arabic(text: str) -> str:
+    """Fold common Arabic spelling variants to one form"""
+    text = _ARABIC_DIACRITICS.sub("", text)
+    text = re.sub("[\u0622\u0623\u0625\u0671]", "\u0627", text)
+    return text.replace("ى", "ي").replace("ة", "ه").replace("ؤ", "و").replace("ئ", "ي")
+
+
+# Stopwords are matched after normalisation, so normalise the list the same way
+ARABIC_STOPWORDS = frozenset(normalize_arabic(word) for word in _ARABIC_STOPWORDS_RAW.split())
+
+
+def _strip_arabic_prefix(token: str) -> str:
+    for prefix in _ARABIC_PREFIXES:
+        if token.startswith(prefix) and len(token) - len(prefix) >= 2:
+            return token[len(prefix):]
+    return token
+
+
+def tokenize(text: str, remove_stopwords: bool = True) -> List[str]:
+    """Lowercased, normalised tokens for indexing and querying"""
+    if not text:
+        return []
+    text = normalize_arabic(text.lower())
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text):
+        token = token.rstrip(".-")
+        if not token:
+            continue
+        if "\u0621" <= token[0] <= "\u064a":
+            if remove_stopwords and token in ARABIC_STOPWORDS:
+                continue
+            token = _strip_arabic_prefix(token)
+        elif remove_stopwords and token in ENGLISH_STOPWORDS:
+            continue
+        tokens.append(token)
+    return tokens
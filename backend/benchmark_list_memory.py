@@ -0,0 +1,81 @@
+"""
+Benchmark memory and time of list-style queries with the large text/JSON
+columns deferred (the model default) versus loaded eagerly (undefer("*"),
+the behaviour before they were deferred). Runs against the configured
+database and reads up to --rows rows per table.
+
+    python benchmark_list_memory.py [--rows N] [--repeat R]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from sqlalchemy.orm import undefer
+
+from app.db.database import SessionLocal
+from app.db import models
+from app.db.models_users import AuditLog
+
+# Label -> (model, list ordering); each is read the way its list endpoint reads it
+TARGETS = {
+    "resumes (GET /resumes/candidate/{id})": (models.Resume, models.Resume.version.desc()),
+    "work_experience": (models.WorkExperience, models.WorkExperience.start_date.desc()),
+    "ai_analysis": (models.AIAnalysis, models.AIAnalysis.id),
+    "ai_chat_queries": (models.AIChatQuery, models.AIChatQuery.timestamp.desc()),
+    "audit_logs": (AuditLog, AuditLog.timestamp.desc()),
+}
+
+
+def measure(query, repeat: int) -> tuple:
+    """Mean milliseconds and peak traced KiB of loading the query's rows (fresh session each run)"""
+    elapsed = peak = 0.0
+    rows = 0
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            tracemalloc.start()
+            start = time.perf_counter()
+            rows = len(query.with_session(db).all())
+            elapsed += time.perf_counter() - start
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+            db.close()
+    return elapsed * 1000 / repeat, peak / 1024, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="Rows read per table")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        for label, (model, ordering) in TARGETS.items():
+            table = model.__tablename__
+            row_bytes = db.execute(text(f"SELECT avg(pg_column_size(t.*)) FROM (SELECT * FROM {table} LIMIT :n) t"),
+                                   {"n": args.rows}).scalar()
+            query = db.query(model).order_by(ordering).limit(args.rows)
+            eager_ms, eager_kib, rows = measure(query.options(undefer("*")), args.repeat)
+            deferred_ms, deferred_kib, _ = measure(query, args.repeat)
+            if not rows:
+                print(f"\nℹ️ {label}: no rows, skipped")
+                continue
+
+            print(f"\n📦 {label}: {rows} rows, ~{float(row_bytes or 0) / 1024:.1f} KiB per stored row")
+            print(f"   {'eager (undefer *)':<20} {eager_ms:8.2f} ms  peak {eager_kib:9.1f} KiB")
+            print(f"   {'deferred (default)':<20} {deferred_ms:8.2f} ms  peak {deferred_kib:9.1f} KiB"
+                  f"  ({eager_kib / max(deferred_kib, 1):.1f}x less memory)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark response serialisation on synthetic payloads (no database):
+a candidate list page and a /candidates/{id}/complete detail payload.
+
+Compares FastAPI's default path (response-model validation where the route has
+one, jsonable_encoder, stdlib json) with the orjson path used by
+negotiated_response(), and MessagePack when msgpack is installed.
+
+    python benchmark_serialization.py [--rows N] [--repeat R]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.v1.endpoints.candidates import CANDIDATE_LIST_FIELDS, CANDIDATE_LIST_RELATIONS
+from app.core.responses import MsgPackResponse, dumps, msgpack
+from app.schemas.schemas import CandidateResponse
+
+CITIES = ["Cairo", "Alexandria", "Riyadh", "Dubai", "Amman", "القاهرة", "الرياض"]
+SKILLS = ["Python", "React", "SQL", "Docker", "Kubernetes", "Java", "Go", "Figma", "Excel", "AWS"]
+
+
+def synthetic_row(rng: random.Random) -> dict:
+    created = datetime(2024, 1, 1) + timedelta(minutes=rng.randint(0, 500000))
+    values = {
+        "id": uuid.uuid4(),
+        "first_name": rng.choice(["Ahmed", "Sara", "Omar", "Lina", "محمد"]),
+        "last_name": rng.choice(["Hassan", "Khaled", "Nasser", "علي"]),
+        "email": f"user{rng.randint(0, 10**9)}@example.com",
+        "status": "active",
+        "created_at": created,
+        "updated_at": created,
+        "preferred_locations": rng.sample(CITIES, 2),
+        "years_of_experience": rng.randint(0, 20),
+        "open_to_relocation": rng.random() < 0.3,
+        "willing_to_travel": rng.random() < 0.5,
+        "notice_period_days": rng.choice([None, 30, 60]),
+        "current_salary_amount": Decimal(rng.randint(1000, 30000)),
+        "expected_salary_amount": Decimal(rng.randint(1000, 30000)),
+        "last_active_at": created,
+    }
+    row = {name: values.get(name, rng.choice([None, "x" * rng.randint(5, 60)])) for name in CANDIDATE_LIST_FIELDS}
+    row.update({relation: [] for relation in CANDIDATE_LIST_RELATIONS})
+    return row
+
+
+def synthetic_detail(rng: random.Random) -> dict:
+    def skill():
+        return {"id": uuid.uuid4(), "skill_name": rng.choice(SKILLS), "skill_category": "Technical",
+                "years_of_experience": float(rng.randint(1, 10)), "last_used_date": date(2024, 1, 1)}
+
+    def experience():
+        return {"id": uuid.uuid4(), "company_name": "Company", "job_title": "Engineer",
+                "start_date": date(2018, 1, 1), "end_date": date(2022, 1, 1),
+                "responsibilities": "Built and operated services. " * 20,
+                "technologies_used": rng.sample(SKILLS, 5), "duration_months": 48}
+
+    return {
+        "candidate": synthetic_row(rng),
+        "skills": [skill() for _ in range(40)],
+        "work_experiences": [experience() for _ in range(8)],
+        "statistics": {"skills_by_category": {"Technical": [{"name": s, "years": 3.0} for s in SKILLS]},
+                       "top_technologies": [{"name": s, "count": 4} for s in SKILLS]},
+    }
+
+
+def timed(repeat: int, fn) -> tuple:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, len(body)
+
+
+def report(title: str, repeat: int, variants: dict):
+    print(f"\n📦 {title}")
+    baseline = None
+    for name, fn in variants.items():
+        ms, size = timed(repeat, fn)
+        baseline = baseline or ms
+        print(f"   {name:<38} {ms:8.3f} ms  {size / 1024:8.1f} KiB  ({baseline / ms:5.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Candidates per list page")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    page = [synthetic_row(rng) for _ in range(args.rows)]
+    detail = synthetic_detail(rng)
+
+    def stdlib(content):
+        return json.dumps(jsonable_encoder(content)).encode()
+
+    def validated(content):
+        return stdlib([CandidateResponse.model_validate(row).model_dump() for row in content])
+
+    list_variants = {
+        "validate + jsonable_encoder + json": lambda: validated(page),
+        "jsonable_encoder + json": lambda: stdlib(page),
+        "orjson (negotiated_response)": lambda: dumps(page),
+    }
+    detail_variants = {
+        "jsonable_encoder + json": lambda: stdlib(detail),
+        "orjson (negotiated_response)": lambda: dumps(detail),
+    }
+    if msgpack is not None:
+        list_variants["msgpack"] = lambda: MsgPackResponse(page).body
+        detail_variants["msgpack"] = lambda: MsgPackResponse(detail).body
+    else:
+        print("ℹ️ msgpack not installed, skipping the MessagePack variant")
+
+    report(f"Candidate list page ({args.rows} rows)", args.repeat, list_variants)
+    report("Candidate detail (/complete)", args.repeat, detail_variants)
+
+
+if __name__ == "__main__":
+    main()
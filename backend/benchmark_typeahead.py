@@ -0,0 +1,118 @@
+"""
+Benchmark GET /candidates/typeahead (pg_trgm GIN lookup) against the name scan
+chat_with_database uses (load every candidate name, substring match in Python).
+
+    python benchmark_typeahead.py                 # benchmark against existing data
+    python benchmark_typeahead.py --seed 100000   # add synthetic candidates first
+    python benchmark_typeahead.py --cleanup       # remove the synthetic candidates
+
+Requires add_trigram_name_search.py to have been run.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import text
+from app.db.database import SessionLocal
+from app.db import models
+from app.services.fuzzy_lookup import typeahead_candidates
+
+SEED_EMAIL_DOMAIN = "typeahead-bench.invalid"
+FIRST_NAMES = ["Mohamed", "Muhammad", "Ahmed", "Ahmad", "Youssef", "Yousef", "Karim", "Kareem", "Fatima",
+               "Aisha", "Omar", "Khaled", "Sara", "Layla", "John", "Maria", "محمد", "أحمد", "يوسف", "فاطمة"]
+LAST_NAMES = ["Hassan", "Hussein", "Ibrahim", "Mahmoud", "Abdullah", "Saleh", "Smith", "Garcia",
+              "Nasser", "Haddad", "حسن", "إبراهيم", "عبدالله", "الحداد"]
+QUERIES = ["moh", "Mohammed Hasan", "kareem", "يوسف", "fatma", "abdallah", "haddad", "محمد حسن", "smith", "sara n"]
+
+
+def seed(db, count: int):
+    """Insert synthetic candidates in batches"""
+    print(f"🌱 Seeding {count} synthetic candidates...")
+    rng = random.Random(42)
+    batch = []
+    for i in range(count):
+        batch.append({
+            "id": uuid.uuid4(),
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "email": f"bench{i}@{SEED_EMAIL_DOMAIN}",
+        })
+        if len(batch) == 5000:
+            db.bulk_insert_mappings(models.Candidate, batch)
+            db.commit()
+            batch = []
+    if batch:
+        db.bulk_insert_mappings(models.Candidate, batch)
+        db.commit()
+    db.execute(text("ANALYZE candidates"))
+    db.commit()
+    print("✅ Seeded")
+
+
+def cleanup(db):
+    deleted = db.query(models.Candidate).filter(
+        models.Candidate.email.like(f"%@{SEED_EMAIL_DOMAIN}")
+    ).delete(synchronize_session=False)
+    db.commit()
+    print(f"🧹 Removed {deleted} synthetic candidates")
+
+
+def name_scan(db, query: str):
+    """The pre-trigram lookup: every name is loaded and substring-matched"""
+    query_lower = query.lower()
+    matches = []
+    for row in db.query(models.Candidate.id, models.Candidate.first_name, models.Candidate.last_name).all():
+        first_name = (row.first_name or "").lower()
+        last_name = (row.last_name or "").lower()
+        if (first_name and first_name in query_lower) or (last_name and last_name in query_lower) \
+                or f"{first_name} {last_name}" in query_lower:
+            matches.append(row.id)
+    return matches
+
+
+def timed(fn, runs: int):
+    samples = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Insert N synthetic candidates before benchmarking")
+    parser.add_argument("--cleanup", action="store_true", help="Remove synthetic candidates and exit")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            cleanup(db)
+            return
+        if args.seed:
+            seed(db, args.seed)
+
+        total = db.query(models.Candidate).count()
+        print(f"📊 {total} candidates, {args.runs} runs per query (median / max ms)\n")
+        print(f"{'query':<18}{'typeahead':>16}{'name scan':>16}  top match")
+        for query in QUERIES:
+            ta_median, ta_max, results = timed(lambda: typeahead_candidates(db, query), args.runs)
+            scan_median, scan_max, _ = timed(lambda: name_scan(db, query), args.runs)
+            top = f"{results[0]['name']} ({results[0]['score']})" if results else "-"
+            print(f"{query:<18}{ta_median:>8.1f} / {ta_max:<6.1f}{scan_median:>8.1f} / {scan_max:<6.1f} {top}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Create the embeddings table and embed all existing resumes and jobs
+Safe to re-run: unchanged documents are skipped via their content hash.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from app.db.database import engine, SessionLocal
+from app.db import models
+from app.services.embedding_service import backfill_embeddings, get_embedder
+
+
+def build_embedding_index():
+    """Create the table if needed and backfill vectors"""
+    print("🔨 Creating embeddings table (if missing)...")
+    models.Embedding.__table__.create(bind=engine, checkfirst=True)
+    
+    embedder = get_embedder()
+    print(f"🧠 Embedding with {embedder.name} ({embedder.dimension} dimensions)")
+    
+    db = SessionLocal()
+    try:
+        counts = backfill_embeddings(db)
+        print(f"✅ Embedded {counts['resume']} resume(s) and {counts['job']} job(s)")
+    except Exception as e:
+        print(f"❌ Error building embedding index: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    build_embedding_index()
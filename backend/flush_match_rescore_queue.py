@@ -0,0 +1,33 @@
+"""
+Rescore every candidate and job waiting in match_rescore_queue
+Writes normally drain the queue from a background task; run this from cron
+to pick up entries left by a failed rescore or a restarted worker.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from app.db.database import SessionLocal
+from app.services.match_maintenance import flush_dirty_matches
+
+
+def flush_match_rescore_queue():
+    """Drain the rescore queue"""
+    print("🔨 Rescoring queued candidate/job matches...")
+    
+    db = SessionLocal()
+    try:
+        stored = flush_dirty_matches(db)
+        print(f"✅ Stored {stored} candidate/job match(es)")
+        
+    except Exception as e:
+        print(f"❌ Error rescoring queued matches: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    flush_match_rescore_queue()
@@ -0,0 +1,68 @@
+"""
+Bulk-import candidates from a CSV or NDJSON export of another ATS
+(see app/services/candidate_import.py for the record layout).
+
+    python import_candidates.py candidates.ndjson [--on-conflict update|skip] [--dry-run]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent))
+
+from app.db.database import SessionLocal
+from app.services.candidate_import import (
+    CONFLICT_MODES, IMPORT_CHUNK_SIZE, IMPORT_FORMATS, import_candidates, refresh_imported_candidates
+)
+from app.services.match_maintenance import flush_dirty_matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension")
+    parser.add_argument("--on-conflict", choices=CONFLICT_MODES, default="update", help="What to do with existing emails")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Records per COPY batch")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and merge, then roll back")
+    parser.add_argument("--skip-refresh", action="store_true",
+                        help="Don't rebuild search structures (run the add_* backfills afterwards instead)")
+    args = parser.parse_args()
+
+    import_format = args.format or ("ndjson" if args.path.suffix.lower() in (".ndjson", ".jsonl") else "csv")
+    print(f"📥 Importing {args.path} ({import_format}, on_conflict={args.on_conflict})...")
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            report = import_candidates(db, stream, import_format, args.on_conflict,
+                                       chunk_size=args.chunk_size, commit=not args.dry_run)
+        print(f"✅ Merged in {time.perf_counter() - started:.1f}s{' (dry run, rolled back)' if args.dry_run else ''}")
+        print(f"   Records: {report['received']} received, {report['rejected']} rejected, "
+              f"{report['duplicates']} duplicate email(s)")
+        print(f"   Candidates: {report['inserted']} inserted, {report['updated']} updated, {report['skipped']} skipped")
+        for key, count in report["children"].items():
+            print(f"   {key}: {count}")
+        for error in report["errors"]:
+            print(f"   ⚠️ line {error['line']}: {error['error']}")
+
+        if not args.dry_run and not args.skip_refresh:
+            started = time.perf_counter()
+            refresh_imported_candidates(db, report["candidate_ids"])
+            print(f"✅ Refreshed search structures in {time.perf_counter() - started:.1f}s")
+            # No request, so no background task: rescore the queued matches here
+            started = time.perf_counter()
+            stored = flush_dirty_matches(db)
+            print(f"✅ Rescored matches ({stored} pair(s) stored) in {time.perf_counter() - started:.1f}s")
+
+    except Exception as e:
+        print(f"❌ Import failed: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
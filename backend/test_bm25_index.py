@@ -0,0 +1,144 @@
+"""
+Tests for the in-process BM25 index (ranking, incremental updates, snapshots).
+No database required.
+"""
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from app.services import bm25_index
+from app.services.bm25_index import BM25Index, _catch_up, search_candidates_bm25
+from app.services.text_tokenizer import tokenize
+
+DOCS = {
+    "a": "Python Django PostgreSQL backend developer",
+    "b": "React TypeScript frontend developer",
+    "c": "Python machine learning PyTorch NLP researcher",
+    "d": "مهندس برمجيات بايثون وتعلم الآلة",
+}
+
+
+def _build() -> BM25Index:
+    index = BM25Index()
+    for key, text in DOCS.items():
+        index.add(key, tokenize(text))
+    return index
+
+
+def test_ranking():
+    index = _build()
+    assert index.search(tokenize("python django"), 1)[0][0] == "a"
+    assert {k for k, _ in index.search(tokenize("python"), 10)} == {"a", "c"}
+    assert index.search(tokenize("البايثون"), 1)[0][0] == "d"
+    assert index.search(tokenize("golang"), 10) == []
+
+
+def test_incremental_update_remove_and_compact():
+    index = _build()
+    index.add("b", tokenize("Golang Kubernetes backend"))  # re-index replaces the old document
+    assert index.search(tokenize("react"), 10) == []
+    assert index.search(tokenize("golang"), 1)[0][0] == "b"
+    assert index.remove("a")
+    index.compact()
+    assert len(index) == 3
+    assert index.search(tokenize("django"), 10) == []
+    assert index.search(tokenize("pytorch"), 1)[0][0] == "c"
+
+
+def test_snapshot_roundtrip():
+    index = _build()
+    index.remove("b")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bm25.npz"
+        index.snapshot(path, {"synced_at": "2024-01-01T00:00:00"})
+        restored, metadata = BM25Index.restore(path)
+    assert metadata["synced_at"] == "2024-01-01T00:00:00"
+    assert len(restored) == 3
+    query = tokenize("python machine learning")
+    assert restored.search(query, 3) == index.search(query, 3)
+
+
+def test_concurrent_snapshots_never_share_a_temp_file():
+    # Separate indexes (as in separate workers) don't share a lock
+    indexes = [_build() for _ in range(8)]
+    for i, index in enumerate(indexes):
+        index.add(f"extra{i}", tokenize("golang " * (i + 1)))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bm25.npz"
+        threads = [
+            threading.Thread(target=index.snapshot, args=(path, {"worker": i})) for i, index in enumerate(indexes)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        restored, metadata = BM25Index.restore(path)
+        assert [p.name for p in Path(tmp).iterdir()] == ["bm25.npz"]
+    # Whole snapshot of exactly one writer
+    assert len(restored) == 5 and f"extra{metadata['worker']}" in restored
+
+
+def test_catch_up_reads_only_logged_changes():
+    index = _build()
+    requested = []
+
+    def fake_tokens(db, candidate_ids=None):
+        requested.append(sorted(candidate_ids))
+        # "b" was deleted, "e" is new
+        return {"a": tokenize("Golang Kubernetes"), "e": tokenize("Rust embedded firmware")}
+
+    originals = bm25_index.changed_candidates_since, bm25_index.build_candidate_tokens
+    bm25_index.changed_candidates_since = lambda db, since: {"a", "b", "e"}
+    bm25_index.build_candidate_tokens = fake_tokens
+    try:
+        assert _catch_up(index, None, datetime(2024, 1, 1)) == (2, 1)
+    finally:
+        bm25_index.changed_candidates_since, bm25_index.build_candidate_tokens = originals
+    # Only the logged candidates are rebuilt; nothing scans the whole table
+    assert requested == [["a", "b", "e"]]
+    assert sorted(index.keys()) == ["a", "c", "d", "e"]
+    assert index.search(tokenize("golang"), 1)[0][0] == "a"
+    assert index.search(tokenize("django"), 10) == []
+
+
+def test_search_does_not_wait_for_the_index_to_load():
+    release, calls = threading.Event(), []
+
+    def slow_sync(db):
+        calls.append(db)
+        release.wait(timeout=10)
+
+    originals = bm25_index.sync_bm25_index, bm25_index.SessionLocal, bm25_index._index
+    bm25_index.sync_bm25_index, bm25_index.SessionLocal, bm25_index._index = slow_sync, _NullSession, None
+    try:
+        assert search_candidates_bm25(None, "python") == []
+        assert search_candidates_bm25(None, "python") == []
+        assert not bm25_index.start_bm25_sync()
+        release.set()
+        bm25_index._sync_thread.join(timeout=10)
+        assert len(calls) == 1
+    finally:
+        release.set()
+        bm25_index.sync_bm25_index, bm25_index.SessionLocal, bm25_index._index = originals
+
+
+class _NullSession:
+    def close(self):
+        pass
+
+
+if __name__ == "__main__":
+    print("🧪 Testing BM25 index...")
+    test_ranking()
+    test_incremental_update_remove_and_compact()
+    test_snapshot_roundtrip()
+    test_concurrent_snapshots_never_share_a_temp_file()
+    test_catch_up_reads_only_logged_changes()
+    test_search_does_not_wait_for_the_index_to_load()
+    print("✅ BM25 index works")
@@ -0,0 +1,108 @@
+"""
+Tests for the candidate change log that in-process search indexes catch up
+from: which flushed rows are logged, and the SQL written and read.
+No database required (SQL is captured instead of run).
+"""
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from app.db import models
+from app.services.candidate_changes import (
+    CHANGE_VISIBILITY_GRACE, _changed_candidate_ids, changed_candidates_since, record_candidate_changes
+)
+from app.services.candidate_sync import candidates_changed
+
+
+class _Flush:
+    """The new/dirty/deleted sets of a session during after_flush"""
+    def __init__(self, new=(), dirty=(), deleted=(), unmodified=()):
+        self.new, self.dirty, self.deleted = list(new), list(dirty) + list(unmodified), list(deleted)
+        self.unmodified = list(unmodified)
+
+    def is_modified(self, obj, include_collections=True):
+        return obj not in self.unmodified
+
+
+class _Recorder:
+    def __init__(self, rows=()):
+        self.statements = []
+        self.rows = rows
+        self.events = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return self.rows
+
+    def commit(self):
+        self.events.append("commit")
+
+    def rollback(self):
+        self.events.append("rollback")
+
+
+def test_flushed_candidates_and_children_are_logged():
+    a, b, c, d = (uuid.uuid4() for _ in range(4))
+    flush = _Flush(
+        new=[models.Skill(candidate_id=a, skill_name="Python"), models.Job(title="Backend")],
+        dirty=[models.WorkExperience(candidate_id=b)],
+        deleted=[models.Candidate(id=c)],
+        unmodified=[models.Candidate(id=d)],
+    )
+    assert _changed_candidate_ids(flush) == [a, b, c]
+    assert _changed_candidate_ids(_Flush(new=[models.Job(title="Backend")])) == []
+    # Resume vectors are logged under their candidate; job vectors have none
+    vectors = [models.Embedding(entity_type="resume", candidate_id=d), models.Embedding(entity_type="job")]
+    assert _changed_candidate_ids(_Flush(new=vectors)) == [d]
+
+
+def test_record_writes_one_insert_per_call():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    db = _Recorder()
+    record_candidate_changes(db, [a, b, a, None])
+    (sql, params), = db.statements
+    assert sql == "INSERT INTO candidate_changes (candidate_id) SELECT unnest(CAST(:ids AS uuid[]))"
+    assert params == {"ids": sorted([str(a), str(b)])}
+    record_candidate_changes(db, [])
+    assert len(db.statements) == 1
+
+
+def test_sync_hook_logs_writes_the_flush_hook_cannot_see():
+    # e.g. bulk query(...).delete() of a candidate's resumes or skills
+    a = uuid.uuid4()
+    db = _Recorder()
+    candidates_changed(db, [a])
+    sql, params = db.statements[0]
+    assert sql.startswith("INSERT INTO candidate_changes") and params == {"ids": [str(a)]}
+    assert db.events[0] == "commit"
+
+
+def test_changes_are_read_with_a_grace_window():
+    a = uuid.uuid4()
+    db = _Recorder(rows=[(a,)])
+    since = datetime(2024, 1, 1, 12, 0)
+    assert changed_candidates_since(db, since) == {str(a)}
+    (sql, params), = db.statements
+    assert "WHERE changed_at > :since" in sql
+    assert params == {"since": since - CHANGE_VISIBILITY_GRACE}
+
+
+def test_change_log_has_no_candidate_foreign_key():
+    # Deletions must stay in the log after the candidate row is gone
+    assert not models.CandidateChange.__table__.foreign_keys
+    assert ("changed_at",) in {tuple(c.name for c in i.columns) for i in models.CandidateChange.__table__.indexes}
+
+
+if __name__ == "__main__":
+    print("🧪 Testing candidate change log...")
+    test_flushed_candidates_and_children_are_logged()
+    test_record_writes_one_insert_per_call()
+    test_sync_hook_logs_writes_the_flush_hook_cannot_see()
+    test_changes_are_read_with_a_grace_window()
+    test_change_log_has_no_candidate_foreign_key()
+    print("✅ All candidate change log tests passed")
@@ -0,0 +1,89 @@
+"""
+Tests for the streaming candidate export encoders.
+No database required: encoders are fed in-memory batches.
+"""
+import csv
+import io
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.services import candidate_export
+from app.services.candidate_export import EXPORT_COLUMNS, encode_csv, encode_ndjson
+
+
+def _row(n: int) -> dict:
+    row = {name: None for name in EXPORT_COLUMNS}
+    row.update({
+        "id": str(uuid.uuid4()),
+        "first_name": "سارة" if n % 2 else "Omar",
+        "email": f"c{n}@example.com",
+        "created_at": datetime(2024, 1, 1, 9, n % 60),
+        "skills": "Python; SQL",
+        "skill_count": 2,
+        "total_experience_months": 12 * n,
+        "best_match_score": 87.5,
+    })
+    return row
+
+
+def _batches(count: int = 5, size: int = 3):
+    return [[_row(b * size + i) for i in range(size)] for b in range(count)]
+
+
+def test_export_query_selects_export_columns():
+    query = candidate_export._export_query(Session())
+    assert [column["name"] for column in query.column_descriptions] == EXPORT_COLUMNS
+
+
+def test_csv_streams_one_chunk_per_batch():
+    chunks = list(encode_csv(iter(_batches())))
+    assert len(chunks) == 5
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8-sig"))))
+    assert len(rows) == 15
+    assert rows[1]["first_name"] == "سارة"
+    assert rows[2]["total_experience_months"] == "24"
+
+
+def test_csv_with_no_rows_is_just_the_header():
+    body = b"".join(encode_csv(iter([]))).decode("utf-8-sig")
+    assert body.strip() == ",".join(EXPORT_COLUMNS)
+
+
+def test_ndjson_one_object_per_line():
+    lines = b"".join(encode_ndjson(iter(_batches(2, 4)))).splitlines()
+    assert len(lines) == 8
+    first = orjson.loads(lines[0])
+    assert list(first) == EXPORT_COLUMNS
+    assert first["created_at"] == "2024-01-01T09:00:00"
+
+
+def test_parquet_row_groups_round_trip():
+    if candidate_export.pq is None:
+        print("ℹ️ pyarrow not installed, skipping the Parquet test")
+        return
+    chunks = list(candidate_export.encode_parquet(iter(_batches())))
+    table_file = candidate_export.pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert table_file.metadata.num_row_groups == 5
+    table = table_file.read()
+    assert table.num_rows == 15
+    assert table.column_names == EXPORT_COLUMNS
+    assert table.column("best_match_score").to_pylist()[0] == 87.5
+
+
+if __name__ == "__main__":
+    print("🧪 Testing candidate export...")
+    test_export_query_selects_export_columns()
+    test_csv_streams_one_chunk_per_batch()
+    test_csv_with_no_rows_is_just_the_header()
+    test_ndjson_one_object_per_line()
+    test_parquet_row_groups_round_trip()
+    print("✅ All candidate export tests passed")
@@ -0,0 +1,101 @@
+"""
+Tests for bulk candidate import: record parsing, validation and COPY encoding.
+No database required (the merge itself runs in PostgreSQL).
+"""
+import csv
+import io
+import json
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from app.services.candidate_import import RecordError, _copy_value, _Stage, normalize_record, read_records
+
+RECORD = {
+    "email": " sara@example.com ",
+    "first_name": "سارة",
+    "last_name": "Khaled",
+    "years_of_experience": "7",
+    "expected_salary_amount": "15000.50",
+    "open_to_relocation": "yes",
+    "preferred_locations": "Cairo; Riyadh",
+    "skills": ["Python", {"skill_name": "SQL", "years_of_experience": 4}],
+    "work_experience": [{"company_name": "Acme", "job_title": "Engineer",
+                         "start_date": "2019-03", "end_date": "2021-03-15"}],
+    "languages": [{"language_name": "Arabic", "proficiency_level": "Native"}],
+}
+
+
+def test_normalize_record_coerces_columns_and_children():
+    candidate, children = normalize_record(RECORD)
+    assert candidate["email"] == "sara@example.com"
+    assert candidate["years_of_experience"] == 7
+    assert candidate["expected_salary_amount"] == Decimal("15000.50")
+    assert candidate["open_to_relocation"] is True
+    assert candidate["preferred_locations"] == ["Cairo", "Riyadh"]
+    assert candidate["phone"] is None
+
+    assert [row["skill_name"] for row in children["skills"]] == ["Python", "SQL"]
+    assert children["skills"][1]["years_of_experience"] == Decimal("4")
+    experience = children["work_experiences"][0]
+    assert experience["start_date"] == date(2019, 3, 1)
+    assert experience["duration_months"] == 24
+    assert experience["is_current"] is False  # model default
+    assert children["languages"][0]["can_read"] is True
+
+
+def test_invalid_records_are_rejected():
+    for broken, message in [
+        ({**RECORD, "email": ""}, "email is required"),
+        ({**RECORD, "years_of_experience": "seven"}, "years_of_experience"),
+        ({**RECORD, "phone": "1" * 51}, "longer than 50"),
+        ({**RECORD, "work_experience": [{"company_name": "Acme"}]}, "work_experiences.job_title is required"),
+        ({**RECORD, "educations": ["MIT"]}, "must be objects"),
+    ]:
+        try:
+            normalize_record(broken)
+        except RecordError as e:
+            assert message in str(e), (message, str(e))
+        else:
+            raise AssertionError(f"accepted a record without {message}")
+
+
+def test_csv_records_take_exported_skill_lists_and_json_cells():
+    rows = io.StringIO()
+    writer = csv.writer(rows)
+    writer.writerow(["email", "first_name", "last_name", "skills", "educations", "skill_count"])
+    writer.writerow(["a@example.com", "Omar", "Nasser", "Python; SQL",
+                     json.dumps([{"institution": "Cairo University", "graduation_year": 2015}]), "2"])
+    (line, record), = list(read_records(io.StringIO(rows.getvalue()), "csv"))
+    candidate, children = normalize_record(record)
+    assert line == 2
+    assert [row["skill_name"] for row in children["skills"]] == ["Python", "SQL"]
+    assert children["educations"][0]["graduation_year"] == 2015
+
+
+def test_ndjson_reports_bad_lines():
+    records = list(read_records(io.StringIO('{"email": "a@b.c"}\n\nnot json\n'), "ndjson"))
+    assert [line for line, _ in records] == [1, 3]
+    assert isinstance(records[1][1], ValueError)
+
+
+def test_copy_encoding_of_nulls_and_arrays():
+    stage = _Stage("import_candidates", ["email", "preferred_locations", "notes"])
+    stage.add({"email": "a@b.c", "preferred_locations": ['New "York"', "a\\b"], "notes": None}, seq=1)
+    assert stage.buffer.getvalue() == 'a@b.c,"{""New \\""York\\"""",""a\\\\b""}",,1\r\n'
+    assert _copy_value(None) is None
+
+
+if __name__ == "__main__":
+    print("🧪 Testing candidate import...")
+    test_normalize_record_coerces_columns_and_children()
+    test_invalid_records_are_rejected()
+    test_csv_records_take_exported_skill_lists_and_json_cells()
+    test_ndjson_reports_bad_lines()
+    test_copy_encoding_of_nulls_and_arrays()
+    print("✅ All candidate import tests passed")
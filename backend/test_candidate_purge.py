@@ -0,0 +1,69 @@
+"""
+Tests for set-based candidate deletion: cascade configuration and purge criteria.
+No database required.
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.services.candidate_purge import delete_candidates, purge_query
+
+
+def test_candidate_children_cascade_in_the_database():
+    for relationship in inspect(models.Candidate).relationships:
+        assert relationship.passive_deletes, relationship.key
+    for relationship in inspect(models.Job).relationships:
+        assert relationship.passive_deletes, relationship.key
+
+
+def test_every_candidate_foreign_key_cascades_and_is_indexed():
+    for table in models.Base.metadata.tables.values():
+        for fk in table.foreign_keys:
+            if fk.column.table.name != "candidates":
+                continue
+            assert fk.ondelete == "CASCADE", table.name
+            # Each cascaded DELETE looks rows up by candidate_id
+            leading = {list(index.columns)[0].name for index in table.indexes if index.columns}
+            leading |= {list(c.columns)[0].name for c in table.constraints if hasattr(c, "columns") and len(c.columns)}
+            assert fk.parent.name in leading, f"{table.name}.{fk.parent.name} has no index"
+
+
+def test_purge_needs_a_criterion():
+    try:
+        purge_query(Session())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("purge_query accepted no criteria")
+
+
+def test_purge_query_filters_by_status_and_age():
+    sql = str(purge_query(Session(), "archived", datetime(2024, 1, 1)).statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+    assert "candidates.status = 'archived'" in sql
+    assert "candidates.updated_at < '2024-01-01 00:00:00'" in sql
+    assert "candidates.updated_at IS NULL AND candidates.created_at <" in sql
+
+
+def test_delete_nothing_is_a_no_op():
+    assert delete_candidates(None, []) == 0
+
+
+if __name__ == "__main__":
+    print("🧪 Testing candidate deletion...")
+    test_candidate_children_cascade_in_the_database()
+    test_every_candidate_foreign_key_cascades_and_is_indexed()
+    test_purge_needs_a_criterion()
+    test_purge_query_filters_by_status_and_age()
+    test_delete_nothing_is_a_no_op()
+    print("✅ All candidate deletion tests passed")
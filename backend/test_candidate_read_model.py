@@ -0,0 +1,195 @@
+"""
+Tests for the candidate detail read document (assembly, statistics, and the
+in-transaction rebuild). No database required: sessions are in-memory fakes.
+"""
+import json
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from sqlalchemy.dialects import postgresql
+
+from app.db import models
+from app.services import candidate_sync
+from app.services.candidate_read_model import build_candidate_detail, mark_candidate_read_documents_stale
+
+
+class _Rows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def options(self, *args):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def order_by(self, *args):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class _Session:
+    def __init__(self, rows_by_model):
+        self.rows_by_model = rows_by_model
+
+    def query(self, model):
+        return _Rows(self.rows_by_model.get(model, []))
+
+
+def _candidate() -> models.Candidate:
+    return models.Candidate(
+        id=uuid.uuid4(), first_name="Sara", last_name="Hassan", email="sara@example.com",
+        expected_salary_amount=Decimal("2500.00"), created_at=datetime(2024, 1, 1), status="active",
+        total_experience_months=84
+    )
+
+
+def test_detail_document_is_plain_json_with_statistics():
+    candidate = _candidate()
+    db = _Session({
+        models.Skill: [
+            models.Skill(id=uuid.uuid4(), skill_name="Python", skill_category="Technical",
+                         proficiency_level="Expert", years_of_experience=Decimal("5")),
+            models.Skill(id=uuid.uuid4(), skill_name="Leadership", skill_category="Soft",
+                         proficiency_level="Advanced"),
+        ],
+        models.WorkExperience: [
+            models.WorkExperience(id=uuid.uuid4(), company_name="Acme", job_title="Lead Engineer",
+                                  job_level="Lead", start_date=date(2021, 1, 1), is_current=True,
+                                  duration_months=36, technologies_used=["Python", "AWS"]),
+            models.WorkExperience(id=uuid.uuid4(), company_name="Initech", job_title="Engineer",
+                                  job_level="Mid", start_date=date(2017, 1, 1), duration_months=48,
+                                  technologies_used=["Python"]),
+        ],
+    })
+
+    document = build_candidate_detail(db, candidate)
+    # Stored as JSONB, so it must round-trip through JSON unchanged
+    assert json.loads(json.dumps(document)) == document
+
+    stats = document["statistics"]
+    assert document["candidate"]["expected_salary_amount"] == 2500.0
+    assert stats["total_years_experience"] == 7.0
+    assert stats["current_company"] == "Acme"
+    assert stats["top_technologies"][0] == {"name": "Python", "count": 2}
+    assert [step["level"] for step in stats["career_progression"]] == ["Mid", "Lead"]
+    assert set(stats["skills_by_category"]) == {"Technical", "Soft"}
+
+
+class _Transaction:
+    """Records statements and savepoints of the caller's transaction"""
+    def __init__(self):
+        self.events = []
+
+    @contextmanager
+    def begin_nested(self):
+        self.events.append("savepoint")
+        yield
+
+    def execute(self, statement, params=None):
+        self.events.append(str(statement.compile(dialect=postgresql.dialect())))
+
+        class _Result:
+            rowcount = 1
+        return _Result()
+
+    def flush(self):
+        self.events.append("flush")
+
+    def commit(self):
+        self.events.append("commit")
+
+
+def test_details_are_rebuilt_in_the_callers_transaction():
+    db, calls = _Transaction(), []
+    original = candidate_sync.refresh_candidate_read_documents
+    candidate_sync.refresh_candidate_read_documents = lambda db, ids, commit=True: calls.append(commit)
+    try:
+        candidate_sync.candidate_details_changed(db, [uuid.uuid4()])
+    finally:
+        candidate_sync.refresh_candidate_read_documents = original
+    assert calls == [False] and db.events[:2] == ["flush", "savepoint"]
+    assert db.events[2].strip().startswith("UPDATE candidates c SET") and "commit" not in db.events
+
+
+def test_failed_rebuild_marks_documents_stale_in_the_transaction():
+    db = _Transaction()
+
+    def failing(db, ids, commit=True):
+        raise RuntimeError("boom")
+
+    original = candidate_sync.refresh_candidate_read_documents
+    candidate_sync.refresh_candidate_read_documents = failing
+    try:
+        candidate_sync.candidate_details_changed(db, [uuid.uuid4()])
+    finally:
+        candidate_sync.refresh_candidate_read_documents = original
+    assert db.events.count("savepoint") == 2
+    assert "ON CONFLICT (candidate_id) DO UPDATE SET stale" in db.events[-1]
+    assert "commit" not in db.events
+
+
+class _JobSession(_Transaction):
+    """Finds one job with one applicant; records the delete"""
+    def __init__(self, applicant_id):
+        super().__init__()
+        self.applicant_id = applicant_id
+
+    def query(self, *entities):
+        db = self
+
+        class _Query:
+            def filter(self, *args):
+                return self
+
+            def first(self):
+                return models.Job(title="Backend")
+
+            def __iter__(self):
+                return iter([(db.applicant_id,)])
+        return _Query()
+
+    def delete(self, obj):
+        self.events.append("delete")
+
+
+def test_delete_job_flushes_before_rebuilding_applicants():
+    from app.api.v1.endpoints import jobs as jobs_endpoint
+
+    applicant_id = uuid.uuid4()
+    db = _JobSession(applicant_id)
+    originals = jobs_endpoint.remove_embeddings, jobs_endpoint.candidate_details_changed
+    jobs_endpoint.remove_embeddings = lambda db, kind, ids, commit=True: None
+    jobs_endpoint.candidate_details_changed = lambda db, ids: db.events.append(("details", list(ids)))
+    try:
+        jobs_endpoint.delete_job(uuid.uuid4(), db)
+    finally:
+        jobs_endpoint.remove_embeddings, jobs_endpoint.candidate_details_changed = originals
+    assert db.events == ["delete", "flush", ("details", [applicant_id]), "commit"]
+
+
+def test_mark_stale_moves_the_version():
+    db = _Transaction()
+    assert mark_candidate_read_documents_stale(db, []) == 0 and not db.events
+    mark_candidate_read_documents_stale(db, [uuid.uuid4()])
+    assert "updated_at = excluded.updated_at" in db.events[0]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing candidate read documents...")
+    test_detail_document_is_plain_json_with_statistics()
+    test_details_are_rebuilt_in_the_callers_transaction()
+    test_failed_rebuild_marks_documents_stale_in_the_transaction()
+    test_delete_job_flushes_before_rebuilding_applicants()
+    test_mark_stale_moves_the_version()
+    print("✅ All candidate read document tests passed")
@@ -0,0 +1,157 @@
+"""
+Query-count regression test for both chat implementations.
+
+Seeds two pool sizes of candidates (with skills, experience, education,
+applications and AI analyses), counts the SQL statements issued by one chat
+message at each size and checks that the counts are equal, i.e. no N+1
+lookups while building the prompt context. Needs PostgreSQL; everything is
+written inside a transaction that is rolled back. Without a reachable
+database the tests print a notice and return.
+"""
+import sys
+import asyncio
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.db.database import engine
+from app.db import models
+
+# Pool sizes compared; one chat message must cost the same statements at both
+SMALL_POOL = 3
+LARGE_POOL = 12
+
+
+@contextmanager
+def rolled_back_session():
+    """A session whose commits become savepoints of one outer, rolled back transaction"""
+    connection = engine.connect()
+    outer = connection.begin()
+    db = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield db
+    finally:
+        db.close()
+        outer.rollback()
+        connection.close()
+
+
+@contextmanager
+def count_queries(db: Session):
+    """Count SQL statements the session's connection executes inside the block"""
+    statements = []
+    connection = db.connection()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Savepoint bookkeeping of the test transaction is not chat work
+        if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")):
+            statements.append(statement)
+
+    # Background index threads use their own connections and are not counted
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+
+def _database_reachable() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
+def seed_candidates(db: Session, count: int, job: models.Job):
+    """Candidates with every relation the chat context reads, each applying to `job`"""
+    for i in range(count):
+        candidate_id = uuid.uuid4()
+        db.add(models.Candidate(
+            id=candidate_id, first_name=f"Query{i}", last_name="Count",
+            email=f"query-count-{candidate_id}@chat-test.invalid", professional_summary="Backend developer"
+        ))
+        db.add_all([
+            models.Skill(candidate_id=candidate_id, skill_name="Python"),
+            models.Skill(candidate_id=candidate_id, skill_name="SQL"),
+            models.WorkExperience(candidate_id=candidate_id, company_name="Acme", job_title="Developer"),
+            models.Education(candidate_id=candidate_id, institution="Cairo University"),
+            models.Application(candidate_id=candidate_id, job_id=job.id),
+            models.AIAnalysis(candidate_id=candidate_id, overall_experience_score=70),
+        ])
+    db.commit()
+
+
+def _pool_query_counts(run_chat) -> list:
+    """Statements of one chat message at SMALL_POOL and at LARGE_POOL candidates"""
+    with rolled_back_session() as db:
+        job = models.Job(title="Backend Developer", status="open", required_skills=["Python"])
+        db.add(job)
+        db.commit()
+        seed_candidates(db, SMALL_POOL, job)
+        # Warm-up: settings, the skill taxonomy and other caches load once per process
+        asyncio.run(run_chat(db))
+
+        counts = []
+        for pool_size in (SMALL_POOL, LARGE_POOL):
+            seeded = db.query(models.Candidate).filter(models.Candidate.last_name == "Count").count()
+            if seeded < pool_size:
+                seed_candidates(db, pool_size - seeded, job)
+            with count_queries(db) as statements:
+                asyncio.run(run_chat(db))
+            print(f"📊 {pool_size} seeded candidates -> {len(statements)} queries")
+            counts.append(len(statements))
+        return counts
+
+
+async def _fake_ai(*args, **kwargs) -> str:
+    return "No specific candidate recommendation."
+
+
+def test_chat_with_database_query_count():
+    """chat_with_database must not issue per-candidate or per-application queries"""
+    if not _database_reachable():
+        print("ℹ️ PostgreSQL not reachable, skipping the chat query count test")
+        return
+    from app.services import ai_service
+
+    original = ai_service.call_ai_api
+    ai_service.call_ai_api = _fake_ai
+    try:
+        # Mentions candidates, jobs and applications so every context block is built
+        query = "Which candidate applied to the best matching job position?"
+        small, large = _pool_query_counts(lambda db: ai_service.chat_with_database(query, db))
+    finally:
+        ai_service.call_ai_api = original
+    assert small == large, f"chat_with_database: {small} queries for {SMALL_POOL} candidates, {large} for {LARGE_POOL}"
+
+
+def test_enhanced_chat_with_database_query_count():
+    """EnhancedAIService.chat_with_database must load AI analyses in bulk"""
+    if not _database_reachable():
+        print("ℹ️ PostgreSQL not reachable, skipping the enhanced chat query count test")
+        return
+    from app.services.ai_service_enhanced import EnhancedAIService
+
+    service = EnhancedAIService()
+    service.call_ai = _fake_ai
+    small, large = _pool_query_counts(
+        lambda db: service.chat_with_database("Who are our strongest candidates?", db)
+    )
+    assert small == large, (
+        f"EnhancedAIService.chat_with_database: {small} queries for {SMALL_POOL} candidates, {large} for {LARGE_POOL}"
+    )
+
+
+if __name__ == "__main__":
+    print("🧪 Testing chat query counts...")
+    test_chat_with_database_query_count()
+    test_enhanced_chat_with_database_query_count()
+    print("✅ Chat query counts are bounded")
@@ -0,0 +1,121 @@
+"""
+Tests for the server-side chat conversation memory: the per-process store,
+trimming to the recent window and the rolling summary, which is written
+locally at once and replaced by the AI summary from a background task.
+No database or AI provider required.
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from fastapi import BackgroundTasks
+
+from app.db import database
+from app.services import conversation_memory
+from app.services.conversation_memory import (
+    MAX_RECENT_TURNS, ConversationSession, ConversationStore, record_exchange
+)
+
+
+class _Session:
+    def close(self):
+        pass
+
+
+def test_store_keys_sessions_by_user():
+    store = ConversationStore()
+    first = store.get("u1", "c1")
+    assert store.get("u1", "c1") is first
+    assert store.get("u2", "c1") is not first
+    assert store.get("u1").conversation_id != "c1"
+    assert store.reset("u1", "c1") == 1 and store.reset("u1", "c1") == 0
+    assert store.get("u1", "c1") is not first
+    assert store.reset("u1") == 2
+
+
+def test_store_evicts_idle_and_oldest_sessions():
+    store = ConversationStore(ttl=timedelta(minutes=5), max_sessions=2)
+    stale = store.get("u1", "old")
+    stale.updated_at = datetime.utcnow() - timedelta(minutes=10)
+    store.get("u1", "a")
+    assert store.get("u1", "old") is not stale
+    store.get("u1", "b")
+    store.get("u1", "c")
+    assert len(store._sessions) == 2
+
+
+def test_exchange_trims_to_the_recent_window():
+    session = ConversationSession("c1")
+    for i in range(5):
+        record_exchange(session, f"question {i}", f"answer {i}. More detail", [f"id{i}"])
+    assert len(session.turns) == MAX_RECENT_TURNS
+    assert session.turns[-1] == {"role": "assistant", "content": "answer 4. More detail"}
+    assert session.candidate_ids == ["id4"]
+    # Dropped turns live on in the local summary, first sentence only
+    assert "- User: question 0" in session.summary and "- Assistant: answer 1" in session.summary
+    assert "More detail" not in session.summary
+    assert "CONVERSATION SUMMARY" in session.build_context()
+
+
+def test_seed_only_fills_empty_sessions():
+    session = ConversationSession("c1")
+    history = [{"role": "user", "content": f"m{i}"} for i in range(8)]
+    session.seed_from_history(history)
+    assert [t["content"] for t in session.turns] == [f"m{i}" for i in range(2, 8)]
+    assert "- User: m0" in session.summary
+    session.seed_from_history([{"role": "user", "content": "ignored"}])
+    assert session.turns[-1]["content"] == "m7"
+
+
+def test_ai_summary_runs_in_the_background():
+    calls = []
+
+    async def fake_summarize(summary, turns, db, user_api_key=None):
+        calls.append([t["content"] for t in turns])
+        return f"AI summary to {turns[-1]['content']}"
+
+    originals = conversation_memory._summarize_turns, database.SessionLocal
+    conversation_memory._summarize_turns, database.SessionLocal = fake_summarize, _Session
+    try:
+        session = ConversationSession("c1")
+        tasks = BackgroundTasks()
+        for i in range(4):
+            record_exchange(session, f"q{i}", f"a{i}", [], tasks)
+        # Nothing waited on the AI: the provisional summary is local
+        assert calls == [] and session.summary.startswith("- User: q0")
+        assert len(tasks.tasks) == 1
+        asyncio.run(tasks())
+        assert calls == [["q0", "a0"]] and session.summary == "AI summary to a0"
+
+        # An older summary finishing late does not replace a newer one
+        tasks = BackgroundTasks()
+        record_exchange(session, "q4", "a4", [], tasks)
+        record_exchange(session, "q5", "a5", [], tasks)
+        asyncio.run(tasks())
+        assert len(calls) == 3 and session.summary == "AI summary to a2"
+    finally:
+        conversation_memory._summarize_turns, database.SessionLocal = originals
+
+
+def test_follow_up_needs_cached_candidates():
+    session = ConversationSession("c1")
+    assert not session.is_follow_up("what about her skills?")
+    session.candidate_ids = ["id1"]
+    assert session.is_follow_up("what about her skills?")
+    assert not session.is_follow_up("list python developers")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing conversation memory...")
+    test_store_keys_sessions_by_user()
+    test_store_evicts_idle_and_oldest_sessions()
+    test_exchange_trims_to_the_recent_window()
+    test_seed_only_fills_empty_sessions()
+    test_ai_summary_runs_in_the_background()
+    test_follow_up_needs_cached_candidates()
+    print("✅ All conversation memory tests passed")
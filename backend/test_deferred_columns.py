@@ -0,0 +1,52 @@
+"""
+Tests that large text/JSON columns stay out of default entity loads.
+No database required: the compiled SELECTs are inspected.
+"""
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, undefer
+
+from app.db import models
+from app.db.models_users import AuditLog
+from app.schemas.schemas import ResumeResponse, ResumeSummary
+
+DEFERRED = {
+    models.Resume: ["extracted_text"],
+    models.AIAnalysis: ["raw_analysis"],
+    models.WorkExperience: ["responsibilities"],
+    models.AIChatQuery: ["response"],
+    AuditLog: ["old_values", "new_values"],
+}
+
+
+def _select_list(query) -> str:
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+    return sql.split(" FROM ")[0]
+
+
+def test_large_columns_are_deferred_by_default():
+    for model, columns in DEFERRED.items():
+        default = _select_list(Session().query(model))
+        eager = _select_list(Session().query(model).options(undefer("*")))
+        for column in columns:
+            qualified = f"{model.__tablename__}.{column}"
+            assert qualified not in default, qualified
+            assert qualified in eager, qualified
+
+
+def test_resume_list_schema_has_no_text():
+    assert "extracted_text" not in ResumeSummary.model_fields
+    assert "extracted_text" in ResumeResponse.model_fields
+
+
+if __name__ == "__main__":
+    print("🧪 Testing deferred columns...")
+    test_large_columns_are_deferred_by_default()
+    test_resume_list_schema_has_no_text()
+    print("✅ All deferred column tests passed")
@@ -0,0 +1,202 @@
+"""
+Tests for the local embedding pipeline and the in-process vector index.
+No database or AI key required (sessions are fakes).
+"""
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+import numpy as np
+
+from app.services import embedding_service
+from app.db import models
+from app.services.embedding_service import (
+    HashedTfEmbedder, VectorIndex, _catch_up_resumes, index_resume, remove_embeddings
+)
+
+DOCS = {
+    "py": "Senior Python developer: Django, FastAPI, PostgreSQL, REST APIs",
+    "fe": "Frontend engineer with React, TypeScript, CSS and Next.js",
+    "ml": "Machine learning engineer: PyTorch, NLP, computer vision, Python",
+    "ar": "مطور تطبيقات جافا وأندرويد مع خبرة في قواعد البيانات",
+}
+
+
+def _build(ivf_min_vectors=10**9):
+    embedder = HashedTfEmbedder(512)
+    index = VectorIndex(embedder.dimension, ivf_min_vectors=ivf_min_vectors)
+    for doc_id, text in DOCS.items():
+        index.upsert(doc_id, embedder.embed([text])[0], owner=f"cand-{doc_id}")
+    return embedder, index
+
+
+def test_relevant_document_ranks_first():
+    embedder, index = _build()
+    assert index.search(embedder.embed(["react typescript frontend"])[0], 1)[0][0] == "fe"
+    assert index.search(embedder.embed(["machine learning pytorch"])[0], 1)[0][0] == "ml"
+    assert index.search(embedder.embed(["مطور أندرويد"])[0], 1)[0][0] == "ar"
+
+
+def test_incremental_update_and_remove():
+    embedder, index = _build()
+    index.upsert("go", embedder.embed(["Golang backend engineer, Kubernetes"])[0], owner="cand-go")
+    assert index.search(embedder.embed(["golang kubernetes"])[0], 1)[0][0] == "go"
+    assert index.remove("py")
+    assert len(index) == 4
+    assert all(hit[0] != "py" for hit in index.search(embedder.embed(["django"])[0], 10))
+    assert index.remove_owner("cand-go") == 1
+
+
+class _DeleteQuery:
+    def __init__(self, session):
+        self.session = session
+
+    def filter(self, *clauses):
+        self.session.clauses.extend(clauses)
+        return self
+
+    def delete(self, synchronize_session=None):
+        self.session.deleted += 1
+        return 1
+
+
+class _Session:
+    """Captures the embedding delete instead of running it"""
+    def __init__(self):
+        self.clauses, self.deleted, self.commits = [], 0, 0
+
+    def query(self, *entities):
+        return _DeleteQuery(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_remove_embeddings_deletes_rows_and_vectors():
+    # Callers pass plain ids (e.g. the job_id path parameter of DELETE /jobs/{job_id}),
+    # which stay valid after the ORM object is deleted
+    embedder, index = _build()
+    original = dict(embedding_service._indexes)
+    embedding_service._indexes["job"] = index
+    try:
+        db = _Session()
+        remove_embeddings(db, "job", ["fe", "ml"], commit=False)
+        assert db.deleted == 1 and db.commits == 0
+        assert db.clauses[1].right.value == ["fe", "ml"]
+        assert len(index) == 2
+        assert {hit[0] for hit in index.search(embedder.embed(["react pytorch"])[0], 10)} == {"py", "ar"}
+        remove_embeddings(db, "job", [])
+        assert db.deleted == 1
+    finally:
+        embedding_service._indexes.clear()
+        embedding_service._indexes.update(original)
+
+
+def test_catch_up_replaces_changed_candidates_vectors():
+    # cand-py re-uploaded (new resume "py2"), cand-fe deleted, the others untouched
+    embedder, index = _build()
+    new_vector = embedder.embed(["Python developer, Flask and Celery"])[0]
+    originals = embedding_service.changed_candidates_since, embedding_service._vector_rows
+    embedding_service.changed_candidates_since = lambda db, since: {"cand-py", "cand-fe"}
+    embedding_service._vector_rows = lambda db, entity_type, model_name, candidate_ids=None: [
+        ("py2", "cand-py", new_vector)
+    ] if sorted(candidate_ids) == ["cand-fe", "cand-py"] else []
+    try:
+        assert _catch_up_resumes(index, None, embedder.name, datetime(2024, 1, 1)) == 2
+    finally:
+        embedding_service.changed_candidates_since, embedding_service._vector_rows = originals
+    assert set(index._rows) == {"py2", "ml", "ar"}
+    assert index.search(embedder.embed(["flask celery"])[0], 1)[0][:2] == ("py2", "cand-py")
+
+
+class _BatchSession:
+    """Records savepoints and whole-transaction rollbacks of a backfill batch"""
+    def __init__(self):
+        self.events = []
+
+    @contextmanager
+    def begin_nested(self):
+        self.events.append("savepoint")
+        try:
+            yield
+        except Exception:
+            self.events.append("rollback to savepoint")
+            raise
+
+    def commit(self):
+        self.events.append("commit")
+
+    def rollback(self):
+        self.events.append("rollback")
+
+
+def test_failed_row_rolls_back_only_its_savepoint():
+    db = _BatchSession()
+    resume = models.Resume(extracted_text="Python developer")
+
+    def failing(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    original = embedding_service.upsert_embedding
+    embedding_service.upsert_embedding = failing
+    try:
+        assert index_resume(db, resume, commit=False) is False
+    finally:
+        embedding_service.upsert_embedding = original
+    # The rest of the uncommitted batch survives
+    assert db.events == ["savepoint", "rollback to savepoint"]
+
+
+def _clustered(count, *indexes):
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(20, 64)).astype(np.float32)
+    for i in range(count):
+        v = centers[i % 20] + 0.1 * rng.normal(size=64).astype(np.float32)
+        v /= np.linalg.norm(v)
+        for index in indexes:
+            index.upsert(str(i), v)
+    return centers[3] / np.linalg.norm(centers[3])
+
+
+def test_ivf_matches_flat_on_clustered_data():
+    flat, ivf = VectorIndex(64, ivf_min_vectors=10**9), VectorIndex(64, ivf_min_vectors=100)
+    query = _clustered(4000, flat, ivf)
+    ivf.train_ivf()
+    assert not ivf.needs_training()
+    expected = {hit[0] for hit in flat.search(query, 10)}
+    start = time.perf_counter()
+    found = {hit[0] for hit in ivf.search(query, 10)}
+    print(f"⏱️ IVF search: {(time.perf_counter() - start) * 1000:.1f} ms")
+    assert len(expected & found) >= 8
+
+
+def test_search_trains_in_the_background():
+    flat, ivf = VectorIndex(64, ivf_min_vectors=10**9), VectorIndex(64, ivf_min_vectors=100)
+    query = _clustered(400, flat, ivf)
+    assert ivf.needs_training()
+    # The first search is answered exactly while training starts on a thread
+    assert ivf.search(query, 10) == flat.search(query, 10)
+    ivf._training_thread.join(timeout=30)
+    assert ivf._centroids is not None and not ivf.needs_training()
+    assert not ivf.train_in_background()
+    # Doubling the index schedules a retrain
+    _clustered(1000, ivf)
+    assert ivf.needs_training()
+
+
+if __name__ == "__main__":
+    print("🧪 Testing embedding index...")
+    test_relevant_document_ranks_first()
+    test_incremental_update_and_remove()
+    test_ivf_matches_flat_on_clustered_data()
+    test_search_trains_in_the_background()
+    test_remove_embeddings_deletes_rows_and_vectors()
+    test_catch_up_replaces_changed_candidates_vectors()
+    test_failed_row_rolls_back_only_its_savepoint()
+    print("✅ Embedding index works")
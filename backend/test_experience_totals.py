@@ -0,0 +1,94 @@
+"""
+Tests for the stored candidate experience totals: the refresh is one
+set-based UPDATE, and filters/sorting read the indexed column, never
+work_experience. No database required (SQL is captured or only compiled).
+"""
+import sys
+import uuid
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.services.experience_totals import (
+    apply_experience_filter, experience_years, refresh_candidate_experience_totals
+)
+
+
+class _Result:
+    rowcount = 3
+
+
+class _Recorder:
+    """Records executed SQL instead of running it"""
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return _Result()
+
+    def commit(self):
+        self.commits += 1
+
+
+def _sql(query) -> str:
+    return str(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_refresh_is_one_update_for_the_given_candidates():
+    db = _Recorder()
+    ids = [uuid.uuid4(), uuid.uuid4()]
+    assert refresh_candidate_experience_totals(db, ids) == 3
+    assert db.commits == 1
+    (sql, params), = db.statements
+    assert sql.strip().startswith("UPDATE candidates c SET")
+    assert "we.candidate_id = ANY(CAST(:ids AS uuid[]))" in sql
+    assert "IS DISTINCT FROM" in sql
+    assert params == {"ids": [str(cid) for cid in ids]}
+
+
+def test_refresh_everything_and_nothing():
+    db = _Recorder()
+    refresh_candidate_experience_totals(db, commit=False)
+    assert ":ids" not in db.statements[0][0] and db.commits == 0
+    assert refresh_candidate_experience_totals(db, []) == 0
+    assert len(db.statements) == 1
+
+
+def test_filter_reads_the_stored_column():
+    query = Session().query(models.Candidate.id)
+    sql = _sql(apply_experience_filter(query, min_years=2.5, max_years=10))
+    assert "candidates.total_experience_months >= 30" in sql
+    assert "candidates.total_experience_months < 120" in sql
+    assert "work_experience" not in sql
+    assert apply_experience_filter(query) is query
+
+
+def test_sort_key_is_indexed():
+    indexed = {tuple(c.name for c in index.columns) for index in models.Candidate.__table__.indexes}
+    assert ("total_experience_months", "id") in indexed
+    assert models.Candidate.__table__.c.total_experience_months.nullable is False
+
+
+def test_experience_years():
+    assert experience_years(0) == 0
+    assert experience_years(None) == 0
+    assert experience_years(84) == 7
+    assert experience_years(90) == 8
+
+
+if __name__ == "__main__":
+    print("🧪 Testing candidate experience totals...")
+    test_refresh_is_one_update_for_the_given_candidates()
+    test_refresh_everything_and_nothing()
+    test_filter_reads_the_stored_column()
+    test_sort_key_is_indexed()
+    test_experience_years()
+    print("✅ All experience total tests passed")
@@ -0,0 +1,63 @@
+"""
+Tests for ETag generation and conditional GET handling.
+No database required.
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from fastapi import Response
+from starlette.requests import Request
+
+from app.core.http_cache import conditional_response, etag_matches, make_etag
+
+
+def _request(if_none_match: str = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_etag_is_strong_and_version_sensitive():
+    etag = make_etag("job", "42", datetime(2024, 5, 1))
+    assert etag.startswith('"') and etag.endswith('"') and not etag.startswith("W/")
+    assert etag == make_etag("job", "42", datetime(2024, 5, 1))
+    assert etag != make_etag("job", "42", datetime(2024, 5, 2))
+
+
+def test_if_none_match_variants():
+    etag = make_etag("x")
+    assert etag_matches(_request(etag), etag)
+    assert etag_matches(_request(f'"other", W/{etag}'), etag)
+    assert etag_matches(_request("*"), etag)
+    assert not etag_matches(_request('"other"'), etag)
+    assert not etag_matches(_request(), etag)
+
+
+def test_conditional_response_skips_building_on_match():
+    etag = make_etag("x")
+    built = []
+
+    def build():
+        built.append(True)
+        return Response(content=b"{}", media_type="application/json")
+
+    response = conditional_response(_request(etag), etag, build)
+    assert response.status_code == 304 and not built
+    assert response.headers["etag"] == etag and response.body == b""
+
+    response = conditional_response(_request('"stale"'), etag, build)
+    assert response.status_code == 200 and built
+    assert response.headers["etag"] == etag
+    assert "no-cache" in response.headers["cache-control"]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing conditional GET...")
+    test_etag_is_strong_and_version_sensitive()
+    test_if_none_match_variants()
+    test_conditional_response_skips_building_on_match()
+    print("✅ All conditional GET tests passed")
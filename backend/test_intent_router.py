@@ -0,0 +1,182 @@
+"""
+Tests for the local chat intent router: only whole, plain questions are
+answered from SQL, and unknown skills/jobs/locations go to the LLM.
+No database required (the skill resolver is preloaded; fake sessions find
+nothing or record the compiled SQL and return canned rows).
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from collections import namedtuple
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.services import skill_taxonomy
+from app.services.intent_router import (
+    MAX_LISTED_RESULTS, Intent, _contains, _known_skill, answer_intent, classify_intent
+)
+
+
+class _EmptyQuery:
+    def filter(self, *args):
+        return self
+
+    def first(self):
+        return None
+
+
+class _EmptySession:
+    """Every lookup finds nothing"""
+    def query(self, *entities):
+        return _EmptyQuery()
+
+
+class _RecordingQuery:
+    """A real Query whose execution is faked: count() returns `total`, all() returns `rows`"""
+    def __init__(self, query, db):
+        self._query = query
+        self._db = db
+
+    def __getattr__(self, name):
+        attr = getattr(self._query, name)
+        if not callable(attr):
+            return attr
+
+        def wrapped(*args, **kwargs):
+            return _RecordingQuery(attr(*args, **kwargs), self._db)
+        return wrapped
+
+    def _record(self):
+        self._db.statements.append(str(self._query.statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )))
+
+    def first(self):
+        self._record()
+        return ("found",)
+
+    def count(self):
+        self._record()
+        return self._db.total
+
+    def all(self):
+        self._record()
+        return self._db.rows[:self._query._limit_clause.value if self._query._limit_clause is not None else None]
+
+
+class _RecordingSession:
+    """Builds real queries, records their SQL and answers with canned totals and rows"""
+    def __init__(self, total, rows):
+        self.total = total
+        self.rows = rows
+        self.statements = []
+        self._session = Session()
+
+    def query(self, *entities):
+        return _RecordingQuery(self._session.query(*entities), self)
+
+
+def setup_module(module):
+    skill_taxonomy._resolver = skill_taxonomy.SkillResolver(
+        [(1, "Python", ["py"]), (2, "React", ["reactjs"]), (3, "JavaScript", ["js"])]
+    )
+    skill_taxonomy._resolver_loaded_at = time.time()
+
+
+def teardown_module(module):
+    skill_taxonomy._resolver = None
+
+
+def test_compound_questions_are_general():
+    for query in [
+        "how many candidates are from Cairo?",
+        "كم عدد المرشحين في القاهرة",
+        "Who applied to the backend role and what are their skills?",
+        "any jobs in Cairo that need React?",
+        "which candidate is best for the backend role?",
+    ]:
+        intent = classify_intent(query)
+        assert intent.name == "general" and not intent.direct, query
+
+
+def test_whole_questions_are_classified():
+    assert classify_intent("How many candidates do we have?").params == {"skills": []}
+    intent = classify_intent("how many candidates know Python and React?")
+    assert intent.name == "count_candidates" and intent.params["skills"] == ["python", "react"] and intent.direct
+    assert classify_intent("كم عدد المرشحين").name == "count_candidates"
+    intent = classify_intent("list open jobs in Cairo")
+    assert intent.name == "list_open_jobs" and intent.params["location"] == "cairo"
+    intent = classify_intent("who applied to the Backend Developer job?")
+    assert intent.name == "job_applicants" and intent.params["job"] == "backend developer"
+    assert classify_intent("من تقدم على وظيفة مطور").params["job"] == "مطور"
+
+
+def test_unknown_skills_are_not_answered():
+    db = _EmptySession()
+    for query in ["how many candidates have 5 years of experience", "how many candidates with a masters degree"]:
+        intent = classify_intent(query)
+        assert intent.name == "count_candidates", query
+        assert answer_intent(intent, db) is None, query
+    assert _known_skill(db, "py") and _known_skill(db, "react")
+    assert not _known_skill(db, "5 years of experience")
+
+
+def test_unknown_jobs_and_locations_are_not_answered():
+    db = _EmptySession()
+    assert answer_intent(Intent("job_applicants", "english", {"job": "backend role"}, direct=True), db) is None
+    assert answer_intent(Intent("list_open_jobs", "english", {"location": "atlantis"}, direct=True), db) is None
+
+
+
+def test_skill_count_uses_taxonomy_ids():
+    Row = namedtuple("Row", "id first_name last_name")
+    db = _RecordingSession(25, [Row(i, "Dev", str(i)) for i in range(25)])
+    answer = answer_intent(classify_intent("how many candidates know JS?"), db)
+    assert answer.response.startswith("25 candidate(s) have js.")
+    assert answer.response.endswith(f"... and {25 - MAX_LISTED_RESULTS} more")
+    assert len(answer.candidates) == MAX_LISTED_RESULTS
+    assert any("candidates.skill_ids @> ARRAY[3]" in sql for sql in db.statements)
+    assert not any("lower(trim(skills.skill_name))" in sql for sql in db.statements)
+
+
+def test_listed_totals_come_from_count():
+    Row = namedtuple("Row", "id first_name last_name status job_id title")
+    db = _RecordingSession(30, [Row(i, "Dev", str(i), "submitted", 1, "Backend") for i in range(30)])
+    answer = answer_intent(Intent("job_applicants", "english", {"job": "backend"}, direct=True), db)
+    assert answer.response.startswith('Applicants for "backend" (30):')
+    assert answer.response.count("\n• ") == MAX_LISTED_RESULTS
+    assert answer.response.endswith(f"... and {30 - MAX_LISTED_RESULTS} more")
+
+    Job = namedtuple("Job", "id title location remote_option")
+    db = _RecordingSession(21, [Job(i, "Dev", "Cairo", None) for i in range(21)])
+    answer = answer_intent(Intent("list_open_jobs", "english", {"location": "cairo"}, direct=True), db)
+    assert answer.response.startswith("Open jobs in cairo (21):")
+
+
+def test_like_wildcards_are_escaped():
+    db = _RecordingSession(0, [])
+    answer_intent(Intent("job_applicants", "english", {"job": "100%_remote"}, direct=True), db)
+    assert _contains("100%_remote") == "%100\\%\\_remote%"
+    assert db.statements and all("ESCAPE" in sql for sql in db.statements)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing chat intent router...")
+    setup_module(None)
+    try:
+        test_compound_questions_are_general()
+        test_whole_questions_are_classified()
+        test_unknown_skills_are_not_answered()
+        test_unknown_jobs_and_locations_are_not_answered()
+        test_skill_count_uses_taxonomy_ids()
+        test_listed_totals_come_from_count()
+        test_like_wildcards_are_escaped()
+    finally:
+        teardown_module(None)
+    print("✅ All intent router tests passed")
@@ -0,0 +1,138 @@
+"""
+Tests for map-reduce chat: card batching, the shared AI rate limiter and the
+progress events streamed to the client, including failed and retried batches.
+No AI provider required (call_ai_api is replaced by a scripted fake).
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from app.services import ai_service
+from app.services.ai_rate_limiter import AsyncRateLimiter
+from app.services.map_reduce_chat import estimate_tokens, map_reduce_chat, partition_cards
+
+
+def _run_map_reduce(fake_call, cards, batch_token_budget):
+    events = []
+
+    async def progress(event):
+        events.append(event)
+
+    original = ai_service.call_ai_api
+    ai_service.call_ai_api = fake_call
+    try:
+        answer = asyncio.run(map_reduce_chat(
+            "summarise", cards, None, "system", progress=progress, batch_token_budget=batch_token_budget
+        ))
+    finally:
+        ai_service.call_ai_api = original
+    return answer, events
+
+
+def test_partition_cards_respects_the_budget():
+    cards = ["a" * 40, "b" * 40, "c" * 40, "d" * 200]
+    assert [estimate_tokens(c) for c in cards] == [11, 11, 11, 51]
+    batches = partition_cards(cards, 25)
+    assert batches == [["a" * 40, "b" * 40], ["c" * 40], ["d" * 200]]
+    # An oversized card still gets a batch of its own; order is kept
+    assert [card for batch in batches for card in batch] == cards
+    assert partition_cards([], 25) == []
+
+
+def _limited_calls(limiter, count, duration):
+    """Run calls through the limiter; returns (peak concurrency, start times)"""
+    running, peak, starts = 0, 0, []
+
+    async def call():
+        nonlocal running, peak
+        async with limiter:
+            starts.append(time.monotonic())
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(duration)
+            running -= 1
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(count)))
+
+    asyncio.run(main())
+    return peak, starts
+
+
+def test_rate_limiter_caps_concurrency():
+    peak, _ = _limited_calls(AsyncRateLimiter(max_concurrency=2, requests_per_minute=0), 5, 0.02)
+    assert peak == 2
+
+
+def test_rate_limiter_spaces_request_starts():
+    _, starts = _limited_calls(AsyncRateLimiter(max_concurrency=5, requests_per_minute=1200), 4, 0)
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.045
+
+
+def test_events_and_answer_when_all_batches_succeed():
+    calls = []
+
+    async def fake_call(prompt, system_message=None, user_api_key=None, db=None, mock_on_rate_limit=True):
+        assert mock_on_rate_limit is False
+        calls.append(prompt)
+        return "combined" if prompt.startswith("The candidate database") else "notes"
+
+    answer, events = _run_map_reduce(fake_call, ["x" * 40] * 3, 15)
+    assert answer == "combined"
+    assert [e["event"] for e in events] == ["map_started", "batch_done", "batch_done", "batch_done", "map_done", "reduce_started"]
+    assert events[-2] == {"event": "map_done", "batches": 3, "failed": 0}
+    assert not any(e.get("failed") for e in events if e["event"] == "batch_done")
+    assert len(calls) == 4
+
+
+def test_failed_batches_are_retried_and_reported():
+    attempts = {}
+
+    async def fake_call(prompt, system_message=None, user_api_key=None, db=None, mock_on_rate_limit=True):
+        if prompt.startswith("The candidate database"):
+            assert "analysed in 2 parts" in prompt
+            return "combined"
+        part = prompt.split("part ")[1].split(" ")[0]
+        attempts[part] = attempts.get(part, 0) + 1
+        if part == "2" and attempts[part] == 1:
+            raise RuntimeError("429 Too Many Requests")
+        if part == "3":
+            return "   "
+        return f"notes {part}"
+
+    answer, events = _run_map_reduce(fake_call, ["x" * 40] * 3, 15)
+    # Batch 2 succeeded on retry, batch 3 never did
+    assert attempts == {"1": 1, "2": 2, "3": 2}
+    assert answer.startswith("combined") and "1 of 3 batches" in answer
+    batch_failed = {e["batch"]: e["failed"] for e in events if e["event"] == "batch_done"}
+    assert batch_failed == {1: False, 2: False, 3: True}
+    assert {"event": "map_done", "batches": 3, "failed": 1} in events
+
+
+def test_all_batches_failing_raises():
+    async def fake_call(prompt, system_message=None, user_api_key=None, db=None, mock_on_rate_limit=True):
+        raise RuntimeError("429 Too Many Requests")
+
+    try:
+        _run_map_reduce(fake_call, ["x" * 40] * 2, 15)
+    except RuntimeError as e:
+        assert "All 2" in str(e)
+    else:
+        raise AssertionError("expected RuntimeError")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing map-reduce chat...")
+    test_partition_cards_respects_the_budget()
+    test_rate_limiter_caps_concurrency()
+    test_rate_limiter_spaces_request_starts()
+    test_events_and_answer_when_all_batches_succeed()
+    test_failed_batches_are_retried_and_reported()
+    test_all_batches_failing_raises()
+    print("✅ All map-reduce chat tests passed")
@@ -0,0 +1,88 @@
+"""
+Tests for the multi-factor match engine (component scores and weighting).
+No database required.
+"""
+import sys
+import uuid
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from app.services.match_engine import LOCATION_UNQUALIFIED_SCORE, CandidatePool, MatchJob, MatchWeights, _location_match
+
+# id, years, location, preferred_locations, relocate, expected salary, currency
+ALICE, BOB, CARA, DAN = (uuid.uuid4() for _ in range(4))
+CANDIDATES = [
+    (ALICE, 6, "Cairo, Egypt", None, False, 9000, "USD"),
+    (BOB, 1, "Dubai", ["Cairo"], False, 20000, "USD"),
+    (CARA, None, None, None, True, None, None),
+    (DAN, 15, "Riyadh", None, False, 40000, "SAR"),
+]
+SKILLS = [(ALICE, "Python"), (ALICE, "SQL"), (BOB, "python"), (DAN, "SQL")]
+JOB = MatchJob(
+    required_skills=["Python", "SQL"], min_experience_years=3, max_experience_years=8,
+    location="Cairo", remote_option="No", salary_min=6000, salary_max=10000, salary_currency="USD",
+)
+
+
+def _scores(job=JOB, weights=None):
+    pool = CandidatePool(CANDIDATES, SKILLS)
+    result = pool.score(job, weights or MatchWeights())
+    return {name: dict(zip(pool.candidate_ids, values.tolist())) for name, values in result.items()}
+
+
+def test_components():
+    scores = _scores()
+    assert scores["skills"] == {ALICE: 70.0, BOB: 35.0, CARA: 0.0, DAN: 35.0}
+    assert scores["experience"][ALICE] == 100.0
+    assert scores["experience"][BOB] == 50.0  # two years short
+    assert scores["experience"][CARA] == 50.0  # unknown
+    assert scores["experience"][DAN] == 65.0  # overqualified by 7 years
+    assert scores["location"] == {ALICE: 100.0, BOB: 90.0, CARA: 70.0, DAN: 10.0}
+    assert scores["salary"][ALICE] == 100.0
+    assert scores["salary"][BOB] == 0.0  # 100% over the band
+    assert scores["salary"][CARA] == 50.0  # unknown expectation
+    assert scores["salary"][DAN] == 50.0  # different currency
+
+
+def test_weights_and_neutral_jobs():
+    skills_only = _scores(weights=MatchWeights(skills=1, experience=0, location=0, salary=0))
+    assert skills_only["total"] == skills_only["skills"]
+    remote = _scores(MatchJob(remote_option="Fully Remote"))
+    assert set(remote["location"].values()) == {100.0}
+    assert set(remote["skills"].values()) == {50.0}
+    assert max(_scores()["total"], key=_scores()["total"].get) == ALICE
+
+
+def test_locations_compare_whole_words():
+    assert _location_match("cairo egypt", "cairo") == 100.0
+    assert _location_match("oman", "romania") == 0.0
+    assert _location_match("romania", "oman") == 0.0
+    assert _location_match("us", "russia") == 0.0
+    assert _location_match("russia", "us") == 0.0
+    assert _location_match("alexandria", "alexandria va usa") == LOCATION_UNQUALIFIED_SCORE
+
+    pool = CandidatePool([
+        (ALICE, 5, "Romania", None, False, None, None),
+        (BOB, 5, "Alexandria", None, False, None, None),
+        (CARA, 5, "Russia", None, False, None, None),
+    ], [])
+    for job_location, candidate in [("Oman", ALICE), ("Alexandria, VA, USA", BOB), ("US", CARA)]:
+        scores = dict(zip(pool.candidate_ids, pool.location_score(MatchJob(location=job_location)).tolist()))
+        assert scores[candidate] < 100.0, job_location
+
+
+def test_empty_pool():
+    pool = CandidatePool([], [])
+    assert len(pool.score(JOB, MatchWeights())["total"]) == 0
+
+
+if __name__ == "__main__":
+    print("🧪 Testing match engine...")
+    test_components()
+    test_weights_and_neutral_jobs()
+    test_locations_compare_whole_words()
+    test_empty_pool()
+    print("✅ All match engine tests passed")
@@ -0,0 +1,143 @@
+"""
+Tests for background match rescoring: writes queue candidates and jobs in the
+shared rescore queue, one flush per burst of writes drains it, failures leave
+entries queued and reads never rescore.
+No database required (SQL is captured and the rescoring functions replaced).
+"""
+import inspect
+import sys
+import uuid
+from collections import namedtuple
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from fastapi import BackgroundTasks
+
+from app.services import match_maintenance
+
+QueueRow = namedtuple("QueueRow", "id entity_type entity_id")
+
+
+class _Result:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+
+    def fetchall(self):
+        return self.rows
+
+
+class _Session:
+    """Records SQL; the queue claim returns the scripted batches in turn"""
+    def __init__(self, batches=()):
+        self.batches = list(batches)
+        self.statements = []
+        self.events = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append((sql, params))
+        if sql.startswith("SELECT id, entity_type, entity_id FROM match_rescore_queue"):
+            return _Result(self.batches.pop(0) if self.batches else [])
+        return _Result()
+
+    def commit(self):
+        self.events.append("commit")
+
+    def rollback(self):
+        self.events.append("rollback")
+
+
+def _reset():
+    match_maintenance._flush_scheduled = False
+
+
+def test_burst_of_writes_schedules_one_flush():
+    _reset()
+    db = _Session()
+    first, second = BackgroundTasks(), BackgroundTasks()
+    candidate_ids = [uuid.uuid4() for _ in range(3)]
+    match_maintenance.mark_candidates_dirty(db, candidate_ids[:2], first)
+    match_maintenance.mark_candidates_dirty(db, candidate_ids[2:], second)
+    match_maintenance.mark_jobs_dirty(db, [uuid.uuid4()], second)
+    assert len(first.tasks) == 1
+    assert len(second.tasks) == 0  # covered by the pending flush
+    # Every mark is persisted, so other workers and restarts see it
+    inserts = [params for sql, params in db.statements if sql.startswith("INSERT INTO match_rescore_queue")]
+    assert [p["entity_type"] for p in inserts] == ["candidate", "candidate", "job"]
+    assert inserts[0]["ids"] == sorted(str(cid) for cid in candidate_ids[:2])
+    assert db.events == ["commit"] * 3
+    _reset()
+
+
+def test_marking_without_background_tasks_only_queues():
+    _reset()
+    db = _Session()
+    match_maintenance.mark_jobs_dirty(db, [uuid.uuid4(), None])
+    (sql, params), = db.statements
+    assert len(params["ids"]) == 1
+    assert not match_maintenance._flush_scheduled
+    match_maintenance.mark_jobs_dirty(db, [None])
+    assert len(db.statements) == 1
+
+
+def _flush(db, fail=False, batch_size=match_maintenance.RESCORE_BATCH_SIZE):
+    calls = []
+
+    def rescore_jobs(db, job_ids):
+        calls.append(("jobs", job_ids))
+        return 2
+
+    def rescore_candidates(db, candidate_ids, skip_job_ids=()):
+        if fail:
+            raise RuntimeError("boom")
+        calls.append(("candidates", candidate_ids, list(skip_job_ids)))
+        return 3
+
+    originals = match_maintenance.rescore_jobs, match_maintenance.rescore_candidates
+    match_maintenance.rescore_jobs, match_maintenance.rescore_candidates = rescore_jobs, rescore_candidates
+    try:
+        return match_maintenance.flush_dirty_matches(db, batch_size=batch_size), calls
+    finally:
+        match_maintenance.rescore_jobs, match_maintenance.rescore_candidates = originals
+
+
+def test_flush_drains_the_queue_in_batches():
+    candidate, job = uuid.uuid4(), uuid.uuid4()
+    db = _Session(batches=[
+        [QueueRow(1, "candidate", candidate), QueueRow(2, "job", job)],
+        [QueueRow(3, "candidate", candidate)],
+    ])
+    stored, calls = _flush(db, batch_size=2)
+    assert stored == 8
+    assert calls == [("jobs", [job]), ("candidates", [candidate], [job]), ("candidates", [candidate], [])]
+    deletes = [params["ids"] for sql, params in db.statements if sql.startswith("DELETE FROM match_rescore_queue")]
+    assert deletes == [[1, 2], [3]]
+    assert db.events == ["commit", "commit"]
+    # Each batch is claimed under the cross-worker lock
+    assert sum("pg_advisory_xact_lock" in sql for sql, _ in db.statements) == 2
+
+
+def test_failed_flush_leaves_the_queue():
+    db = _Session(batches=[[QueueRow(1, "candidate", uuid.uuid4())]])
+    stored, calls = _flush(db, fail=True)
+    assert stored == 0
+    assert not any(sql.startswith("DELETE") for sql, _ in db.statements)
+    assert db.events == ["rollback"]
+
+
+def test_reads_never_rescore():
+    for read in (match_maintenance.get_job_shortlist, match_maintenance.get_candidate_top_jobs):
+        assert "flush_dirty_matches" not in inspect.getsource(read)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing background match rescoring...")
+    test_burst_of_writes_schedules_one_flush()
+    test_marking_without_background_tasks_only_queues()
+    test_flush_drains_the_queue_in_batches()
+    test_failed_flush_leaves_the_queue()
+    test_reads_never_rescore()
+    print("✅ All match maintenance tests passed")
@@ -0,0 +1,66 @@
+"""
+Tests for keyset pagination cursors and the page predicate.
+No database required (SQL is only compiled).
+"""
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_cursor, encode_cursor, keyset_page
+from app.db import models
+from app.db.models_users import AuditLog, User
+
+KEYS = (models.Candidate.created_at, models.Candidate.id)
+
+
+def test_cursor_round_trip_keeps_types():
+    values = [datetime(2024, 5, 1, 12, 30, 15, 123456), uuid.uuid4()]
+    cursor = encode_cursor(values)
+    assert "=" not in cursor and "{" not in cursor
+    assert decode_cursor(cursor, KEYS) == values
+
+
+def test_malformed_cursor_is_a_400():
+    for cursor in ["not-a-cursor", encode_cursor(["2024-01-01T00:00:00"]), encode_cursor(["yesterday", "x"])]:
+        with pytest.raises(HTTPException) as error:
+            decode_cursor(cursor, KEYS)
+        assert error.value.status_code == 400
+
+
+def test_page_predicate_is_a_row_comparison():
+    values = decode_cursor(encode_cursor([datetime(2024, 5, 1), uuid.uuid4()]), KEYS)
+    query = Session().query(models.Candidate.id).filter(tuple_(*KEYS) < tuple_(*values))
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+    assert "(candidates.created_at, candidates.id) < (" in sql
+
+
+
+def test_keys_must_be_not_null():
+    # NULLs sort first under DESC but drop out of the row comparison
+    with pytest.raises(ValueError):
+        keyset_page(Session().query(models.Candidate.id), (models.Candidate.updated_at, models.Candidate.id))
+    for key in [
+        models.Candidate.created_at, models.Candidate.total_experience_months, models.Job.created_at,
+        models.Application.applied_date, models.AIChatQuery.timestamp, User.created_at, AuditLog.timestamp,
+    ]:
+        assert key.expression.nullable is False, key
+
+
+if __name__ == "__main__":
+    print("🧪 Testing keyset pagination...")
+    test_cursor_round_trip_keeps_types()
+    test_malformed_cursor_is_a_400()
+    test_page_predicate_is_a_row_comparison()
+    test_keys_must_be_not_null()
+    print("✅ All pagination tests passed")
@@ -0,0 +1,57 @@
+"""
+Tests for column-projected list responses (fieldset parsing, row -> dict).
+No database required.
+"""
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.core.projection import parse_fields, projected_query, response_columns
+from app.db import models
+from app.schemas.schemas import CandidateResponse
+
+
+def test_default_fieldset_is_response_columns():
+    names = response_columns(models.Candidate, CandidateResponse)
+    assert "first_name" in names and "id" in names
+    # Relations and internal columns are never part of a list row
+    assert "skills" not in names and "skill_ids" not in names
+    assert parse_fields(models.Candidate, None, names) == names
+
+
+def test_sparse_fieldset_always_has_id():
+    names = parse_fields(models.Candidate, "first_name, email,first_name,,", ["id"])
+    assert names == ["id", "first_name", "email"]
+
+
+def test_unknown_field_is_a_400():
+    with pytest.raises(HTTPException) as error:
+        parse_fields(models.Candidate, "first_name,password,skills", ["id"])
+    assert error.value.status_code == 400
+    assert "password" in error.value.detail and "skills" in error.value.detail
+
+
+def test_projected_query_selects_only_named_columns_and_keys():
+    keys = (models.Candidate.created_at, models.Candidate.id)
+    query = projected_query(Session(), models.Candidate, ["id", "first_name"], keys)
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+    select_list = sql.split("FROM")[0]
+    assert select_list.count(",") == 2
+    assert "candidates.created_at" in select_list and "candidates.email" not in select_list
+
+
+if __name__ == "__main__":
+    print("🧪 Testing list projections...")
+    test_default_fieldset_is_response_columns()
+    test_sparse_fieldset_always_has_id()
+    test_unknown_field_is_a_400()
+    test_projected_query_selects_only_named_columns_and_keys()
+    print("✅ All projection tests passed")
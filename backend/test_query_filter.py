@@ -0,0 +1,97 @@
+"""
+Tests for the natural-language -> structured candidate filter compiler.
+The rule compiler needs no database or AI key; filter SQL is only compiled.
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.services import skill_taxonomy
+from app.services.query_filter import CandidateFilter, apply_candidate_filter, compile_filter_rules
+
+KNOWN_SKILLS = {"python", "django", "react", "c++", "machine learning", "sql", "go", "communication", "english", "sales"}
+
+
+def test_full_constraint_query():
+    f = compile_filter_rules(
+        "Senior Python and Django developers based in Cairo with 5+ years, fluent in English", KNOWN_SKILLS
+    )
+    assert sorted(f.skills) == ["django", "python"]
+    assert f.min_years == 5 and f.max_years is None
+    assert f.location == "Cairo"
+    assert f.career_level == "Senior"
+    assert f.languages == ["English"]
+
+
+def test_skill_after_preposition_is_not_a_location():
+    f = compile_filter_rules("candidates with experience in Python and at least 3 years", KNOWN_SKILLS)
+    assert f.skills == ["python"]
+    assert f.location is None
+    assert f.min_years == 3
+
+
+def test_upper_bound_and_multi_word_location():
+    f = compile_filter_rules("junior react devs with less than 2 years living in New York", KNOWN_SKILLS)
+    assert f.max_years == 2 and f.min_years is None
+    assert f.location == "New York"
+    assert f.career_level == "Entry"
+
+
+def test_arabic_query():
+    f = compile_filter_rules("مطورين خبرة أكثر من 5 سنوات يتحدثون الإنجليزية", KNOWN_SKILLS)
+    assert f.min_years == 5
+    assert f.languages == ["English"]
+
+
+def test_general_question_compiles_to_empty_filter():
+    assert compile_filter_rules("Who are our strongest candidates?", KNOWN_SKILLS).is_empty()
+
+
+def test_everyday_words_are_not_criteria():
+    for query in [
+        "Which candidate should we go with",
+        "Who has the best communication skills?",
+        "candidates from IBM",
+        "Who worked in Dubai?",
+    ]:
+        assert compile_filter_rules(query, KNOWN_SKILLS).is_empty(), query
+
+    f = compile_filter_rules("Which candidates speak English?", KNOWN_SKILLS)
+    assert f.skills == [] and f.languages == ["English"]
+
+    # The job's city is not the candidate's location
+    assert compile_filter_rules("best fit for the sales job in Cairo", KNOWN_SKILLS).is_empty()
+
+
+
+def test_filter_skills_resolve_through_the_taxonomy():
+    skill_taxonomy._resolver = skill_taxonomy.SkillResolver([(3, "JavaScript", ["js"])])
+    skill_taxonomy._resolver_loaded_at = time.time()
+    try:
+        db = Session()
+        query = apply_candidate_filter(db, db.query(models.Candidate.id), CandidateFilter(skills=["js", "cobol"]))
+        sql = str(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    finally:
+        skill_taxonomy._resolver = None
+    assert "candidates.skill_ids @> ARRAY[3]" in sql
+    assert "candidates.skill_names @> ARRAY['cobol']" in sql
+
+
+if __name__ == "__main__":
+    print("🧪 Testing candidate filter compilation...")
+    test_full_constraint_query()
+    test_skill_after_preposition_is_not_a_location()
+    test_upper_bound_and_multi_word_location()
+    test_arabic_query()
+    test_general_question_compiles_to_empty_filter()
+    test_everyday_words_are_not_criteria()
+    test_filter_skills_resolve_through_the_taxonomy()
+    print("✅ Candidate filter compilation works")
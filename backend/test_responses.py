@@ -0,0 +1,65 @@
+"""
+Tests for the orjson response layer and MessagePack negotiation.
+No database required.
+"""
+import sys
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+import orjson
+from starlette.requests import Request
+
+from app.core import responses
+from app.core.responses import FastJSONResponse, dumps, negotiated_response
+from app.schemas.schemas import CandidateInfo
+
+
+def _request(accept: str) -> Request:
+    return Request({"type": "http", "headers": [(b"accept", accept.encode())]})
+
+
+def test_dumps_handles_api_value_types():
+    candidate_id = uuid.uuid4()
+    body = orjson.loads(dumps({
+        "id": candidate_id,
+        "created_at": datetime(2024, 5, 1, 12, 0),
+        "deadline": date(2024, 6, 1),
+        "salary": Decimal("1500.50"),
+        "info": CandidateInfo(id=candidate_id, name="سارة"),
+        "tags": {"python"},
+        1: "non-string key",
+    }))
+    assert body["id"] == str(candidate_id)
+    assert body["created_at"] == "2024-05-01T12:00:00"
+    assert body["deadline"] == "2024-06-01"
+    assert body["salary"] == 1500.5
+    assert body["info"]["name"] == "سارة"
+    assert body["tags"] == ["python"]
+    assert body["1"] == "non-string key"
+
+
+def test_negotiated_response_defaults_to_json_and_keeps_headers():
+    response = negotiated_response(_request("application/json"), [{"a": 1}], headers={"x-next-cursor": "abc"})
+    assert isinstance(response, FastJSONResponse)
+    assert response.body == b'[{"a":1}]'
+    assert response.headers["x-next-cursor"] == "abc"
+    assert response.headers["vary"] == "Accept"
+
+
+def test_msgpack_only_when_requested_and_available():
+    assert responses.wants_msgpack(_request("application/json")) is False
+    assert responses.wants_msgpack(_request("application/msgpack")) is (responses.msgpack is not None)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing response serialisation...")
+    test_dumps_handles_api_value_types()
+    test_negotiated_response_defaults_to_json_and_keeps_headers()
+    test_msgpack_only_when_requested_and_available()
+    print("✅ All response serialisation tests passed")
@@ -0,0 +1,66 @@
+"""
+Tests for the skill array filters: canonical ids when the skill is known,
+lowercase names otherwise, @> for all-of and && for any-of.
+No database required (the resolver is preloaded and SQL is only compiled).
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.services import skill_taxonomy
+from app.services.skill_arrays import _split, apply_skill_filter
+
+
+def _session() -> Session:
+    skill_taxonomy._resolver = skill_taxonomy.SkillResolver([(1, "Python", ["py"]), (2, "React", ["reactjs"])])
+    skill_taxonomy._resolver_loaded_at = time.time()
+    return Session()
+
+
+def teardown_module(module):
+    skill_taxonomy._resolver = None
+
+
+def _sql(query) -> str:
+    return str(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_split_accepts_repeated_and_comma_separated_values():
+    assert _split(["python, react", " ", "go"]) == ["python", "react", "go"]
+    assert _split(None) == []
+
+
+def test_all_of_uses_containment():
+    db = _session()
+    sql = _sql(apply_skill_filter(db, db.query(models.Candidate.id), all_of=["py,ReactJS", "Cobol"]))
+    assert "candidates.skill_ids @> ARRAY[1, 2]" in sql
+    assert "candidates.skill_names @> ARRAY['cobol']" in sql
+
+
+def test_any_of_uses_overlap():
+    db = _session()
+    sql = _sql(apply_skill_filter(db, db.query(models.Candidate.id), any_of=["python", "cobol"]))
+    assert "candidates.skill_ids && ARRAY[1] OR candidates.skill_names && ARRAY['cobol']" in sql
+
+
+def test_no_skills_leaves_query_unchanged():
+    db = _session()
+    query = db.query(models.Candidate.id)
+    assert apply_skill_filter(db, query) is query
+
+
+if __name__ == "__main__":
+    print("🧪 Testing skill array filters...")
+    test_split_accepts_repeated_and_comma_separated_values()
+    test_all_of_uses_containment()
+    test_any_of_uses_overlap()
+    test_no_skills_leaves_query_unchanged()
+    print("✅ All skill array filter tests passed")
@@ -0,0 +1,48 @@
+"""
+Tests for canonical skill resolution (aliases, separators, versions).
+No database required.
+"""
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+from app.services.skill_taxonomy import SEED_TAXONOMY, SkillResolver, skill_key
+
+
+def _resolver() -> SkillResolver:
+    return SkillResolver((i, name, aliases) for i, (name, aliases) in enumerate(SEED_TAXONOMY.items(), 1))
+
+
+def test_aliases_resolve_to_one_id():
+    resolver = _resolver()
+    javascript = resolver.resolve("JavaScript")
+    assert javascript is not None
+    for variant in ["JS", "Javascript", "JavaScript ES6", "javascript es2015", " ECMAScript "]:
+        assert resolver.resolve(variant) == javascript, variant
+    assert resolver.canonical_name(javascript) == "JavaScript"
+
+
+def test_separators_and_versions():
+    resolver = _resolver()
+    assert resolver.resolve("node js") == resolver.resolve("NodeJS") == resolver.resolve("Node.js")
+    assert resolver.resolve("Python 3.11") == resolver.resolve("python")
+    assert resolver.resolve("HTML5") == resolver.resolve("html")
+    assert resolver.resolve("C++") != resolver.resolve("C") != resolver.resolve("C#")
+
+
+def test_unknown_skills_fall_back_to_normalised_names():
+    resolver = _resolver()
+    assert resolver.resolve("Quantum Basket Weaving") is None
+    assert resolver.key("Quantum Basket-Weaving") == resolver.key("quantum basket weaving")
+    assert skill_key("  Scikit_Learn ") == "scikitlearn"
+
+
+if __name__ == "__main__":
+    print("🧪 Testing skill taxonomy...")
+    test_aliases_resolve_to_one_id()
+    test_separators_and_versions()
+    test_unknown_skills_fall_back_to_normalised_names()
+    print("✅ All skill taxonomy tests passed")
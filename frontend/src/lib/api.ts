@@ -105,7 +105,7 @@ api.interceptors.response.use(
 
 // Candidate APIs
 export const candidateApi = {
-  getAll: (params?: { skip?: number; limit?: number; status?: string }) =>
+  getAll: (params?: { skip?: number; limit?: number; cursor?: string; include_total?: boolean; status?: string; fields?: string }) =>
     api.get('/candidates/', { params }),
   
   getById: (id: string) =>
@@ -158,7 +158,7 @@ export const resumeApi = {
 
 // Job APIs
 export const jobApi = {
-  getAll: (params?: { skip?: number; limit?: number; status?: string }) =>
+  getAll: (params?: { skip?: number; limit?: number; cursor?: string; include_total?: boolean; status?: string; fields?: string }) =>
     api.get('/jobs/', { params }),
   
   getById: (id: string) =>
@@ -176,7 +176,7 @@ export const jobApi = {
 
 // Application APIs
 export const applicationApi = {
-  getAll: (params?: { skip?: number; limit?: number; candidate_id?: string; job_id?: string }) =>
+  getAll: (params?: { skip?: number; limit?: number; cursor?: string; include_total?: boolean; candidate_id?: string; job_id?: string; fields?: string }) =>
     api.get('/applications/', { params }),
   
   getById: (id: string) =>
@@ -191,11 +191,49 @@ export const applicationApi = {
 
 // AI APIs
 export const aiApi = {
-  chat: (query_text: string, conversation_history?: any[], user_id?: string) =>
-    api.post('/ai/chat', { query_text, conversation_history, user_id }),
+  chat: (query_text: string, conversation_history?: any[], user_id?: string, conversation_id?: string | null) =>
+    api.post('/ai/chat', { query_text, conversation_history, user_id, conversation_id }),
+  
+  // Streams newline-delimited JSON progress events; resolves with the final result event
+  chatStream: async (
+    body: { query_text: string; conversation_history?: any[]; user_id?: string; conversation_id?: string | null; mode?: string },
+    onEvent: (event: any) => void
+  ) => {
+    const token = localStorage.getItem('access_token')
+    const response = await fetch(`${API_BASE_URL}/api/v1/ai/chat/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(token ? { Authorization: `Bearer ${token}` } : {}),
+      },
+      body: JSON.stringify(body),
+    })
+    if (!response.ok || !response.body) {
+      throw new Error(`Chat stream failed with status ${response.status}`)
+    }
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    let result: any = null
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+      const lines = buffer.split('\n')
+      buffer = lines.pop() || ''
+      for (const line of lines) {
+        if (!line.trim()) continue
+        const event = JSON.parse(line)
+        onEvent(event)
+        if (event.event === 'result') result = event
+        if (event.event === 'error') throw new Error(event.detail)
+      }
+    }
+    return result
+  },
   
-  search: (query: string, limit?: number) =>
-    api.post('/ai/search', { query, limit: limit || 10 }),
+  search: (query: string, limit?: number, explain?: boolean) =>
+    api.post('/ai/search', { query, limit: limit || 10, explain: explain || false }),
   
   getQueryHistory: (params?: { skip?: number; limit?: number; user_id?: string }) =>
     api.get('/ai/queries', { params }),
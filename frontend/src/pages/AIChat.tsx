@@ -40,6 +40,8 @@ const AIChat = () => {
   const [messages, setMessages] = useState<Message[]>([])
   const [conversations, setConversations] = useState<Conversation[]>([])
   const [currentConversationId, setCurrentConversationId] = useState<string | null>(null)
+  // Server-side conversation session; once established the history no longer needs to be resent
+  const [serverConversationId, setServerConversationId] = useState<string | null>(null)
   const messagesEndRef = useRef<HTMLDivElement>(null)
   const queryClient = useQueryClient()
 
@@ -105,16 +107,19 @@ const AIChat = () => {
     setConversations([])
     setMessages([])
     setCurrentConversationId(null)
+    setServerConversationId(null)
   }
 
   const loadConversation = (conversation: Conversation) => {
     setMessages(conversation.messages)
     setCurrentConversationId(conversation.id)
+    setServerConversationId(null)
   }
 
   const startNewConversation = () => {
     setMessages([])
     setCurrentConversationId(null)
+    setServerConversationId(null)
   }
 
   // Check if user has personal API key configured
@@ -138,15 +143,19 @@ const AIChat = () => {
 
   const chatMutation = useMutation({
     mutationFn: (queryText: string) => {
-      // Prepare conversation history (exclude candidates from history to keep it lightweight)
-      const history = messages.map(msg => ({
+      // The server keeps the conversation memory; history is only sent to seed a new session
+      // (e.g. after loading a saved conversation). Candidates are excluded to keep it lightweight.
+      const history = serverConversationId ? [] : messages.map(msg => ({
         role: msg.role,
         content: msg.content
       }))
       
-      return aiApi.chat(queryText, history)
+      return aiApi.chat(queryText, history, undefined, serverConversationId)
     },
     onSuccess: (data) => {
+      if (data.data.conversation_id) {
+        setServerConversationId(data.data.conversation_id)
+      }
       setMessages((prev) => [
         ...prev,
         { 
@@ -21,6 +21,7 @@ const Candidates = () => {
       candidateApi.getAll({
         status: statusFilter === 'all' ? undefined : statusFilter,
         limit: 100,
+        fields: 'first_name,last_name,email,phone,current_location,career_level,status,created_at',
       }),
   })
 
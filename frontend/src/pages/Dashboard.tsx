@@ -9,7 +9,7 @@ const Dashboard = () => {
 
   const { data: candidates } = useQuery({
     queryKey: ['candidates'],
-    queryFn: () => candidateApi.getAll({ limit: 100 }),
+    queryFn: () => candidateApi.getAll({ limit: 100, fields: 'first_name,last_name,email,created_at,updated_at' }),
   })
 
   const { data: jobs } = useQuery({